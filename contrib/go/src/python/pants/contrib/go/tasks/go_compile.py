@@ -6,10 +6,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+from multiprocessing import cpu_count
 
 from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
-from pants.util.dirutil import safe_mkdir
 
 from pants.contrib.go.targets.go_target import GoTarget
 from pants.contrib.go.tasks.go_workspace_task import GoWorkspaceTask
@@ -27,6 +28,9 @@ class GoCompile(GoWorkspaceTask):
     super(GoCompile, cls).register_options(register)
     register('--build-flags', default='',
              help='Build flags to pass to Go compiler.')
+    register('--worker-count', advanced=True, type=int, default=cpu_count(),
+             help='The number of Go packages to compile concurrently.  Defaults to the current '
+                  'machine\'s CPU count.')
 
   @classmethod
   def product_types(cls):
@@ -43,10 +47,6 @@ class GoCompile(GoWorkspaceTask):
         gopath = self.get_gopath(vt.target)
         if not isinstance(vt.target, GoTarget):
           continue
-        if not vt.valid:
-          self.ensure_workspace(vt.target)
-          self._sync_binary_dep_links(vt.target, gopath, lib_binary_map)
-          self._go_install(vt.target, gopath)
         if self.is_binary(vt.target):
           binary_path = os.path.join(gopath, 'bin', os.path.basename(vt.target.address.spec_path))
           self.context.products.get_data('exec_binary')[vt.target] = binary_path
@@ -54,6 +54,54 @@ class GoCompile(GoWorkspaceTask):
           lib_binary_map[vt.target] = os.path.join(gopath, 'pkg', self.goos_goarch,
                                                    vt.target.import_path + '.a')
 
+      invalid_targets = [vt.target for vt in invalidation_check.invalid_vts
+                         if isinstance(vt.target, GoTarget)]
+      if invalid_targets:
+        with self.context.new_workunit(name='compile',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          self._compile_in_waves(invalid_targets, lib_binary_map, workunit)
+
+  def _compile_in_waves(self, targets, lib_binary_map, workunit):
+    """Compiles the given targets, concurrently compiling those that don't depend on each other.
+
+    :param list targets: The Go targets to compile, in topological order.
+    :param dict lib_binary_map: Maps each library to the path of its compiled binary.
+    """
+    closures = {}
+    rebuilt_libs = frozenset(targets)
+    # Each target is compiled in the wave after the last of its dependencies being compiled.
+    waves = []
+    wave_by_target = {}
+    for target in targets:
+      wave = 1 + max([wave_by_target[dep] for dep in self.go_closure(target, closures)
+                      if dep in wave_by_target] or [-1])
+      wave_by_target[target] = wave
+      if wave == len(waves):
+        waves.append([])
+      waves[wave].append(target)
+
+    def compile_target(target):
+      gopath = self.get_gopath(target)
+      self.ensure_workspace(target, closures)
+      self._sync_binary_dep_links(target, gopath, lib_binary_map, rebuilt_libs=rebuilt_libs,
+                                  closures=closures)
+      self._go_install(target, gopath)
+
+    worker_count = min(self.get_options().worker_count, max(len(wave) for wave in waves))
+    if worker_count <= 1:
+      for wave in waves:
+        for target in wave:
+          compile_target(target)
+      return
+
+    worker_pool = WorkerPool(workunit, self.context.run_tracker, worker_count)
+    try:
+      for wave in waves:
+        worker_pool.submit_work_and_wait(Work(compile_target, [(target,) for target in wave]),
+                                         workunit_parent=workunit)
+    finally:
+      worker_pool.shutdown()
+
   def _go_install(self, target, gopath):
     args = self.get_options().build_flags.split() + [target.import_path]
     result, go_cmd = self.go_dist.execute_go_cmd('install', gopath=gopath, args=args,
@@ -62,7 +110,8 @@ class GoCompile(GoWorkspaceTask):
     if result != 0:
       raise TaskError('{} failed with exit code {}'.format(go_cmd, result))
 
-  def _sync_binary_dep_links(self, target, gopath, lib_binary_map):
+  def _sync_binary_dep_links(self, target, gopath, lib_binary_map, rebuilt_libs=None,
+                             closures=None):
     """Syncs symlinks under gopath to the library binaries of target's transitive dependencies.
 
     :param Target target: Target whose transitive dependencies must be linked.
@@ -71,29 +120,29 @@ class GoCompile(GoWorkspaceTask):
     :param dict<Target, str> lib_binary_map: Dictionary mapping a remote/local Go library to the
                                              path of the compiled binary (the ".a" file) of the
                                              library.
+    :param rebuilt_libs: The libraries whose binaries were rebuilt since the links were last
+                         synced, if known.
+    :param dict closures: An optional memo of Go closures; see `go_closure`.
 
     Required links to binary dependencies under gopath's "pkg/" dir are either created if
-    non-existent, or refreshed if the link is older than the underlying binary. Any pre-existing
-    links within gopath's "pkg/" dir that do not correspond to a transitive dependency of target
-    are deleted.
+    non-existent, or refreshed if the underlying binary was rebuilt. Refreshing the link makes its
+    mtime (modification time) greater than the mtime of the binary, which stops Go from needlessly
+    re-compiling the library. If `rebuilt_libs` is not given, the binaries that are newer than
+    their links are refreshed. Any pre-existing links within gopath's "pkg/" dir that do not
+    correspond to a transitive dependency of target are deleted.
     """
-    required_links = set()
-    for dep in target.closure():
+    required_links = {}
+    refresh = set()
+    for dep in self.go_closure(target, closures):
       if dep == target:
         continue
-      if not isinstance(dep, GoTarget):
-        continue
       lib_binary = lib_binary_map[dep]
       lib_binary_link = os.path.join(gopath, os.path.relpath(lib_binary, self.get_gopath(dep)))
-      safe_mkdir(os.path.dirname(lib_binary_link))
-      if os.path.islink(lib_binary_link):
-        if os.stat(lib_binary).st_mtime > os.lstat(lib_binary_link).st_mtime:
-          # The binary under the link was updated after the link was created. Refresh
-          # the link so the mtime (modification time) of the link is greater than the
-          # mtime of the binary. This stops Go from needlessly re-compiling the library.
-          os.unlink(lib_binary_link)
-          os.symlink(lib_binary, lib_binary_link)
-      else:
-        os.symlink(lib_binary, lib_binary_link)
-      required_links.add(lib_binary_link)
-    self.remove_unused_links(os.path.join(gopath, 'pkg'), required_links)
+      required_links[lib_binary_link] = lib_binary
+      if rebuilt_libs is None:
+        if (os.path.islink(lib_binary_link) and
+            os.stat(lib_binary).st_mtime > os.lstat(lib_binary_link).st_mtime):
+          refresh.add(lib_binary_link)
+      elif dep in rebuilt_libs:
+        refresh.add(lib_binary_link)
+    self.sync_links(gopath, 'pkg', required_links, refresh=refresh)
@@ -5,9 +5,12 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import errno
 import os
-import shutil
-from collections import defaultdict
+import re
+from collections import OrderedDict, defaultdict
+from hashlib import sha1
+from multiprocessing.pool import ThreadPool
 
 from pants.base.exceptions import TaskError
 from pants.build_graph.address import Address
@@ -23,10 +26,24 @@ from pants.contrib.go.tasks.go_task import GoTask
 class GoFetch(GoTask):
   """Fetches third-party Go libraries."""
 
+  # Only a full commit sha names the same contents on every fetch; tags and branches can move.
+  _IMMUTABLE_REV_RE = re.compile(r'^[0-9a-f]{40}$')
+
   @classmethod
   def global_subsystems(cls):
     return super(GoFetch, cls).global_subsystems() + (Fetchers,)
 
+  @classmethod
+  def register_options(cls, register):
+    super(GoFetch, cls).register_options(register)
+    register('--worker-count', type=int, default=4, advanced=True,
+             help='The maximum number of remote roots to fetch concurrently.')
+    register('--fetch-cache-dir', advanced=True,
+             default=os.path.join(register.bootstrap.pants_bootstrapdir, 'go', 'fetches'),
+             help='A directory shared by all workspaces on this machine in which remote roots '
+                  'fetched at a full commit sha are unpacked, so that a given commit of a remote '
+                  'root is only ever downloaded once.')
+
   @classmethod
   def product_types(cls):
     return ['go_remote_lib_src']
@@ -87,23 +104,17 @@ class GoFetch(GoTask):
     go_remote_lib_src = self.context.products.get_data('go_remote_lib_src')
 
     with self.invalidated(go_remote_libs) as invalidation_check:
+      # Each library discovered below is only fetched by the next round of recursion, so the
+      # invalid libraries of this round are the fetch frontier and can all be fetched at once.
+      root_dirs = self._fetch_remote_roots([vt.target for vt in invalidation_check.invalid_vts])
+
       for vt in invalidation_check.all_vts:
         go_remote_lib = vt.target
         gopath = vt.results_dir
-        fetcher = self._get_fetcher(go_remote_lib.import_path)
 
         if not vt.valid:
-          root = fetcher.root(go_remote_lib.import_path)
-          fetch_dir = os.path.join(self.workdir, 'fetches')
-          root_dir = os.path.join(fetch_dir, root)
-
-          # Only fetch each remote root once.
-          if not os.path.exists(root_dir):
-            with temporary_dir() as tmp_fetch_root:
-              fetcher.fetch(go_remote_lib.import_path, dest=tmp_fetch_root, rev=go_remote_lib.rev)
-              safe_mkdir(root_dir)
-              for path in os.listdir(tmp_fetch_root):
-                shutil.move(os.path.join(tmp_fetch_root, path), os.path.join(root_dir, path))
+          root = self._get_fetcher(go_remote_lib.import_path).root(go_remote_lib.import_path)
+          root_dir = root_dirs[go_remote_lib]
 
           # TODO(John Sirois): Circle back and get get rid of this symlink tree.
           # GoWorkspaceTask will further symlink a single package from the tree below into a
@@ -154,6 +165,67 @@ class GoFetch(GoTask):
 
     return undeclared_deps
 
+  def _root_dir(self, root, rev):
+    """Returns the directory the given `rev` of the remote `root` is unpacked in.
+
+    Roots fetched at a full commit sha are shared by all workspaces on this machine; roots fetched
+    at a symbolic rev, such as a tag or branch, or at the fetcher's default rev may change from
+    fetch to fetch and so are private to this one.
+    """
+    if rev and self._IMMUTABLE_REV_RE.match(rev):
+      return os.path.join(self.get_options().fetch_cache_dir, root, sha1(rev).hexdigest())
+    else:
+      return os.path.join(self.workdir, 'fetches', root)
+
+  def _fetch_remote_roots(self, go_remote_libs):
+    """Fetches the remote roots of the given libraries that are not fetched yet, concurrently.
+
+    Each remote root is only fetched once per rev, even if several of the libraries live in it.
+
+    :param go_remote_libs: The remote libraries to fetch.
+    :returns: A dict from each given library to the directory its remote root is unpacked in.
+    :rtype: dict
+    """
+    root_dirs = {}
+    fetches = OrderedDict()
+    for go_remote_lib in go_remote_libs:
+      fetcher = self._get_fetcher(go_remote_lib.import_path)
+      root_dir = self._root_dir(fetcher.root(go_remote_lib.import_path), go_remote_lib.rev)
+      root_dirs[go_remote_lib] = root_dir
+      if root_dir not in fetches and not os.path.exists(root_dir):
+        fetches[root_dir] = (root_dir, fetcher, go_remote_lib.import_path, go_remote_lib.rev)
+
+    def fetch(args):
+      self._fetch_remote_root(*args)
+
+    worker_count = min(self.get_options().worker_count, len(fetches))
+    if worker_count <= 1:
+      for args in fetches.values():
+        fetch(args)
+    else:
+      pool = ThreadPool(processes=worker_count)
+      try:
+        pool.map(fetch, fetches.values(), chunksize=1)
+      finally:
+        pool.close()
+        pool.join()
+    return root_dirs
+
+  @staticmethod
+  def _fetch_remote_root(root_dir, fetcher, import_path, rev):
+    # Unpack beside the root dir and then move the whole tree into place in one rename, so that
+    # other workspaces sharing the root dir never see a partially unpacked root.
+    parent_dir = os.path.dirname(root_dir)
+    safe_mkdir(parent_dir)
+    with temporary_dir(root_dir=parent_dir) as tmp_fetch_root:
+      fetcher.fetch(import_path, dest=tmp_fetch_root, rev=rev)
+      try:
+        os.rename(tmp_fetch_root, root_dir)
+      except OSError as e:
+        # Another workspace fetched the same rev of the root in the meantime; we use its copy.
+        if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+          raise
+
   class UndeclaredRemoteLibError(Exception):
     def __init__(self, address):
       self.address = address
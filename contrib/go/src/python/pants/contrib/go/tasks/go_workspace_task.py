@@ -5,11 +5,13 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import json
 import os
 from itertools import chain
 
 from pants.base.build_environment import get_buildroot
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import safe_delete, safe_mkdir, safe_open
+from pants.util.memo import memoized_method
 
 from pants.contrib.go.targets.go_target import GoTarget
 from pants.contrib.go.tasks.go_task import GoTask
@@ -33,74 +35,120 @@ class GoWorkspaceTask(GoTask):
     """Returns the $GOPATH for the given target."""
     return os.path.join(self.workdir, target.id)
 
-  def ensure_workspace(self, target):
+  def go_closure(self, target, closures=None):
+    """Returns the Go targets in the transitive closure of the given target, including itself.
+
+    :param Target target: The target to return the Go closure of.
+    :param dict closures: An optional memo of the Go closures of targets.  Callers handling many
+                          targets should pass the same dict for each, so that each closure is
+                          assembled from the memoized closures of the target's dependencies
+                          instead of by walking its whole transitive closure again.
+    :rtype: frozenset
+    """
+    if closures is None:
+      closures = {}
+    closure = closures.get(target)
+    if closure is None:
+      closure = set([target]) if isinstance(target, GoTarget) else set()
+      for dep in target.dependencies:
+        closure.update(self.go_closure(dep, closures))
+      closure = closures[target] = frozenset(closure)
+    return closure
+
+  def ensure_workspace(self, target, closures=None):
     """Ensures that an up-to-date Go workspace exists for the given target.
 
     Creates any necessary symlinks to source files based on the target and its transitive
     dependencies, and removes any symlinks which do not correspond to any needed dep.
+
+    :param Target target: The target to ensure a workspace for.
+    :param dict closures: An optional memo of Go closures; see `go_closure`.
     """
     gopath = self.get_gopath(target)
     for d in ('bin', 'pkg', 'src'):
       safe_mkdir(os.path.join(gopath, d))
-    required_links = set()
-    for dep in target.closure():
-      if not isinstance(dep, GoTarget):
-        continue
-      if self.is_remote_lib(dep):
-        self._symlink_remote_lib(gopath, dep, required_links)
-      else:
-        self._symlink_local_src(gopath, dep, required_links)
-    self.remove_unused_links(os.path.join(gopath, 'src'), required_links)
-
-  @staticmethod
-  def remove_unused_links(dirpath, required_links):
-    """Recursively remove any links in dirpath which are not contained in required_links.
-
-    :param str dirpath: Absolute path of directory to search.
-    :param container required_links: Container of "in use" links which should not be removed,
-                                     where each link is an absolute path.
+    required_links = {}
+    for dep in self.go_closure(target, closures):
+      src_dir = os.path.join(gopath, 'src', dep.import_path)
+      for source in self._lib_sources(dep):
+        required_links[os.path.join(src_dir, os.path.basename(source))] = source
+    self.sync_links(gopath, 'src', required_links)
+
+  def sync_links(self, gopath, subdir, required_links, refresh=frozenset()):
+    """Makes the links under the given dir of a $GOPATH exactly the given required links.
+
+    Each $GOPATH is a persistent link farm: the links made by a sync are recorded in a manifest, so
+    that the next sync only creates, re-points and removes the links that changed since, rather
+    than reading every link.  Recorded links are still checked for existence, so that links deleted
+    since are created again.  Without a manifest, all the links under the dir are examined.
+
+    :param str gopath: The $GOPATH to sync links in.
+    :param str subdir: The dir of the $GOPATH holding the links; either "src" or "pkg".
+    :param dict required_links: Maps the absolute path of each required link to the path it links
+                                to.
+    :param refresh: The paths of required links to re-create even if they are up to date, so that
+                    their mtime is newer than that of the path they link to.
     """
-    for root, dirs, files in os.walk(dirpath):
-      for p in chain(dirs, files):
-        p = os.path.join(root, p)
-        if os.path.islink(p) and p not in required_links:
-          os.unlink(p)
-
-  def _symlink_local_src(self, gopath, go_local_src, required_links):
-    """Creates symlinks from the given gopath to the source files of the given local package.
+    link_dir = os.path.join(gopath, subdir)
+    manifest_path = os.path.join(gopath, '.{}-links.json'.format(subdir))
+    existing_links = self._read_links_manifest(link_dir, manifest_path)
+    if existing_links is None:
+      existing_links = {}
+      for root, dirs, files in os.walk(link_dir):
+        for p in chain(dirs, files):
+          p = os.path.join(root, p)
+          if os.path.islink(p):
+            existing_links[p] = os.readlink(p)
+    else:
+      # Until the sync completes the manifest can't be trusted.
+      safe_delete(manifest_path)
+
+    for link in existing_links:
+      if link not in required_links:
+        safe_delete(link)
+
+    link_parents = set()
+    for link, path in required_links.items():
+      if existing_links.get(link) != path or link in refresh or not os.path.islink(link):
+        link_parent = os.path.dirname(link)
+        if link_parent not in link_parents:
+          safe_mkdir(link_parent)
+          link_parents.add(link_parent)
+        safe_delete(link)
+        os.symlink(path, link)
+
+    with safe_open(manifest_path, 'w') as fp:
+      json.dump({os.path.relpath(link, link_dir): path for link, path in required_links.items()},
+                fp)
 
-    Also duplicates directory structure leading to source files of package within
-    gopath, in order to provide isolation to the package.
-
-    Adds the symlinks to the source files to required_links.
-    """
-    source_iter = (os.path.join(get_buildroot(), src)
-                   for src in go_local_src.sources_relative_to_buildroot())
-    return self._symlink_lib(gopath, go_local_src, source_iter, required_links)
-
-  def _symlink_remote_lib(self, gopath, go_remote_lib, required_links):
-    """Creates symlinks from the given gopath to the source files of the given remote lib.
-
-    Also duplicates directory structure leading to source files of package within
-    gopath, in order to provide isolation to the package.
-
-    Adds the symlinks to the source files to required_links.
+  @staticmethod
+  def _read_links_manifest(link_dir, manifest_path):
+    try:
+      with open(manifest_path, 'r') as fp:
+        links = json.load(fp)
+    except (IOError, ValueError):
+      return None
+    return {os.path.join(link_dir, link): path for link, path in links.items()}
+
+  def _lib_sources(self, lib):
+    """Returns the absolute paths of the source files of the given local or remote Go package.
+
+    The source files are linked into the package's dir of each $GOPATH that needs the package,
+    which isolates the package from other code in the same dir.
     """
-    def source_iter():
-      remote_lib_source_dir = self.context.products.get_data('go_remote_lib_src')[go_remote_lib]
-      for path in os.listdir(remote_lib_source_dir):
-        remote_src = os.path.join(remote_lib_source_dir, path)
-        # We grab any file since a go package might have .go, .c, .cc, etc files - all needed for
-        # installation.
-        if os.path.isfile(remote_src):
-          yield remote_src
-    return self._symlink_lib(gopath, go_remote_lib, source_iter(), required_links)
-
-  def _symlink_lib(self, gopath, lib, source_iter, required_links):
-    src_dir = os.path.join(gopath, 'src', lib.import_path)
-    safe_mkdir(src_dir)
-    for path in source_iter:
-      src_link = os.path.join(src_dir, os.path.basename(path))
-      if not os.path.islink(src_link):
-        os.symlink(path, src_link)
-      required_links.add(src_link)
+    if self.is_remote_lib(lib):
+      return self._remote_lib_sources(lib)
+    else:
+      return [os.path.join(get_buildroot(), src) for src in lib.sources_relative_to_buildroot()]
+
+  @memoized_method
+  def _remote_lib_sources(self, go_remote_lib):
+    remote_lib_source_dir = self.context.products.get_data('go_remote_lib_src')[go_remote_lib]
+    sources = []
+    for path in os.listdir(remote_lib_source_dir):
+      remote_src = os.path.join(remote_lib_source_dir, path)
+      # We grab any file since a go package might have .go, .c, .cc, etc files - all needed for
+      # installation.
+      if os.path.isfile(remote_src):
+        sources.append(remote_src)
+    return sources
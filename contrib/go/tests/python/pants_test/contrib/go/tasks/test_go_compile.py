@@ -85,3 +85,40 @@ class GoCompileTest(TaskTestBase):
     mtime = lambda t: os.lstat(os.path.join(os.path.join(a_gopath, 'pkg', t.address.spec))).st_mtime
     # Make sure c's link was untouched, while b's link was refreshed.
     self.assertLessEqual(mtime(c), mtime(b) - 1)
+
+  def test_sync_binary_dep_links_refreshes_rebuilt_libs(self):
+    c = self.make_target(spec='libC', target_type=GoLibrary)
+    b = self.make_target(spec='libB', target_type=GoLibrary)
+    a = self.make_target(spec='libA', target_type=GoLibrary, dependencies=[b, c])
+    lib_binary_map = self._create_lib_binary_map(a, b, c)
+
+    a_gopath = self.go_compile.get_gopath(a)
+    self.go_compile._sync_binary_dep_links(a, a_gopath, lib_binary_map, rebuilt_libs={b, c})
+    time.sleep(1.5)
+    self.go_compile._sync_binary_dep_links(a, a_gopath, lib_binary_map, rebuilt_libs={b})
+
+    mtime = lambda t: os.lstat(os.path.join(os.path.join(a_gopath, 'pkg', t.address.spec))).st_mtime
+    self.assertLessEqual(mtime(c), mtime(b) - 1)
+
+  def test_compile_in_waves(self):
+    d = self.make_target(spec='libD', target_type=GoLibrary)
+    c = self.make_target(spec='libC', target_type=GoLibrary)
+    b = self.make_target(spec='libB', target_type=GoLibrary, dependencies=[c])
+    a = self.make_target(spec='libA', target_type=GoLibrary, dependencies=[b, d])
+    lib_binary_map = self._create_lib_binary_map(a, b, c, d)
+
+    self.set_options(worker_count=2)
+    go_compile = self.create_task(self.context())
+    installed = []
+
+    def go_install(target, gopath):
+      # Each target's dependencies are installed, and linked into its workspace, before it.
+      for dep in target.dependencies:
+        self.assertIn(dep, installed)
+        self.assertTrue(os.path.islink(os.path.join(gopath, 'pkg', dep.address.spec)))
+      installed.append(target)
+    go_compile._go_install = go_install
+
+    with go_compile.context.new_workunit(name='compile') as workunit:
+      go_compile._compile_in_waves([c, d, b, a], lib_binary_map, workunit)
+    self.assertItemsEqual([a, b, c, d], installed)
@@ -87,10 +87,11 @@ class GoFetchTest(TaskTestBase):
     """Zips the Go package in src named 'name' into dest."""
     shutil.make_archive(os.path.join(dest, name), 'zip', root_dir=src)
 
-  def _create_remote_lib(self, name):
-    self.make_target(spec='3rdparty/go/localzip/{name}'.format(name=name),
-                     target_type=GoRemoteLibrary,
-                     pkg=name)
+  def _create_remote_lib(self, name, rev=''):
+    return self.make_target(spec='3rdparty/go/localzip/{name}'.format(name=name),
+                            target_type=GoRemoteLibrary,
+                            pkg=name,
+                            rev=rev)
 
   def _init_dep_graph_files(self, src, zipdir, dep_graph):
     """Given a dependency graph, initializes the corresponding BUILD/packages/zip files.
@@ -191,6 +192,37 @@ class GoFetchTest(TaskTestBase):
         expected[r2] = {('localzip/r4', self.address('3rdparty/go/localzip/r4'))}
         self.assertEqual(undeclared_deps, expected)
 
+  def test_fetch_remote_roots(self):
+    with temporary_dir() as src:
+      with temporary_dir() as zipdir:
+        with temporary_dir() as fetch_cache_dir:
+          for name in ('r1', 'r2', 'r3', 'r4'):
+            self._create_package(src, name, [])
+            self._create_zip(src, zipdir, name)
+          pinned = [self._create_remote_lib('r1', rev='a' * 40),
+                    self._create_remote_lib('r2', rev='b' * 40)]
+          # Neither a symbolic rev nor the default rev is shared, since either can move.
+          unpinned = [self._create_remote_lib('r3', rev='v1'),
+                      self._create_remote_lib('r4')]
+
+          self.set_options(worker_count=2, fetch_cache_dir=fetch_cache_dir)
+          go_fetch = self.create_task(self._create_fetch_context(zipdir))
+          root_dirs = go_fetch._fetch_remote_roots(pinned + unpinned)
+
+          for lib in pinned:
+            self.assertTrue(root_dirs[lib].startswith(fetch_cache_dir))
+          for lib in unpinned:
+            self.assertTrue(root_dirs[lib].startswith(go_fetch.workdir))
+          for lib, root_dir in root_dirs.items():
+            self.assertTrue(os.path.isfile(os.path.join(root_dir, lib.name, lib.name + '.go')))
+
+          # Pinned roots are shared with other workspaces, which need not fetch them again.
+          shutil.rmtree(zipdir)
+          other_go_fetch = self.create_task(self._create_fetch_context(zipdir),
+                                            workdir=os.path.join(self.build_root, 'other'))
+          self.assertEqual({lib: root_dirs[lib] for lib in pinned},
+                           other_go_fetch._fetch_remote_roots(pinned))
+
   def test_issues_2616(self):
     go_fetch = self.create_task(self.context())
     self.create_file('src/github.com/u/a/a.go', contents="""
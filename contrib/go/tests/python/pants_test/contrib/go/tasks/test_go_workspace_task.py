@@ -11,7 +11,6 @@ from collections import defaultdict
 from itertools import chain
 
 from pants.util.contextutil import pushd, temporary_dir
-from pants.util.dirutil import safe_mkdir, touch
 from pants_test.tasks.task_test_base import TaskTestBase
 
 from pants.contrib.go.targets.go_library import GoLibrary
@@ -32,29 +31,7 @@ class GoWorkspaceTaskTest(TaskTestBase):
   def task_type(cls):
     return MockGoWorkspaceTask
 
-  def test_remove_unused_links(self):
-    with temporary_dir() as d:
-      dpath = lambda p: os.path.join(d, p)
-      safe_mkdir(dpath('foo'))
-      safe_mkdir(dpath('bar'))
-      touch(dpath('f'))
-      for l in ('l1', 'foo/l2', 'bar/l3'):
-        # Create symlinks to directories.
-        os.symlink('/', dpath(l))
-      for l in ('l4', 'foo/l5', 'bar/l6'):
-        # Create symlinks to files.
-        os.symlink(dpath('f'), dpath(l))
-
-      required_links = [dpath(l) for l in ('foo/l2', 'l4', 'bar/l6')]
-      GoWorkspaceTask.remove_unused_links(d, required_links)
-
-      for p in chain(required_links, ['f']):
-        self.assertTrue(os.path.exists(dpath(p)))
-
-      for l in ('l1', 'bar/l3', 'foo/l5'):
-        self.assertFalse(os.path.exists(dpath(l)))
-
-  def test_symlink_local_src(self):
+  def test_ensure_workspace_local_src(self):
     with pushd(self.build_root):
       spec = 'src/main/go/foo/bar/mylib'
 
@@ -71,7 +48,7 @@ class GoWorkspaceTaskTest(TaskTestBase):
         self.assertTrue(os.path.islink(link))
         self.assertEqual(os.readlink(link), os.path.join(self.build_root, spec, src))
 
-      ws_task._symlink_local_src(gopath, go_lib, set())
+      ws_task.ensure_workspace(go_lib)
       for src in sources:
         assert_is_linked(src)
 
@@ -83,7 +60,7 @@ class GoWorkspaceTaskTest(TaskTestBase):
       self.reset_build_graph()
       go_lib = self.make_target(spec=spec, target_type=GoLibrary)
 
-      ws_task._symlink_local_src(gopath, go_lib, set())
+      ws_task.ensure_workspace(go_lib)
       for src in chain(sources, ['w.go']):
         assert_is_linked(src)
 
@@ -92,7 +69,41 @@ class GoWorkspaceTaskTest(TaskTestBase):
         # Ensure none of the old links were overwritten.
         self.assertLessEqual(mtime(src), mtime('w.go') - 1)
 
-  def test_symlink_remote_lib(self):
+  def test_ensure_workspace_recreates_deleted_links(self):
+    with pushd(self.build_root):
+      spec = 'src/main/go/foo/bar/mylib'
+      self.create_file(os.path.join(spec, 'x.go'))
+      self.create_file(os.path.join(spec, 'y.go'))
+      go_lib = self.make_target(spec=spec, target_type=GoLibrary)
+      ws_task = self.create_task(self.context())
+      ws_task.ensure_workspace(go_lib)
+
+      # The manifest still records the link, but it was deleted out of band.
+      link = os.path.join(ws_task.get_gopath(go_lib), 'src/foo/bar/mylib', 'x.go')
+      os.unlink(link)
+      ws_task.ensure_workspace(go_lib)
+      self.assertTrue(os.path.islink(link))
+      self.assertEqual(os.path.join(self.build_root, spec, 'x.go'), os.readlink(link))
+
+  def test_ensure_workspace_removes_stale_links(self):
+    with pushd(self.build_root):
+      spec = 'src/main/go/foo/bar/mylib'
+      self.create_file(os.path.join(spec, 'x.go'))
+      self.create_file(os.path.join(spec, 'y.go'))
+      go_lib = self.make_target(spec=spec, target_type=GoLibrary)
+      ws_task = self.create_task(self.context())
+      ws_task.ensure_workspace(go_lib)
+      lib_dir = os.path.join(ws_task.get_gopath(go_lib), 'src/foo/bar/mylib')
+      self.assertEqual(['x.go', 'y.go'], sorted(os.listdir(lib_dir)))
+
+      # The link to the removed source is only known from the manifest of the first sync.
+      os.unlink(os.path.join(self.build_root, spec, 'y.go'))
+      self.reset_build_graph()
+      go_lib = self.make_target(spec=spec, target_type=GoLibrary)
+      ws_task.ensure_workspace(go_lib)
+      self.assertEqual(['x.go'], sorted(os.listdir(lib_dir)))
+
+  def test_ensure_workspace_remote_lib(self):
     with pushd(self.build_root):
       with temporary_dir() as d:
         spec = '3rdparty/go/github.com/user/lib'
@@ -112,7 +123,7 @@ class GoWorkspaceTaskTest(TaskTestBase):
         ws_task = self.create_task(context)
 
         gopath = ws_task.get_gopath(go_remote_lib)
-        ws_task._symlink_remote_lib(gopath, go_remote_lib, set())
+        ws_task.ensure_workspace(go_remote_lib)
         workspace_dir = os.path.join(gopath, 'src/github.com/user/lib')
         self.assertTrue(os.path.isdir(workspace_dir))
 
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import subprocess
+import threading
 from abc import abstractmethod
 from collections import namedtuple
 
@@ -21,6 +22,9 @@ from pants.util.meta import AbstractClass
 class NodeDistribution(object):
   """Represents a self-bootstrapping Node distribution."""
 
+  # Serializes bootstrapping, since node packages may be resolved concurrently.
+  _bootstrap_lock = threading.Lock()
+
   class Factory(Subsystem):
     options_scope = 'node-distribution'
 
@@ -73,14 +77,16 @@ class NodeDistribution(object):
     :returns: The Node distribution root path.
     :rtype: string
     """
-    node_distribution = self._binary_util.select_binary(self._relpath, self.version, 'node.tar.gz')
-    distribution_workdir = os.path.dirname(node_distribution)
-    outdir = os.path.join(distribution_workdir, 'unpacked')
-    if not os.path.exists(outdir):
-      with temporary_dir(root_dir=distribution_workdir) as tmp_dist:
-        TGZ.extract(node_distribution, tmp_dist)
-        os.rename(tmp_dist, outdir)
-    return os.path.join(outdir, 'node')
+    with self._bootstrap_lock:
+      node_distribution = self._binary_util.select_binary(self._relpath, self.version,
+                                                          'node.tar.gz')
+      distribution_workdir = os.path.dirname(node_distribution)
+      outdir = os.path.join(distribution_workdir, 'unpacked')
+      if not os.path.exists(outdir):
+        with temporary_dir(root_dir=distribution_workdir) as tmp_dist:
+          TGZ.extract(node_distribution, tmp_dist)
+          os.rename(tmp_dist, outdir)
+      return os.path.join(outdir, 'node')
 
   class Command(namedtuple('Command', ['bin_dir_path', 'executable', 'args'])):
     """Describes a command to be run using a Node distribution."""
@@ -14,6 +14,7 @@ import six.moves.urllib.error as urllib_error
 import six.moves.urllib.parse as urllib_parse
 import six.moves.urllib.request as urllib_request
 from pants.base.exceptions import TaskError
+from pants.base.hash_utils import hash_file
 from pants.fs.archive import archiver_for_path
 from pants.subsystem.subsystem import Subsystem
 from pants.util.contextutil import temporary_dir
@@ -39,42 +40,59 @@ class NodePreinstalledModuleResolver(Subsystem, NodeResolverBase):
     self._copy_sources(target, results_dir)
 
     with temporary_dir() as temp_dir:
-      archive_file_name = urllib_parse.urlsplit(target.dependencies_archive_url).path.split('/')[-1]
-      if not archive_file_name:
-        raise TaskError('Could not determine archive file name for {target} from {url}'
-                        .format(target=target.address.reference(),
-                                url=target.dependencies_archive_url))
-
-      download_path = os.path.join(temp_dir, archive_file_name)
-
-      logger.info('Downloading archive {archive_file_name} from '
-                  '{dependencies_archive_url} to {path}'
-                  .format(archive_file_name=archive_file_name,
-                          dependencies_archive_url=target.dependencies_archive_url,
-                          path=download_path))
-
-      try:
-        with closing(urllib_request.urlopen(target.dependencies_archive_url)) as opened_archive_url:
-          with safe_open(download_path, 'wb') as downloaded_archive:
-            downloaded_archive.write(opened_archive_url.read())
-      except (IOError, urllib_error.HTTPError, urllib_error.URLError, ValueError) as error:
-        raise TaskError('Failed to fetch preinstalled node_modules for {target} from '
-                        '{dependencies_archive_url}: {error}'
-                        .format(target=target.address.reference(),
-                                url=target.dependencies_archive_url, error=error))
-
-      logger.info('Fetched archive {archive_file_name} from {dependencies_archive_url} to {path}'
-                  .format(archive_file_name=archive_file_name,
-                          dependencies_archive_url=target.dependencies_archive_url,
-                          path=download_path))
-
-      archiver_for_path(archive_file_name).extract(download_path, temp_dir)
-
-      extracted_node_modules = os.path.join(temp_dir, 'node_modules')
-      if not os.path.isdir(extracted_node_modules):
-        raise TaskError('Did not find an extracted node_modules directory for {target} '
-                        'inside {dependencies_archive_url}'
-                        .format(target=target.address.reference(),
-                                dependencies_archive_url=target.dependencies_archive_url))
-
-      shutil.move(extracted_node_modules, os.path.join(results_dir, 'node_modules'))
+      download_path = self._download_archive(target, temp_dir)
+
+      module_store = node_task.module_store
+      if module_store:
+        # The archive at a url may be replaced, so stored modules are keyed by its contents.
+        key = module_store.key('preinstalled', hash_file(download_path))
+        if not module_store.link(key, results_dir):
+          module_store.put(key, self._extract_node_modules(target, download_path, temp_dir))
+          module_store.link(key, results_dir)
+      else:
+        shutil.move(self._extract_node_modules(target, download_path, temp_dir),
+                    os.path.join(results_dir, 'node_modules'))
+
+  def _download_archive(self, target, temp_dir):
+    """Downloads the target's dependencies archive into temp_dir and returns its path."""
+    archive_file_name = urllib_parse.urlsplit(target.dependencies_archive_url).path.split('/')[-1]
+    if not archive_file_name:
+      raise TaskError('Could not determine archive file name for {target} from {url}'
+                      .format(target=target.address.reference(),
+                              url=target.dependencies_archive_url))
+
+    download_path = os.path.join(temp_dir, archive_file_name)
+
+    logger.info('Downloading archive {archive_file_name} from '
+                '{dependencies_archive_url} to {path}'
+                .format(archive_file_name=archive_file_name,
+                        dependencies_archive_url=target.dependencies_archive_url,
+                        path=download_path))
+
+    try:
+      with closing(urllib_request.urlopen(target.dependencies_archive_url)) as opened_archive_url:
+        with safe_open(download_path, 'wb') as downloaded_archive:
+          downloaded_archive.write(opened_archive_url.read())
+    except (IOError, urllib_error.HTTPError, urllib_error.URLError, ValueError) as error:
+      raise TaskError('Failed to fetch preinstalled node_modules for {target} from '
+                      '{dependencies_archive_url}: {error}'
+                      .format(target=target.address.reference(),
+                              url=target.dependencies_archive_url, error=error))
+
+    logger.info('Fetched archive {archive_file_name} from {dependencies_archive_url} to {path}'
+                .format(archive_file_name=archive_file_name,
+                        dependencies_archive_url=target.dependencies_archive_url,
+                        path=download_path))
+    return download_path
+
+  def _extract_node_modules(self, target, download_path, temp_dir):
+    """Extracts the downloaded archive into temp_dir and returns its node_modules directory."""
+    archiver_for_path(download_path).extract(download_path, temp_dir)
+
+    extracted_node_modules = os.path.join(temp_dir, 'node_modules')
+    if not os.path.isdir(extracted_node_modules):
+      raise TaskError('Did not find an extracted node_modules directory for {target} '
+                      'inside {dependencies_archive_url}'
+                      .format(target=target.address.reference(),
+                              dependencies_archive_url=target.dependencies_archive_url))
+    return extracted_node_modules
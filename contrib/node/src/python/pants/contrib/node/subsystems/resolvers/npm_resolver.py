@@ -11,7 +11,6 @@ import os
 from pants.base.exceptions import TaskError
 from pants.base.workunit import WorkUnitLabel
 from pants.subsystem.subsystem import Subsystem
-from pants.util.contextutil import pushd
 
 from pants.contrib.node.subsystems.resolvers.node_resolver_base import NodeResolverBase
 from pants.contrib.node.targets.node_module import NodeModule
@@ -21,6 +20,13 @@ from pants.contrib.node.tasks.node_resolve import NodeResolve
 class NpmResolver(Subsystem, NodeResolverBase):
   options_scope = 'npm-resolver'
 
+  # Scripts npm runs on the package itself when installing it, which may write outside of
+  # node_modules and so must run even if the package's node_modules are already stored.
+  _INSTALL_SCRIPTS = frozenset(['preinstall', 'install', 'postinstall', 'prepublish', 'prepare'])
+
+  # Prefixes of dependency versions that name local paths rather than published packages.
+  _LOCAL_VERSION_PREFIXES = ('file:', '.', '/', '~')
+
   @classmethod
   def register_options(cls, register):
     super(NpmResolver, cls).register_options(register)
@@ -28,14 +34,53 @@ class NpmResolver(Subsystem, NodeResolverBase):
 
   def resolve_target(self, node_task, target, results_dir, node_paths):
     self._copy_sources(target, results_dir)
-    self._emit_package_descriptor(node_task, target, results_dir, node_paths)
-    with pushd(results_dir):
-      result, npm_install = node_task.execute_npm(args=['install'],
-                                                  workunit_name=target.address.reference(),
-                                                  workunit_labels=[WorkUnitLabel.COMPILER])
-      if result != 0:
-        raise TaskError('Failed to resolve dependencies for {}:\n\t{} failed with exit code {}'
-                        .format(target.address.reference(), npm_install, result))
+    package = self._emit_package_descriptor(node_task, target, results_dir, node_paths)
+
+    module_store = node_task.module_store
+    if module_store and self._storable(node_task, target, package, results_dir):
+      key = self._module_store_key(node_task, results_dir)
+      if not module_store.link(key, results_dir):
+        self._install(node_task, target, results_dir)
+        node_modules_dir = os.path.join(results_dir, 'node_modules')
+        if os.path.isdir(node_modules_dir):
+          module_store.put(key, node_modules_dir)
+          module_store.link(key, results_dir)
+    else:
+      self._install(node_task, target, results_dir)
+
+  @classmethod
+  def _storable(cls, node_task, target, package, results_dir):
+    """Returns whether the package's installed node_modules are fully determined by its descriptors.
+
+    Without a shrinkwrap, version ranges in the dependency tree resolve differently over time.
+    Internal and local dependencies are installed from chroots and paths whose contents can change
+    under the same name.  Install scripts may write outside of node_modules, so must run even if
+    the package's node_modules are already stored.
+    """
+    if not os.path.isfile(os.path.join(results_dir, 'npm-shrinkwrap.json')):
+      return False
+    if cls._INSTALL_SCRIPTS.intersection(package.get('scripts', ())):
+      return False
+    for dep in target.dependencies:
+      if node_task.is_node_module(dep) or dep.version.startswith(cls._LOCAL_VERSION_PREFIXES):
+        return False
+    return True
+
+  def _module_store_key(self, node_task, results_dir):
+    descriptors = [node_task.node_distribution.version]
+    for descriptor in ('package.json', 'npm-shrinkwrap.json'):
+      with open(os.path.join(results_dir, descriptor), 'rb') as fp:
+        descriptors.append(fp.read())
+    return node_task.module_store.key(*descriptors)
+
+  def _install(self, node_task, target, results_dir):
+    result, npm_install = node_task.execute_npm(args=['install'],
+                                                workunit_name=target.address.reference(),
+                                                workunit_labels=[WorkUnitLabel.COMPILER],
+                                                cwd=results_dir)
+    if result != 0:
+      raise TaskError('Failed to resolve dependencies for {}:\n\t{} failed with exit code {}'
+                      .format(target.address.reference(), npm_install, result))
 
   def _emit_package_descriptor(self, node_task, target, results_dir, node_paths):
     dependencies = {
@@ -76,3 +121,4 @@ class NpmResolver(Subsystem, NodeResolverBase):
 
     with open(package_json_path, 'wb') as fp:
       json.dump(package, fp, indent=2)
+    return package
@@ -0,0 +1,102 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import errno
+import os
+import shutil
+from hashlib import sha1
+
+import six
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_mkdir
+
+
+class NodeModuleStore(object):
+  """A content addressed store of installed `node_modules` directories.
+
+  Entries are keyed by the content of whatever determines the installed modules, e.g. the
+  package.json and npm-shrinkwrap.json they were installed from, so packages with identical
+  dependencies share a single installation that each links to from its own chroot.  The store may
+  be shared by several workspaces on the same machine, so only installations whose inputs are
+  fully pinned should be stored.
+  """
+
+  @staticmethod
+  def key(*descriptors):
+    """Returns the store key for modules installed from the given descriptors.
+
+    :param descriptors: Strings that together determine the installed modules.
+    :rtype: string
+    """
+    hasher = sha1()
+    for descriptor in descriptors:
+      if isinstance(descriptor, six.text_type):
+        descriptor = descriptor.encode('utf-8')
+      hasher.update(descriptor)
+      hasher.update(b'\0')
+    return hasher.hexdigest()
+
+  def __init__(self, root_dir):
+    """
+    :param string root_dir: The directory entries are stored under.
+    """
+    self._root_dir = root_dir
+
+  def _entry_dir(self, key):
+    # Installed modules find their own dependencies by walking up to enclosing `node_modules`
+    # directories, so an entry must hold the `node_modules` directory itself and not its contents.
+    return os.path.join(self._root_dir, key, 'node_modules')
+
+  def get(self, key):
+    """Returns the stored `node_modules` directory for the given key, or `None` if there is none.
+
+    :rtype: string
+    """
+    entry_dir = self._entry_dir(key)
+    return entry_dir if os.path.isdir(entry_dir) else None
+
+  def put(self, key, node_modules_dir):
+    """Moves the given installed `node_modules` directory into the store under the given key.
+
+    If another installation was stored under the key in the meantime, it is kept and the given
+    directory is discarded.
+
+    :returns: The stored `node_modules` directory.
+    :rtype: string
+    """
+    entry_dir = self._entry_dir(key)
+    parent_dir = os.path.dirname(os.path.dirname(entry_dir))
+    safe_mkdir(parent_dir)
+    # Move beside the entry first and then into place with a single rename, so that other
+    # workspaces sharing the store never see a partially moved entry.
+    with temporary_dir(root_dir=parent_dir) as tmp_entry:
+      shutil.move(node_modules_dir, os.path.join(tmp_entry, 'node_modules'))
+      try:
+        os.rename(tmp_entry, os.path.dirname(entry_dir))
+      except OSError as e:
+        if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+          raise
+    return entry_dir
+
+  def link(self, key, results_dir):
+    """Links the modules of the stored entry for the given key into the given results dir.
+
+    The results dir gets a `node_modules` directory of its own holding a symlink to each of the
+    stored modules, so that files tools write directly under `node_modules` (e.g. the
+    `node_modules/.cache` of build tools) stay private to the package rather than leaking into the
+    shared entry.
+
+    :returns: The stored `node_modules` directory, or `None` if there is no entry for the key.
+    :rtype: string
+    """
+    entry_dir = self.get(key)
+    if entry_dir:
+      node_modules_dir = os.path.join(results_dir, 'node_modules')
+      safe_mkdir(node_modules_dir)
+      for name in os.listdir(entry_dir):
+        os.symlink(os.path.join(entry_dir, name), os.path.join(node_modules_dir, name))
+    return entry_dir
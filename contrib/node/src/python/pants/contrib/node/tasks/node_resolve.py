@@ -5,12 +5,12 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
-import json
-
-from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.util.dirutil import safe_mkdir
+from pants.util.memo import memoized_property
 
+from pants.contrib.node.tasks.node_module_store import NodeModuleStore
 from pants.contrib.node.tasks.node_paths import NodePaths
 from pants.contrib.node.tasks.node_task import NodeTask
 
@@ -20,6 +20,22 @@ class NodeResolve(NodeTask):
 
   _resolver_by_type = dict()
 
+  @classmethod
+  def register_options(cls, register):
+    super(NodeResolve, cls).register_options(register)
+    register('--worker-count', advanced=True, type=int, default=1,
+             help='The maximum number of node packages to resolve concurrently.  A package is '
+                  'resolved once all the packages it depends on are.')
+    register('--module-store-dir', advanced=True, default='',
+             help='If set, a directory, which may be shared by several workspaces on this '
+                  'machine, in which installed node_modules directories are stored, keyed by the '
+                  'contents of what they were installed from.  Resolved packages link to their '
+                  'modules there, so that identical dependencies are only installed once.  Only '
+                  'packages whose dependencies are fully pinned are stored: preinstalled modules, '
+                  'and packages with an npm-shrinkwrap.json, no install scripts and no local '
+                  'dependencies.  By default, each package installs its node_modules in its own '
+                  'results dir.')
+
   @classmethod
   def product_types(cls):
     return [NodePaths]
@@ -35,6 +51,15 @@ class NodeResolve(NodeTask):
   def cache_target_dirs(self):
     return True
 
+  @memoized_property
+  def module_store(self):
+    """The store resolvers should install node_modules directories in, if any.
+
+    :rtype: :class:`pants.contrib.node.tasks.node_module_store.NodeModuleStore`
+    """
+    module_store_dir = self.get_options().module_store_dir
+    return NodeModuleStore(module_store_dir) if module_store_dir else None
+
   @classmethod
   def register_resolver_for_type(cls, node_package_type, resolver):
     """Register a NodeResolver instance for a particular subclass of NodePackage.
@@ -84,12 +109,49 @@ class NodeResolve(NodeTask):
                           topological_order=True,
                           invalidate_dependents=True) as invalidation_check:
 
-      with self.context.new_workunit(name='install', labels=[WorkUnitLabel.MULTITOOL]):
-        for vt in invalidation_check.all_vts:
-          target = vt.target
-          resolver_for_target_type = self._resolver_for_target(target).global_instance()
-          results_dir = vt.results_dir
-          if not vt.valid:
-            safe_mkdir(results_dir, clean=True)
-            resolver_for_target_type.resolve_target(self, target, results_dir, node_paths)
-          node_paths.resolved(target, results_dir)
+      for vt in invalidation_check.all_vts:
+        node_paths.resolved(vt.target, vt.results_dir)
+
+      invalid_vts = invalidation_check.invalid_vts
+      if invalid_vts:
+        with self.context.new_workunit(name='install',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          self._resolve_in_waves(invalid_vts, node_paths, workunit)
+
+  def _resolve_in_waves(self, vts, node_paths, workunit):
+    """Resolves the given targets, concurrently resolving those that don't depend on each other.
+
+    :param list vts: The versioned targets to resolve, in topological order.
+    :param node_paths: The chroot paths of all targets being resolved.
+    :type node_paths: :class:`pants.contrib.node.tasks.node_paths.NodePaths`
+    """
+    # Each target is resolved in the wave after the last of its dependencies being resolved.
+    waves = []
+    wave_by_target = {}
+    for vt in vts:
+      wave = 1 + max([wave_by_target[dep] for dep in vt.target.closure()
+                      if dep in wave_by_target] or [-1])
+      wave_by_target[vt.target] = wave
+      if wave == len(waves):
+        waves.append([])
+      waves[wave].append(vt)
+
+    def resolve(vt):
+      resolver_for_target_type = self._resolver_for_target(vt.target).global_instance()
+      safe_mkdir(vt.results_dir, clean=True)
+      resolver_for_target_type.resolve_target(self, vt.target, vt.results_dir, node_paths)
+
+    worker_count = min(self.get_options().worker_count, max(len(wave) for wave in waves))
+    if worker_count <= 1:
+      for wave in waves:
+        for vt in wave:
+          resolve(vt)
+      return
+
+    worker_pool = WorkerPool(workunit, self.context.run_tracker, worker_count)
+    try:
+      for wave in waves:
+        worker_pool.submit_work_and_wait(Work(resolve, [(vt,) for vt in wave]),
+                                         workunit_parent=workunit)
+    finally:
+      worker_pool.shutdown()
@@ -0,0 +1,61 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+from pants.contrib.node.tasks.node_module_store import NodeModuleStore
+
+
+class NodeModuleStoreTest(unittest.TestCase):
+
+  def test_key(self):
+    self.assertEqual(NodeModuleStore.key('a', 'b'), NodeModuleStore.key('a', b'b'))
+    self.assertNotEqual(NodeModuleStore.key('a', 'b'), NodeModuleStore.key('ab'))
+
+  def test_put_and_link(self):
+    with temporary_dir() as store_dir, temporary_dir() as results_dir:
+      store = NodeModuleStore(store_dir)
+      key = store.key('package.json')
+      self.assertIsNone(store.get(key))
+      self.assertIsNone(store.link(key, results_dir))
+
+      node_modules_dir = os.path.join(results_dir, 'node_modules')
+      safe_file_dump(os.path.join(node_modules_dir, 'a', 'index.js'), 'first')
+      stored_dir = store.put(key, node_modules_dir)
+      self.assertEqual(stored_dir, store.get(key))
+      self.assertEqual('node_modules', os.path.basename(stored_dir))
+      self.assertFalse(os.path.exists(node_modules_dir))
+
+      # A racing installation of the same modules is discarded in favor of the stored one.
+      safe_file_dump(os.path.join(node_modules_dir, 'a', 'index.js'), 'second')
+      self.assertEqual(stored_dir, store.put(key, node_modules_dir))
+      self.assertFalse(os.path.exists(node_modules_dir))
+
+      self.assertEqual(stored_dir, store.link(key, results_dir))
+      with open(os.path.join(node_modules_dir, 'a', 'index.js')) as fp:
+        self.assertEqual('first', fp.read())
+
+  def test_link_keeps_node_modules_private(self):
+    with temporary_dir() as store_dir, temporary_dir() as results_dir:
+      store = NodeModuleStore(store_dir)
+      key = store.key('package.json')
+      node_modules_dir = os.path.join(results_dir, 'node_modules')
+      safe_file_dump(os.path.join(node_modules_dir, 'a', 'index.js'), 'a')
+      stored_dir = store.put(key, node_modules_dir)
+
+      store.link(key, results_dir)
+      self.assertFalse(os.path.islink(node_modules_dir))
+      self.assertEqual(os.path.join(stored_dir, 'a'),
+                       os.readlink(os.path.join(node_modules_dir, 'a')))
+
+      # Tools writing directly under node_modules don't write to the stored entry.
+      safe_file_dump(os.path.join(node_modules_dir, '.cache', 'state'), 'private')
+      self.assertEqual(['a'], os.listdir(stored_dir))
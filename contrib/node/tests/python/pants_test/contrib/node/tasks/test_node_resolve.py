@@ -7,9 +7,15 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import json
 import os
+import shutil
+import threading
 from textwrap import dedent
 
+import mock
 from pants.build_graph.target import Target
+from pants.fs.archive import TGZ
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump, safe_mkdir
 from pants_test.tasks.task_test_base import TaskTestBase
 
 from pants.contrib.node.subsystems.resolvers.node_preinstalled_module_resolver import \
@@ -204,3 +210,127 @@ class NodeResolveTest(TaskTestBase):
       self.assertNotIn('devDependencies', package)
       self.assertNotIn('peerDependencies', package)
       self.assertNotIn('optionalDependencies', package)
+
+  def _create_modules_archive(self, outdir, module_name):
+    with temporary_dir() as tmpdir:
+      safe_file_dump(os.path.join(tmpdir, 'node_modules', module_name, 'index.js'),
+                     'module.exports = "{}";'.format(module_name))
+      return TGZ.create(tmpdir, outdir, 'node_modules')
+
+  def _preinstalled_module(self, spec, archive_path, dependencies=None):
+    return self.make_target(spec=spec,
+                            target_type=NodePreinstalledModule,
+                            sources=[],
+                            dependencies=dependencies or [],
+                            dependencies_archive_url='file://{}'.format(archive_path))
+
+  def _resolve(self, target_roots):
+    context = self.context(target_roots=target_roots,
+                           for_subsystems=[NodePreinstalledModuleResolver])
+    self.create_task(context).execute()
+    return context.products.get_data(NodePaths)
+
+  def test_resolve_shares_module_store(self):
+    with temporary_dir() as archive_dir, temporary_dir() as module_store_dir:
+      self.set_options(module_store_dir=module_store_dir)
+      archive_path = self._create_modules_archive(archive_dir, 'shared')
+      a = self._preinstalled_module('src/node/a', archive_path)
+      b = self._preinstalled_module('src/node/b', archive_path)
+      node_paths = self._resolve([a, b])
+
+      def stored_module(target, module_name):
+        module = os.path.join(node_paths.node_path(target), 'node_modules', module_name)
+        self.assertTrue(os.path.islink(module))
+        self.assertTrue(os.path.isfile(os.path.join(module, 'index.js')))
+        return os.path.realpath(module)
+
+      a_shared = stored_module(a, 'shared')
+      self.assertEqual(a_shared, stored_module(b, 'shared'))
+      self.assertTrue(a_shared.startswith(os.path.realpath(module_store_dir)))
+
+      # The same archive at another url is stored once, as the modules are keyed by its contents.
+      copied_archive_path = os.path.join(archive_dir, 'copy', os.path.basename(archive_path))
+      safe_mkdir(os.path.dirname(copied_archive_path))
+      shutil.copy(archive_path, copied_archive_path)
+      c = self._preinstalled_module('src/node/c', copied_archive_path)
+      node_paths = self._resolve([c])
+      self.assertEqual(a_shared, stored_module(c, 'shared'))
+
+      # Replacing the archive at a url replaces the stored modules of packages resolved from it.
+      os.unlink(archive_path)
+      self._create_modules_archive(archive_dir, 'replaced')
+      d = self._preinstalled_module('src/node/d', archive_path)
+      node_paths = self._resolve([d])
+      stored_module(d, 'replaced')
+      self.assertFalse(os.path.exists(os.path.join(node_paths.node_path(d), 'node_modules',
+                                                   'shared')))
+
+  def test_resolve_without_module_store(self):
+    with temporary_dir() as archive_dir:
+      archive_path = self._create_modules_archive(archive_dir, 'private')
+      a = self._preinstalled_module('src/node/a', archive_path)
+      node_paths = self._resolve([a])
+
+      a_modules = os.path.join(node_paths.node_path(a), 'node_modules')
+      self.assertFalse(os.path.islink(a_modules))
+      self.assertTrue(os.path.isfile(os.path.join(a_modules, 'private', 'index.js')))
+
+  def test_npm_packages_stored_only_when_pinned(self):
+    task = self.create_task(self.context())
+    pinned = self.make_target(spec='3rdparty/node:pinned', target_type=NodeRemoteModule,
+                              version='1.0.0')
+    local = self.make_target(spec='3rdparty/node:local', target_type=NodeRemoteModule,
+                             version='file:../local')
+    internal = self.make_target(spec='src/node/internal', target_type=NodeModule, sources=[])
+    target = self.make_target(spec='src/node/target', target_type=NodeModule, sources=[],
+                              dependencies=[pinned])
+
+    def storable(target, package=None, shrinkwrap=True):
+      with temporary_dir() as results_dir:
+        if shrinkwrap:
+          safe_file_dump(os.path.join(results_dir, 'npm-shrinkwrap.json'), '{}')
+        return NpmResolver._storable(task, target, package or {}, results_dir)
+
+    self.assertTrue(storable(target))
+    self.assertFalse(storable(target, shrinkwrap=False))
+    self.assertFalse(storable(target, package={'scripts': {'postinstall': 'make'}}))
+    self.assertTrue(storable(target, package={'scripts': {'test': 'mocha'}}))
+    for dep in (local, internal):
+      self.assertFalse(storable(self.make_target(spec='src/node/uses_{}'.format(dep.name),
+                                                 target_type=NodeModule,
+                                                 sources=[],
+                                                 dependencies=[pinned, dep])))
+
+  def test_resolve_concurrently_in_dependency_order(self):
+    with temporary_dir() as archive_dir, temporary_dir() as module_store_dir:
+      self.set_options(module_store_dir=module_store_dir, worker_count=4)
+      archive_path = self._create_modules_archive(archive_dir, 'shared')
+      base = self._preinstalled_module('src/node/base', archive_path)
+      left = self._preinstalled_module('src/node/left', archive_path, dependencies=[base])
+      right = self._preinstalled_module('src/node/right', archive_path, dependencies=[base])
+      top = self._preinstalled_module('src/node/top', archive_path, dependencies=[left, right])
+
+      resolve_target = NodePreinstalledModuleResolver.resolve_target
+      resolved = []
+      # Left and right only depend on base, so each can wait for the other to start resolving.
+      started = {left: threading.Event(), right: threading.Event()}
+      overlapped = []
+
+      def recording_resolve_target(resolver, node_task, target, results_dir, node_paths):
+        for dep in target.dependencies:
+          self.assertIn(dep, resolved)
+        if target in started:
+          started[target].set()
+          other = right if target == left else left
+          if started[other].wait(10):
+            overlapped.append(target)
+        resolve_target(resolver, node_task, target, results_dir, node_paths)
+        resolved.append(target)
+
+      with mock.patch.object(NodePreinstalledModuleResolver, 'resolve_target',
+                             recording_resolve_target):
+        self._resolve([top])
+
+      self.assertEqual({base, left, right, top}, set(resolved))
+      self.assertEqual({left, right}, set(overlapped))
+
@@ -0,0 +1,28 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+# What this backend's register module registers, so that it need only be imported once it is
+# needed when backends are loaded lazily.  See `pants.bin.extension_loader.BackendMetadata`.
+
+tasks = [
+  'gen.antlr', 'gen.jaxb', 'gen.protoc', 'gen.ragel', 'gen.thrift', 'gen.wire',
+]
+
+aliases = [
+  'java_antlr_library', 'java_protobuf_library', 'java_ragel_library', 'java_thrift_library',
+  'java_wire_library', 'jaxb_library', 'python_antlr_library', 'python_thrift_library',
+]
+
+subsystems = [
+  'binaries', 'jvm-distributions', 'jvm-platform', 'thrift-binary', 'thrift-defaults',
+]
+
+# The backends whose tasks produce products this backend's tasks require.
+dependencies = [
+  'pants.backend.jvm',
+]
@@ -14,11 +14,13 @@ from twitter.common.collections import OrderedSet
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.task.task import Task
 from pants.util.dirutil import fast_relpath, safe_delete, safe_walk
+from pants.util.memo import memoized_property
 
 
 logger = logging.getLogger(__name__)
@@ -46,6 +48,9 @@ class SimpleCodegenTask(Task):
                    'allowed, the logic of find_sources will associate generated sources with '
                    'the least-dependent targets that generate them.',
               advanced=True)
+    register('--worker-count', advanced=True, type=int, default=1,
+             help='The number of targets to generate code for concurrently.  Code generators '
+                  'must be safe to run from several threads at once to set this above 1.')
 
   @classmethod
   def get_fingerprint_strategy(cls):
@@ -146,16 +151,37 @@ class SimpleCodegenTask(Task):
     with self.invalidated(self.codegen_targets(),
                           invalidate_dependents=True,
                           fingerprint_strategy=self.get_fingerprint_strategy()) as invalidation_check:
-      with self.context.new_workunit(name='execute', labels=[WorkUnitLabel.MULTITOOL]):
+      with self.context.new_workunit(name='execute', labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+        generated_vts = [vt for vt in invalidation_check.invalid_vts
+                         if self._do_validate_sources_present(vt.target)]
+        self._execute_codegen_concurrently(generated_vts, workunit)
+
+        # Duplicate sources are detected via the synthetic targets of dependencies, so targets
+        # are handled and injected in order, but their dependees are invalidated in one walk.
+        generated_targets = set(vt.target for vt in generated_vts)
         for vt in invalidation_check.all_vts:
-          # Build the target and handle duplicate sources.
           if not vt.valid:
-            if self._do_validate_sources_present(vt.target):
-              self.execute_codegen(vt.target, vt.results_dir)
+            if vt.target in generated_targets:
               self._handle_duplicate_sources(vt.target, vt.results_dir)
             vt.update()
-          # And inject a synthetic target to represent it.
-          self._inject_synthetic_target(vt.target, vt.results_dir)
+          self._add_synthetic_target(vt.target, vt.results_dir)
+        self._mark_transitive_invalidation_hashes_dirty(
+          [vt.target.address for vt in invalidation_check.all_vts])
+
+  def _execute_codegen_concurrently(self, vts, workunit):
+    worker_count = min(self.get_options().worker_count, len(vts))
+    if worker_count <= 1:
+      for vt in vts:
+        self.execute_codegen(vt.target, vt.results_dir)
+      return
+
+    worker_pool = WorkerPool(workunit, self.context.run_tracker, worker_count)
+    try:
+      worker_pool.submit_work_and_wait(Work(self.execute_codegen,
+                                            [(vt.target, vt.results_dir) for vt in vts]),
+                                       workunit_parent=workunit)
+    finally:
+      worker_pool.shutdown()
 
   @property
   def _copy_target_attributes(self):
@@ -171,6 +197,15 @@ class SimpleCodegenTask(Task):
     :param target: The target to inject a synthetic target for.
     :param target_workdir: The work directory containing the generated code for the target.
     """
+    synthetic_target = self._add_synthetic_target(target, target_workdir)
+    self._mark_transitive_invalidation_hashes_dirty([target.address])
+    return synthetic_target
+
+  def _add_synthetic_target(self, target, target_workdir):
+    """Create and return a synthetic target for the given target, wired in its place.
+
+    The transitive invalidation hashes affected are left for the caller to mark dirty.
+    """
     copied_attributes = {}
     for attribute in self._copy_target_attributes:
       copied_attributes[attribute] = getattr(target, attribute)
@@ -202,16 +237,25 @@ class SimpleCodegenTask(Task):
         dependent=synthetic_target.address,
         dependency=concrete_dependency_address,
       )
-    build_graph.walk_transitive_dependee_graph(
-      build_graph.dependencies_of(target.address),
-      work=lambda t: t.mark_transitive_invalidation_hash_dirty(),
-    )
 
     if target in self.context.target_roots:
       self.context.target_roots.append(synthetic_target)
 
     return synthetic_target
 
+  def _mark_transitive_invalidation_hashes_dirty(self, target_addresses):
+    """Marks the hashes of everything depending on the dependencies of the given targets dirty.
+
+    All the targets are handled in a single walk of the dependee graph.
+    """
+    build_graph = self.context.build_graph
+    build_graph.walk_transitive_dependee_graph(
+      [dependency_address
+       for target_address in target_addresses
+       for dependency_address in build_graph.dependencies_of(target_address)],
+      work=lambda t: t.mark_transitive_invalidation_hash_dirty(),
+    )
+
   def resolve_deps(self, unresolved_deps):
     deps = OrderedSet()
     for dep in unresolved_deps:
@@ -270,7 +314,7 @@ class SimpleCodegenTask(Task):
     def record_duplicates(dep):
       if dep == target or not self.is_gentarget(dep.concrete_derived_from):
         return
-      duped_sources = [s for s in dep.sources_relative_to_source_root() if s in by_target]
+      duped_sources = [s for s in self._sources_relative_to_source_root(dep) if s in by_target]
       if duped_sources:
         duplicates_by_target[dep] = duped_sources
     target.walk(record_duplicates)
@@ -297,6 +341,19 @@ class SimpleCodegenTask(Task):
       for duped_source in duped_sources:
         safe_delete(os.path.join(target_workdir, duped_source))
 
+  @memoized_property
+  def _sources_relative_to_source_root_by_target(self):
+    return {}
+
+  def _sources_relative_to_source_root(self, target):
+    # The same dependencies are checked for every one of their dependees, and their sources are
+    # fixed by then, so they are only computed once.
+    sources = self._sources_relative_to_source_root_by_target.get(target)
+    if sources is None:
+      sources = list(target.sources_relative_to_source_root())
+      self._sources_relative_to_source_root_by_target[target] = sources
+    return sources
+
   class DuplicateSourceError(TaskError):
     """A target generated the same code that was generated by one of its dependencies.
 
@@ -0,0 +1,23 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+# What this backend's register module registers, so that it need only be imported once it is
+# needed when backends are loaded lazily.  See `pants.bin.extension_loader.BackendMetadata`.
+
+tasks = [
+  'cloc', 'dependees', 'filemap', 'filter', 'list', 'list-owners', 'minimize', 'path', 'pathdeps',
+  'paths', 'sort',
+]
+
+aliases = []
+
+subsystems = [
+  'binaries',
+]
+
+dependencies = []
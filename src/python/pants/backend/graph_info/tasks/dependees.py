@@ -9,6 +9,7 @@ from collections import defaultdict
 
 from pants.backend.graph_info.tasks.target_filter_task_mixin import TargetFilterTaskMixin
 from pants.base.build_environment import get_buildroot
+from pants.build_graph.dependee_index import DependeeIndex
 from pants.task.console_task import ConsoleTask
 
 
@@ -22,6 +23,10 @@ class ReverseDepmap(TargetFilterTaskMixin, ConsoleTask):
              help='List transitive dependees.')
     register('--closed', default=False, action='store_true',
              help='Include the input targets in the output along with the dependees.')
+    register('--dependee-index', advanced=True, action='store_true', default=False,
+             help='Find dependees using a persistent index stored in the workdir instead of loading '
+                  'the whole build graph. Only BUILD files that changed since the index was last '
+                  'updated are parsed.')
 
   def __init__(self, *args, **kwargs):
     super(ReverseDepmap, self).__init__(*args, **kwargs)
@@ -32,6 +37,11 @@ class ReverseDepmap(TargetFilterTaskMixin, ConsoleTask):
     self._spec_excludes = None
 
   def console_output(self, _):
+    if self.get_options().dependee_index:
+      for spec in self._console_output_from_index():
+        yield spec
+      return
+
     address_mapper = self.context.address_mapper
     buildfiles = address_mapper.scan_build_files(base_path=None, spec_excludes=self._spec_excludes)
 
@@ -60,6 +70,23 @@ class ReverseDepmap(TargetFilterTaskMixin, ConsoleTask):
     for dependent in self.get_dependents(dependees_by_target, roots):
       yield dependent.address.spec
 
+  def _console_output_from_index(self):
+    index_file = DependeeIndex.index_file_for(self.get_options().pants_workdir)
+    dependee_index = DependeeIndex(self.context.address_mapper, index_file)
+
+    roots = set(self.get_concrete_target(root).address for root in self.context.target_roots)
+    if self._closed:
+      for root in roots:
+        yield root.spec
+
+    if self._transitive:
+      dependents = dependee_index.transitive_dependees_of_addresses(roots)
+    else:
+      dependents = set().union(*[dependee_index.dependees_of(root) for root in roots])
+    for dependent in dependents:
+      if dependent not in roots:
+        yield dependent.spec
+
   def get_dependents(self, dependees_by_target, roots):
     check = set(roots)
     known_dependents = set()
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 from pants.base.exceptions import TaskError
 from pants.build_graph.source_mapper import LazySourceMapper
+from pants.build_graph.source_owner_index import SourceOwnerIndex
 from pants.task.console_task import ConsoleTask
 
 
@@ -18,6 +19,13 @@ class ListOwners(ConsoleTask):
       another/path:target2
   """
 
+  @classmethod
+  def register_options(cls, register):
+    super(ListOwners, cls).register_options(register)
+    register('--source-owner-index', advanced=True, action='store_true', default=False,
+             help='Find owners using a persistent index stored in the workdir. Only BUILD files '
+                  'that changed since the index was last updated are parsed.')
+
   @classmethod
   def supports_passthru_args(cls):
     return True
@@ -28,8 +36,16 @@ class ListOwners(ConsoleTask):
       raise TaskError('No source was specified')
     elif len(sources) > 1:
       raise TaskError('Too many sources specified.')
-    lazy_source_mapper = LazySourceMapper(self.context.address_mapper, self.context.build_graph)
+    source_owner_index = None
+    if self.get_options().source_owner_index:
+      index_file = SourceOwnerIndex.index_file_for(self.get_options().pants_workdir)
+      source_owner_index = SourceOwnerIndex(self.context.address_mapper, self.context.build_graph,
+                                            index_file)
+    lazy_source_mapper = LazySourceMapper(self.context.address_mapper, self.context.build_graph,
+                                          source_owner_index=source_owner_index)
     for source in sources:
       target_addresses_for_source = lazy_source_mapper.target_addresses_for_source(source)
       for address in target_addresses_for_source:
         yield address.spec
+    if source_owner_index is not None:
+      source_owner_index.flush()
@@ -8,11 +8,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import copy
 import errno
 import logging
+import multiprocessing
 import os
 import pkgutil
 import threading
-import xml.etree.ElementTree as ET
+import xml.etree.cElementTree as ET
 from collections import OrderedDict, defaultdict, namedtuple
+from multiprocessing.pool import ThreadPool
 
 import six
 from twitter.common.collections import OrderedSet
@@ -103,6 +105,44 @@ class IvyModuleRef(object):
                         ext=self.ext)
 
 
+class _OrderedRefSet(object):
+  """An insertion ordered set of refs, used to collect the transitive closures of modules.
+
+  Closures are built by merging the closures of dependencies into their dependees, so `update`
+  from another `_OrderedRefSet` does the membership work with builtin set operations rather than
+  adding items one at a time as `OrderedSet` does.
+  """
+
+  __slots__ = ('_items', '_members')
+
+  @classmethod
+  def of(cls, item):
+    return cls((item,))
+
+  def __init__(self, items=()):
+    self._items = []
+    self._members = set()
+    self.update(items)
+
+  def update(self, items):
+    if isinstance(items, _OrderedRefSet):
+      missing = items._members - self._members
+      if missing:
+        self._items.extend(item for item in items._items if item in missing)
+        self._members |= missing
+    else:
+      for item in items:
+        if item not in self._members:
+          self._members.add(item)
+          self._items.append(item)
+
+  def __iter__(self):
+    return iter(self._items)
+
+  def __len__(self):
+    return len(self._items)
+
+
 class IvyInfo(object):
 
   def __init__(self, conf):
@@ -113,6 +153,10 @@ class IvyInfo(object):
     self._deps_by_caller = defaultdict(OrderedSet)
     # Map from _unversioned_ ref to OrderedSet of IvyArtifact instances.
     self._artifacts_by_ref = defaultdict(OrderedSet)
+    # The module graph in adjacency array form, built on first traversal; see `_dependency_graph`.
+    self._graph = None
+    # Map from ref to the ResolvedJars for its artifacts, built as refs are traversed.
+    self._resolved_jars_by_ref = {}
 
   def add_module(self, module):
     if not module.artifact:
@@ -132,28 +176,35 @@ class IvyInfo(object):
     for caller in module.callers:
       self._deps_by_caller[caller.caller_key].add(module.ref)
     self._artifacts_by_ref[ref_unversioned].add(module.artifact)
+    self._graph = None
+    self._resolved_jars_by_ref.clear()
 
-  def _do_traverse_dependency_graph(self, ref, collector, memo, visited):
-    memoized_value = memo.get(ref)
-    if memoized_value:
-      return memoized_value
-
-    if ref in visited:
-      # Ivy allows for circular dependencies
-      # If we're here, that means we're resolving something that
-      # transitively depends on itself
-      return set()
-
-    visited.add(ref)
-    acc = collector(ref)
+  def _sorted_deps(self, ref):
     # NB(zundel): ivy does not return deps in a consistent order for the same module for
     # different resolves.  Sort them to get consistency and prevent cache invalidation.
     # See https://github.com/pantsbuild/pants/issues/2607
-    deps = sorted(self._deps_by_caller.get(ref.caller_key, ()))
-    for dep in deps:
-      acc.update(self._do_traverse_dependency_graph(dep, collector, memo, visited))
-    memo[ref] = acc
-    return acc
+    return sorted(self._deps_by_caller.get(ref.caller_key, ()))
+
+  def _dependency_graph(self):
+    """Returns the module graph as a list of refs, a map from ref to index and adjacency arrays.
+
+    The adjacency array at index `i` holds the indexes of the (sorted) dependencies of the module
+    at index `i`.  Modules that differ only by classifier or extension share an adjacency array.
+    """
+    if self._graph is None:
+      refs = list(self.modules_by_ref)
+      index_by_ref = {ref: index for index, ref in enumerate(refs)}
+      adjacency_by_caller = {}
+      adjacency = []
+      for ref in refs:
+        caller_key = ref.caller_key
+        deps = adjacency_by_caller.get(caller_key)
+        if deps is None:
+          deps = tuple(index_by_ref[dep] for dep in self._sorted_deps(ref))
+          adjacency_by_caller[caller_key] = deps
+        adjacency.append(deps)
+      self._graph = refs, index_by_ref, adjacency
+    return self._graph
 
   def traverse_dependency_graph(self, ref, collector, memo=None):
     """Traverses module graph, starting with ref, collecting values for each ref into the sets
@@ -172,8 +223,55 @@ class IvyInfo(object):
       ref = resolved_ref
     if memo is None:
       memo = dict()
-    visited = set()
-    return self._do_traverse_dependency_graph(ref, collector, memo, visited)
+    memoized_value = memo.get(ref)
+    if memoized_value:
+      return memoized_value
+
+    refs, index_by_ref, adjacency = self._dependency_graph()
+    # Ivy allows for circular dependencies, so we track the modules visited in this traversal and
+    # do not re-enter them.
+    visited = bytearray(len(refs))
+    index = index_by_ref.get(ref)
+    if index is None:
+      # The root need not be a resolved module, e.g. it may be the module of the resolve itself.
+      root_deps = tuple(index_by_ref[dep] for dep in self._sorted_deps(ref))
+    else:
+      visited[index] = 1
+      root_deps = adjacency[index]
+
+    # An explicit stack of (ref, accumulated values, remaining deps) stands in for recursion, which
+    # is both slow and limited in depth for large graphs.
+    stack = [(ref, collector(ref), iter(root_deps))]
+    while True:
+      current_ref, acc, deps = stack[-1]
+      for dep in deps:
+        dep_ref = refs[dep]
+        memoized_value = memo.get(dep_ref)
+        if memoized_value:
+          acc.update(memoized_value)
+        elif not visited[dep]:
+          visited[dep] = 1
+          stack.append((dep_ref, collector(dep_ref), iter(adjacency[dep])))
+          break
+      else:
+        stack.pop()
+        memo[current_ref] = acc
+        if not stack:
+          return acc
+        stack[-1][1].update(acc)
+
+  def _resolved_jars_for_ref(self, ref):
+    resolved_jars = self._resolved_jars_by_ref.get(ref)
+    if resolved_jars is None:
+      coordinate = M2Coordinate(org=ref.org,
+                                name=ref.name,
+                                rev=ref.rev,
+                                classifier=ref.classifier,
+                                ext=ref.ext)
+      resolved_jars = tuple(ResolvedJar(coordinate=coordinate, cache_path=artifact_path)
+                            for artifact_path in self._artifacts_by_ref.get(ref.unversioned, ()))
+      self._resolved_jars_by_ref[ref] = resolved_jars
+    return resolved_jars
 
   def get_resolved_jars_for_coordinates(self, coordinates, memo=None):
     """Collects jars for the passed coordinates.
@@ -190,22 +288,14 @@ class IvyInfo(object):
               including transitive dependencies.
     :rtype: list of :class:`pants.backend.jvm.jar_dependency_utils.ResolvedJar`
     """
-    def to_resolved_jar(jar_ref, jar_path):
-      return ResolvedJar(coordinate=M2Coordinate(org=jar_ref.org,
-                                                 name=jar_ref.name,
-                                                 rev=jar_ref.rev,
-                                                 classifier=jar_ref.classifier,
-                                                 ext=jar_ref.ext),
-                         cache_path=jar_path)
-    resolved_jars = OrderedSet()
-    def create_collection(dep):
-      return OrderedSet([dep])
+    module_refs = _OrderedRefSet()
     for jar in coordinates:
       classifier = jar.classifier if self._conf == 'default' else self._conf
       jar_module_ref = IvyModuleRef(jar.org, jar.name, jar.rev, classifier)
-      for module_ref in self.traverse_dependency_graph(jar_module_ref, create_collection, memo):
-        for artifact_path in self._artifacts_by_ref[module_ref.unversioned]:
-          resolved_jars.add(to_resolved_jar(module_ref, artifact_path))
+      module_refs.update(self.traverse_dependency_graph(jar_module_ref, _OrderedRefSet.of, memo))
+    resolved_jars = OrderedSet()
+    for module_ref in module_refs:
+      resolved_jars.update(self._resolved_jars_for_ref(module_ref))
     return resolved_jars
 
 
@@ -270,6 +360,75 @@ class IvyUtils(object):
     except runner.executor.Error as e:
       raise IvyUtils.IvyError(e)
 
+  # The name of the manifest of the symlinks created under a symlink dir by `symlink_cachepath`.
+  _SYMLINK_MANIFEST = '.symlinks'
+
+  # Fewer new symlinks than this are created serially, since a pool costs more than it saves.
+  _PARALLEL_SYMLINK_THRESHOLD = 32
+
+  # Protects the in-memory views of symlink dirs and realpaths below.
+  _symlink_lock = threading.Lock()
+
+  # Map from symlink dir to the set of symlinks known to exist in it.
+  _symlinks_by_dir = {}
+
+  # Map from ivy cache path to its realpath; artifacts never move once in the ivy cache.
+  _realpaths = {}
+
+  @classmethod
+  def _realpath(cls, path):
+    realpath = cls._realpaths.get(path)
+    if realpath is None:
+      realpath = os.path.realpath(path)
+      cls._realpaths[path] = realpath
+    return realpath
+
+  @classmethod
+  def _existing_symlinks(cls, symlink_dir):
+    """Returns the set of symlinks known to exist under symlink_dir.
+
+    The set is read from the symlink dir's manifest the first time the dir is seen, and is
+    discarded if the manifest disappears, e.g. because the dir was cleaned.
+    """
+    manifest = os.path.join(symlink_dir, cls._SYMLINK_MANIFEST)
+    symlinks = cls._symlinks_by_dir.get(symlink_dir)
+    if symlinks is None or not os.path.exists(manifest):
+      symlinks = set()
+      if os.path.exists(manifest):
+        with open(manifest, 'r') as fp:
+          symlinks.update(os.path.join(symlink_dir, line.rstrip('\n')) for line in fp)
+      cls._symlinks_by_dir[symlink_dir] = symlinks
+    return symlinks
+
+  @staticmethod
+  def _symlink(path_and_symlink):
+    path, symlink = path_and_symlink
+    try:
+      os.symlink(path, symlink)
+    except OSError as e:
+      # We don't delete and recreate the symlink, as this may break concurrently executing code.
+      if e.errno != errno.EEXIST:
+        raise
+
+  @classmethod
+  def _create_symlinks(cls, links):
+    """Creates the given (path, symlink) pairs, in parallel if there are many of them."""
+    dirs = set(os.path.dirname(symlink) for _, symlink in links)
+    if len(links) < cls._PARALLEL_SYMLINK_THRESHOLD:
+      for directory in dirs:
+        safe_mkdir(directory)
+      for link in links:
+        cls._symlink(link)
+    else:
+      pool = ThreadPool(processes=min(len(links) // cls._PARALLEL_SYMLINK_THRESHOLD + 1,
+                                      2 * multiprocessing.cpu_count()))
+      try:
+        pool.map(safe_mkdir, dirs)
+        pool.map(cls._symlink, links)
+      finally:
+        pool.close()
+        pool.join()
+
   @classmethod
   def symlink_cachepath(cls, ivy_cache_dir, inpath, symlink_dir, outpath):
     """Symlinks all paths listed in inpath that are under ivy_cache_dir into symlink_dir.
@@ -277,6 +436,10 @@ class IvyUtils(object):
     If there is an existing symlink for a file under inpath, it is used rather than creating
     a new symlink. Preserves all other paths. Writes the resulting paths to outpath.
     Returns a map of path -> symlink to that path.
+
+    The symlinks created are recorded in a manifest in symlink_dir, so that later calls, including
+    those from later runs, need only check that the recorded symlinks still exist rather than
+    attempt to create them again.
     """
     safe_mkdir(symlink_dir)
     # The ivy_cache_dir might itself be a symlink. In this case, ivy may return paths that
@@ -285,35 +448,45 @@ class IvyUtils(object):
     real_ivy_cache_dir = os.path.realpath(ivy_cache_dir)
     symlink_map = OrderedDict()
 
-    inpaths = cls.load_classpath_from_cachepath(inpath)
-    paths = OrderedSet([os.path.realpath(path) for path in inpaths])
-
-    for path in paths:
-      if path.startswith(real_ivy_cache_dir):
-        symlink_map[path] = os.path.join(symlink_dir, os.path.relpath(path, real_ivy_cache_dir))
-      else:
-        # This path is outside the cache. We won't symlink it.
-        symlink_map[path] = path
-
-    # Create symlinks for paths in the ivy cache dir.
-    for path, symlink in six.iteritems(symlink_map):
-      if path == symlink:
-        # Skip paths that aren't going to be symlinked.
-        continue
-      safe_mkdir(os.path.dirname(symlink))
-      try:
-        os.symlink(path, symlink)
-      except OSError as e:
-        # We don't delete and recreate the symlink, as this may break concurrently executing code.
-        if e.errno != errno.EEXIST:
-          raise
-
-    # (re)create the classpath with all of the paths
-    with safe_open(outpath, 'w') as outfile:
-      outfile.write(':'.join(OrderedSet(symlink_map.values())))
+    with cls._symlink_lock:
+      inpaths = cls.load_classpath_from_cachepath(inpath)
+      paths = OrderedSet([cls._realpath(path) for path in inpaths])
+
+      for path in paths:
+        if path.startswith(real_ivy_cache_dir):
+          symlink_map[path] = os.path.join(symlink_dir, os.path.relpath(path, real_ivy_cache_dir))
+        else:
+          # This path is outside the cache. We won't symlink it.
+          symlink_map[path] = path
+
+      # Create symlinks for paths in the ivy cache dir that no earlier call has, as well as any
+      # recorded in the manifest that have since been deleted.
+      existing_symlinks = cls._existing_symlinks(symlink_dir)
+      new_links = [(path, symlink) for path, symlink in six.iteritems(symlink_map)
+                   if path != symlink and (symlink not in existing_symlinks or
+                                           not os.path.islink(symlink))]
+      if new_links:
+        cls._create_symlinks(new_links)
+        unrecorded = [symlink for _, symlink in new_links if symlink not in existing_symlinks]
+        if unrecorded:
+          with open(os.path.join(symlink_dir, cls._SYMLINK_MANIFEST), 'a') as manifest:
+            manifest.write(''.join('{}\n'.format(os.path.relpath(symlink, symlink_dir))
+                                   for symlink in unrecorded))
+          existing_symlinks.update(unrecorded)
+
+    # (re)create the classpath with all of the paths, unless it is unchanged.
+    classpath = ':'.join(OrderedSet(symlink_map.values()))
+    if not os.path.exists(outpath) or cls._read_file(outpath) != classpath:
+      with safe_open(outpath, 'w') as outfile:
+        outfile.write(classpath)
 
     return dict(symlink_map)
 
+  @staticmethod
+  def _read_file(path):
+    with open(path, 'r') as fp:
+      return fp.read()
+
   @staticmethod
   def identify(targets):
     targets = list(targets)
@@ -362,20 +535,26 @@ class IvyUtils(object):
   def _parse_xml_report(cls, conf, path):
     logger.debug("Parsing ivy report {}".format(path))
     ret = IvyInfo(conf)
-    etree = ET.parse(path)
-    doc = etree.getroot()
-    for module in doc.findall('dependencies/module'):
-      org = module.get('organisation')
-      name = module.get('name')
-      for revision in module.findall('revision'):
-        rev = revision.get('name')
-        callers = []
-        for caller in revision.findall('caller'):
-          callers.append(IvyModuleRef(caller.get('organisation'),
-                                      caller.get('name'),
-                                      caller.get('callerrev')))
-
-        for artifact in revision.findall('artifacts/artifact'):
+    # Stream the report rather than building a tree of the whole thing; each module's elements are
+    # discarded once the module has been added.
+    in_dependencies = False
+    org = name = None
+    # NB: cElementTree requires the event names to be native strings.
+    for event, elem in ET.iterparse(path, events=(b'start', b'end')):
+      tag = elem.tag
+      if event == 'start':
+        if tag == 'dependencies':
+          in_dependencies = True
+        elif tag == 'module' and in_dependencies:
+          org = elem.get('organisation')
+          name = elem.get('name')
+      elif tag == 'revision' and in_dependencies:
+        rev = elem.get('name')
+        callers = [IvyModuleRef(caller.get('organisation'),
+                                caller.get('name'),
+                                caller.get('callerrev'))
+                   for caller in elem.iterfind('caller')]
+        for artifact in elem.iterfind('artifacts/artifact'):
           classifier = artifact.get('extra-classifier')
           ext = artifact.get('ext')
           ivy_module_ref = IvyModuleRef(org=org, name=name, rev=rev,
@@ -385,6 +564,10 @@ class IvyUtils(object):
           ivy_module = IvyModule(ivy_module_ref, artifact_cache_path, callers)
 
           ret.add_module(ivy_module)
+      elif tag == 'module' and in_dependencies:
+        elem.clear()
+      elif tag == 'dependencies':
+        in_dependencies = False
     return ret
 
   @classmethod
@@ -434,7 +617,7 @@ class IvyUtils(object):
     # [2] https://svn.apache.org/repos/asf/ant/ivy/core/branches/2.3.0/
     #     src/java/org/apache/ivy/core/module/descriptor/DependencyDescriptor.java
     # [3] http://ant.apache.org/ivy/history/2.3.0/ivyfile/override.html
-    overrides = [cls._generate_override_template(coord) for coord in artifact_set]
+    overrides = [cls._generate_override_template(override) for override in artifact_set]
 
     excludes = [cls._generate_exclude_template(exclude) for exclude in excludes]
 
@@ -0,0 +1,42 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+# What this backend's register module registers, so that it need only be imported once it is
+# needed when backends are loaded lazily.  See `pants.bin.extension_loader.BackendMetadata`.
+
+tasks = [
+  'bench', 'binary.binary-jvm-prep-command', 'binary.dup', 'binary.jvm',
+  'bootstrap.bootstrap-jvm-tools', 'bootstrap.jar-dependency-management', 'bundle.dup',
+  'bundle.jvm', 'check_published_deps', 'clean-all.ng-killall', 'compile.compile-jvm-prep-command',
+  'compile.jvm-dep-check', 'compile.zinc', 'dep-usage.jvm', 'detect-duplicates', 'doc.javadoc',
+  'doc.scaladoc', 'export-classpath', 'imports.ivy-imports', 'invalidate.ng-killall', 'jar.create',
+  'jvm-platform-explain', 'jvm-platform-validate', 'ng-killall', 'publish.jar',
+  'repl-dirty.scala-dirty', 'repl.scala', 'resolve.ivy', 'resources.prepare', 'resources.services',
+  'run-dirty.jvm-dirty', 'run.jvm', 'test.junit', 'test.test-jvm-prep-command', 'unpack-jars',
+]
+
+aliases = [
+  'DirectoryReMapper', 'Duplicate', 'Skip', 'annotation_processor', 'artifact', 'benchmark',
+  'bundle', 'credentials', 'developer', 'exclude', 'github', 'jar', 'jar_library', 'jar_rules',
+  'java_agent', 'java_library', 'java_tests', 'junit_tests', 'jvm_app', 'jvm_binary',
+  'jvm_prep_command', 'license', 'managed_jar_dependencies', 'managed_jar_libraries', 'ossrh',
+  'repository', 'scala_artifact', 'scala_jar', 'scala_library', 'scalac_plugin', 'scm',
+  'shading_exclude', 'shading_exclude_package', 'shading_keep', 'shading_keep_package',
+  'shading_relocate', 'shading_relocate_package', 'shading_zap', 'shading_zap_package',
+  'unpacked_jars',
+]
+
+subsystems = [
+  'ivy', 'ivy-resolution-cache', 'jar-dependency-management', 'jar-entry-index', 'jar-tool',
+  'java', 'jvm', 'jvm-distributions', 'jvm-platform', 'scala-platform', 'shader',
+]
+
+# The backends whose tasks produce products this backend's tasks require.
+dependencies = [
+  'pants.backend.codegen',
+]
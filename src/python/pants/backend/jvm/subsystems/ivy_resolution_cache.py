@@ -0,0 +1,209 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import marshal
+import os
+from collections import namedtuple
+
+from pants.backend.jvm.ivy_utils import IvyInfo, IvyModule, IvyModuleRef
+from pants.base.hash_utils import hash_file
+from pants.base.payload_field import stable_json_sha1
+from pants.ivy.ivy_subsystem import IvySubsystem
+from pants.subsystem.subsystem import Subsystem
+from pants.util.dirutil import safe_delete, safe_mkdir_for
+from pants.util.memo import memoized_property
+
+
+logger = logging.getLogger(__name__)
+
+
+class IvyResolution(namedtuple('IvyResolution', ['classpath', 'reports', 'ivy_infos'])):
+  """The results of an ivy resolve.
+
+  :param list classpath: The raw classpath ivy resolved, as paths into the ivy cache.
+  :param dict reports: A map from ivy conf to the text of its xml report.
+  :param dict ivy_infos: A map from ivy conf to the :class:`pants.backend.jvm.ivy_utils.IvyInfo`
+                         parsed from its xml report.
+  """
+
+
+class IvyResolutionCache(Subsystem):
+  """A machine-wide cache of ivy resolution results.
+
+  Resolves are keyed by the normalized set of jar coordinates, excludes, overrides and confs fed
+  to ivy rather than by the targets that declared them, so identical resolves in different
+  checkouts, and in different tasks (`resolve.ivy`, `imports.ivy-imports` and jvm tool
+  bootstrapping), share a single entry.  A hit restores the resolve's reports and classpath
+  without starting an ivy JVM.
+
+  Resolves that depend on mutable jars or dynamic revisions are never cached, and entries whose
+  artifacts have since been removed from the ivy cache are ignored.
+  """
+
+  options_scope = 'ivy-resolution-cache'
+
+  # Bump this whenever the format of cached resolutions changes.
+  _VERSION = 1
+
+  # Reports name the resolve they came from; entries are stored with the name replaced by this
+  # token so that they can be restored under the resolve name of any checkout.
+  _RESOLVE_HASH_NAME_TOKEN = '@RESOLVE_HASH_NAME@'
+
+  _DYNAMIC_REV_CHARS = frozenset('[]()+,')
+
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(IvyResolutionCache, cls).subsystem_dependencies() + (IvySubsystem,)
+
+  @classmethod
+  def register_options(cls, register):
+    super(IvyResolutionCache, cls).register_options(register)
+    register('--enabled', advanced=True, action='store_true', default=False,
+             help='Reuse the results of identical ivy resolves across checkouts and tasks.')
+    register('--dir', advanced=True, metavar='<dir>', default=None,
+             help='The directory to store resolution results in; '
+                  'by default, a directory under --pants-bootstrapdir.')
+
+  def __init__(self, *args, **kwargs):
+    super(IvyResolutionCache, self).__init__(*args, **kwargs)
+    options = self.get_options()
+    self._cache_dir = options.dir or os.path.join(options.pants_bootstrapdir, 'ivy_resolutions')
+    self.hits = 0
+    self.misses = 0
+
+  @property
+  def enabled(self):
+    return self.get_options().enabled
+
+  @memoized_property
+  def _ivy_fingerprint(self):
+    ivy_options = IvySubsystem.global_instance().get_options()
+    settings = ivy_options.ivy_settings
+    return dict(cache_dir=os.path.realpath(ivy_options.cache_dir),
+                ivy_profile=ivy_options.ivy_profile,
+                settings=hash_file(settings) if settings and os.path.isfile(settings) else settings)
+
+  @classmethod
+  def _is_dynamic(cls, jar):
+    rev = jar.rev
+    return not rev or rev.startswith('latest.') or any(c in cls._DYNAMIC_REV_CHARS for c in rev)
+
+  def resolution_key(self, jars, global_excludes, pinned_artifacts, confs, extra_args=None):
+    """Returns the key identifying the resolve of the given jars, or `None` if it can't be cached.
+
+    :param jars: The jars to resolve, as calculated by `IvyUtils.calculate_classpath`.
+    :type jars: list of :class:`pants.backend.jvm.targets.jar_dependency.JarDependency`
+    :param global_excludes: The excludes to apply to the whole resolve.
+    :type global_excludes: :class:`collections.Iterable` of
+                           :class:`pants.backend.jvm.targets.exclude.Exclude`
+    :param pinned_artifacts: The coordinates whose versions are pinned for the resolve.
+    :type pinned_artifacts: :class:`collections.Iterable` of
+                            :class:`pants.backend.jvm.jar_dependency_utils.M2Coordinate`
+    :param confs: The ivy confs to resolve.
+    :param extra_args: Any extra command line arguments passed to ivy.
+    :rtype: string
+    """
+    if not self.enabled or any(jar.mutable or self._is_dynamic(jar) for jar in jars):
+      return None
+
+    def exclude_key(exclude):
+      return exclude.org, exclude.name
+
+    # NB: The order of the dependencies is significant, since it determines classpath order.
+    dependencies = [dict(org=jar.org,
+                         name=jar.name,
+                         rev=jar.rev,
+                         classifier=jar.classifier,
+                         ext=jar.ext,
+                         url=jar.url,
+                         force=jar.force,
+                         transitive=jar.transitive,
+                         excludes=sorted(set(exclude_key(e) for e in jar.excludes)))
+                    for jar in jars]
+    return stable_json_sha1(dict(version=self._VERSION,
+                                 ivy=self._ivy_fingerprint,
+                                 confs=sorted(set(confs)),
+                                 dependencies=dependencies,
+                                 excludes=sorted(set(exclude_key(e) for e in global_excludes)),
+                                 overrides=sorted(set(str(c) for c in pinned_artifacts or ())),
+                                 extra_args=list(extra_args or ())))
+
+  def load(self, key, resolve_hash_name):
+    """Returns the cached resolution for the given key, or `None` if there is none.
+
+    :param string key: A key returned by `resolution_key`.
+    :param string resolve_hash_name: The name of the resolve to restore the resolution as.
+    :rtype: :class:`IvyResolution`
+    """
+    entry = self._read(key)
+    if entry is None or not all(os.path.exists(path) for path in entry[2]):
+      self.misses += 1
+      return None
+    self.hits += 1
+
+    _, _, classpath, reports, modules_by_conf = entry
+    restore = lambda value: value.replace(self._RESOLVE_HASH_NAME_TOKEN, resolve_hash_name)
+    ivy_infos = {}
+    for conf, modules in modules_by_conf.items():
+      ivy_info = IvyInfo(conf)
+      for org, name, rev, classifier, ext, artifact, callers in modules:
+        caller_refs = [IvyModuleRef(caller_org, restore(caller_name), caller_rev)
+                       for caller_org, caller_name, caller_rev in callers]
+        ivy_info.add_module(IvyModule(IvyModuleRef(org, name, rev, classifier, ext),
+                                      artifact,
+                                      caller_refs))
+      ivy_infos[conf] = ivy_info
+    return IvyResolution(classpath=classpath,
+                         reports={conf: restore(text) for conf, text in reports.items()},
+                         ivy_infos=ivy_infos)
+
+  def store(self, key, resolve_hash_name, resolution):
+    """Caches the given resolution under the given key.
+
+    :param string key: A key returned by `resolution_key`.
+    :param string resolve_hash_name: The name of the resolve the resolution was produced by.
+    :param resolution: The resolution to cache.
+    :type resolution: :class:`IvyResolution`
+    """
+    anonymize = lambda value: value.replace(resolve_hash_name, self._RESOLVE_HASH_NAME_TOKEN)
+    modules_by_conf = {}
+    for conf, ivy_info in resolution.ivy_infos.items():
+      modules_by_conf[conf] = [(module.ref.org, module.ref.name, module.ref.rev,
+                                module.ref.classifier, module.ref.ext, module.artifact,
+                                [(caller.org, anonymize(caller.name), caller.rev)
+                                 for caller in module.callers])
+                               for module in ivy_info.modules_by_ref.values()]
+    reports = {conf: anonymize(text) for conf, text in resolution.reports.items()}
+
+    entry_path = self._entry_path(key)
+    safe_mkdir_for(entry_path)
+    tmp_path = '{}.tmp.{}'.format(entry_path, os.getpid())
+    try:
+      with open(tmp_path, 'wb') as fp:
+        marshal.dump((self._VERSION, key, list(resolution.classpath), reports, modules_by_conf), fp)
+      os.rename(tmp_path, entry_path)
+    except (IOError, OSError) as e:
+      logger.debug('Failed to cache ivy resolution {}: {}'.format(key, e))
+    finally:
+      safe_delete(tmp_path)
+
+  def _entry_path(self, key):
+    return os.path.join(self._cache_dir, key[:2], key[2:])
+
+  def _read(self, key):
+    try:
+      with open(self._entry_path(key), 'rb') as fp:
+        entry = marshal.load(fp)
+    except IOError:
+      return None
+    except (EOFError, ValueError, TypeError) as e:
+      logger.debug('Ignoring unreadable ivy resolution {}: {}'.format(key, e))
+      return None
+    if len(entry) != 5 or entry[0] != self._VERSION or entry[1] != key:
+      return None
+    return entry
@@ -0,0 +1,121 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import hashlib
+import logging
+import marshal
+import os
+
+from pants.subsystem.subsystem import Subsystem
+from pants.util.contextutil import open_zip
+from pants.util.dirutil import safe_delete, safe_mkdir_for
+
+
+logger = logging.getLogger(__name__)
+
+
+class JarEntryIndex(Subsystem):
+  """An index of the entries of jar files, shared by the tasks that list them.
+
+  Listing a jar means reading its zip central directory, and tasks like `detect-duplicates`,
+  `dep-usage` and junit test discovery list the same third party jars on every run.  Listings are
+  memoized for the duration of a run and, unless disabled, persisted under the workdir keyed by
+  the jar's real path, size and modification time, so a jar is only re-read when it changes.
+  """
+
+  options_scope = 'jar-entry-index'
+
+  # Bump this whenever the format of persisted listings changes.
+  _VERSION = 1
+
+  @classmethod
+  def register_options(cls, register):
+    super(JarEntryIndex, cls).register_options(register)
+    register('--persist', advanced=True, action='store_true', default=True,
+             help='Persist jar entry listings in the workdir so they are reused across runs.')
+
+  def __init__(self, *args, **kwargs):
+    super(JarEntryIndex, self).__init__(*args, **kwargs)
+    self._index_dir = (os.path.join(self.get_options().pants_workdir, 'jar_entry_index')
+                       if self.get_options().persist else None)
+    self._listings = {}
+    self.hits = 0
+    self.misses = 0
+
+  def entry_names(self, jar_path):
+    """Returns the names of the entries in the given jar, in the order `ZipFile.namelist` would.
+
+    :param string jar_path: The path of the jar to list.
+    :rtype: list of string
+    """
+    names, _ = self._listing(jar_path)
+    return names
+
+  def entry_crcs(self, jar_path):
+    """Returns a map from the name of each entry in the given jar to its CRC-32.
+
+    :param string jar_path: The path of the jar to list.
+    :rtype: dict of string to int
+    """
+    names, crcs = self._listing(jar_path)
+    return dict(zip(names, crcs))
+
+  def _listing(self, jar_path):
+    realpath = os.path.realpath(jar_path)
+    stat = os.stat(realpath)
+    key = (realpath, stat.st_size, stat.st_mtime)
+    listing = self._listings.get(key)
+    if listing is None:
+      listing = self._load(key)
+      if listing is None:
+        self.misses += 1
+        listing = self._read(realpath)
+        self._store(key, listing)
+      else:
+        self.hits += 1
+      self._listings[key] = listing
+    return listing
+
+  @staticmethod
+  def _read(jar_path):
+    with open_zip(jar_path, 'r') as jar:
+      infos = jar.infolist()
+    return [info.filename for info in infos], [info.CRC for info in infos]
+
+  def _index_path(self, realpath):
+    key = hashlib.sha1(realpath.encode('utf-8')).hexdigest()
+    return os.path.join(self._index_dir, key[:2], key[2:])
+
+  def _load(self, key):
+    if self._index_dir is None:
+      return None
+    try:
+      with open(self._index_path(key[0]), 'rb') as fp:
+        version, stored_key, names, crcs = marshal.load(fp)
+    except IOError:
+      return None
+    except (EOFError, ValueError, TypeError) as e:
+      logger.debug('Ignoring unreadable jar entry listing for {}: {}'.format(key[0], e))
+      return None
+    if version != self._VERSION or tuple(stored_key) != key:
+      return None
+    return names, crcs
+
+  def _store(self, key, listing):
+    if self._index_dir is None:
+      return
+    index_path = self._index_path(key[0])
+    safe_mkdir_for(index_path)
+    tmp_path = '{}.tmp.{}'.format(index_path, os.getpid())
+    try:
+      with open(tmp_path, 'wb') as fp:
+        marshal.dump((self._VERSION, key, listing[0], listing[1]), fp)
+      os.rename(tmp_path, index_path)
+    except (IOError, OSError) as e:
+      logger.debug('Failed to persist jar entry listing for {}: {}'.format(key[0], e))
+    finally:
+      safe_delete(tmp_path)
@@ -6,18 +6,55 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+import shutil
+from collections import OrderedDict
 
 from twitter.common.collections import OrderedSet
 
+from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.targets.jvm_app import JvmApp
 from pants.backend.jvm.targets.jvm_binary import JvmBinary
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.jvm_binary_task import JvmBinaryTask
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.fingerprint_strategy import TaskIdentityFingerprintStrategy
 from pants.fs import archive
 from pants.fs.archive import JAR
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import fast_relpath, safe_mkdir, safe_mkdir_for, safe_rmtree, safe_walk
+
+
+class ResolvedJarIdentityFingerprintStrategy(TaskIdentityFingerprintStrategy):
+  """Task fingerprint strategy that also includes the identity of the files of resolved jars.
+
+  A SNAPSHOT or other mutable jar can be resolved to new contents at the same coordinate, so the
+  path, size and mtime of each resolved jar file are fingerprinted rather than its coordinate.
+  """
+
+  def __init__(self, task, classpath_products):
+    super(ResolvedJarIdentityFingerprintStrategy, self).__init__(task)
+    self._classpath_products = classpath_products
+
+  def _build_hasher(self, target):
+    hasher = super(ResolvedJarIdentityFingerprintStrategy, self)._build_hasher(target)
+    if isinstance(target, JarLibrary):
+      classpath_entries = self._classpath_products.get_artifact_classpath_entries_for_targets(
+        [target])
+      for _, entry in classpath_entries:
+        hasher.update(entry.path)
+        try:
+          stat = os.stat(entry.path)
+        except OSError:
+          continue
+        hasher.update('{}:{}'.format(stat.st_size, stat.st_mtime))
+    return hasher
+
+  def __hash__(self):
+    return hash((type(self), self._task.fingerprint))
+
+  def __eq__(self, other):
+    return (isinstance(other, ResolvedJarIdentityFingerprintStrategy) and
+            super(ResolvedJarIdentityFingerprintStrategy, self).__eq__(other))
 
 
 class BundleCreate(JvmBinaryTask):
@@ -39,6 +76,13 @@ class BundleCreate(JvmBinaryTask):
     register('--archive', choices=list(archive.TYPE_NAMES),
              fingerprint=True,
              help='Create an archive of this type from the bundle.')
+    register('--archive-compression-level', advanced=True, type=int, default=None,
+             fingerprint=True,
+             help='The compression level to create compressed archives with; 0 creates '
+                  'store-only zips.  By default, the level of the archive type.')
+    register('--archive-parallelism', advanced=True, type=int, default=1,
+             fingerprint=True,
+             help='The number of threads to compress tgz and zip archives with.')
     register('--archive-prefix', action='store_true', default=False,
              fingerprint=True,
              help='If --archive is specified, prefix archive with target basename or a unique '
@@ -46,6 +90,7 @@ class BundleCreate(JvmBinaryTask):
     # `target.id` ensures global uniqueness, this flag is provided primarily for
     # backward compatibility.
     register('--use-basename-prefix', action='store_true', default=False,
+             fingerprint=True,
              help='Use target basename to prefix bundle folder or archive; otherwise a unique '
                   'identifier derived from target will be used.')
 
@@ -74,8 +119,12 @@ class BundleCreate(JvmBinaryTask):
     return True
 
   def execute(self):
-    archiver_type = self.get_options().archive
-    archiver = archive.archiver(archiver_type) if archiver_type else None
+    options = self.get_options()
+    archiver = None
+    if options.archive:
+      archiver = archive.archiver(options.archive,
+                                  compression_level=options.archive_compression_level,
+                                  parallelism=options.archive_parallelism)
 
     if self.get_options().use_basename_prefix:
       # NB(peiyu) This special casing is confusing especially given we already fail
@@ -99,38 +148,126 @@ class BundleCreate(JvmBinaryTask):
     runtime_classpath = self.context.products.get_data('runtime_classpath')
     targets_to_consolidate = self.find_consolidate_classpath_candidates(runtime_classpath,
                                                                         self.context.targets())
-    self.consolidate_classpath(targets_to_consolidate, runtime_classpath)
+    apps_by_target = OrderedDict((app.target, app) for app in apps)
+
+    # NB: Consolidated jars and bundles share one invalidation round, since the invalidator tracks
+    # a single version of each target per task.  Apps are re-bundled when the files of the jars
+    # they bundle change, even if the jars were resolved at unchanged coordinates.
+    targets = OrderedSet(targets_to_consolidate)
+    targets.update(apps_by_target)
+    fingerprint_strategy = ResolvedJarIdentityFingerprintStrategy(self, runtime_classpath)
+    with self.invalidated(targets=targets,
+                          invalidate_dependents=True,
+                          fingerprint_strategy=fingerprint_strategy) as invalidation:
+      consolidate = set(targets_to_consolidate)
+      self._consolidate_classpath([vt for vt in invalidation.all_vts if vt.target in consolidate],
+                                  runtime_classpath)
 
-    for app in apps:
-      basedir = self.bundle(app)
-      # NB(Eric Ayers): Note that this product is not housed/controlled under .pants.d/  Since
-      # the bundle is re-created every time, this shouldn't cause a problem, but if we ever
-      # expect the product to be cached, a user running an 'rm' on the dist/ directory could
-      # cause inconsistencies.
-      jvm_bundles_product = self.context.products.get('jvm_bundles')
-      jvm_bundles_product.add(app.target, os.path.dirname(basedir)).append(os.path.basename(basedir))
+      for vt in invalidation.all_vts:
+        app = apps_by_target.get(vt.target)
+        if app:
+          self._bundle_and_archive(vt, app, archiver)
+
+  def _bundle_and_archive(self, vt, app, archiver):
+    # Bundles are made of symlinks to local paths, so rather than in the results dir, which may be
+    # written to the artifact cache, they live in a dir of their own keyed like it.  An app whose
+    # inputs have not changed is not re-bundled or re-archived; its bundle is just cloned into
+    # the dist dir again.
+    bundle_root = os.path.join(self.workdir, 'bundles', fast_relpath(vt.results_dir, self.workdir))
+    bundle_dir = os.path.join(bundle_root, 'bundle')
+    archive_dir = os.path.join(bundle_root, 'archive')
+    if not vt.valid or not os.path.isdir(bundle_dir):
+      # Only keep the latest bundle of each app.
+      safe_mkdir(os.path.dirname(bundle_root), clean=True)
+      self.bundle(app, bundle_dir)
       if archiver:
-        archivepath = archiver.create(
-          basedir,
-          self.get_options().pants_distdir,
+        safe_mkdir(archive_dir)
+        archiver.create(
+          bundle_dir,
+          archive_dir,
           app.basename,
           prefix=app.basename if self.get_options().archive_prefix else None
         )
-        self.context.log.info('created {}'.format(os.path.relpath(archivepath, get_buildroot())))
+
+    basedir = os.path.join(self.get_options().pants_distdir, '{}-bundle'.format(app.basename))
+    self._clone_bundle(bundle_dir, basedir)
+    self.context.log.info('created {}'.format(os.path.relpath(basedir, get_buildroot())))
+
+    jvm_bundles_product = self.context.products.get('jvm_bundles')
+    jvm_bundles_product.add(app.target,
+                            os.path.dirname(basedir)).append(os.path.basename(basedir))
+    if archiver:
+      archivename = '{}.{}'.format(app.basename, archiver.extension)
+      archivepath = os.path.join(self.get_options().pants_distdir, archivename)
+      self._link_archive(os.path.join(archive_dir, archivename), archivepath)
+      self.context.log.info('created {}'.format(os.path.relpath(archivepath, get_buildroot())))
+
+  @staticmethod
+  def _remove(path):
+    if os.path.islink(path) or os.path.isfile(path):
+      os.unlink(path)
+    elif os.path.isdir(path):
+      safe_rmtree(path)
+
+  @staticmethod
+  def _link_file(path, dist_path):
+    # Files are hard linked rather than symlinked so that the dist dir survives a clean-all and can
+    # be shipped as is; each rebuild creates new files, so the ones in the dist dir are never
+    # mutated.
+    try:
+      os.link(path, dist_path)
+    except OSError:
+      shutil.copy2(path, dist_path)
+
+  @classmethod
+  def _clone_bundle(cls, bundle_dir, dist_bundle_dir):
+    """Recreates the bundle at bundle_dir as a real directory at dist_bundle_dir.
+
+    The symlinks in the bundle are recreated as they are, just as `bundle` would have created them
+    in the dist dir, and its files are hard linked.
+    """
+    cls._remove(dist_bundle_dir)
+    safe_mkdir(dist_bundle_dir)
+    for root, dirs, files in safe_walk(bundle_dir):
+      dist_root = os.path.join(dist_bundle_dir, fast_relpath(root, bundle_dir))
+      for name in dirs + files:
+        path = os.path.join(root, name)
+        dist_path = os.path.join(dist_root, name)
+        if os.path.islink(path):
+          os.symlink(os.readlink(path), dist_path)
+        elif os.path.isdir(path):
+          os.mkdir(dist_path)
+        else:
+          cls._link_file(path, dist_path)
+
+  @classmethod
+  def _link_archive(cls, archivepath, dist_archivepath):
+    if os.path.isfile(dist_archivepath) and os.path.samefile(archivepath, dist_archivepath):
+      return
+    cls._remove(dist_archivepath)
+    safe_mkdir_for(dist_archivepath)
+    cls._link_file(archivepath, dist_archivepath)
 
   class BasenameConflictError(TaskError):
     """Indicates the same basename is used by two targets."""
 
-  def bundle(self, app):
+  def bundle(self, app, bundle_dir=None):
     """Create a self-contained application bundle.
 
     The bundle will contain the target classes, dependencies and resources.
+
+    :param app: The app to bundle.
+    :type app: :class:`BundleCreate.App`
+    :param string bundle_dir: The directory to create the bundle in; any existing contents are
+                              removed.  Defaults to the app's bundle dir under the dist dir.
+    :returns: The directory the bundle was created in.
     """
 
     assert(isinstance(app, BundleCreate.App))
 
-    bundle_dir = os.path.join(self.get_options().pants_distdir, '{}-bundle'.format(app.basename))
-    self.context.log.info('creating {}'.format(os.path.relpath(bundle_dir, get_buildroot())))
+    if bundle_dir is None:
+      bundle_dir = os.path.join(self.get_options().pants_distdir, '{}-bundle'.format(app.basename))
+    self.context.log.info('creating bundle for {}'.format(app.address.spec))
 
     safe_mkdir(bundle_dir, clean=True)
 
@@ -178,18 +315,21 @@ class BundleCreate(JvmBinaryTask):
     """Convert loose directories in classpath_products into jars. """
 
     with self.invalidated(targets=targets, invalidate_dependents=True) as invalidation:
-      for vt in invalidation.all_vts:
-        entries = classpath_products.get_internal_classpath_entries_for_targets([vt.target])
-        for index, (conf, entry) in enumerate(entries):
-          if ClasspathUtil.is_dir(entry.path):
-            # regenerate artifact for invalid vts
-            if not vt.valid:
-              JAR.create(entry.path, vt.results_dir, 'output-{}'.format(index))
-
-            # replace directory classpath entry with its jarpath
-            jarpath = os.path.join(vt.results_dir, 'output-{}.jar'.format(index))
-            classpath_products.remove_for_target(vt.target, [(conf, entry.path)])
-            classpath_products.add_for_target(vt.target, [(conf, jarpath)])
+      self._consolidate_classpath(invalidation.all_vts, classpath_products)
+
+  def _consolidate_classpath(self, vts, classpath_products):
+    for vt in vts:
+      entries = classpath_products.get_internal_classpath_entries_for_targets([vt.target])
+      for index, (conf, entry) in enumerate(entries):
+        if ClasspathUtil.is_dir(entry.path):
+          # regenerate artifact for invalid vts
+          if not vt.valid:
+            JAR.create(entry.path, vt.results_dir, 'output-{}'.format(index))
+
+          # replace directory classpath entry with its jarpath
+          jarpath = os.path.join(vt.results_dir, 'output-{}.jar'.format(index))
+          classpath_products.remove_for_target(vt.target, [(conf, entry.path)])
+          classpath_products.add_for_target(vt.target, [(conf, jarpath)])
 
   def find_consolidate_classpath_candidates(self, classpath_products, targets):
     targets_with_directory_in_classpath = []
@@ -6,13 +6,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+from collections import defaultdict
 
 from twitter.common.collections import OrderedSet
 
 from pants.backend.jvm.targets.exclude import Exclude
 from pants.backend.jvm.targets.jvm_target import JvmTarget
 from pants.base.exceptions import TaskError
-from pants.build_graph.build_graph import BuildGraph
 from pants.goal.products import UnionProducts
 
 
@@ -148,7 +148,12 @@ def _not_excluded_filter(excludes):
 
 
 class ClasspathProducts(object):
-  """
+  """The classpath entries and excludes of targets.
+
+  Classpath queries are memoized until the classpaths of their targets, or any excludes, change,
+  and the excludes in play for the closure of each target are memoized until excludes change.
+  Both assume the dependencies of targets no longer change once their classpaths are queried.
+
   :API: public
   """
 
@@ -156,6 +161,14 @@ class ClasspathProducts(object):
     self._classpaths = classpaths or UnionProducts()
     self._excludes = excludes or UnionProducts()
     self._pants_workdir = pants_workdir
+    # A map from (targets, respect_excludes) to the classpath product-target mappings for them.
+    self._mappings_by_query = {}
+    # A map from target to the memoized queries that include it.
+    self._queries_by_target = defaultdict(set)
+    # A map from target to the frozenset of excludes declared in its closure.
+    self._closure_excludes_by_target = {}
+    self.query_cache_hits = 0
+    self.query_cache_misses = 0
 
   @staticmethod
   def init_func(pants_workdir):
@@ -217,6 +230,7 @@ class ClasspathProducts(object):
   def remove_for_target(self, target, classpath_elements):
     """Removes the given entries for the target."""
     self._classpaths.remove_for_target(target, self._wrap_path_elements(classpath_elements))
+    self._invalidate_queries_for_target(target)
 
   def get_for_target(self, target):
     """Gets the classpath products for the given target.
@@ -267,11 +281,21 @@ class ClasspathProducts(object):
     :param bool respect_excludes: `True` to respect excludes; `False` to ignore them.
     :returns: The ordered (classpath products, target) tuples.
     """
-    classpath_target_tuples = self._classpaths.get_product_target_mappings_for_targets(targets)
-    if respect_excludes:
-      return self._filter_by_excludes(classpath_target_tuples, targets)
+    targets = tuple(targets)
+    query = (targets, respect_excludes)
+    classpath_target_tuples = self._mappings_by_query.get(query)
+    if classpath_target_tuples is not None:
+      self.query_cache_hits += 1
     else:
-      return classpath_target_tuples
+      self.query_cache_misses += 1
+      classpath_target_tuples = self._classpaths.get_product_target_mappings_for_targets(targets)
+      if respect_excludes:
+        classpath_target_tuples = self._filter_by_excludes(classpath_target_tuples, targets)
+      self._mappings_by_query[query] = classpath_target_tuples
+      for target in targets:
+        self._queries_by_target[target].add(query)
+    # Callers are free to mutate the list they are handed.
+    return list(classpath_target_tuples)
 
   def get_artifact_classpath_entries_for_targets(self, targets, respect_excludes=True):
     """Gets the artifact classpath products for the given targets.
@@ -308,11 +332,47 @@ class ClasspathProducts(object):
   def _filter_by_excludes(self, classpath_target_tuples, root_targets):
     # Excludes are always applied transitively, so regardless of whether a transitive
     # set of targets was included here, their closure must be included.
-    closure = BuildGraph.closure(root_targets, bfs=True)
-    excludes = self._excludes.get_for_targets(closure)
+    excludes = set()
+    for target in root_targets:
+      excludes.update(self._closure_excludes(target))
+    if not excludes:
+      return classpath_target_tuples
     return filter(_not_excluded_filter(excludes), classpath_target_tuples)
 
+  def _closure_excludes(self, target):
+    """Returns the excludes declared by the targets in the closure of `target`."""
+    memo = self._closure_excludes_by_target
+    if target in memo:
+      return memo[target]
+
+    # Walk the closure depth first without recursion, which deep graphs could exhaust, memoizing
+    # each target once all of its dependencies have been.
+    to_walk = [(target, False)]
+    while to_walk:
+      current, dependencies_walked = to_walk.pop()
+      if current in memo:
+        continue
+      if dependencies_walked:
+        excludes = set(self._excludes.get_for_target(current))
+        for dependency in current.dependencies:
+          excludes.update(memo[dependency])
+        memo[current] = frozenset(excludes)
+      else:
+        to_walk.append((current, True))
+        to_walk.extend((dependency, False) for dependency in current.dependencies
+                       if dependency not in memo)
+    return memo[target]
+
+  def _invalidate_queries_for_target(self, target):
+    # Queries that don't include the target don't read its classpath, so they stay memoized.
+    for query in self._queries_by_target.pop(target, ()):
+      self._mappings_by_query.pop(query, None)
+
   def _add_excludes_for_target(self, target):
+    # Excludes apply across the closures of the queried targets, so forget every query.
+    self._mappings_by_query.clear()
+    self._queries_by_target.clear()
+    self._closure_excludes_by_target.clear()
     if target.is_exported:
       self._excludes.add_for_target(target, [Exclude(target.provides.org,
                                                      target.provides.name)])
@@ -325,6 +385,7 @@ class ClasspathProducts(object):
   def _add_elements_for_target(self, target, elements):
     self._validate_classpath_tuples(elements, target)
     self._classpaths.add_for_target(target, elements)
+    self._invalidate_queries_for_target(target)
 
   def _validate_classpath_tuples(self, classpath, target):
     """Validates that all files are located within the working directory, to simplify relativization.
@@ -123,28 +123,32 @@ class ClasspathUtil(object):
       yield entry
 
   @classmethod
-  def classpath_contents(cls, targets, classpath_products, confs=('default',)):
+  def classpath_contents(cls, targets, classpath_products, confs=('default',), jar_entry_index=None):
     """Provide a generator over the contents (classes/resources) of a classpath.
 
     :param targets: Targets to iterate the contents classpath for.
     :param ClasspathProducts classpath_products: Product containing classpath elements.
     :param confs: The list of confs for use by this classpath.
+    :param jar_entry_index: An optional index to list jars with.
+    :type jar_entry_index: :class:`pants.backend.jvm.subsystems.jar_entry_index.JarEntryIndex`
     :returns: An iterator over all classpath contents, one directory, class or resource relative
               path per iteration step.
     :rtype: :class:`collections.Iterator` of string
     """
     classpath_iter = cls._classpath_iter(targets, classpath_products, confs=confs)
-    for f in cls.classpath_entries_contents(classpath_iter):
+    for f in cls.classpath_entries_contents(classpath_iter, jar_entry_index=jar_entry_index):
       yield f
 
   @classmethod
-  def classpath_entries_contents(cls, classpath_entries):
+  def classpath_entries_contents(cls, classpath_entries, jar_entry_index=None):
     """Provide a generator over the contents (classes/resources) of a classpath.
 
     Subdirectories are included and differentiated via a trailing forward slash (for symmetry
     across ZipFile.namelist and directory walks).
 
     :param classpath_entries: A sequence of classpath_entries. Non-jars/dirs are ignored.
+    :param jar_entry_index: An optional index to list jars with, rather than opening each jar.
+    :type jar_entry_index: :class:`pants.backend.jvm.subsystems.jar_entry_index.JarEntryIndex`
     :returns: An iterator over all classpath contents, one directory, class or resource relative
               path per iteration step.
     :rtype: :class:`collections.Iterator` of string
@@ -152,9 +156,13 @@ class ClasspathUtil(object):
     for entry in classpath_entries:
       if cls.is_jar(entry):
         # Walk the jar namelist.
-        with open_zip(entry, mode='r') as jar:
-          for name in jar.namelist():
+        if jar_entry_index is not None:
+          for name in jar_entry_index.entry_names(entry):
             yield name
+        else:
+          with open_zip(entry, mode='r') as jar:
+            for name in jar.namelist():
+              yield name
       elif os.path.isdir(entry):
         # Walk the directory, including subdirs.
         def rel_walk_name(abs_sub_dir, name):
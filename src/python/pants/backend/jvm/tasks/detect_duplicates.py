@@ -11,12 +11,12 @@ from collections import defaultdict
 
 from pex.compatibility import to_bytes
 
+from pants.backend.jvm.subsystems.jar_entry_index import JarEntryIndex
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.jvm_binary_task import JvmBinaryTask
 from pants.base.exceptions import TaskError
 from pants.java.jar.manifest import Manifest
 from pants.option.custom_types import list_option
-from pants.util.contextutil import open_zip
 from pants.util.memo import memoized_property
 
 
@@ -48,6 +48,10 @@ class DuplicateDetector(JvmBinaryTask):
     register('--skip', action='store_true', default=False,
              help='Disable the dup checking step.')
 
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(DuplicateDetector, cls).subsystem_dependencies() + (JarEntryIndex,)
+
   @classmethod
   def prepare(cls, options, round_manager):
     super(DuplicateDetector, cls).prepare(options, round_manager)
@@ -109,12 +113,13 @@ class DuplicateDetector(JvmBinaryTask):
   def _get_internal_dependencies(self, binary_target):
     artifacts_by_file_name = defaultdict(set)
     classpath_products = self.context.products.get_data('runtime_classpath')
+    jar_entry_index = JarEntryIndex.global_instance()
 
     # Select classfiles from the classpath - we want all the direct products of internal targets,
     # no external JarLibrary products.
     def record_file_ownership(target):
       entries = ClasspathUtil.internal_classpath([target], classpath_products)
-      for f in ClasspathUtil.classpath_entries_contents(entries):
+      for f in ClasspathUtil.classpath_entries_contents(entries, jar_entry_index=jar_entry_index):
         artifacts_by_file_name[f].add(target.address.reference())
 
     binary_target.walk(record_file_ownership)
@@ -122,16 +127,16 @@ class DuplicateDetector(JvmBinaryTask):
 
   def _get_external_dependencies(self, binary_target):
     artifacts_by_file_name = defaultdict(set)
+    jar_entry_index = JarEntryIndex.global_instance()
     for external_dep, coordinate in self.list_external_jar_dependencies(binary_target):
       self.context.log.debug('  scanning {} from {}'.format(coordinate, external_dep))
-      with open_zip(external_dep) as dep_zip:
-        for qualified_file_name in dep_zip.namelist():
-          # Zip entry names can come in any encoding and in practice we find some jars that have
-          # utf-8 encoded entry names, some not.  As a result we cannot simply decode in all cases
-          # and need to do this to_bytes(...).decode('utf-8') dance to stay safe across all entry
-          # name flavors and under all supported pythons.
-          decoded_file_name = to_bytes(qualified_file_name).decode('utf-8')
-          artifacts_by_file_name[decoded_file_name].add(coordinate.artifact_filename)
+      for qualified_file_name in jar_entry_index.entry_names(external_dep):
+        # Zip entry names can come in any encoding and in practice we find some jars that have
+        # utf-8 encoded entry names, some not.  As a result we cannot simply decode in all cases
+        # and need to do this to_bytes(...).decode('utf-8') dance to stay safe across all entry
+        # name flavors and under all supported pythons.
+        decoded_file_name = to_bytes(qualified_file_name).decode('utf-8')
+        artifacts_by_file_name[decoded_file_name].add(coordinate.artifact_filename)
     return artifacts_by_file_name
 
   def _is_excluded(self, path):
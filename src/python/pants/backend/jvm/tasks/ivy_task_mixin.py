@@ -13,6 +13,7 @@ from hashlib import sha1
 
 from pants.backend.jvm.ivy_utils import IvyUtils
 from pants.backend.jvm.jar_dependency_utils import ResolvedJar
+from pants.backend.jvm.subsystems.ivy_resolution_cache import IvyResolution, IvyResolutionCache
 from pants.backend.jvm.subsystems.jar_dependency_management import JarDependencyManagement
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.targets.jvm_target import JvmTarget
@@ -22,6 +23,7 @@ from pants.invalidation.cache_manager import VersionedTargetSet
 from pants.ivy.bootstrapper import Bootstrapper
 from pants.ivy.ivy_subsystem import IvySubsystem
 from pants.task.task import TaskBase
+from pants.util.dirutil import safe_open
 from pants.util.memo import memoized_property
 
 
@@ -86,7 +88,9 @@ class IvyTaskMixin(TaskBase):
 
   @classmethod
   def global_subsystems(cls):
-    return super(IvyTaskMixin, cls).global_subsystems() + (IvySubsystem, JarDependencyManagement)
+    return super(IvyTaskMixin, cls).global_subsystems() + (IvySubsystem,
+                                                           IvyResolutionCache,
+                                                           JarDependencyManagement)
 
   @classmethod
   def register_options(cls, register):
@@ -210,9 +214,19 @@ class IvyTaskMixin(TaskBase):
 
     return resolve_hash_name
 
+  @memoized_property
+  def _ivy_infos(self):
+    # A map from (resolve_hash_name, conf) to the IvyInfo parsed from that resolve's report.
+    return {}
+
   # Extracted for testing.
   def _parse_report(self, resolve_hash_name, conf):
-    return IvyUtils.parse_xml_report(self.ivy_cache_dir, resolve_hash_name, conf)
+    key = (resolve_hash_name, conf)
+    ivy_info = self._ivy_infos.get(key)
+    if ivy_info is None:
+      ivy_info = IvyUtils.parse_xml_report(self.ivy_cache_dir, resolve_hash_name, conf)
+      self._ivy_infos[key] = ivy_info
+    return ivy_info
 
   # TODO(Eric Ayers): Change this method to relocate the resolution reports to under workdir
   # and return that path instead of having everyone know that these reports live under the
@@ -281,27 +295,42 @@ class IvyTaskMixin(TaskBase):
           any_report_missing or
           not os.path.exists(raw_target_classpath_file)):
 
-        ivy = Bootstrapper.default_ivy(bootstrap_workunit_factory=self.context.new_workunit)
-        raw_target_classpath_file_tmp = raw_target_classpath_file + '.tmp'
-        args = ['-cachepath', raw_target_classpath_file_tmp] + extra_args
-
-        self._exec_ivy(
-            target_workdir=target_workdir,
-            targets=global_vts.targets,
-            args=args,
-            executor=executor,
-            ivy=ivy,
-            workunit_name=workunit_name,
-            confs=confs,
-            use_soft_excludes=self.get_options().soft_excludes,
-            resolve_hash_name=resolve_hash_name,
-            pinned_artifacts=pinned_artifacts)
-
-        if not os.path.exists(raw_target_classpath_file_tmp):
-          raise self.Error('Ivy failed to create classpath file at {}'
-                           .format(raw_target_classpath_file_tmp))
-        shutil.move(raw_target_classpath_file_tmp, raw_target_classpath_file)
-        logger.debug('Moved ivy classfile file to {dest}'.format(dest=raw_target_classpath_file))
+        jars, global_excludes = self._calculate_classpath(global_vts.targets)
+        resolution_cache = IvyResolutionCache.global_instance()
+        resolution_key = resolution_cache.resolution_key(jars, global_excludes, pinned_artifacts,
+                                                         confs, extra_args)
+        resolution = (resolution_cache.load(resolution_key, resolve_hash_name)
+                      if resolution_key else None)
+        if resolution:
+          logger.debug('Restoring cached ivy resolution {}'.format(resolution_key))
+          self._restore_resolution(resolution, resolve_hash_name, raw_target_classpath_file)
+        else:
+          ivy = Bootstrapper.default_ivy(bootstrap_workunit_factory=self.context.new_workunit)
+          raw_target_classpath_file_tmp = raw_target_classpath_file + '.tmp'
+          args = ['-cachepath', raw_target_classpath_file_tmp] + extra_args
+
+          self._exec_ivy(
+              target_workdir=target_workdir,
+              targets=global_vts.targets,
+              jars=jars,
+              global_excludes=global_excludes,
+              args=args,
+              executor=executor,
+              ivy=ivy,
+              workunit_name=workunit_name,
+              confs=confs,
+              resolve_hash_name=resolve_hash_name,
+              pinned_artifacts=pinned_artifacts)
+
+          if not os.path.exists(raw_target_classpath_file_tmp):
+            raise self.Error('Ivy failed to create classpath file at {}'
+                             .format(raw_target_classpath_file_tmp))
+          shutil.move(raw_target_classpath_file_tmp, raw_target_classpath_file)
+          logger.debug('Moved ivy classfile file to {dest}'.format(dest=raw_target_classpath_file))
+
+          if resolution_key:
+            self._store_resolution(resolution_cache, resolution_key, resolve_hash_name, confs,
+                                   raw_target_classpath_file)
       else:
         logger.debug("Using previously resolved reports: {}".format(existing_report_paths))
 
@@ -334,26 +363,54 @@ class IvyTaskMixin(TaskBase):
         report_paths.append(report_path)
     return report_missing, report_paths
 
+  def _restore_resolution(self, resolution, resolve_hash_name, raw_target_classpath_file):
+    for conf, report in resolution.reports.items():
+      with safe_open(IvyUtils.xml_report_path(self.ivy_cache_dir, resolve_hash_name, conf),
+                     'wb') as fp:
+        fp.write(report.encode('utf-8'))
+    for conf, ivy_info in resolution.ivy_infos.items():
+      self._ivy_infos[(resolve_hash_name, conf)] = ivy_info
+    with safe_open(raw_target_classpath_file, 'w') as fp:
+      fp.write(os.pathsep.join(resolution.classpath))
+
+  def _store_resolution(self, resolution_cache, resolution_key, resolve_hash_name, confs,
+                        raw_target_classpath_file):
+    any_report_missing, report_paths = self._collect_existing_reports(confs, resolve_hash_name)
+    if any_report_missing:
+      return
+    reports = {}
+    ivy_infos = {}
+    for conf, report_path in zip(confs, report_paths):
+      with open(report_path, 'rb') as fp:
+        reports[conf] = fp.read().decode('utf-8')
+      ivy_infos[conf] = self._parse_report(resolve_hash_name, conf)
+    classpath = IvyUtils.load_classpath_from_cachepath(raw_target_classpath_file)
+    resolution_cache.store(resolution_key, resolve_hash_name,
+                           IvyResolution(classpath=classpath, reports=reports, ivy_infos=ivy_infos))
+
+  def _calculate_classpath(self, targets):
+    # TODO(John Sirois): merge the code below into IvyUtils or up here; either way, better
+    # diagnostics can be had in `IvyUtils.generate_ivy` if this is done.
+    # See: https://github.com/pantsbuild/pants/issues/2239
+    jars, global_excludes = IvyUtils.calculate_classpath(targets)
+
+    # Don't pass global excludes to ivy when using soft excludes.
+    if self.get_options().soft_excludes:
+      global_excludes = []
+    return jars, global_excludes
+
   def _exec_ivy(self,
                target_workdir,
                targets,
+               jars,
+               global_excludes,
                args,
                confs,
                executor=None,
                ivy=None,
                workunit_name='ivy',
-               use_soft_excludes=False,
                resolve_hash_name=None,
                pinned_artifacts=None):
-    # TODO(John Sirois): merge the code below into IvyUtils or up here; either way, better
-    # diagnostics can be had in `IvyUtils.generate_ivy` if this is done.
-    # See: https://github.com/pantsbuild/pants/issues/2239
-    jars, global_excludes = IvyUtils.calculate_classpath(targets)
-
-    # Don't pass global excludes to ivy when using soft excludes.
-    if use_soft_excludes:
-      global_excludes = []
-
     with IvyUtils.ivy_lock:
       ivyxml = os.path.join(target_workdir, 'ivy.xml')
       try:
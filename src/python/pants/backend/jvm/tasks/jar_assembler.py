@@ -0,0 +1,286 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import multiprocessing
+import os
+import struct
+import time
+import uuid
+import zipfile
+import zlib
+from collections import OrderedDict, namedtuple
+from multiprocessing.pool import ThreadPool
+
+from pants.backend.jvm.targets.jvm_binary import Duplicate, Skip
+from pants.fs.archive import write_compressed_entry
+from pants.java.jar.manifest import Manifest
+from pants.util.dirutil import safe_delete
+
+
+# The sources an entry of an assembled jar can come from.
+_FileSource = namedtuple('_FileSource', ['path'])
+_JarEntrySource = namedtuple('_JarEntrySource', ['jar', 'info'])
+
+# An entry ready to be written: the fields of its `ZipInfo` and its (possibly compressed) data.
+_PreparedEntry = namedtuple('_PreparedEntry', ['name', 'date_time', 'external_attr',
+                                               'compress_type', 'crc', 'file_size', 'data'])
+
+
+class JarAssembler(object):
+  """Assembles a jar in-process from files, in-memory contents and the entries of other jars.
+
+  Entries of input jars are copied byte for byte in their already compressed form instead of
+  being inflated and deflated again, which dominates the time it takes jar-tool to build large
+  monolithic jars.  Duplicate entries are handled according to the same `JarRules` jar-tool
+  applies, and input jars are read (and files compressed) on a pool of threads while the output
+  jar is written sequentially.
+
+  Entries whose duplicates must be combined (`Duplicate.CONCAT` and `Duplicate.CONCAT_TEXT`) are
+  the only jar entries that are inflated and recompressed.
+  """
+
+  class Contents(namedtuple('Contents', ['contents'])):
+    """The in-memory bytes of a file to add to a jar."""
+
+  # Entries are handed to the pool in chunks of at most this many, to amortize dispatch.
+  _CHUNK_SIZE = 256
+
+  _LOCAL_FILE_HEADER = struct.Struct(b'<4s2B4HL2L2H')
+
+  _DIR_ATTRS = (0o40755 << 16) | 0x10
+  _FILE_ATTRS = 0o100644 << 16
+
+  def __init__(self, path, jar_rules, compressed=True, workers=None):
+    """
+    :param string path: The path to write the assembled jar to; any existing file is replaced.
+    :param jar_rules: The rules for skipping entries and handling duplicate entries.
+    :type jar_rules: :class:`pants.backend.jvm.targets.jvm_binary.JarRules`
+    :param bool compressed: `True` to compress the entries of the jar.
+    :param int workers: The number of threads to read input jars and compress entries with;
+                        defaults to the number of cpus.
+    """
+    self._path = path
+    self._compressed = compressed
+    self._compress_type = zipfile.ZIP_DEFLATED if compressed else zipfile.ZIP_STORED
+    self._workers = workers or multiprocessing.cpu_count()
+
+    self._skip_patterns = []
+    self._duplicate_rules = []
+    for rule in jar_rules.rules:
+      if isinstance(rule, Skip):
+        self._skip_patterns.append(rule.apply_pattern)
+      elif isinstance(rule, Duplicate):
+        self._duplicate_rules.append(rule)
+      else:
+        raise ValueError('Unrecognized rule: {}'.format(rule))
+    self._default_dup_action = jar_rules.default_dup_action
+
+  def assemble(self, manifest, files, jars):
+    """Writes the jar.
+
+    :param manifest: The contents of the jar's manifest.
+    :type manifest: :class:`pants.java.jar.manifest.Manifest`
+    :param files: (source, entry name) pairs of files to add to the jar, in order.  A source is
+                  either a path or a :class:`JarAssembler.Contents`.  If a path is a directory,
+                  each of its descendant files is added under the given entry name, if any.
+    :param jars: The paths of jars whose entries, save for their manifests, should be added to the
+                 jar, in order.
+    :raises: :class:`pants.backend.jvm.targets.jvm_binary.Duplicate.Error` if a duplicate entry
+             is encountered that the jar rules say should fail the build.
+    """
+    pool = ThreadPool(processes=self._workers)
+    try:
+      sources_by_name = self._collect_sources(manifest, files, pool.map(self._read_infolist, jars))
+      # Resolve duplicates before anything is written, so a failing rule leaves no partial jar.
+      chunks = list(self._chunks(sources_by_name))
+
+      # The jar is written to a temporary file that replaces any existing jar only on success.
+      tmp_path = '{}.tmp.{}'.format(self._path, uuid.uuid4().hex)
+      try:
+        with zipfile.ZipFile(tmp_path, 'w', self._compress_type, allowZip64=True) as zf:
+          window = 2 * self._workers
+          for i in range(0, len(chunks), window):
+            for prepared_entries in pool.map(self._prepare_chunk, chunks[i:i + window]):
+              for prepared_entry in prepared_entries:
+                self._write_prepared(zf, prepared_entry)
+        os.rename(tmp_path, self._path)
+      finally:
+        safe_delete(tmp_path)
+    finally:
+      pool.close()
+      pool.join()
+
+  @staticmethod
+  def _read_infolist(jar):
+    with zipfile.ZipFile(jar, 'r') as zf:
+      return jar, zf.infolist()
+
+  def _skipped(self, name):
+    return any(pattern.search(name) for pattern in self._skip_patterns)
+
+  def _dup_action(self, name):
+    for rule in self._duplicate_rules:
+      if rule.apply_pattern.search(name):
+        return rule.action
+    return self._default_dup_action
+
+  def _collect_sources(self, manifest, files, infolists):
+    """Returns an ordered map from entry name to the sources of the entry, in input order."""
+    sources_by_name = OrderedDict()
+
+    def add(name, source):
+      if not self._skipped(name):
+        sources_by_name.setdefault(name, []).append(source)
+
+    def add_file(source, name):
+      # Make sure the dirs leading to the file have entries, as jar-tool does.
+      parent = os.path.dirname(name)
+      parents = []
+      while parent and '{}/'.format(parent) not in sources_by_name:
+        parents.append('{}/'.format(parent))
+        parent = os.path.dirname(parent)
+      for parent_dir in reversed(parents):
+        add(parent_dir, None)
+      add(name, source)
+
+    sources_by_name['META-INF/'] = [None]
+    sources_by_name[Manifest.PATH] = [self.Contents(manifest.contents())]
+    for src, dest in files:
+      if isinstance(src, self.Contents):
+        add_file(src, dest)
+      elif os.path.isdir(src):
+        for root, dirnames, filenames in os.walk(src):
+          dirnames.sort()
+          for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, src)
+            add_file(_FileSource(path), os.path.join(dest, name) if dest else name)
+      else:
+        add_file(_FileSource(src), dest)
+
+    for jar, infolist in infolists:
+      for info in infolist:
+        name = info.filename
+        if name == Manifest.PATH:
+          continue
+        add(name, None if name.endswith('/') else _JarEntrySource(jar, info))
+    return sources_by_name
+
+  def _chunks(self, sources_by_name):
+    """Yields lists of (name, source) to prepare, grouping entries copied from the same jar."""
+    chunk = []
+    chunk_jar = None
+    for name, sources in sources_by_name.items():
+      source = self._resolve_duplicates(name, sources)
+      jar = source.jar if isinstance(source, _JarEntrySource) else None
+      if chunk and (jar != chunk_jar or len(chunk) >= self._CHUNK_SIZE):
+        yield chunk
+        chunk = []
+      chunk.append((name, source))
+      chunk_jar = jar
+    if chunk:
+      yield chunk
+
+  def _resolve_duplicates(self, name, sources):
+    if len(sources) == 1 or name.endswith('/'):
+      return sources[0]
+    action = self._dup_action(name)
+    if action == Duplicate.SKIP:
+      return sources[0]
+    elif action == Duplicate.REPLACE:
+      return sources[-1]
+    elif action == Duplicate.FAIL:
+      raise Duplicate.Error(name)
+    else:
+      contents = [self._read_source(source) for source in sources]
+      if action == Duplicate.CONCAT_TEXT:
+        contents = [content if content.endswith(b'\n') else content + b'\n'
+                    for content in contents[:-1]] + contents[-1:]
+      return self.Contents(b''.join(contents))
+
+  @staticmethod
+  def _read_source(source):
+    if isinstance(source, JarAssembler.Contents):
+      return source.contents
+    elif isinstance(source, _FileSource):
+      with open(source.path, 'rb') as fp:
+        return fp.read()
+    else:
+      with zipfile.ZipFile(source.jar, 'r') as zf:
+        return zf.read(source.info)
+
+  def _prepare_chunk(self, chunk):
+    jar = None
+    try:
+      prepared_entries = []
+      for name, source in chunk:
+        if isinstance(source, _JarEntrySource):
+          if jar is None:
+            jar = open(source.jar, 'rb')
+          prepared_entries.append(self._prepare_jar_entry(name, source, jar))
+        else:
+          prepared_entries.append(self._prepare_entry(name, source))
+      return prepared_entries
+    finally:
+      if jar is not None:
+        jar.close()
+
+  def _prepare_jar_entry(self, name, source, jar):
+    info = source.info
+    if not self._compressed and info.compress_type != zipfile.ZIP_STORED:
+      return self._prepare_entry(name, source)
+
+    jar.seek(info.header_offset)
+    header = self._LOCAL_FILE_HEADER.unpack(jar.read(self._LOCAL_FILE_HEADER.size))
+    name_length, extra_length = header[-2:]
+    jar.seek(name_length + extra_length, os.SEEK_CUR)
+    return _PreparedEntry(name=name,
+                          date_time=info.date_time,
+                          external_attr=info.external_attr,
+                          compress_type=info.compress_type,
+                          crc=info.CRC,
+                          file_size=info.file_size,
+                          data=jar.read(info.compress_size))
+
+  def _prepare_entry(self, name, source):
+    if source is None:
+      return _PreparedEntry(name=name,
+                            date_time=time.localtime()[:6],
+                            external_attr=self._DIR_ATTRS,
+                            compress_type=zipfile.ZIP_STORED,
+                            crc=0,
+                            file_size=0,
+                            data=b'')
+
+    if isinstance(source, _FileSource):
+      date_time = time.localtime(os.path.getmtime(source.path))[:6]
+    elif isinstance(source, _JarEntrySource):
+      date_time = source.info.date_time
+    else:
+      date_time = time.localtime()[:6]
+    contents = self._read_source(source)
+    data = contents
+    if self._compressed:
+      compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+      data = compressor.compress(contents) + compressor.flush()
+    return _PreparedEntry(name=name,
+                          date_time=date_time,
+                          external_attr=self._FILE_ATTRS,
+                          compress_type=self._compress_type,
+                          crc=zlib.crc32(contents) & 0xffffffff,
+                          file_size=len(contents),
+                          data=data)
+
+  @staticmethod
+  def _write_prepared(zf, prepared_entry):
+    """Writes an entry whose data is already in its final, possibly compressed, form."""
+    info = zipfile.ZipInfo(prepared_entry.name, prepared_entry.date_time)
+    info.external_attr = prepared_entry.external_attr
+    info.compress_type = prepared_entry.compress_type
+    info.CRC = prepared_entry.crc
+    info.file_size = prepared_entry.file_size
+    write_compressed_entry(zf, info, prepared_entry.data)
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import tempfile
+import zipfile
 from abc import abstractmethod
 from contextlib import contextmanager
 
@@ -18,6 +19,7 @@ from pants.backend.jvm.subsystems.jar_tool import JarTool
 from pants.backend.jvm.targets.java_agent import JavaAgent
 from pants.backend.jvm.targets.jvm_binary import Duplicate, JarRules, JvmBinary, Skip
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.backend.jvm.tasks.jar_assembler import JarAssembler
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.exceptions import TaskError
 from pants.binaries.binary_util import safe_args
@@ -173,6 +175,41 @@ class Jar(object):
 
     self._jars.append(jar)
 
+  def _is_empty(self):
+    return not (self._entries or self._jars or self._manifest_entry or self._main or
+                self._classpath)
+
+  def _assemble(self, jar_rules, compressed):
+    """Writes the jar in-process, copying the entries of grafted jars without recompressing them.
+
+    :param jar_rules: The rules for handling jar exclusions and duplicates.
+    :param bool compressed: entries added to the jar should be compressed
+    """
+    with temporary_dir() as manifest_stage_dir:
+      if self._manifest_entry:
+        with open(self._manifest_entry.materialize(manifest_stage_dir), 'rb') as fp:
+          manifest = Manifest(fp.read().replace(b'\r\n', b'\n').decode('ascii'))
+      else:
+        manifest = Manifest()
+        manifest.addentry(Manifest.MANIFEST_VERSION, '1.0')
+        manifest.addentry(Manifest.CREATED_BY, 'pants')
+      if self._main:
+        manifest.addentry(Manifest.MAIN_CLASS, self._main)
+      if self.classpath:
+        classpath = relativize_classpath(self.classpath,
+                                         os.path.dirname(self._path),
+                                         followlinks=False)
+        manifest.addentry(Manifest.CLASS_PATH, ' '.join(classpath))
+
+      def as_file(entry):
+        if isinstance(entry, self.MemoryEntry):
+          return JarAssembler.Contents(entry._contents), entry.dest
+        return entry.materialize(manifest_stage_dir), entry.dest
+      files = [as_file(entry) for entry in self._entries]
+
+      JarAssembler(self._path, jar_rules, compressed=compressed).assemble(manifest, files,
+                                                                          self._jars)
+
   @contextmanager
   def _render_jar_tool_args(self, options):
     """Format the arguments to jar-tool.
@@ -243,6 +280,13 @@ class JarTask(NailgunTask):
   def global_subsystems(cls):
     return super(JarTask, cls).global_subsystems() + (JarTool,)
 
+  @classmethod
+  def register_options(cls, register):
+    super(JarTask, cls).register_options(register)
+    register('--raw-copy-jars', advanced=True, action='store_true', default=False,
+             help='Write new jars in-process, copying the already compressed entries of the jars '
+                  'they include byte for byte rather than re-compressing them with jar-tool.')
+
   @classmethod
   def prepare(cls, options, round_manager):
     super(JarTask, cls).prepare(options, round_manager)
@@ -291,6 +335,15 @@ class JarTask(NailgunTask):
     except jar.Error as e:
       raise TaskError('Failed to write to jar at {}: {}'.format(path, e))
 
+    # Updating an existing jar is left to jar-tool.
+    if overwrite and self.get_options().raw_copy_jars:
+      if not jar._is_empty():  # Don't build an empty jar
+        try:
+          jar._assemble(jar_rules or JarRules.default(), compressed)
+        except (Duplicate.Error, IOError, OSError, zipfile.BadZipfile) as e:
+          raise TaskError('Failed to write jar at {}: {}'.format(path, e))
+      return
+
     with jar._render_jar_tool_args(self.get_options()) as args:
       if args:  # Don't build an empty jar
         args.append('-update={}'.format(self._flag(not overwrite)))
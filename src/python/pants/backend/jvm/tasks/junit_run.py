@@ -13,6 +13,7 @@ from collections import defaultdict
 from six.moves import range
 from twitter.common.collections import OrderedSet
 
+from pants.backend.jvm.subsystems.jar_entry_index import JarEntryIndex
 from pants.backend.jvm.subsystems.shader import Shader
 from pants.backend.jvm.targets.jar_dependency import JarDependency
 from pants.backend.jvm.targets.java_tests import JavaTests as junit_tests
@@ -123,7 +124,7 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
 
   @classmethod
   def subsystem_dependencies(cls):
-    return super(JUnitRun, cls).subsystem_dependencies() + (DistributionLocator,)
+    return super(JUnitRun, cls).subsystem_dependencies() + (DistributionLocator, JarEntryIndex)
 
   @classmethod
   def request_classes_by_source(cls, test_specs):
@@ -431,8 +432,10 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     generates tuples (class_name, target).
     """
     classpath_products = self.context.products.get_data('runtime_classpath')
+    jar_entry_index = JarEntryIndex.global_instance()
     for target in targets:
-      contents = ClasspathUtil.classpath_contents((target,), classpath_products, confs=self.confs)
+      contents = ClasspathUtil.classpath_contents((target,), classpath_products, confs=self.confs,
+                                                  jar_entry_index=jar_entry_index)
       for f in contents:
         classname = ClasspathUtil.classname_for_rel_classfile(f)
         if classname:
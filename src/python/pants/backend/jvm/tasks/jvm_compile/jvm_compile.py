@@ -384,6 +384,10 @@ class JvmCompile(NailgunTaskBase):
           classpath_products.remove_for_target(cc.target, [(conf, cc.classes_dir)])
           classpath_products.add_for_target(cc.target, [(conf, cc.jar_file)])
 
+    self.context.log.debug('runtime_classpath queries: {} cached, {} computed.'
+                           .format(classpath_product.query_cache_hits,
+                                   classpath_product.query_cache_misses))
+
   def compile_chunk(self,
                     invalidation_check,
                     compile_contexts,
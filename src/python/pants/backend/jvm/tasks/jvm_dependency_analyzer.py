@@ -11,6 +11,7 @@ from collections import defaultdict
 
 from twitter.common.collections import OrderedSet
 
+from pants.backend.jvm.subsystems.jar_entry_index import JarEntryIndex
 from pants.backend.jvm.targets.jvm_target import JvmTarget
 from pants.backend.jvm.targets.scala_library import ScalaLibrary
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
@@ -18,7 +19,6 @@ from pants.base.build_environment import get_buildroot
 from pants.build_graph.build_graph import sort_targets
 from pants.java.distribution.distribution import DistributionLocator
 from pants.task.task import Task
-from pants.util.contextutil import open_zip
 from pants.util.memo import memoized_property
 
 
@@ -35,6 +35,10 @@ class JvmDependencyAnalyzer(Task):
     """Return true if the task should be entirely skipped, and thus have no product requirements."""
     pass
 
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(JvmDependencyAnalyzer, cls).subsystem_dependencies() + (JarEntryIndex,)
+
   @classmethod
   def prepare(cls, options, round_manager):
     super(JvmDependencyAnalyzer, cls).prepare(options, round_manager)
@@ -70,9 +74,11 @@ class JvmDependencyAnalyzer(Task):
 
     # Compute classfile -> target and jar -> target.
     self.context.log.debug('Mapping classpath...')
+    jar_entry_index = JarEntryIndex.global_instance()
     for target in self.context.targets():
       # Classpath content.
-      files = ClasspathUtil.classpath_contents((target,), runtime_classpath)
+      files = ClasspathUtil.classpath_contents((target,), runtime_classpath,
+                                               jar_entry_index=jar_entry_index)
       # And jars; for binary deps, zinc doesn't emit precise deps (yet).
       cp_entries = ClasspathUtil.classpath((target,), runtime_classpath)
       jars = [cpe for cpe in cp_entries if ClasspathUtil.is_jar(cpe)]
@@ -84,10 +90,9 @@ class JvmDependencyAnalyzer(Task):
 
   def _jar_classfiles(self, jar_file):
     """Returns an iterator over the classfiles inside jar_file."""
-    with open_zip(jar_file, 'r') as jar:
-      for cls in jar.namelist():
-        if cls.endswith(b'.class'):
-          yield cls
+    for cls in JarEntryIndex.global_instance().entry_names(jar_file):
+      if cls.endswith(b'.class'):
+        yield cls
 
   @memoized_property
   def bootstrap_jar_classfiles(self):
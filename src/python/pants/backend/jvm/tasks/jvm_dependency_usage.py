@@ -10,6 +10,7 @@ import os
 import sys
 from collections import defaultdict, namedtuple
 
+from pants.backend.jvm.subsystems.jar_entry_index import JarEntryIndex
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.jvm_dependency_analyzer import JvmDependencyAnalyzer
@@ -127,7 +128,8 @@ class JvmDependencyUsage(JvmDependencyAnalyzer):
       return set(p for _, paths in classes_by_source[rel_src].rel_paths() for p in paths)
 
   def _count_products(self, classpath_products, target):
-    contents = ClasspathUtil.classpath_contents((target,), classpath_products)
+    contents = ClasspathUtil.classpath_contents((target,), classpath_products,
+                                                jar_entry_index=JarEntryIndex.global_instance())
     # Generators don't implement len.
     return sum(1 for _ in contents)
 
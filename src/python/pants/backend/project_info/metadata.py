@@ -0,0 +1,26 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+# What this backend's register module registers, so that it need only be imported once it is
+# needed when backends are loaded lazily.  See `pants.bin.extension_loader.BackendMetadata`.
+
+tasks = [
+  'dependencies', 'depmap', 'eclipse', 'ensime', 'export', 'filedeps', 'idea',
+]
+
+aliases = []
+
+subsystems = [
+  'binaries', 'ivy', 'ivy-resolution-cache', 'jar-dependency-management', 'jvm-distributions',
+  'jvm-platform', 'python-repos', 'python-setup', 'thrift-binary',
+]
+
+# The backends whose tasks produce products this backend's tasks require.
+dependencies = [
+  'pants.backend.codegen', 'pants.backend.jvm', 'pants.backend.python',
+]
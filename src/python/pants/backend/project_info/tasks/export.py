@@ -5,9 +5,12 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import itertools
 import json
 import os
+import types
 from collections import defaultdict
+from hashlib import sha1
 
 import six
 from pex.pex_info import PexInfo
@@ -27,15 +30,63 @@ from pants.backend.python.targets.python_target import PythonTarget
 from pants.backend.python.tasks.python_task import PythonTask
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.fingerprint_strategy import TaskIdentityFingerprintStrategy
+from pants.base.payload_field import stable_json_sha1
 from pants.build_graph.resources import Resources
 from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import SubprocessExecutor
 from pants.option.errors import OptionsError
 from pants.option.ranked_value import RankedValue
+from pants.source.payload_fields import SourcesField
 from pants.task.console_task import ConsoleTask
+from pants.util.dirutil import safe_mkdir, safe_open
 from pants.util.memo import memoized_property
 
 
+class ExportFingerprintStrategy(TaskIdentityFingerprintStrategy):
+  """Fingerprints everything the cached export fragment of a target is derived from.
+
+  Fragments only hold the paths of a target's sources, so unlike the payload fingerprint this does
+  not read the contents of sources.  Besides the rest of the target's payload and the task's
+  options, a fragment depends on the addresses of the target's dependencies and its source root.
+  """
+
+  def _build_hasher(self, target):
+    hasher = sha1()
+    field_keys = []
+    for key, field in target.payload.fields:
+      if isinstance(field, SourcesField):
+        hasher.update(key)
+        hasher.update(field.rel_path)
+        for source_path in field.source_paths:
+          hasher.update(source_path)
+        hasher.update(stable_json_sha1(field.filespec))
+      else:
+        field_keys.append(key)
+    if field_keys:
+      hasher.update(target.payload.fingerprint(field_keys=field_keys) or '')
+    hasher.update(self._task.fingerprint or '')
+    hasher.update(type(target).__module__)
+    hasher.update(type(target).__name__)
+    hasher.update(self._task._get_pants_target_alias(type(target)))
+    hasher.update(target.target_base)
+    for dep in target.dependencies:
+      hasher.update(dep.address.spec)
+    if isinstance(target, ScalaLibrary):
+      for dep in target.java_sources:
+        hasher.update(dep.address.spec)
+    if isinstance(target, JvmTarget):
+      hasher.update(target.platform.name)
+    return hasher
+
+  def __hash__(self):
+    return hash((type(self), self._task.fingerprint))
+
+  def __eq__(self, other):
+    return (isinstance(other, ExportFingerprintStrategy) and
+            super(ExportFingerprintStrategy, self).__eq__(other))
+
+
 # Changing the behavior of this task may affect the IntelliJ Pants plugin.
 # Please add tdesai to reviews for this file.
 class ExportTask(IvyTaskMixin, PythonTask):
@@ -103,8 +154,12 @@ class ExportTask(IvyTaskMixin, PythonTask):
              help='Causes libraries with sources to be output.')
     register('--libraries-javadocs', default=False, action='store_true',
              help='Causes libraries with javadocs to be output.')
-    register('--sources', default=False, action='store_true',
+    register('--sources', default=False, action='store_true', fingerprint=True,
              help='Causes sources to be output.')
+    register('--fragment-cache', advanced=True, default=True, action='store_true',
+             help='Cache the parts of the export of each target that only depend on the target in '
+                  'the workdir, so that only the targets that changed since the last export are '
+                  'recomputed.')
 
   @classmethod
   def prepare(cls, options, round_manager):
@@ -154,7 +209,18 @@ class ExportTask(IvyTaskMixin, PythonTask):
     :param classpath_products: Optional classpath_products. If not provided when the --libraries
       option is `True`, this task will perform its own jar resolution.
     """
-    targets_map = {}
+    graph_info = {}
+    for key, value in self.iter_graph_info(targets, classpath_products=classpath_products):
+      graph_info[key] = dict(value) if key == 'targets' else value
+    return graph_info
+
+  def iter_graph_info(self, targets, classpath_products=None):
+    """Lazily generates the (key, value) pairs of the dictionary `generate_targets_map` returns.
+
+    The value of the 'targets' key is itself an iterator of (target spec, target info) pairs, so
+    the information about each target can be consumed as it is generated; it must be consumed
+    before the following pairs are requested.
+    """
     resource_target_map = {}
     python_interpreter_targets_mapping = defaultdict(list)
 
@@ -165,7 +231,7 @@ class ExportTask(IvyTaskMixin, PythonTask):
     else:
       classpath_products = None
 
-    def process_target(current_target):
+    def process_target(current_target, fragment=None):
       """
       :type current_target:pants.build_graph.target.Target
       """
@@ -182,27 +248,8 @@ class ExportTask(IvyTaskMixin, PythonTask):
           else:
             return ExportTask.SourceRootTypes.SOURCE
 
-      info = {
-        'targets': [],
-        'libraries': [],
-        'roots': [],
-        'id': current_target.id,
-        'target_type': get_target_type(current_target),
-        # NB: is_code_gen should be removed when export format advances to 1.1.0 or higher
-        'is_code_gen': current_target.is_codegen,
-        'is_synthetic': current_target.is_synthetic,
-        'pants_target_type': self._get_pants_target_alias(type(current_target))
-      }
-
-      if not current_target.is_synthetic:
-        info['globs'] = current_target.globs_relative_to_buildroot()
-        if self.get_options().sources:
-          info['sources'] = list(current_target.sources_relative_to_buildroot())
-
-      if isinstance(current_target, PythonRequirementLibrary):
-        reqs = current_target.payload.get_field_value('requirements', set())
-        """:type : set[pants.backend.python.python_requirement.PythonRequirement]"""
-        info['requirements'] = [req.key for req in reqs]
+      info = fragment if fragment is not None else self._target_fragment(current_target)
+      info['target_type'] = get_target_type(current_target)
 
       if isinstance(current_target, PythonTarget):
         interpreter_for_target = self.select_interpreter_for_targets([current_target])
@@ -230,7 +277,6 @@ class ExportTask(IvyTaskMixin, PythonTask):
       if isinstance(current_target, JarLibrary):
         target_libraries = OrderedSet(iter_transitive_jars(current_target))
       for dep in current_target.dependencies:
-        info['targets'].append(dep.address.spec)
         if isinstance(dep, JarLibrary):
           for jar in dep.jar_dependencies:
             target_libraries.add(M2Coordinate(jar.org, jar.name, jar.rev))
@@ -241,24 +287,23 @@ class ExportTask(IvyTaskMixin, PythonTask):
 
       if isinstance(current_target, ScalaLibrary):
         for dep in current_target.java_sources:
-          info['targets'].append(dep.address.spec)
-          process_target(dep)
-
-      if isinstance(current_target, JvmTarget):
-        info['excludes'] = [self._exclude_id(exclude) for exclude in current_target.excludes]
-        info['platform'] = current_target.platform.name
-
-      info['roots'] = map(lambda (source_root, package_prefix): {
-        'source_root': source_root,
-        'package_prefix': package_prefix
-      }, self._source_roots_for_target(current_target))
+          for item in process_target(dep):
+            yield item
 
       if classpath_products:
         info['libraries'] = [self._jar_id(lib) for lib in target_libraries]
-      targets_map[current_target.address.spec] = info
+      yield current_target.address.spec, info
+
+    def iter_targets_map():
+      specs = set()
+      for target, fragment in self._iter_target_fragments(targets):
+        for spec, info in process_target(target, fragment):
+          if spec not in specs:
+            specs.add(spec)
+            yield spec, info
 
-    for target in targets:
-      process_target(target)
+    yield 'version', self.DEFAULT_EXPORT_VERSION
+    yield 'targets', iter_targets_map()
 
     jvm_platforms_map = {
       'default_platform' : JvmPlatform.global_instance().default_platform.name,
@@ -269,18 +314,14 @@ class ExportTask(IvyTaskMixin, PythonTask):
           'args' : platform.args,
         } for platform_name, platform in JvmPlatform.global_instance().platforms_by_name.items() }
     }
+    yield 'jvm_platforms', jvm_platforms_map
 
-    graph_info = {
-      'version': self.DEFAULT_EXPORT_VERSION,
-      'targets': targets_map,
-      'jvm_platforms': jvm_platforms_map,
-    }
     jvm_distributions = DistributionLocator.global_instance().all_jdk_paths()
     if jvm_distributions:
-      graph_info['jvm_distributions'] = jvm_distributions
+      yield 'jvm_distributions', jvm_distributions
 
     if classpath_products:
-      graph_info['libraries'] = self._resolve_jars_info(targets, classpath_products)
+      yield 'libraries', self._resolve_jars_info(targets, classpath_products)
 
     if python_interpreter_targets_mapping:
       interpreters = self.interpreter_cache.select_interpreter(
@@ -299,12 +340,82 @@ class ExportTask(IvyTaskMixin, PythonTask):
           'chroot': chroot.path()
         }
 
-      graph_info['python_setup'] = {
+      yield 'python_setup', {
         'default_interpreter': str(default_interpreter.identity),
         'interpreters': interpreters_info
       }
 
-    return graph_info
+  def _target_fragment(self, target):
+    """Returns the information about a target that depends on nothing but the target itself.
+
+    Fragments are what the fragment cache holds, so the information that also depends on other
+    targets, the jar resolve or the python environment is filled in by `process_target` instead.
+    """
+    info = {
+      'targets': [dep.address.spec for dep in target.dependencies],
+      'libraries': [],
+      'roots': [],
+      'id': target.id,
+      # NB: is_code_gen should be removed when export format advances to 1.1.0 or higher
+      'is_code_gen': target.is_codegen,
+      'is_synthetic': target.is_synthetic,
+      'pants_target_type': self._get_pants_target_alias(type(target))
+    }
+
+    if not target.is_synthetic:
+      info['globs'] = target.globs_relative_to_buildroot()
+      if self.get_options().sources:
+        info['sources'] = list(target.sources_relative_to_buildroot())
+
+    if isinstance(target, PythonRequirementLibrary):
+      reqs = target.payload.get_field_value('requirements', set())
+      """:type : set[pants.backend.python.python_requirement.PythonRequirement]"""
+      info['requirements'] = [req.key for req in reqs]
+
+    if isinstance(target, ScalaLibrary):
+      info['targets'].extend(dep.address.spec for dep in target.java_sources)
+
+    if isinstance(target, JvmTarget):
+      info['excludes'] = [self._exclude_id(exclude) for exclude in target.excludes]
+      info['platform'] = target.platform.name
+
+    info['roots'] = map(lambda (source_root, package_prefix): {
+      'source_root': source_root,
+      'package_prefix': package_prefix
+    }, self._source_roots_for_target(target))
+    return info
+
+  def _iter_target_fragments(self, targets):
+    """Yields each target with its fragment, reading unchanged targets' fragments from the cache.
+
+    Fragments are cached in the workdir under the target's cache key, so a target's fragment is
+    only recomputed when the target, its dependencies' addresses or the task options change.
+    """
+    if not self.get_options().fragment_cache:
+      for target in targets:
+        yield target, None
+      return
+
+    with self.invalidated(targets,
+                          fingerprint_strategy=ExportFingerprintStrategy(self),
+                          silent=True,
+                          use_cache=False) as invalidation_check:
+      vts_by_target = {vt.target: vt for vt in invalidation_check.all_vts}
+      # NB: Targets are processed in their given order, which the types of resources depend on.
+      for target in targets:
+        vt = vts_by_target[target]
+        fragment_dir = os.path.join(self.workdir, 'fragments', vt.target.id)
+        fragment_file = os.path.join(fragment_dir, '{}.json'.format(vt.cache_key.hash))
+        fragment = None
+        if vt.valid and os.path.isfile(fragment_file):
+          with open(fragment_file, 'rb') as fp:
+            fragment = json.load(fp)
+        if fragment is None:
+          fragment = self._target_fragment(vt.target)
+          safe_mkdir(fragment_dir, clean=True)
+          with safe_open(fragment_file, 'wb') as fp:
+            json.dump(fragment, fp)
+        yield vt.target, fragment
 
   def _resolve_jars_info(self, targets, classpath_products):
     """Consults ivy_jar_products to export the external libraries.
@@ -367,8 +478,51 @@ class Export(ExportTask, ConsoleTask):
     super(ExportTask, self).__init__(*args, **kwargs)
 
   def console_output(self, targets, classpath_products=None):
-    graph_info = self.generate_targets_map(targets, classpath_products=classpath_products)
-    if self.get_options().formatted:
-      return json.dumps(graph_info, indent=4, separators=(',', ': ')).splitlines()
+    formatted = self.get_options().formatted
+    lines = self._json_object_lines(self.iter_graph_info(targets,
+                                                         classpath_products=classpath_products),
+                                    formatted)
+    # The information about each target is serialized as soon as it is generated, rather than
+    # the whole graph being gathered up front.  Each line is written as soon as it is complete;
+    # unformatted output is a single line, so it is only written once the graph is exhausted.
+    if formatted:
+      return lines
+    else:
+      return [''.join(lines)]
+
+  @classmethod
+  def _json_object_lines(cls, pairs, formatted, depth=0):
+    """Yields the lines of the JSON object with the given (key, value) pairs, as they are consumed.
+
+    The lines are those `json.dumps` would produce for the object; values that are generators of
+    (key, value) pairs are serialized as nested objects the same way.  The keys of other values are
+    sorted so that a value reads the same whether it was computed or loaded from a cached fragment.
+    Unless `formatted`, the lines are pieces of a single line.
+    """
+    indent = ' ' * 4 * (depth + 1) if formatted else ''
+    separator = ',' if formatted else ', '
+    line = None
+    for key, value in pairs:
+      if line is None:
+        yield '{'
+      else:
+        yield line + separator
+      if isinstance(value, types.GeneratorType):
+        value_lines = cls._json_object_lines(value, formatted, depth=depth + 1)
+      elif formatted:
+        value_lines = iter(json.dumps(value, indent=4, separators=(',', ': '),
+                                           sort_keys=True).splitlines())
+        value_lines = itertools.chain([next(value_lines)],
+                                      (indent + value_line for value_line in value_lines))
+      else:
+        value_lines = iter([json.dumps(value, sort_keys=True)])
+      # Hold the last line of each value back until it is known whether a separator follows it.
+      line = '{}{}: {}'.format(indent, json.dumps(key), next(value_lines))
+      for value_line in value_lines:
+        yield line
+        line = value_line
+    if line is None:
+      yield '{}'
     else:
-      return [json.dumps(graph_info)]
+      yield line
+      yield ' ' * 4 * depth + '}' if formatted else '}'
@@ -15,6 +15,7 @@ from twitter.common.collections import OrderedSet
 
 from pants.base.deprecated import deprecated, deprecated_conditional
 from pants.base.file_system_project_tree import FileSystemProjectTree
+from pants.base.ignore_pattern_matcher import IgnorePatternMatcher
 from pants.util.dirutil import fast_relpath
 from pants.util.meta import AbstractClass
 
@@ -73,6 +74,9 @@ class BuildFile(AbstractClass):
 
   @staticmethod
   def _add_spec_excludes_to_build_ignore_patterns(build_root, build_ignore_patterns=None, spec_excludes=None):
+    if not spec_excludes and build_ignore_patterns:
+      # Reuse the given patterns so that their compiled matcher is reused too.
+      return build_ignore_patterns
     if not build_ignore_patterns:
       build_ignore_patterns = PathSpec.from_lines(GitIgnorePattern, [])
 
@@ -112,26 +116,41 @@ class BuildFile(AbstractClass):
                                                                                   build_ignore_patterns,
                                                                                   spec_excludes)
 
+    ignore_matcher = IgnorePatternMatcher.for_path_spec(build_ignore_patterns)
+    build_files = BuildFile._walk_build_file_relpaths(project_tree, base_relpath or '', ignore_matcher)
+    project_tree.prefetch(build_files)
+    return BuildFile._build_files_from_paths(project_tree, build_files)
+
+  @staticmethod
+  def _walk_build_file_relpaths(project_tree, base_relpath, ignore_matcher):
+    """Returns the set of relpaths of the BUILD files under `base_relpath` that are not ignored.
+
+    Ignored directories are pruned as they are encountered, so nothing below them is visited, and
+    BUILD files are checked as they are found rather than in a second pass.
+
+    :param ignore_matcher: The matcher for the ignore patterns to apply.
+    :type ignore_matcher: :class:`pants.base.ignore_pattern_matcher.IgnorePatternMatcher`
+    """
     build_files = set()
-    for root, dirs, files in project_tree.walk(base_relpath or '', topdown=True):
-      excluded_dirs = list(build_ignore_patterns.match_files('{}/'.format(os.path.join(root, dirname))
-                                                          for dirname in dirs))
-      for subdir in excluded_dirs:
-        # Remove trailing '/' from paths which were added to indicate that paths are paths to directories.
-        dirs.remove(fast_relpath(subdir, root)[:-1])
-      for filename in files:
-        if BuildFile._is_buildfile_name(filename):
-          build_files.add(os.path.join(root, filename))
+    for root, dirs, files in project_tree.walk(base_relpath, topdown=True):
+      ignore_matcher.prune_dirs(root, dirs)
+      build_files.update(BuildFile._unignored_build_file_relpaths(root, files, ignore_matcher))
+    return build_files
 
-    return BuildFile._build_files_from_paths(project_tree, build_files, build_ignore_patterns)
+  @staticmethod
+  def _unignored_build_file_relpaths(root, files, ignore_matcher):
+    for filename in files:
+      if BuildFile._is_buildfile_name(filename):
+        relpath = os.path.join(root, filename)
+        if not ignore_matcher.matches(relpath):
+          yield relpath
 
   @staticmethod
-  def _build_files_from_paths(project_tree, rel_paths, build_ignore_patterns):
-    if build_ignore_patterns:
-      build_files_without_ignores = rel_paths.difference(build_ignore_patterns.match_files(rel_paths))
-    else:
-      build_files_without_ignores = rel_paths
-    return OrderedSet(sorted((BuildFile._cached(project_tree, relpath) for relpath in build_files_without_ignores),
+  def _build_files_from_paths(project_tree, rel_paths, build_ignore_patterns=None):
+    ignore_matcher = IgnorePatternMatcher.for_path_spec(build_ignore_patterns)
+    if ignore_matcher:
+      rel_paths = rel_paths.difference(ignore_matcher.match_files(rel_paths))
+    return OrderedSet(sorted((BuildFile._cached(project_tree, relpath) for relpath in rel_paths),
                              key=lambda build_file: build_file.full_path))
 
   def __init__(self, project_tree, relpath, must_exist=True):
@@ -219,7 +238,11 @@ class BuildFile(AbstractClass):
 
   def code(self):
     """Returns the code object for this BUILD file."""
-    return compile(self.source(), self.full_path, 'exec', flags=0, dont_inherit=True)
+    return self.compile(self.source())
+
+  def compile(self, source):
+    """Returns the code object for the given source of this BUILD file."""
+    return compile(source, self.full_path, 'exec', flags=0, dont_inherit=True)
 
   def __eq__(self, other):
     return (
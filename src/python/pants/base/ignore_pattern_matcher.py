@@ -0,0 +1,101 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import re
+import weakref
+
+
+class IgnorePatternMatcher(object):
+  """Matches paths against the patterns of a `pathspec.PathSpec` with a few combined regexes.
+
+  `PathSpec.match_files` runs every pattern over every path, so a scan that checks each directory
+  it visits against a long `.gitignore` style pattern list does work proportional to the number
+  of patterns for every path.  Since the last pattern that matches a path decides whether it is
+  ignored, this matcher folds each run of consecutive patterns with the same polarity into a
+  single regex and tries the runs from last to first, stopping at the first run that matches.
+  Without negated (`!`) patterns that is a single regex match per path.
+  """
+
+  _cache = weakref.WeakKeyDictionary()
+
+  @classmethod
+  def for_path_spec(cls, path_spec):
+    """Returns the (memoized) matcher for `path_spec`.
+
+    :param path_spec: The patterns to match; `None` matches nothing.
+    :type path_spec: :class:`pathspec.pathspec.PathSpec`
+    :rtype: :class:`IgnorePatternMatcher`
+    """
+    if path_spec is None:
+      return cls([])
+    matcher = cls._cache.get(path_spec)
+    if matcher is None:
+      matcher = cls(path_spec.patterns)
+      cls._cache[path_spec] = matcher
+    return matcher
+
+  def __init__(self, patterns):
+    """
+    :param patterns: The patterns to match, in `PathSpec` order.
+    :type patterns: list of :class:`pathspec.pattern.Pattern`
+    """
+    runs = []
+    for pattern in reversed(list(patterns)):
+      if pattern.include is None:
+        continue
+      if runs and runs[-1][0] == pattern.include:
+        runs[-1][1].append(pattern)
+      else:
+        runs.append((pattern.include, [pattern]))
+    self._runs = [(include, self._combine(run_patterns)) for include, run_patterns in runs]
+
+  @staticmethod
+  def _combine(patterns):
+    """Returns a predicate that is true for the paths matched by any of `patterns`."""
+    regexes = [getattr(pattern, 'regex', None) for pattern in patterns]
+    if any(regex is None for regex in regexes) or len({regex.flags for regex in regexes}) > 1:
+      # Not all patterns are uniform regexes: fall back to asking each pattern.
+      return lambda path: any(any(True for _ in pattern.match([path])) for pattern in patterns)
+    try:
+      combined = re.compile('|'.join('(?:{})'.format(regex.pattern) for regex in regexes),
+                            regexes[0].flags)
+    except (AssertionError, OverflowError, re.error):
+      # Python 2's `re` caps the number of groups in a single regex.
+      return lambda path: any(regex.match(path) is not None for regex in regexes)
+    return lambda path: combined.match(path) is not None
+
+  def __nonzero__(self):
+    return bool(self._runs)
+
+  __bool__ = __nonzero__
+
+  def matches(self, path):
+    """Returns `True` if `path` is ignored.
+
+    :param string path: A buildroot relative path; directories should have a trailing `/`.
+    """
+    for include, match in self._runs:
+      if match(path):
+        return include
+    return False
+
+  def match_files(self, paths):
+    """Returns the subset of `paths` that are ignored."""
+    return set(path for path in paths if self.matches(path))
+
+  def prune_dirs(self, root, dirs):
+    """Removes the ignored directories from a walk's `dirs` under `root`, in place.
+
+    Pruning a directory during a top-down walk means none of its descendants are visited or
+    matched at all.
+    """
+    if not self._runs:
+      return
+    for dirname in list(dirs):
+      if self.matches('{}/'.format(os.path.join(root, dirname))):
+        dirs.remove(dirname)
@@ -51,3 +51,9 @@ class ProjectTree(AbstractClass):
   @abstractmethod
   def content(self, file_relpath):
     """Returns the content for file at path."""
+
+  def prefetch(self, file_relpaths):
+    """Hints that the content of the given files will be read soon.
+
+    Project trees for which reading files one at a time is expensive may read them ahead in bulk.
+    """
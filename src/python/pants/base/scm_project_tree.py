@@ -16,11 +16,15 @@ logger = logging.getLogger(__name__)
 
 
 class ScmProjectTree(ProjectTree):
-  def __init__(self, build_root, scm, rev):
+  def __init__(self, build_root, scm, rev, prefetch=False):
+    """
+    :param bool prefetch: `True` to load the listing of every directory at `rev` up front, rather
+                          than one directory at a time as the tree is walked.
+    """
     super(ScmProjectTree, self).__init__(build_root)
     self._scm = scm
     self._rev = rev
-    self._reader = scm.repo_reader(rev)
+    self._reader = scm.repo_reader(rev, prefetch=prefetch)
     self._scm_worktree = os.path.realpath(scm.detect_worktree())
 
   def _scm_relpath(self, build_root_relpath):
@@ -34,6 +38,9 @@ class ScmProjectTree(ProjectTree):
     with self._reader.open(self._scm_relpath(file_relpath)) as source:
       return source.read()
 
+  def prefetch(self, file_relpaths):
+    self._reader.prefetch_blobs([self._scm_relpath(relpath) for relpath in file_relpaths])
+
   def isdir(self, relpath):
     return self._reader.isdir(self._scm_relpath(relpath))
 
@@ -6,13 +6,16 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import importlib
+import threading
 import traceback
+from collections import namedtuple
 
 from pkg_resources import Requirement
 from twitter.common.collections import OrderedSet
 
 from pants.base.exceptions import BackendConfigurationError
 from pants.build_graph.build_configuration import BuildConfiguration
+from pants.option.scope import ScopeInfo
 
 
 class PluginLoadingError(Exception): pass
@@ -92,13 +95,11 @@ def load_plugins(build_configuration, plugins, working_set):
     loaded[dist.as_requirement().key] = dist
 
 
-def load_build_configuration_from_source(build_configuration, additional_backends=None):
-  """Installs pants backend packages to provide BUILD file symbols and cli goals.
+def backend_packages(additional_backends=None):
+  """Returns the backend packages to load, in the order they must be loaded.
 
-  :param BuildConfiguration build_configuration: The BuildConfiguration (for adding aliases).
   :param additional_backends: An optional list of additional packages to load backends from.
-  :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
-    the build configuration.
+  :rtype: list of string
   """
   # Note: pants.core_tasks must be first in this list, as it registers various stubs
   # that other tasks can use for scheduling against.
@@ -111,19 +112,183 @@ def load_build_configuration_from_source(build_configuration, additional_backend
   #
   # TODO: Consider replacing the "backend" nomenclature here. For example, pants.build_graph and
   # pants.core_tasks aren't really backends.
-  backend_packages = ['pants.build_graph',
-                      'pants.core_tasks',
-                      'pants.backend.graph_info',
-                      'pants.backend.docgen',
-                      'pants.backend.python',
-                      'pants.backend.jvm',
-                      'pants.backend.codegen',
-                      'pants.backend.project_info']
-
-  for backend_package in OrderedSet(backend_packages + (additional_backends or [])):
+  builtin_backend_packages = ['pants.build_graph',
+                              'pants.core_tasks',
+                              'pants.backend.graph_info',
+                              'pants.backend.docgen',
+                              'pants.backend.python',
+                              'pants.backend.jvm',
+                              'pants.backend.codegen',
+                              'pants.backend.project_info']
+  return list(OrderedSet(builtin_backend_packages + (additional_backends or [])))
+
+
+def load_build_configuration_from_source(build_configuration, additional_backends=None):
+  """Installs pants backend packages to provide BUILD file symbols and cli goals.
+
+  :param BuildConfiguration build_configuration: The BuildConfiguration (for adding aliases).
+  :param additional_backends: An optional list of additional packages to load backends from.
+  :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
+    the build configuration.
+  """
+  for backend_package in backend_packages(additional_backends):
     load_backend(build_configuration, backend_package)
 
 
+class BackendMetadata(namedtuple('BackendMetadata', ['backend_package', 'tasks', 'aliases',
+                                                     'subsystems', 'dependencies'])):
+  """Declares what a backend registers, without importing the backend itself.
+
+  A backend declares its metadata as lists of strings in the `metadata` module of its package:
+
+  * `tasks`: The options scopes of the tasks it installs in goals.
+  * `aliases`: The BUILD file aliases it registers.
+  * `subsystems`: The options scopes of the global subsystems its aliases and tasks use.
+  * `dependencies`: The backend packages that must be loaded along with it, e.g. because their
+    tasks produce products its tasks require.
+  """
+
+  @classmethod
+  def load(cls, backend_package):
+    """Returns the metadata of the given backend package, or `None` if it declares none.
+
+    :param string backend_package: The package name containing the backend's register module.
+    :rtype: :class:`BackendMetadata`
+    """
+    try:
+      module = importlib.import_module(backend_package + '.metadata')
+    except ImportError:
+      return None
+    return cls(backend_package=backend_package,
+               tasks=tuple(getattr(module, 'tasks', ())),
+               aliases=tuple(getattr(module, 'aliases', ())),
+               subsystems=tuple(getattr(module, 'subsystems', ())),
+               dependencies=tuple(getattr(module, 'dependencies', ())))
+
+  def scope_infos(self):
+    """Returns ScopeInfos for the options scopes this backend registers.
+
+    :rtype: list of :class:`pants.option.scope.ScopeInfo`
+    """
+    return ([ScopeInfo(scope, ScopeInfo.TASK) for scope in self.tasks] +
+            [ScopeInfo(scope, ScopeInfo.SUBSYSTEM) for scope in self.subsystems])
+
+  def provides_scope(self, scope):
+    """Returns `True` if this backend registers the given scope, or one enclosing or enclosed by it.
+
+    :param string scope: An options scope, e.g. a requested goal.
+    """
+    def related(registered_scope):
+      return (scope == registered_scope or
+              registered_scope.startswith(scope + '.') or
+              scope.startswith(registered_scope + '.'))
+    return any(related(registered_scope) for registered_scope in self.tasks + self.subsystems)
+
+
+class LazyBackendLoader(object):
+  """Loads the backends that declare metadata only once they are needed.
+
+  Backends that declare no metadata (see :class:`BackendMetadata`) are always loaded.  The others
+  are loaded up front if the command line needs them, and otherwise on first use of one of their
+  aliases in a BUILD file.  Backends are loaded in the order given, along with their dependencies.
+  """
+
+  # Goals that describe every goal, and so need every backend loaded.
+  ALL_BACKENDS_GOALS = ('goals',)
+
+  def __init__(self, build_configuration, backend_packages, late_load_hook=None):
+    """
+    :param BuildConfiguration build_configuration: The BuildConfiguration to load backends into.
+    :param list<str> backend_packages: The backend packages to load, in load order.
+    :param late_load_hook: An optional callable that is passed a no-arg function that loads the
+                           backends needed by a BUILD file, and that must call it.  Lets the caller
+                           act on what backends loaded after startup register.
+    """
+    self._build_configuration = build_configuration
+    self._backend_packages = list(backend_packages)
+    self._late_load_hook = late_load_hook or (lambda load: load())
+    self._metadata_by_backend = {}
+    for backend_package in self._backend_packages:
+      metadata = BackendMetadata.load(backend_package)
+      if metadata:
+        self._metadata_by_backend[backend_package] = metadata
+    self._loaded = set()
+    self._lock = threading.RLock()
+
+  def known_scope_infos(self):
+    """Returns ScopeInfos for the scopes registered by backends that may be loaded lazily.
+
+    These, along with the `ALL_BACKENDS_GOALS`, are the scopes that select backends to load, and so
+    are the scopes the command line must be split with before loading any backends.
+
+    :rtype: list of :class:`pants.option.scope.ScopeInfo`
+    """
+    scope_infos = [ScopeInfo(goal, ScopeInfo.TASK) for goal in self.ALL_BACKENDS_GOALS]
+    for metadata in self._metadata_by_backend.values():
+      scope_infos.extend(metadata.scope_infos())
+    return scope_infos
+
+  def load(self, requested_scopes):
+    """Loads the backends without metadata and the backends needed by the given scopes.
+
+    The aliases of the backends not loaded are registered with the build configuration, to load
+    their backends on first use.
+
+    :param requested_scopes: The requested goals, and the scopes options are set for on the command
+                             line.
+    """
+    requested_scopes = list(requested_scopes)
+    if any(goal in requested_scopes for goal in self.ALL_BACKENDS_GOALS):
+      self.load_all()
+      return
+
+    needed = [backend_package for backend_package, metadata in self._metadata_by_backend.items()
+              if any(metadata.provides_scope(scope) for scope in requested_scopes)]
+    eager = [backend_package for backend_package in self._backend_packages
+             if backend_package not in self._metadata_by_backend]
+    self._load_backends(eager + needed)
+
+    for backend_package, metadata in self._metadata_by_backend.items():
+      if backend_package not in self._loaded:
+        def load_late(backend_package=backend_package):
+          with self._lock:
+            self._late_load_hook(lambda: self._load_backends([backend_package]))
+        self._build_configuration.register_lazy_aliases(metadata.aliases, load_late)
+
+  def load_all(self):
+    """Loads all the backends."""
+    self._load_backends(self._backend_packages)
+
+  def _with_dependencies(self, backend_packages):
+    closure = set()
+    to_visit = list(backend_packages)
+    while to_visit:
+      backend_package = to_visit.pop()
+      if backend_package not in closure:
+        closure.add(backend_package)
+        metadata = self._metadata_by_backend.get(backend_package)
+        if metadata:
+          to_visit.extend(metadata.dependencies)
+    return closure
+
+  def _load_backends(self, backend_packages):
+    with self._lock:
+      to_load = self._with_dependencies(backend_packages) - self._loaded
+      for backend_package in self._backend_packages:
+        if backend_package in to_load:
+          load_backend(self._build_configuration, backend_package)
+          self._loaded.add(backend_package)
+
+  @property
+  def loaded_backend_packages(self):
+    """The backend packages loaded so far, in load order.
+
+    :rtype: list of string
+    """
+    return [backend_package for backend_package in self._backend_packages
+            if backend_package in self._loaded]
+
+
 def load_backend(build_configuration, backend_package):
   """Installs the given backend package into the build configuration.
 
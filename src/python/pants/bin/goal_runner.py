@@ -6,6 +6,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+import os
 import sys
 
 import pkg_resources
@@ -18,11 +19,14 @@ from pants.base.exceptions import BuildConfigurationError
 from pants.base.file_system_project_tree import FileSystemProjectTree
 from pants.base.scm_project_tree import ScmProjectTree
 from pants.base.workunit import WorkUnit, WorkUnitLabel
-from pants.bin.extension_loader import load_plugins_and_backends
+from pants.bin.extension_loader import (LazyBackendLoader, backend_packages, load_plugins,
+                                        load_plugins_and_backends)
 from pants.bin.plugin_resolver import PluginResolver
 from pants.bin.repro import Reproducer
 from pants.build_graph.address_lookup_error import AddressLookupError
+from pants.build_graph.build_configuration import BuildConfiguration
 from pants.build_graph.build_file_address_mapper import BuildFileAddressMapper
+from pants.build_graph.build_file_code_cache import BuildFileCodeCache
 from pants.build_graph.build_file_parser import BuildFileParser
 from pants.build_graph.build_graph import BuildGraph
 from pants.engine.round_engine import RoundEngine
@@ -32,6 +36,7 @@ from pants.goal.run_tracker import RunTracker
 from pants.help.help_printer import HelpPrinter
 from pants.java.nailgun_executor import NailgunProcessGroup
 from pants.logging.setup import setup_logging
+from pants.option.arg_splitter import OptionsHelp
 from pants.option.global_options import GlobalOptionsRegistrar
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.pantsd.subsystem.pants_daemon_launcher import PantsDaemonLauncher
@@ -80,6 +85,67 @@ class OptionsInitializer(object):
       # Register task options.
       goal.register_options(options)
 
+  @staticmethod
+  def _subsystems(build_configuration):
+    """Returns all needed subsystems via a union of all known subsystem sets."""
+    return Subsystem.closure(
+      GoalRunner.subsystems() | Goal.subsystems() | build_configuration.subsystems()
+    )
+
+  @staticmethod
+  def _scope_infos(subsystems):
+    """Returns the scopes of the given subsystems and of all tasks in all goals."""
+    scope_infos = [subsystem.get_scope_info() for subsystem in subsystems]
+    for goal in Goal.all():
+      scope_infos.extend(filter(None, goal.known_scope_infos()))
+    return scope_infos
+
+  def _load_plugins_and_needed_backends(self, options_bootstrapper, plugins, working_set,
+                                        additional_backends):
+    """Loads plugins, and those backends the command line or (later) BUILD files need.
+
+    Returns the build configuration and a list the caller must append the full options to once
+    they are created: backends loaded after that, for the aliases used in BUILD files, have their
+    scopes added to and their options registered on those options.
+    """
+    build_configuration = BuildConfiguration()
+    load_plugins(build_configuration, plugins or [], working_set)
+
+    late_loads = []
+
+    def register_late_backend_options(load):
+      subsystems = self._subsystems(build_configuration)
+      scopes = {si.scope for si in self._scope_infos(subsystems)}
+      load()
+      if not late_loads:
+        return
+      options = late_loads[0]
+      new_subsystems = self._subsystems(build_configuration) - subsystems
+      new_scope_infos = [si for si in self._scope_infos(new_subsystems) if si.scope not in scopes]
+      options.add_known_scope_infos(new_scope_infos)
+      for subsystem in new_subsystems:
+        subsystem.register_options_on_scope(options)
+      for goal in Goal.all():
+        for task_type in goal.task_types():
+          if task_type.options_scope not in scopes:
+            task_type.register_options_on_scope(options)
+
+    backend_loader = LazyBackendLoader(build_configuration,
+                                       backend_packages(additional_backends),
+                                       late_load_hook=register_late_backend_options)
+
+    # Split the command line by just the scopes that select backends, to find the needed ones.
+    split_options = options_bootstrapper.get_full_options(backend_loader.known_scope_infos())
+    bootstrap_options = options_bootstrapper.get_bootstrap_options().for_global_scope()
+    help_request = split_options.help_request
+    if (bootstrap_options.verify_config or
+        (isinstance(help_request, OptionsHelp) and help_request.all_scopes)):
+      backend_loader.load_all()
+    else:
+      flagged_scopes = [scope for scope, flags in split_options.scope_to_flags.items() if flags]
+      backend_loader.load(list(split_options.goals) + flagged_scopes)
+    return build_configuration, late_loads
+
   def _setup_options(self, options_bootstrapper, working_set):
     bootstrap_options = options_bootstrapper.get_bootstrap_options()
     global_bootstrap_options = bootstrap_options.for_global_scope()
@@ -101,26 +167,24 @@ class OptionsInitializer(object):
 
     # Load plugins and backends.
     plugins = global_bootstrap_options.plugins
-    backend_packages = global_bootstrap_options.backend_packages
-    build_configuration = load_plugins_and_backends(plugins, working_set, backend_packages)
+    additional_backends = global_bootstrap_options.backend_packages
+    if global_bootstrap_options.lazy_backends:
+      build_configuration, late_loads = self._load_plugins_and_needed_backends(
+        options_bootstrapper, plugins, working_set, additional_backends)
+    else:
+      build_configuration = load_plugins_and_backends(plugins, working_set, additional_backends)
+      late_loads = None
 
     # Now that plugins and backends are loaded, we can gather the known scopes.
     known_scope_infos = [GlobalOptionsRegistrar.get_scope_info()]
-
-    # Add scopes for all needed subsystems via a union of all known subsystem sets.
-    subsystems = Subsystem.closure(
-      GoalRunner.subsystems() | Goal.subsystems() | build_configuration.subsystems()
-    )
-    for subsystem in subsystems:
-      known_scope_infos.append(subsystem.get_scope_info())
-
-    # Add scopes for all tasks in all goals.
-    for goal in Goal.all():
-      known_scope_infos.extend(filter(None, goal.known_scope_infos()))
+    subsystems = self._subsystems(build_configuration)
+    known_scope_infos.extend(self._scope_infos(subsystems))
 
     # Now that we have the known scopes we can get the full options.
     options = options_bootstrapper.get_full_options(known_scope_infos)
     self._register_options(subsystems, options)
+    if late_loads is not None:
+      late_loads.append(options)
 
     # Make the options values available to all subsystems.
     Subsystem.set_options(options)
@@ -184,7 +248,8 @@ class GoalRunnerFactory(object):
     self._kill_nailguns = self._global_options.kill_nailguns
 
     self._project_tree = self._get_project_tree(self._global_options.build_file_rev)
-    self._build_file_parser = BuildFileParser(self._build_config, self._root_dir)
+    self._build_file_parser = BuildFileParser(self._build_config, self._root_dir,
+                                              code_cache=self._get_build_file_code_cache())
     build_ignore_patterns = self._global_options.ignore_patterns or []
     build_ignore_patterns.extend(BuildFile._spec_excludes_to_gitignore_syntax(self._root_dir,
                                                                               self._global_options.spec_excludes))
@@ -192,17 +257,27 @@ class GoalRunnerFactory(object):
       self._build_file_parser,
       self._project_tree,
       build_ignore_patterns,
-      exclude_target_regexps=self._global_options.exclude_target_regexp
+      exclude_target_regexps=self._global_options.exclude_target_regexp,
+      parallel_scan=self._global_options.parallel_build_file_scan
     )
     self._build_graph = BuildGraph(self._address_mapper)
 
   def _get_project_tree(self, build_file_rev):
     """Creates the project tree for build files for use in a given pants run."""
     if build_file_rev:
-      return ScmProjectTree(self._root_dir, get_scm(), build_file_rev)
+      return ScmProjectTree(self._root_dir, get_scm(), build_file_rev,
+                            prefetch=self._global_options.build_file_rev_prefetch)
     else:
       return FileSystemProjectTree(self._root_dir)
 
+  def _get_build_file_code_cache(self):
+    """Creates the BUILD file code cache for use in a given pants run, if enabled."""
+    if not self._global_options.build_file_code_cache:
+      return None
+    cache_dir = os.path.join(self._global_options.pants_workdir, 'build_file_code')
+    return BuildFileCodeCache(cache_dir, self._build_config.registered_aliases(),
+                              lazy_aliases=self._build_config.lazy_aliases())
+
   def _expand_goals(self, goals):
     """Check and populate the requested goals for a given run."""
     for goal in goals:
@@ -327,7 +402,8 @@ class GoalRunner(object):
       self._context.log.error('Unknown goal(s): {}\n'.format(' '.join(unknown_goals)))
       return 1
 
-    engine = RoundEngine()
+    engine = RoundEngine(
+      max_concurrent_tasks=self._context.options.for_global_scope().max_concurrent_tasks)
     result = engine.execute(self._context, self._goals)
 
     if self._invalidation_report:
@@ -335,6 +411,10 @@ class GoalRunner(object):
 
     return result
 
+  def _record_build_file_parse_timings(self):
+    for phase, secs in self._context.build_file_parser.timings.items():
+      self._run_tracker.build_file_parse_timings.add_timing(phase, secs)
+
   def run(self):
     should_kill_nailguns = self._kill_nailguns
 
@@ -352,6 +432,8 @@ class GoalRunner(object):
       self._run_tracker.set_root_outcome(WorkUnit.FAILURE)
       raise
     finally:
+      self._record_build_file_parse_timings()
+
       # Must kill nailguns only after run_tracker.end() is called, otherwise there may still
       # be pending background work that needs a nailgun.
       if should_kill_nailguns:
@@ -9,6 +9,8 @@ import inspect
 import logging
 from collections import Iterable, namedtuple
 
+from twitter.common.collections import OrderedSet
+
 from pants.base.parse_context import ParseContext
 from pants.build_graph.addressable import AddressableCallProxy
 from pants.build_graph.build_file_aliases import BuildFileAliases
@@ -35,6 +37,7 @@ class BuildConfiguration(object):
     self._exposed_object_by_alias = {}
     self._exposed_context_aware_object_factory_by_alias = {}
     self._subsystems = set()
+    self._lazy_alias_loaders = {}
 
   def registered_aliases(self):
     """Return the registered aliases exposed in BUILD files.
@@ -74,6 +77,34 @@ class BuildConfiguration(object):
     for alias, context_aware_object_factory in aliases.context_aware_object_factories.items():
       self._register_exposed_context_aware_object_factory(alias, context_aware_object_factory)
 
+  def register_lazy_aliases(self, aliases, load):
+    """Registers aliases that are only defined once they are first used in a BUILD file.
+
+    :param aliases: The names of the aliases.
+    :param load: A no-arg callable that registers the aliases (via `register_aliases`) when called.
+    """
+    for alias in aliases:
+      self._lazy_alias_loaders[alias] = load
+
+  def lazy_aliases(self):
+    """Returns the names of the registered aliases that are not yet defined.
+
+    :rtype: frozenset of string
+    """
+    return frozenset(self._lazy_alias_loaders)
+
+  def load_lazy_aliases(self, names):
+    """Defines any of the given names that are lazily registered aliases.
+
+    :param names: Names that may be about to be used, e.g. the names referenced by a BUILD file.
+    """
+    loads = OrderedSet(self._lazy_alias_loaders[name] for name in sorted(names)
+                       if name in self._lazy_alias_loaders)
+    for load in loads:
+      for alias in [alias for alias, loader in self._lazy_alias_loaders.items() if loader is load]:
+        self._lazy_alias_loaders.pop(alias, None)
+      load()
+
   # TODO(John Sirois): Warn on alias override across all aliases since they share a global
   # namespace in BUILD files.
   # See: https://github.com/pantsbuild/pants/issues/2151
@@ -14,13 +14,17 @@ from collections import defaultdict
 import six
 from pathspec import PathSpec
 from pathspec.gitignore import GitIgnorePattern
+from pathspec.pattern import RegexPattern
 from twitter.common.collections import OrderedSet
 
 from pants.base.build_environment import get_buildroot
 from pants.base.build_file import BuildFile
 from pants.base.deprecated import deprecated, deprecated_conditional
+from pants.base.file_system_project_tree import FileSystemProjectTree
+from pants.base.ignore_pattern_matcher import IgnorePatternMatcher
 from pants.base.project_tree import ProjectTree
 from pants.base.specs import DescendantAddresses, SiblingAddresses, SingleAddress
+from pants.base.worker_pool import SubprocPool
 from pants.build_graph.address import Address, parse_spec
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.build_file_parser import BuildFileParser
@@ -30,6 +34,14 @@ from pants.util.dirutil import fast_relpath
 logger = logging.getLogger(__name__)
 
 
+def _scan_build_file_relpaths(args):
+  """Returns the relpaths of the BUILD files under a directory; run in a subprocess."""
+  project_tree, base_relpath, pattern_tuples = args
+  ignore_matcher = IgnorePatternMatcher([RegexPattern(regex, include)
+                                         for regex, include in pattern_tuples])
+  return list(BuildFile._walk_build_file_relpaths(project_tree, base_relpath, ignore_matcher))
+
+
 # Note: Significant effort has been made to keep the types BuildFile, BuildGraph, Address, and
 # Target separated appropriately.  The BuildFileAddressMapper is intended to have knowledge
 # of just BuildFile, BuildFileParser and Address.
@@ -66,11 +78,18 @@ class BuildFileAddressMapper(object):
   # patterns, because the asterisks in its name make it an invalid regexp.
   _UNMATCHED_KEY = '** unmatched **'
 
-  def __init__(self, build_file_parser, project_tree, build_ignore_patterns=None, exclude_target_regexps=None):
+  # The number of directory levels walked on the main thread before a parallel scan fans out.
+  _PARALLEL_SCAN_SPLIT_DEPTH = 2
+
+  def __init__(self, build_file_parser, project_tree, build_ignore_patterns=None, exclude_target_regexps=None,
+               parallel_scan=False):
     """Create a BuildFileAddressMapper.
 
     :param build_file_parser: An instance of BuildFileParser
     :param build_file_type: A subclass of BuildFile used to construct and cache BuildFile objects
+    :param bool parallel_scan: If `True`, recursive scans of a filesystem project tree walk
+      directories and compile BUILD files in the shared subprocess pool.  BUILD files are still
+      executed on the calling thread, in sorted order.
     """
     self._build_file_parser = build_file_parser
     self._spec_path_to_address_map_map = {}  # {spec_path: {address: addressable}} mapping
@@ -85,6 +104,8 @@ class BuildFileAddressMapper(object):
     self._exclude_target_regexps = exclude_target_regexps or []
     self._exclude_patterns = [re.compile(pattern) for pattern in self._exclude_target_regexps]
 
+    self._parallel_scan = parallel_scan and isinstance(self._project_tree, FileSystemProjectTree)
+
   @property
   def root_dir(self):
     return self._build_file_parser.root_dir
@@ -190,9 +211,56 @@ class BuildFileAddressMapper(object):
     deprecated_conditional(lambda: spec_excludes is not None,
                            '0.0.75',
                            'Use build_ignore_patterns consturctor parameter instead.')
+    if self._parallel_scan and spec_excludes is None:
+      return self._scan_build_files_in_parallel(base_path)
     return BuildFile.scan_build_files(self._project_tree, base_path, spec_excludes,
                                       build_ignore_patterns=self._build_ignore_patterns)
 
+  @staticmethod
+  def _subproc_map(f, items):
+    return SubprocPool.foreground().map(f, items)
+
+  def _scan_build_files_in_parallel(self, base_path):
+    """Equivalent to `BuildFile.scan_build_files`, but walks subtrees in the subprocess pool.
+
+    The top `_PARALLEL_SCAN_SPLIT_DEPTH` levels of the tree are walked on the calling thread to
+    find enough independent subtrees to fan out.  The results are merged and sorted exactly as a
+    serial scan would sort them.
+    """
+    project_tree = self._project_tree
+    if base_path and (os.path.isabs(base_path) or not project_tree.isdir(base_path)):
+      # Let the serial scan raise the appropriate error.
+      return BuildFile.scan_build_files(project_tree, base_path,
+                                        build_ignore_patterns=self._build_ignore_patterns)
+
+    ignore_matcher = IgnorePatternMatcher.for_path_spec(self._build_ignore_patterns)
+    build_relpaths = set()
+    subtrees = [base_path or '']
+    for _ in range(self._PARALLEL_SCAN_SPLIT_DEPTH):
+      next_subtrees = []
+      for subtree in subtrees:
+        root, dirs, files = next(project_tree.walk(subtree, topdown=True))
+        ignore_matcher.prune_dirs(root, dirs)
+        build_relpaths.update(BuildFile._unignored_build_file_relpaths(root, files, ignore_matcher))
+        next_subtrees.extend(os.path.join(root, d) for d in dirs)
+      subtrees = next_subtrees
+
+    pattern_tuples = [(pattern.regex.pattern if pattern.regex is not None else None, pattern.include)
+                      for pattern in self._build_ignore_patterns.patterns]
+    for relpaths in self._subproc_map(_scan_build_file_relpaths,
+                                      [(project_tree, subtree, pattern_tuples)
+                                       for subtree in sorted(subtrees)]):
+      build_relpaths.update(relpaths)
+    return BuildFile._build_files_from_paths(project_tree, build_relpaths)
+
+  def _precompile(self, build_files):
+    """Compiles not yet parsed `build_files` in the subprocess pool, if scanning in parallel."""
+    if not self._parallel_scan:
+      return
+    unparsed = [build_file for build_file in build_files
+                if build_file.spec_path not in self._spec_path_to_address_map_map]
+    self._build_file_parser.precompile(unparsed, map_fn=self._subproc_map)
+
   def specs_to_addresses(self, specs, relative_to=''):
     """The equivalent of `spec_to_address` for a group of specs all relative to the same path.
 
@@ -225,10 +293,9 @@ class BuildFileAddressMapper(object):
 
     addresses = set()
     try:
-      for build_file in BuildFile.scan_build_files(self._project_tree,
-                                                   base_relpath=base_path,
-                                                   spec_excludes=spec_excludes,
-                                                   build_ignore_patterns=self._build_ignore_patterns):
+      build_files = self.scan_build_files(base_path, spec_excludes=spec_excludes)
+      self._precompile(build_files)
+      for build_file in build_files:
         for address in self.addresses_in_spec_path(build_file.spec_path):
           addresses.add(address)
     except BuildFile.BuildFileError as e:
@@ -292,6 +359,7 @@ class BuildFileAddressMapper(object):
       except BuildFile.BuildFileError as e:
         raise AddressLookupError(e)
 
+      self._precompile(build_files)
       for build_file in build_files:
         try:
           addresses.update(self.addresses_in_spec_path(build_file.spec_path))
@@ -0,0 +1,100 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import hashlib
+import imp
+import logging
+import marshal
+import os
+
+from pants.util.dirutil import safe_delete, safe_mkdir_for
+
+
+logger = logging.getLogger(__name__)
+
+
+class BuildFileCodeCache(object):
+  """A persistent cache of compiled BUILD file code objects.
+
+  Code objects are marshalled to files named by a key derived from the BUILD file's path and
+  content, the set of registered BUILD file aliases and the running interpreter's bytecode magic
+  number, so a cached entry is only ever used for exactly the source and interpreter it was
+  compiled for.
+  """
+
+  def __init__(self, cache_dir, registered_aliases, lazy_aliases=()):
+    """
+    :param string cache_dir: The directory to store marshalled code objects in.
+    :param registered_aliases: The aliases BUILD files are parsed with.
+    :type registered_aliases: :class:`pants.build_graph.build_file_aliases.BuildFileAliases`
+    :param lazy_aliases: The names of aliases BUILD files are parsed with that are not yet defined.
+    """
+    self._cache_dir = cache_dir
+    self._aliases_key = self._compute_aliases_key(registered_aliases, lazy_aliases)
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def _compute_aliases_key(registered_aliases, lazy_aliases):
+    aliases = set(lazy_aliases)
+    aliases.update(registered_aliases.target_types)
+    aliases.update(registered_aliases.target_macro_factories)
+    aliases.update(registered_aliases.objects)
+    aliases.update(registered_aliases.context_aware_object_factories)
+    return '\0'.join(sorted(aliases)).encode('utf-8')
+
+  def _cache_path(self, build_file, source):
+    hasher = hashlib.sha1()
+    hasher.update(imp.get_magic())
+    hasher.update(self._aliases_key)
+    hasher.update(b'\0')
+    hasher.update(build_file.full_path.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(source)
+    key = hasher.hexdigest()
+    return os.path.join(self._cache_dir, key[:2], key[2:])
+
+  def _load(self, cache_path):
+    try:
+      with open(cache_path, 'rb') as fp:
+        return marshal.load(fp)
+    except IOError:
+      return None
+    except (EOFError, ValueError, TypeError) as e:
+      logger.debug('Ignoring unreadable cached BUILD file code {}: {}'.format(cache_path, e))
+      return None
+
+  def _store(self, cache_path, code):
+    safe_mkdir_for(cache_path)
+    tmp_path = '{}.tmp.{}'.format(cache_path, os.getpid())
+    try:
+      with open(tmp_path, 'wb') as fp:
+        marshal.dump(code, fp)
+      os.rename(tmp_path, cache_path)
+    except (IOError, OSError) as e:
+      logger.debug('Failed to cache BUILD file code at {}: {}'.format(cache_path, e))
+    finally:
+      safe_delete(tmp_path)
+
+  def code(self, build_file, source):
+    """Returns the code object for `source`, the content of `build_file`.
+
+    :param build_file: The BUILD file `source` was read from.
+    :type build_file: :class:`pants.base.build_file.BuildFile`
+    :param bytes source: The BUILD file's source.
+    :raises SyntaxError: if the source cannot be compiled.
+    """
+    cache_path = self._cache_path(build_file, source)
+    code = self._load(cache_path)
+    if code is not None:
+      self.hits += 1
+      return code
+
+    self.misses += 1
+    code = build_file.compile(source)
+    self._store(cache_path, code)
+    return code
@@ -6,16 +6,41 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+import marshal
+import types
 import warnings
+from collections import defaultdict
 
 import six
 
 from pants.base.deprecated import deprecated
+from pants.util.contextutil import Timer
 
 
 logger = logging.getLogger(__name__)
 
 
+def _precompile_build_file(args):
+  """Returns the marshalled code object for a BUILD file; run in a subprocess."""
+  build_file, code_cache = args
+  try:
+    source = build_file.source()
+    code = code_cache.code(build_file, source) if code_cache else build_file.compile(source)
+    return marshal.dumps(code)
+  except Exception:
+    # The error is reported, with context, when the BUILD file is parsed on the calling thread.
+    return None
+
+
+def _referenced_names(code):
+  """Returns the global names the given code object, or any code nested in it, may reference."""
+  names = set(code.co_names)
+  for const in code.co_consts:
+    if isinstance(const, types.CodeType):
+      names.update(_referenced_names(const))
+  return names
+
+
 # Note: Significant effort has been made to keep the types BuildFile, BuildGraph, Address, and
 # Target separated appropriately.  The BuildFileParser is intended to have knowledge of just
 # BuildFile and Address.
@@ -52,14 +77,73 @@ class BuildFileParser(object):
   class ExecuteError(BuildFileParserError):
     """An exception was encountered executing code in the BUILD file"""
 
-  def __init__(self, build_configuration, root_dir):
+  def __init__(self, build_configuration, root_dir, code_cache=None):
+    """
+    :param build_configuration: The aliases and parse context to parse BUILD files with.
+    :type build_configuration: :class:`pants.build_graph.build_configuration.BuildConfiguration`
+    :param string root_dir: The root directory of the pants workspace.
+    :param code_cache: An optional cache of compiled BUILD file code objects.
+    :type code_cache: :class:`pants.build_graph.build_file_code_cache.BuildFileCodeCache`
+    """
     self._build_configuration = build_configuration
     self._root_dir = root_dir
+    self._code_cache = code_cache
+    self._timings = defaultdict(float)
+    self._precompiled = {}
 
   @property
   def root_dir(self):
     return self._root_dir
 
+  @property
+  def timings(self):
+    """Returns the cumulative seconds spent in each phase of parsing BUILD files so far.
+
+    The phases are 'read', 'compile', 'exec' and 'addressables', along with 'precompile' for time
+    spent waiting on BUILD files compiled ahead of parsing via `precompile`.
+
+    :rtype: dict of string to float
+    """
+    return dict(self._timings)
+
+  def precompile(self, build_files, map_fn=map):
+    """Compiles `build_files` ahead of parsing them.
+
+    Reading and compiling BUILD files does not depend on any parse state, so it can be fanned out
+    to other processes.  The resulting code objects are held until each BUILD file is parsed.
+
+    :param build_files: The BUILD files to compile.
+    :param map_fn: A `map`-like function used to apply a module level, pickleable function to the
+                   BUILD files, e.g. the `map` method of a `multiprocessing.Pool`.
+    """
+    build_files = [build_file for build_file in build_files if build_file not in self._precompiled]
+    if not build_files:
+      return
+    with Timer() as timer:
+      marshalled = map_fn(_precompile_build_file,
+                          [(build_file, self._code_cache) for build_file in build_files])
+      for build_file, code in zip(build_files, marshalled):
+        if code is not None:
+          self._precompiled[build_file] = marshal.loads(code)
+    self._timings['precompile'] += timer.elapsed
+
+  def _compile(self, build_file):
+    code = self._precompiled.pop(build_file, None)
+    if code is not None:
+      return code
+
+    with Timer() as timer:
+      source = build_file.source()
+    self._timings['read'] += timer.elapsed
+
+    with Timer() as timer:
+      try:
+        if self._code_cache:
+          return self._code_cache.code(build_file, source)
+        return build_file.compile(source)
+      finally:
+        self._timings['compile'] += timer.elapsed
+
   def registered_aliases(self):
     """Returns a copy of the registered build file aliases this build file parser uses."""
     return self._build_configuration.registered_aliases()
@@ -124,7 +208,7 @@ class BuildFileParser(object):
                  .format(build_file=build_file))
 
     try:
-      build_file_code = build_file.code()
+      build_file_code = self._compile(build_file)
     except SyntaxError as e:
       raise self.ParseError(_format_context_msg(e.lineno, e.offset, e.__class__.__name__, e))
     except Exception as e:
@@ -132,30 +216,40 @@ class BuildFileParser(object):
                             .format(error_type=e.__class__.__name__,
                                     message=e, build_file=build_file))
 
-    parse_state = self._build_configuration.initialize_parse_state(build_file)
-    try:
-      with warnings.catch_warnings(record=True) as warns:
-        six.exec_(build_file_code, parse_state.parse_globals)
-        for warn in warns:
-          logger.warning(_format_context_msg(lineno=warn.lineno,
-                                             offset=None,
-                                             error_type=warn.category.__name__,
-                                             message=warn.message))
-    except Exception as e:
-      raise self.ExecuteError("{message}\n while executing BUILD file {build_file}"
-                              .format(message=e, build_file=build_file))
+    # Load the backends of any lazily registered aliases the BUILD file may use before exposing
+    # the aliases to it.
+    if self._build_configuration.lazy_aliases():
+      self._build_configuration.load_lazy_aliases(_referenced_names(build_file_code))
 
-    address_map = {}
-    for address, addressable in parse_state.registered_addressable_instances:
-      logger.debug('Adding {addressable} to the BuildFileParser address map with {address}'
-                   .format(addressable=addressable,
-                           address=address))
-      if address in address_map:
-        raise self.AddressableConflictException(
-          "File {conflicting_file} defines address '{target_name}' more than once."
-          .format(conflicting_file=address.build_file,
-                  target_name=address.target_name))
-      address_map[address] = addressable
+    with Timer() as timer:
+      parse_state = self._build_configuration.initialize_parse_state(build_file)
+      try:
+        with warnings.catch_warnings(record=True) as warns:
+          six.exec_(build_file_code, parse_state.parse_globals)
+          for warn in warns:
+            logger.warning(_format_context_msg(lineno=warn.lineno,
+                                               offset=None,
+                                               error_type=warn.category.__name__,
+                                               message=warn.message))
+      except Exception as e:
+        raise self.ExecuteError("{message}\n while executing BUILD file {build_file}"
+                                .format(message=e, build_file=build_file))
+      finally:
+        self._timings['exec'] += timer.elapsed
+
+    with Timer() as timer:
+      address_map = {}
+      for address, addressable in parse_state.registered_addressable_instances:
+        logger.debug('Adding {addressable} to the BuildFileParser address map with {address}'
+                     .format(addressable=addressable,
+                             address=address))
+        if address in address_map:
+          raise self.AddressableConflictException(
+            "File {conflicting_file} defines address '{target_name}' more than once."
+            .format(conflicting_file=address.build_file,
+                    target_name=address.target_name))
+        address_map[address] = addressable
+    self._timings['addressables'] += timer.elapsed
 
     logger.debug("{build_file} produced the following Addressables:"
                  .format(build_file=build_file))
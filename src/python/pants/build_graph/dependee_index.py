@@ -0,0 +1,162 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import logging
+import os
+from collections import defaultdict, deque
+
+from twitter.common.collections import OrderedSet
+
+from pants.base.hash_utils import hash_all
+from pants.build_graph.address import Address
+from pants.build_graph.build_graph import BuildGraph
+from pants.util.dirutil import safe_delete, safe_mkdir_for
+
+
+logger = logging.getLogger(__name__)
+
+
+class DependeeIndex(object):
+  """A persistent index mapping addresses to the addresses of their direct dependees.
+
+  Inverting the build graph normally requires parsing every BUILD file in the repo and
+  materializing every Target.  This index instead records the dependency edges declared by each
+  BUILD file alongside a digest of that BUILD file's content.  On `update`, only BUILD files whose
+  content changed (or which are new) are parsed, and only for the dependency specs their targets
+  declare: each target is injected alone into a scratch BuildGraph, so the BUILD files of its
+  dependencies are not parsed.  Edges for all other BUILD files are read back from disk.
+
+  Dependee queries are answered in terms of addresses and never require the dependee Targets to
+  be present in the BuildGraph.
+  """
+
+  # Bump this whenever the on-disk format or the way edges are computed changes.
+  _VERSION = 2
+
+  @staticmethod
+  def index_file_for(pants_workdir):
+    """Returns the location of the shared dependee index under `pants_workdir`."""
+    return os.path.join(pants_workdir, 'dependee_index', 'index.json')
+
+  def __init__(self, address_mapper, index_file):
+    """
+    :param address_mapper: The address mapper used to scan and parse BUILD files.
+    :type address_mapper: :class:`pants.build_graph.build_file_address_mapper.BuildFileAddressMapper`
+    :param string index_file: The path of the file the index is persisted to.
+    """
+    self._address_mapper = address_mapper
+    self._index_file = index_file
+    self._dependees_by_address = None
+
+  def _load(self):
+    """Returns the stored {BUILD file relpath: entry} mapping, or an empty one if unusable."""
+    if not os.path.isfile(self._index_file):
+      return {}
+    try:
+      with open(self._index_file, 'r') as fp:
+        stored = json.load(fp)
+    except ValueError as e:
+      logger.warn('Ignoring corrupt dependee index at {}: {}'.format(self._index_file, e))
+      return {}
+    if stored.get('version') != self._VERSION:
+      return {}
+    return stored['build_files']
+
+  def _store(self, entries):
+    safe_mkdir_for(self._index_file)
+    tmp_file = '{}.tmp.{}'.format(self._index_file, os.getpid())
+    try:
+      with open(tmp_file, 'w') as fp:
+        json.dump({'version': self._VERSION, 'build_files': entries}, fp)
+      os.rename(tmp_file, self._index_file)
+    finally:
+      safe_delete(tmp_file)
+
+  def _declared_dependencies(self, build_file, scratch_graph):
+    """Returns {address spec: [dependency address specs]} for the targets in `build_file`."""
+    dependencies = {}
+    for address in self._address_mapper.addresses_in_spec_path(build_file.spec_path):
+      if address.build_file != build_file:
+        continue
+      _, addressable = self._address_mapper.resolve(address)
+      # Injecting the target alone, rather than its closure, exposes the dependency specs it
+      # declares without parsing the BUILD files of its dependencies.  For the same reason specs
+      # are only normalized relative to their own BUILD file.
+      target = addressable.instantiate(scratch_graph, address)
+      scratch_graph.inject_target(target)
+      dependency_specs = OrderedSet(addressable.dependency_specs)
+      dependency_specs.update(target.traversable_dependency_specs)
+      dependencies[address.spec] = [Address.parse(spec, relative_to=address.spec_path).spec
+                                    for spec in dependency_specs]
+    return dependencies
+
+  def update(self):
+    """Brings the index up to date with the BUILD files currently in the project tree.
+
+    :returns: The number of BUILD files that had to be (re-)parsed.
+    :rtype: int
+    """
+    stored = self._load()
+    entries = {}
+    parsed = 0
+    # Targets are injected without their dependencies, so they must not leak into the run's graph.
+    scratch_graph = BuildGraph(self._address_mapper)
+    for build_file in self._address_mapper.scan_build_files(base_path=None):
+      digest = hash_all([build_file.source()])
+      entry = stored.get(build_file.relpath)
+      if entry is None or entry['digest'] != digest:
+        entry = {'digest': digest,
+                 'dependencies': self._declared_dependencies(build_file, scratch_graph)}
+        parsed += 1
+      entries[build_file.relpath] = entry
+
+    if parsed or set(entries) != set(stored):
+      self._store(entries)
+    logger.debug('Dependee index re-parsed {} of {} BUILD files.'.format(parsed, len(entries)))
+
+    dependees_by_address = defaultdict(set)
+    for entry in entries.values():
+      for spec, dependency_specs in entry['dependencies'].items():
+        dependee = Address.parse(spec)
+        for dependency_spec in dependency_specs:
+          dependees_by_address[Address.parse(dependency_spec)].add(dependee)
+    self._dependees_by_address = dependees_by_address
+    return parsed
+
+  def _dependees(self):
+    if self._dependees_by_address is None:
+      self.update()
+    return self._dependees_by_address
+
+  def dependees_of(self, address):
+    """Returns the addresses of the direct dependees of `address`.
+
+    :param Address address: The address to find dependees of.
+    :rtype: set of :class:`pants.build_graph.address.Address`
+    """
+    return set(self._dependees().get(address, ()))
+
+  def transitive_dependees_of_addresses(self, addresses):
+    """Returns `addresses` along with the addresses of all of their transitive dependees.
+
+    This mirrors `BuildGraph.transitive_dependees_of_addresses` but yields addresses rather than
+    Targets.
+
+    :param list addresses: The root addresses to find transitive dependees of.
+    :rtype: :class:`twitter.common.collections.OrderedSet` of
+            :class:`pants.build_graph.address.Address`
+    """
+    dependees_by_address = self._dependees()
+    walked = OrderedSet()
+    to_walk = deque(addresses)
+    while to_walk:
+      address = to_walk.popleft()
+      if address not in walked:
+        walked.add(address)
+        to_walk.extend(dependees_by_address.get(address, ()))
+    return walked
@@ -26,17 +26,21 @@ class SpecSourceMapper(SourceMapper):
   Note: it doesn't check if a file exists.
   """
 
-  def __init__(self, address_mapper, build_graph, stop_after_match=False):
+  def __init__(self, address_mapper, build_graph, stop_after_match=False, source_owner_index=None):
     """
     :param AddressMapper address_mapper: An address mapper that can be used to populate the
       `build_graph` with targets source mappings are needed for.
     :param BuildGraph build_graph: The build graph to map sources from.
     :param bool stop_after_match: If `True` a search will not traverse into parent directories once
       an owner is identified.
+    :param SourceOwnerIndex source_owner_index: An optional persistent index to consult instead of
+      populating the `build_graph` for spec paths whose BUILD files have not changed.  The caller
+      should flush it once done querying.
     """
     self._stop_after_match = stop_after_match
     self._build_graph = build_graph
     self._address_mapper = address_mapper
+    self._source_owner_index = source_owner_index
 
   def target_addresses_for_source(self, source):
     result = []
@@ -56,6 +60,11 @@ class SpecSourceMapper(SourceMapper):
     return result
 
   def _find_targets_for_source(self, source, spec_path):
+    if self._source_owner_index is not None:
+      for address in self._source_owner_index.addresses_matching(source, spec_path):
+        yield address
+      return
+
     for address in self._address_mapper.addresses_in_spec_path(spec_path):
       self._build_graph.inject_address_closure(address)
       target = self._build_graph.get_target(address)
@@ -88,7 +97,7 @@ class LazySourceMapper(SourceMapper):
   populating the BuildGraph is expensive, so in general there should only be one instance of it.
   """
 
-  def __init__(self, address_mapper, build_graph, stop_after_match=False):
+  def __init__(self, address_mapper, build_graph, stop_after_match=False, source_owner_index=None):
     """Initialize LazySourceMapper.
 
     :param AddressMapper address_mapper: An address mapper that can be used to populate the
@@ -96,10 +105,14 @@ class LazySourceMapper(SourceMapper):
     :param BuildGraph build_graph: The build graph to map sources from.
     :param bool stop_after_match: If `True` a search will not traverse into parent directories once
       an owner is identified.
+    :param SourceOwnerIndex source_owner_index: An optional persistent index to consult instead of
+      populating the `build_graph` for spec paths whose BUILD files have not changed.  The caller
+      should flush it once done querying.
     """
     self._stop_after_match = stop_after_match
     self._build_graph = build_graph
     self._address_mapper = address_mapper
+    self._source_owner_index = source_owner_index
     self._source_to_address = defaultdict(set)
     self._mapped_paths = set()
     self._searched_sources = set()
@@ -147,6 +160,11 @@ class LazySourceMapper(SourceMapper):
 
     :param spec_path: a spec_path of targets from which to map sources.
     """
+    if self._source_owner_index is not None:
+      for source, addresses in self._source_owner_index.owned_sources(spec_path).items():
+        self._source_to_address[source].update(addresses)
+      return
+
     for address in self._address_mapper.addresses_in_spec_path(spec_path):
       self._build_graph.inject_address_closure(address)
       target = self._build_graph.get_target(address)
@@ -0,0 +1,210 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+
+import six
+
+from pants.build_graph.address import Address
+from pants.build_graph.address_lookup_error import AddressLookupError
+from pants.source.payload_fields import DeferredSourcesField
+from pants.source.wrapped_globs import matches_filespec
+from pants.util.dirutil import safe_delete, safe_mkdir_for
+
+
+logger = logging.getLogger(__name__)
+
+
+class SourceOwnerIndex(object):
+  """A persistent index of the sources owned by the targets in each BUILD file family.
+
+  Finding the owners of a source otherwise requires injecting the address closures of every
+  target in the BUILD files at or above the source and expanding all of their globs, work that
+  is thrown away when the process exits.  This index records, per spec path, the sources owned by
+  each address there (both expanded and as filespecs) and persists them in the workdir.
+
+  An entry is keyed by the content of the BUILD files it was computed from and by the listings of
+  the directories its owned sources live in, so edits to BUILD files and files added to or removed
+  from globbed directories cause the entry to be recomputed.  A glob that starts matching files in
+  a directory that previously contributed no sources is not detected until one of the watched
+  listings or BUILD files changes.
+  """
+
+  # Bump this whenever the on-disk format or the way entries are computed changes.
+  _VERSION = 1
+
+  _MISSING = b'\0missing'
+
+  @staticmethod
+  def index_file_for(pants_workdir):
+    """Returns the location of the shared source owner index under `pants_workdir`."""
+    return os.path.join(pants_workdir, 'source_owner_index', 'index.json')
+
+  def __init__(self, address_mapper, build_graph, index_file):
+    """
+    :param address_mapper: The address mapper used to parse the BUILD files of a spec path.
+    :type address_mapper: :class:`pants.build_graph.build_file_address_mapper.BuildFileAddressMapper`
+    :param build_graph: The build graph used to materialize targets for stale entries.
+    :type build_graph: :class:`pants.build_graph.build_graph.BuildGraph`
+    :param string index_file: The path of the file the index is persisted to.
+    """
+    self._address_mapper = address_mapper
+    self._build_graph = build_graph
+    self._index_file = index_file
+    self._entries = self._load()
+    self._validated = set()
+    self._dirty = False
+
+  @property
+  def _root_dir(self):
+    return self._address_mapper.root_dir
+
+  def _load(self):
+    if not os.path.isfile(self._index_file):
+      return {}
+    try:
+      with open(self._index_file, 'r') as fp:
+        stored = json.load(fp)
+    except ValueError as e:
+      logger.warn('Ignoring corrupt source owner index at {}: {}'.format(self._index_file, e))
+      return {}
+    if stored.get('version') != self._VERSION:
+      return {}
+    return stored['spec_paths']
+
+  def flush(self):
+    """Persists any entries computed since the index was loaded or last flushed.
+
+    This rewrites the whole index, so call it once after a batch of queries rather than after each.
+    """
+    if not self._dirty:
+      return
+    safe_mkdir_for(self._index_file)
+    tmp_file = '{}.tmp.{}'.format(self._index_file, os.getpid())
+    try:
+      with open(tmp_file, 'w') as fp:
+        json.dump({'version': self._VERSION, 'spec_paths': self._entries}, fp)
+      os.rename(tmp_file, self._index_file)
+    finally:
+      safe_delete(tmp_file)
+    self._dirty = False
+
+  def _fingerprint(self, build_files, watched_dirs):
+    hasher = hashlib.sha1()
+    for relpath in build_files:
+      hasher.update(relpath.encode('utf-8'))
+      path = os.path.join(self._root_dir, relpath)
+      if os.path.isfile(path):
+        with open(path, 'rb') as fp:
+          hasher.update(fp.read())
+      else:
+        hasher.update(self._MISSING)
+    for relpath in watched_dirs:
+      hasher.update(relpath.encode('utf-8'))
+      path = os.path.join(self._root_dir, relpath)
+      if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+          hasher.update(b'\0')
+          hasher.update(name.encode('utf-8') if isinstance(name, six.text_type) else name)
+      else:
+        hasher.update(self._MISSING)
+    return hasher.hexdigest()
+
+  def _watched_dirs(self, spec_path, sources):
+    watched = {spec_path}
+    for source in sources:
+      path = os.path.dirname(source)
+      if spec_path and not path.startswith(spec_path + os.sep):
+        watched.add(path)
+        continue
+      while path != spec_path:
+        watched.add(path)
+        path = os.path.dirname(path)
+    return sorted(watched)
+
+  def _compute_entry(self, spec_path):
+    try:
+      addresses = self._address_mapper.addresses_in_spec_path(spec_path)
+    except AddressLookupError:
+      addresses = []
+
+    owners = defaultdict(set)
+    filespecs = defaultdict(list)
+    build_files = set()
+    for address in addresses:
+      self._build_graph.inject_address_closure(address)
+      target = self._build_graph.get_target(address)
+      spec = address.spec
+      build_files.add(address.build_file.relpath)
+      owners[address.build_file.relpath].add(spec)
+
+      sources = target.payload.get_field('sources')
+      if sources and not isinstance(sources, DeferredSourcesField):
+        filespecs[spec].append(sources.filespec)
+        for source in target.sources_relative_to_buildroot():
+          owners[source].add(spec)
+
+      if target.has_resources:
+        for resource in target.resources:
+          if not resource.is_synthetic:
+            build_files.add(resource.address.build_file.relpath)
+          filespecs[spec].append(resource.payload.sources.filespec)
+          for source in resource.sources_relative_to_buildroot():
+            owners[source].add(spec)
+
+    build_files = sorted(build_files)
+    watched_dirs = self._watched_dirs(spec_path, owners)
+    return {
+      'fingerprint': self._fingerprint(build_files, watched_dirs),
+      'build_files': build_files,
+      'watched_dirs': watched_dirs,
+      'owners': {source: sorted(specs) for source, specs in owners.items()},
+      'filespecs': filespecs,
+    }
+
+  def _entry(self, spec_path):
+    if spec_path not in self._validated:
+      entry = self._entries.get(spec_path)
+      if (entry is None or
+          entry['fingerprint'] != self._fingerprint(entry['build_files'], entry['watched_dirs'])):
+        self._entries[spec_path] = self._compute_entry(spec_path)
+        self._dirty = True
+      self._validated.add(spec_path)
+    return self._entries[spec_path]
+
+  def owned_sources(self, spec_path):
+    """Returns the sources owned by targets defined at `spec_path`, as expanded on disk.
+
+    :param string spec_path: The spec path whose BUILD files should be consulted.
+    :returns: A mapping from buildroot-relative source path to the set of owning addresses.
+    :rtype: dict of string to set of :class:`pants.build_graph.address.Address`
+    """
+    owners = self._entry(spec_path)['owners']
+    return {source: set(Address.parse(spec) for spec in specs) for source, specs in owners.items()}
+
+  def addresses_matching(self, source, spec_path):
+    """Returns the addresses at `spec_path` whose sources specs match `source`.
+
+    Unlike `owned_sources`, this matches against the filespecs of the targets, so `source` does
+    not need to exist.
+
+    :param string source: The buildroot-relative path of the source to match.
+    :param string spec_path: The spec path whose BUILD files should be consulted.
+    :rtype: list of :class:`pants.build_graph.address.Address`
+    """
+    entry = self._entry(spec_path)
+    matching = set()
+    for spec, filespecs in entry['filespecs'].items():
+      if any(matches_filespec(source, filespec) for filespec in filespecs):
+        matching.add(spec)
+    if source in entry['build_files']:
+      matching.update(entry['owners'].get(source, ()))
+    return [Address.parse(spec) for spec in sorted(matching)]
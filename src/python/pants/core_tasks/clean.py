@@ -12,5 +12,9 @@ from pants.util.dirutil import safe_rmtree
 class Clean(Task):
   """Delete all build products, creating a clean workspace."""
 
+  @classmethod
+  def executes_exclusively(cls):
+    return True
+
   def execute(self):
     safe_rmtree(self.get_options().pants_workdir)
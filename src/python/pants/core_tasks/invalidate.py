@@ -14,6 +14,10 @@ from pants.util.dirutil import safe_rmtree
 class Invalidate(Task):
   """Invalidate the entire build."""
 
+  @classmethod
+  def executes_exclusively(cls):
+    return True
+
   def execute(self):
     build_invalidator_dir = os.path.join(self.get_options().pants_workdir, 'build_invalidator')
     safe_rmtree(build_invalidator_dir)
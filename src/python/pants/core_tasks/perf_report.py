@@ -0,0 +1,96 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import socket
+
+from pants.base.exceptions import TaskError
+from pants.stats.statsdb import StatsDBFactory
+from pants.task.console_task import ConsoleTask
+
+
+class PerfReport(ConsoleTask):
+  """Report the timings of a recorded run that regressed against the runs before it.
+
+  The timings of each goal and task in the run are compared to their baseline over a window of
+  earlier successful runs of the same command on the same machine, as recorded in the statsdb.
+  """
+
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(PerfReport, cls).subsystem_dependencies() + (StatsDBFactory,)
+
+  @classmethod
+  def register_options(cls, register):
+    super(PerfReport, cls).register_options(register)
+    register('--run-id',
+             help='Report on this recorded run.  Defaults to the latest run recorded on this '
+                  'machine, other than runs of perf-report itself.')
+    register('--timings', choices=['cumulative', 'self'], default='cumulative',
+             help='Compare these timings.  Cumulative timings include the time spent in nested '
+                  'workunits, self timings do not.')
+    register('--window', type=int, default=20,
+             help='Compare against up to this many earlier runs of the same command.')
+    register('--min-runs', type=int, default=3,
+             help='Only report on goals and tasks timed in at least this many earlier runs.')
+    register('--percentile', type=int, default=90,
+             help='Report this percentile of the earlier timings, besides their median.')
+    register('--threshold', type=float, default=25.0,
+             help='Report timings that exceed their median by more than this percentage.')
+    register('--min-regression-ms', type=int, default=500,
+             help='Ignore timings that exceed their median by fewer than this many milliseconds.')
+    register('--fail-on-regression', action='store_true', default=False,
+             help='Fail if any timings regressed.')
+
+  def console_output(self, targets):
+    options = self.get_options()
+    statsdb = StatsDBFactory.global_instance().get_db()
+    if options.run_id:
+      run_info = statsdb.get_run_info(run_id=options.run_id)
+    else:
+      # Every run is recorded, including earlier runs of this goal, which are never of interest.
+      run_info = statsdb.get_run_info(machine=socket.gethostname(),
+                                      exclude_cmd_line_like='%perf-report%')
+    if run_info is None:
+      raise TaskError('No run {}found in the statsdb.'.format(
+        '{} '.format(options.run_id) if options.run_id else ''))
+
+    timing_table = '{}_timings'.format(options.timings)
+    timings = statsdb.get_timings_for_run(timing_table, run_info['id'])
+    baselines = statsdb.get_baselines(timing_table,
+                                      cmd_line=run_info['cmd_line'],
+                                      machine=run_info['machine'],
+                                      window=options.window,
+                                      before_run_id=run_info['id'],
+                                      percentile=options.percentile)
+
+    regressions = []
+    for label, timing in timings.items():
+      baseline = baselines.get(label)
+      if baseline is None or baseline.count < options.min_runs:
+        continue
+      excess = timing - baseline.median
+      if (excess >= options.min_regression_ms and
+          excess > baseline.median * options.threshold / 100.0):
+        regressions.append((excess, label, timing, baseline))
+
+    yield 'Run {} ({})'.format(run_info['id'], run_info['cmd_line'])
+    if not regressions:
+      yield 'No regressions.'
+      return
+    for excess, label, timing, baseline in sorted(regressions, reverse=True):
+      increase = '+{:.1f}%'.format(100.0 * excess / baseline.median) if baseline.median else 'n/a'
+      yield ('{label}: {timing:.3f}s, {increase} over median {median:.3f}s '
+             '(p{pct} {percentile:.3f}s over {count} runs)'.format(
+               label=label,
+               timing=timing / 1000.0,
+               increase=increase,
+               median=baseline.median / 1000.0,
+               pct=options.percentile,
+               percentile=baseline.percentile / 1000.0,
+               count=baseline.count))
+    if options.fail_on_regression:
+      raise TaskError('{} timings regressed.'.format(len(regressions)))
@@ -14,6 +14,7 @@ from pants.core_tasks.invalidate import Invalidate
 from pants.core_tasks.list_goals import ListGoals
 from pants.core_tasks.noop import NoopCompile, NoopTest
 from pants.core_tasks.pantsd_kill import PantsDaemonKill
+from pants.core_tasks.perf_report import PerfReport
 from pants.core_tasks.reporting_server_kill import ReportingServerKill
 from pants.core_tasks.reporting_server_run import ReportingServerRun
 from pants.core_tasks.roots import ListRoots
@@ -62,6 +63,9 @@ def register_goals():
   task(name='server', action=ReportingServerRun, serialize=False).install()
   task(name='killserver', action=ReportingServerKill, serialize=False).install()
 
+  # Performance history.
+  task(name='perf-report', action=PerfReport).install()
+
   # Getting help.
   task(name='goals', action=ListGoals).install()
   task(name='options', action=ExplainOptionsTask).install()
@@ -5,15 +5,21 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import heapq
 import os
+import sys
 from collections import OrderedDict, namedtuple
 
+import six
+from six.moves import queue
 from twitter.common.collections.orderedset import OrderedSet
 
 from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnit, WorkUnitLabel
 from pants.engine.engine import Engine
 from pants.engine.round_manager import RoundManager
+from pants.task.console_task import ConsoleTask
 
 
 class GoalExecutor(object):
@@ -21,13 +27,19 @@ class GoalExecutor(object):
   :API: public
   """
 
-  def __init__(self, context, goal, tasktypes_by_name):
+  def __init__(self, context, goal, tasktypes_by_name, producer_infos_by_name=None):
     """
     :API: public
+
+    :param context: The pants run context.
+    :param goal: The goal to execute.
+    :param tasktypes_by_name: The goal's task types by name, in reverse installed order.
+    :param dict producer_infos_by_name: The producers of the data each task requires, by task name.
     """
     self._context = context
     self._goal = goal
     self._tasktypes_by_name = tasktypes_by_name
+    self._producer_infos_by_name = producer_infos_by_name or {}
 
   @property
   def goal(self):
@@ -36,6 +48,18 @@ class GoalExecutor(object):
     """
     return self._goal
 
+  @property
+  def ordered_tasktypes_by_name(self):
+    """The (name, task type) pairs of the goal's tasks, in installed order."""
+    return list(reversed(self._tasktypes_by_name.items()))
+
+  def producer_infos(self, name):
+    """Returns the producers of the data required by the named task of this goal.
+
+    :rtype: set of :class:`pants.engine.round_manager.ProducerInfo`
+    """
+    return self._producer_infos_by_name.get(name, frozenset())
+
   def attempt(self, explain):
     """Attempts to execute the goal's tasks in installed order.
 
@@ -44,18 +68,9 @@ class GoalExecutor(object):
     :param bool explain: If ``True`` then the goal plan will be explained instead of being
                          executed.
     """
-    goal_workdir = os.path.join(self._context.options.for_global_scope().pants_workdir,
-                                self._goal.name)
     with self._context.new_workunit(name=self._goal.name, labels=[WorkUnitLabel.GOAL]):
-      for name, task_type in reversed(self._tasktypes_by_name.items()):
-        task_workdir = os.path.join(goal_workdir, name)
-        task = task_type(self._context, task_workdir)
-        log_config = WorkUnit.LogConfig(level=task.get_options().level, colors=task.get_options().colors)
-        with self._context.new_workunit(name=name, labels=[WorkUnitLabel.TASK], log_config=log_config):
-          if explain:
-            self._context.log.debug('Skipping execution of {} in explain mode'.format(name))
-          else:
-            task.execute()
+      for name, task_type in self.ordered_tasktypes_by_name:
+        self.attempt_task(name, task_type, explain)
 
       if explain:
         reversed_tasktypes_by_name = reversed(self._tasktypes_by_name.items())
@@ -63,6 +78,23 @@ class GoalExecutor(object):
             '{}->{}'.format(name, task_type.__name__) for name, task_type in reversed_tasktypes_by_name)
         print('{goal} [{goal_to_task}]'.format(goal=self._goal.name, goal_to_task=goal_to_task))
 
+  def attempt_task(self, name, task_type, explain=False):
+    """Attempts to execute one of the goal's tasks in a workunit under the current workunit.
+
+    :param string name: The name the task is installed under in this goal.
+    :param type task_type: The task's type.
+    :param bool explain: If ``True`` then the task will be skipped.
+    """
+    task_workdir = os.path.join(self._context.options.for_global_scope().pants_workdir,
+                                self._goal.name, name)
+    task = task_type(self._context, task_workdir)
+    log_config = WorkUnit.LogConfig(level=task.get_options().level, colors=task.get_options().colors)
+    with self._context.new_workunit(name=name, labels=[WorkUnitLabel.TASK], log_config=log_config):
+      if explain:
+        self._context.log.debug('Skipping execution of {} in explain mode'.format(name))
+      else:
+        task.execute()
+
 
 class RoundEngine(Engine):
   """
@@ -82,7 +114,21 @@ class RoundEngine(Engine):
   class MissingProductError(DependencyError):
     """Indicates an expressed data dependency if not provided by any installed task."""
 
-  GoalInfo = namedtuple('GoalInfo', ['goal', 'tasktypes_by_name', 'goal_dependencies'])
+  GoalInfo = namedtuple('GoalInfo', ['goal', 'tasktypes_by_name', 'goal_dependencies',
+                                     'producer_infos_by_name'])
+
+  def __init__(self, max_concurrent_tasks=1):
+    """
+    :API: public
+
+    :param int max_concurrent_tasks: The maximum number of tasks to execute at once.  Tasks are
+                                     executed one at a time in goal order when this is 1, and
+                                     otherwise as soon as the tasks they depend on have executed.
+    """
+    if max_concurrent_tasks < 1:
+      raise ValueError('max_concurrent_tasks must be at least 1, given {}'
+                       .format(max_concurrent_tasks))
+    self._max_concurrent_tasks = max_concurrent_tasks
 
   def _topological_sort(self, goal_info_by_goal):
     dependees_by_goal = OrderedDict()
@@ -148,6 +194,7 @@ class RoundEngine(Engine):
 
     tasktypes_by_name = OrderedDict()
     goal_dependencies = set()
+    producer_infos_by_name = {}
     visited_task_types = set()
     for task_name in reversed(goal.ordered_task_names()):
       task_type = goal.task_type_by_name(task_name)
@@ -163,6 +210,7 @@ class RoundEngine(Engine):
       task_type._prepare(context.options, round_manager)
       try:
         dependencies = round_manager.get_dependencies()
+        producer_infos_by_name[task_name] = dependencies
         for producer_info in dependencies:
           producer_goal = producer_info.goal
           if producer_goal == goal:
@@ -193,7 +241,7 @@ class RoundEngine(Engine):
             "Could not satisfy data dependencies for goal '{name}' with action {action}: {error}"
             .format(name=task_name, action=task_type.__name__, error=e))
 
-    goal_info = self.GoalInfo(goal, tasktypes_by_name, goal_dependencies)
+    goal_info = self.GoalInfo(goal, tasktypes_by_name, goal_dependencies, producer_infos_by_name)
     goal_info_by_goal[goal] = goal_info
 
     for goal_dependency in goal_dependencies:
@@ -210,7 +258,8 @@ class RoundEngine(Engine):
     target_roots_replacement.apply(context)
 
     for goal_info in reversed(list(self._topological_sort(goal_info_by_goal))):
-      yield GoalExecutor(context, goal_info.goal, goal_info.tasktypes_by_name)
+      yield GoalExecutor(context, goal_info.goal, goal_info.tasktypes_by_name,
+                         goal_info.producer_infos_by_name)
 
   def attempt(self, context, goals):
     """
@@ -225,6 +274,10 @@ class RoundEngine(Engine):
       print('Goal Execution Order:\n\n{}\n'.format(execution_goals))
       print('Goal [TaskRegistrar->Task] Order:\n')
 
+    if self._max_concurrent_tasks > 1 and not explain:
+      self._attempt_concurrently(context, goal_executors)
+      return
+
     serialized_goals_executors = [ge for ge in goal_executors if ge.goal.serialize]
     outer_lock_holder = serialized_goals_executors[-1] if serialized_goals_executors else None
 
@@ -239,3 +292,158 @@ class RoundEngine(Engine):
     finally:
       if outer_lock_holder:
         context.release_lock()
+
+  class _TaskNode(object):
+    """A task to execute, with the tasks it must execute after."""
+
+    def __init__(self, index, goal_executor, name, task_type):
+      # The position of the task in goal order, which breaks ties between tasks ready to execute.
+      self.index = index
+      self.goal_executor = goal_executor
+      self.name = name
+      self.task_type = task_type
+      self.dependencies = set()
+      self.dependees = []
+
+  def _task_graph(self, goal_executors):
+    """Returns the tasks of the given goals in goal order, linked to the tasks they depend on.
+
+    Each task depends on the task installed before it in its goal, since a goal's installed order
+    is the only ordering some of its tasks express, and on every task producing data it requires.
+    Console tasks also depend on the console task before them, so their output is not interleaved
+    and appears in goal order.
+
+    Tasks that execute exclusively are barriers: they depend on every task before them in goal
+    order and every task after them depends on them.  Nothing but goal order orders such tasks
+    relative to the others; `clean-all`, for one, deletes the workdir that the tasks of goals after
+    it write to.
+    """
+    nodes = []
+    node_by_producer = {}
+    previous_console_node = None
+    barrier = None
+    nodes_since_barrier = []
+    for goal_executor in goal_executors:
+      previous = None
+      for name, task_type in goal_executor.ordered_tasktypes_by_name:
+        node = self._TaskNode(len(nodes), goal_executor, name, task_type)
+        if previous:
+          node.dependencies.add(previous)
+        if issubclass(task_type, ConsoleTask):
+          if previous_console_node:
+            node.dependencies.add(previous_console_node)
+          previous_console_node = node
+        if barrier:
+          node.dependencies.add(barrier)
+        if task_type.executes_exclusively():
+          node.dependencies.update(nodes_since_barrier)
+          barrier = node
+          nodes_since_barrier = []
+        else:
+          nodes_since_barrier.append(node)
+        nodes.append(node)
+        node_by_producer[(goal_executor.goal, task_type)] = node
+        previous = node
+
+    for node in nodes:
+      for producer_info in node.goal_executor.producer_infos(node.name):
+        producer = node_by_producer.get((producer_info.goal, producer_info.task_type))
+        # Producers later in the same goal were rejected by _visit_goal, and a task may produce
+        # data it requires itself.
+        if producer and producer.index < node.index:
+          node.dependencies.add(producer)
+      for dependency in node.dependencies:
+        dependency.dependees.append(node)
+    return nodes
+
+  def _attempt_concurrently(self, context, goal_executors):
+    """Executes the tasks of the given goals in a pool of threads.
+
+    A task executes as soon as the tasks it depends on have executed successfully.  Each goal's
+    workunit is open from the start of its first task to the end of its last one, and its tasks'
+    workunits nest under it as they do when executing serially.  If a task fails no further tasks
+    are started, and the first failure is raised once the running tasks have finished.
+    """
+    nodes = self._task_graph(goal_executors)
+    remaining_by_goal_executor = OrderedDict((goal_executor, 0)
+                                             for goal_executor in goal_executors)
+    for node in nodes:
+      remaining_by_goal_executor[node.goal_executor] += 1
+    serialized_remaining = sum(remaining for goal_executor, remaining
+                               in remaining_by_goal_executor.items()
+                               if goal_executor.goal.serialize)
+
+    run_tracker = context.run_tracker
+    root_workunit = run_tracker.get_current_workunit()
+    goal_workunits = {}
+    completions = queue.Queue()
+
+    def execute(node, goal_workunit):
+      try:
+        run_tracker.register_thread(goal_workunit)
+        node.goal_executor.attempt_task(node.name, node.task_type)
+      except Exception:
+        completions.put((node, sys.exc_info()))
+      else:
+        completions.put((node, None))
+
+    def start_goal_workunit(goal_executor):
+      workunit_context = run_tracker.new_workunit_under_parent(name=goal_executor.goal.name,
+                                                               parent=root_workunit,
+                                                               labels=[WorkUnitLabel.GOAL])
+      goal_workunits[goal_executor] = (workunit_context, workunit_context.__enter__())
+
+    def end_goal_workunit(goal_executor, exc_info=None):
+      workunit_context, _ = goal_workunits.pop(goal_executor)
+      workunit_context.__exit__(*(exc_info or (None, None, None)))
+
+    if serialized_remaining:
+      context.acquire_lock()
+    worker_pool = WorkerPool(root_workunit, run_tracker, self._max_concurrent_tasks)
+    ready = [(node.index, node) for node in nodes if not node.dependencies]
+    running = 0
+    failure = None
+    try:
+      while ready or running:
+        while ready and running < self._max_concurrent_tasks and not failure:
+          _, node = heapq.heappop(ready)
+          if node.goal_executor not in goal_workunits:
+            start_goal_workunit(node.goal_executor)
+          _, goal_workunit = goal_workunits[node.goal_executor]
+          worker_pool.submit_async_work(Work(execute, [(node, goal_workunit)]))
+          running += 1
+        if not running:
+          break
+
+        # A timeout is needed for python to deliver SIGINT while waiting on the queue.
+        node, exc_info = completions.get(timeout=1000000000)
+        running -= 1
+        if exc_info:
+          failure = failure or exc_info
+          end_goal_workunit(node.goal_executor, exc_info)
+          continue
+
+        for dependee in node.dependees:
+          dependee.dependencies.discard(node)
+          if not dependee.dependencies:
+            heapq.heappush(ready, (dependee.index, dependee))
+        remaining_by_goal_executor[node.goal_executor] -= 1
+        if not remaining_by_goal_executor[node.goal_executor]:
+          end_goal_workunit(node.goal_executor)
+        if node.goal_executor.goal.serialize:
+          serialized_remaining -= 1
+          if not serialized_remaining:
+            context.release_lock()
+    except BaseException:
+      worker_pool.abort()
+      raise
+    else:
+      worker_pool.shutdown()
+    finally:
+      for goal_executor in list(goal_workunits):
+        end_goal_workunit(goal_executor, failure or sys.exc_info())
+      if serialized_remaining:
+        context.release_lock()
+
+    if failure:
+      six.reraise(*failure)
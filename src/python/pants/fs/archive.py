@@ -6,8 +6,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+import struct
+import time
+import zipfile
+import zlib
 from abc import abstractmethod
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 from zipfile import ZIP_DEFLATED, ZIP_STORED
 
 from pants.util.contextutil import open_tar, open_zip
@@ -33,6 +38,13 @@ class Archiver(AbstractClass):
     If prefix is specified, it should be prepended to all archive paths.
     """
 
+  def configured(self, compression_level=None, parallelism=1):
+    """Returns a copy of this archiver that compresses with the given level and parallelism.
+
+    Archivers that don't support configuring their compression return themselves.
+    """
+    return self
+
 
 class TarArchiver(Archiver):
   """An archiver that stores files in a tar file with optional compression.
@@ -48,13 +60,29 @@ class TarArchiver(Archiver):
     with open_tar(path, errorlevel=1) as tar:
       tar.extractall(outdir)
 
-  def __init__(self, mode, extension):
+  def __init__(self, mode, extension, compression_level=None, parallelism=1):
     """
     :API: public
+
+    :param string mode: The `tarfile` mode to write archives with, eg: 'w:gz'.
+    :param string extension: The extension of the archives created.
+    :param int compression_level: The compression level to use for compressed modes; by default
+                                  that of `tarfile`.
+    :param int parallelism: The number of threads to gzip archives with.  Archives are then
+                            written as a series of independently compressed gzip members, which any
+                            gzip reader can decompress.  Ignored for modes other than 'w:gz'.
     """
     super(TarArchiver, self).__init__()
     self.mode = mode
     self.extension = extension
+    self.compression_level = compression_level
+    self.parallelism = parallelism
+
+  def configured(self, compression_level=None, parallelism=1):
+    """
+    :API: public
+    """
+    return TarArchiver(self.mode, self.extension, compression_level, parallelism)
 
   def create(self, basedir, outdir, name, prefix=None):
     """
@@ -62,11 +90,91 @@ class TarArchiver(Archiver):
     """
     basedir = ensure_text(basedir)
     tarpath = os.path.join(outdir, '{}.{}'.format(ensure_text(name), self.extension))
-    with open_tar(tarpath, self.mode, dereference=True, errorlevel=1) as tar:
-      tar.add(basedir, arcname=prefix or '.')
+    if self.mode == 'w:gz' and self.parallelism > 1:
+      level = zlib.Z_BEST_COMPRESSION if self.compression_level is None else self.compression_level
+      with open(tarpath, 'wb') as fp:
+        with _ParallelGzipWriter(fp, level, self.parallelism) as gzip_fp:
+          with open_tar(gzip_fp, 'w:', dereference=True, errorlevel=1) as tar:
+            tar.add(basedir, arcname=prefix or '.')
+    else:
+      kwargs = {}
+      if self.compression_level is not None and self.mode in ('w:gz', 'w:bz2'):
+        kwargs['compresslevel'] = self.compression_level
+      with open_tar(tarpath, self.mode, dereference=True, errorlevel=1, **kwargs) as tar:
+        tar.add(basedir, arcname=prefix or '.')
     return tarpath
 
 
+class _ParallelGzipWriter(object):
+  """A write-only file object that gzips what is written to it on a pool of threads.
+
+  The data is split into blocks, each of which is compressed into a gzip member of its own;
+  zlib releases the GIL while compressing, so the blocks are compressed in parallel.
+  """
+
+  _BLOCK_SIZE = 1024 * 1024
+
+  # A gzip member header: deflate, no flags, no mtime (for reproducible archives), unknown OS.
+  _HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+  @classmethod
+  def _compress(cls, args):
+    block, level = args
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return b''.join((cls._HEADER,
+                     compressor.compress(block),
+                     compressor.flush(),
+                     struct.pack(b'<2L', zlib.crc32(block) & 0xffffffff, len(block) & 0xffffffff)))
+
+  def __init__(self, fp, level, parallelism):
+    self._fp = fp
+    self._level = level
+    self._parallelism = parallelism
+    self._pool = ThreadPool(processes=parallelism)
+    self._buffer = []
+    self._buffered = 0
+    self._pending = []
+    self._offset = 0
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    try:
+      if exc_type is None:
+        self.close()
+    finally:
+      self._pool.terminate()
+      self._pool.join()
+
+  def tell(self):
+    return self._offset
+
+  def write(self, data):
+    self._buffer.append(data)
+    self._buffered += len(data)
+    self._offset += len(data)
+    if self._buffered >= self._BLOCK_SIZE:
+      self._submit(b''.join(self._buffer))
+      self._buffer = []
+      self._buffered = 0
+
+  def _submit(self, block):
+    self._pending.append(self._pool.apply_async(self._compress, [(block, self._level)]))
+    # Bound the memory held by blocks in flight.
+    while len(self._pending) > 2 * self._parallelism:
+      self._fp.write(self._pending.pop(0).get())
+
+  def close(self):
+    if self._buffered or not self._offset:
+      self._submit(b''.join(self._buffer))
+      self._buffer = []
+      self._buffered = 0
+    for result in self._pending:
+      self._fp.write(result.get())
+    self._pending = []
+
+
 class ZipArchiver(Archiver):
   """An archiver that stores files in a zip file with optional compression.
 
@@ -97,33 +205,128 @@ class ZipArchiver(Archiver):
           if (not filter_func or filter_func(name)):
             archive_file.extract(name, outdir)
 
-  def __init__(self, compression, extension):
+  def __init__(self, compression, extension, compression_level=None, parallelism=1):
     """
     :API: public
+
+    :param int compression: `zipfile.ZIP_DEFLATED` or `zipfile.ZIP_STORED`.
+    :param string extension: The extension of the archives created.
+    :param int compression_level: The zlib compression level to deflate entries with, where 0
+                                  stores them uncompressed; by default that of `zipfile`.
+    :param int parallelism: The number of threads to compress entries with.
     """
     super(ZipArchiver, self).__init__()
     self.compression = compression
     self.extension = extension
+    self.compression_level = compression_level
+    self.parallelism = parallelism
+
+  def configured(self, compression_level=None, parallelism=1):
+    """
+    :API: public
+    """
+    return ZipArchiver(self.compression, self.extension, compression_level, parallelism)
 
   def create(self, basedir, outdir, name, prefix=None):
     """
     :API: public
     """
     zippath = os.path.join(outdir, '{}.{}'.format(name, self.extension))
-    with open_zip(zippath, 'w', compression=self.compression) as zip:
-      # For symlinks, we want to archive the actual content of linked files but
-      # under the relpath derived from symlink.
-      for root, _, files in safe_walk(basedir, followlinks=True):
-        root = ensure_text(root)
-        for file in files:
-          file = ensure_text(file)
-          full_path = os.path.join(root, file)
-          relpath = os.path.relpath(full_path, basedir)
-          if prefix:
-            relpath = os.path.join(ensure_text(prefix), relpath)
+    compression = ZIP_STORED if self.compression_level == 0 else self.compression
+    with open_zip(zippath, 'w', compression=compression) as zip:
+      entries = self._entries(basedir, prefix)
+      if compression == ZIP_DEFLATED and (self.compression_level is not None or
+                                          self.parallelism > 1):
+        self._write_compressed(zip, entries)
+      else:
+        for full_path, relpath in entries:
           zip.write(full_path, relpath)
     return zippath
 
+  @staticmethod
+  def _entries(basedir, prefix):
+    # For symlinks, we want to archive the actual content of linked files but
+    # under the relpath derived from symlink.
+    for root, _, files in safe_walk(basedir, followlinks=True):
+      root = ensure_text(root)
+      for file in files:
+        file = ensure_text(file)
+        full_path = os.path.join(root, file)
+        relpath = os.path.relpath(full_path, basedir)
+        if prefix:
+          relpath = os.path.join(ensure_text(prefix), relpath)
+        yield full_path, relpath
+
+  # Files larger than this are compressed in a streaming fashion by `zipfile` rather than being
+  # read into memory to be compressed in parallel.
+  _MAX_PARALLEL_FILE_SIZE = 64 * 1024 * 1024
+
+  def _compress(self, entry):
+    full_path, relpath = entry
+    info = self._zipinfo(full_path, relpath)
+    if os.path.getsize(full_path) > self._MAX_PARALLEL_FILE_SIZE:
+      return info, None
+    with open(full_path, 'rb') as fp:
+      data = fp.read()
+    level = zlib.Z_DEFAULT_COMPRESSION if self.compression_level is None else self.compression_level
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    info.compress_type = ZIP_DEFLATED
+    info.CRC = zlib.crc32(data) & 0xffffffff
+    info.file_size = len(data)
+    return info, compressor.compress(data) + compressor.flush()
+
+  @staticmethod
+  def _zipinfo(full_path, relpath):
+    st = os.stat(full_path)
+    info = zipfile.ZipInfo(relpath, time.localtime(st.st_mtime)[0:6])
+    info.external_attr = (st.st_mode & 0xFFFF) << 16
+    return info
+
+  def _write_compressed(self, zip, entries):
+    pool = ThreadPool(processes=self.parallelism)
+    try:
+      window = []
+      for entry in entries:
+        window.append((entry, pool.apply_async(self._compress, [entry])))
+        # Bound the memory held by entries in flight.
+        if len(window) > 4 * self.parallelism:
+          self._write_entry(zip, *window.pop(0))
+      for entry, result in window:
+        self._write_entry(zip, entry, result)
+    finally:
+      pool.terminate()
+      pool.join()
+
+  @staticmethod
+  def _write_entry(zip, entry, result):
+    info, data = result.get()
+    if data is None:
+      zip.write(*entry)
+    else:
+      write_compressed_entry(zip, info, data)
+
+
+def write_compressed_entry(zf, info, data):
+  """Writes an entry whose data is already compressed to an open zip file.
+
+  :API: public
+
+  :param zf: The zip file to write to.
+  :type zf: :class:`zipfile.ZipFile`
+  :param info: The entry, with its `compress_type`, `CRC` and `file_size` set.
+  :type info: :class:`zipfile.ZipInfo`
+  :param bytes data: The entry's data, compressed according to `info.compress_type`.
+  """
+  info.compress_size = len(data)
+  info.header_offset = zf.fp.tell()
+  zf._writecheck(info)
+  zf._didModify = True
+  zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+  zf.fp.write(info.FileHeader(zip64))
+  zf.fp.write(data)
+  zf.filelist.append(info)
+  zf.NameToInfo[info.filename] = info
+
 
 TAR = TarArchiver('w:', 'tar')
 TGZ = TarArchiver('w:gz', 'tar.gz')
@@ -136,11 +339,16 @@ _ARCHIVER_BY_TYPE = OrderedDict(tar=TAR, tgz=TGZ, tbz2=TBZ2, zip=ZIP, jar=JAR)
 TYPE_NAMES = frozenset(_ARCHIVER_BY_TYPE.keys())
 
 
-def archiver(typename):
+def archiver(typename, compression_level=None, parallelism=1):
   """Returns Archivers in common configurations.
 
   :API: public
 
+  :param string typename: The type of archiver to return, see below.
+  :param int compression_level: The compression level to use, if the archive type is compressed.
+                                A level of 0 creates store-only zips.
+  :param int parallelism: The number of threads to compress 'tgz' and 'zip' archives with.
+
   The typename must correspond to one of the following:
   'tar'   Returns a tar archiver that applies no compression and emits .tar files.
   'tgz'   Returns a tar archiver that applies gzip compression and emits .tar.gz files.
@@ -155,6 +363,8 @@ def archiver(typename):
   archiver = _ARCHIVER_BY_TYPE.get(typename)
   if not archiver:
     raise ValueError('No archiver registered for {!r}'.format(typename))
+  if compression_level is not None or parallelism > 1:
+    return archiver.configured(compression_level=compression_level, parallelism=parallelism)
   return archiver
 
 
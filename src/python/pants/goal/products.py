@@ -26,6 +26,9 @@ class UnionProducts(object):
 
   When products for multiple targets are requested, an ordered union is provided.
 
+  Copies share the product sets of the targets they have not modified with the UnionProducts they
+  were copied from: a target's set is only cloned when it is first modified on either side.
+
   :API: public
   """
 
@@ -35,6 +38,10 @@ class UnionProducts(object):
     """
     # A map of target to OrderedSet of product members.
     self._products_by_target = products_by_target or defaultdict(OrderedSet)
+    # The targets whose product sets are not shared with any copy, and so may be edited in place.
+    self._owned_targets = set(self._products_by_target)
+    # A lazily computed map of product member to the OrderedSet of targets that have it.
+    self._targets_by_product = None
 
   def copy(self):
     """Returns a copy of this UnionProducts.
@@ -48,16 +55,32 @@ class UnionProducts(object):
     :rtype: :class:`UnionProducts`
     """
     products_by_target = defaultdict(OrderedSet)
-    for key, value in self._products_by_target.items():
-      products_by_target[key] = OrderedSet(value)
-    return UnionProducts(products_by_target=products_by_target)
+    products_by_target.update(self._products_by_target)
+    # Both sides now share every product set, so neither may edit them in place.
+    self._owned_targets = set()
+    copied = UnionProducts(products_by_target=products_by_target)
+    copied._owned_targets = set()
+    return copied
+
+  def _products_for_update(self, target):
+    """Returns the product set for `target`, cloning it first if it is shared with a copy."""
+    if target not in self._owned_targets:
+      self._products_by_target[target] = OrderedSet(self._products_by_target.get(target, ()))
+      self._owned_targets.add(target)
+    return self._products_by_target[target]
 
   def add_for_target(self, target, products):
     """Updates the products for a particular target, adding to existing entries.
 
     :API: public
     """
-    self._products_by_target[target].update(products)
+    products_for_target = self._products_for_update(target)
+    if self._targets_by_product is None:
+      products_for_target.update(products)
+    else:
+      for product in products:
+        products_for_target.add(product)
+        self._targets_by_product[product].add(target)
 
   def add_for_targets(self, targets, products):
     """Updates the products for the given targets, adding to existing entries.
@@ -73,8 +96,14 @@ class UnionProducts(object):
 
     :API: public
     """
+    products_for_target = self._products_for_update(target)
     for product in products:
-      self._products_by_target[target].discard(product)
+      products_for_target.discard(product)
+      if self._targets_by_product is not None and product in self._targets_by_product:
+        targets = self._targets_by_product[product]
+        targets.discard(target)
+        if not targets:
+          del self._targets_by_product[product]
 
   def get_for_target(self, target):
     """Gets the products for the given target.
@@ -90,7 +119,7 @@ class UnionProducts(object):
     """
     products = OrderedSet()
     for target in targets:
-      products.update(self._products_by_target[target])
+      products.update(self._products_by_target.get(target, ()))
     return products
 
   def get_product_target_mappings_for_targets(self, targets):
@@ -103,7 +132,7 @@ class UnionProducts(object):
     """
     product_target_mappings = []
     for target in targets:
-      for product in self._products_by_target[target]:
+      for product in self._products_by_target.get(target, ()):
         product_target_mappings.append((product, target))
 
     return product_target_mappings
@@ -111,15 +140,21 @@ class UnionProducts(object):
   def target_for_product(self, product):
     """Looks up the target key for a product.
 
+    If several targets have the product, any one of them may be returned.
+
     :API: public
 
     :param product: The product to search for
     :return: None if there is no target for the product
     """
-    for target, products in self._products_by_target.items():
-      if product in products:
-        return target
-    return None
+    if self._targets_by_product is None:
+      targets_by_product = defaultdict(OrderedSet)
+      for target, products in self._products_by_target.items():
+        for member in products:
+          targets_by_product[member].add(target)
+      self._targets_by_product = targets_by_product
+    targets = self._targets_by_product.get(product)
+    return next(iter(targets)) if targets else None
 
   def __str__(self):
     return "UnionProducts({})".format(self._products_by_target)
@@ -111,6 +111,10 @@ class RunTracker(Subsystem):
     # Time spent in a workunit, not including its children.
     self.self_timings = AggregatedTimings(os.path.join(self.run_info_dir, 'self_timings'))
 
+    # Time spent in each phase of parsing BUILD files.
+    self.build_file_parse_timings = AggregatedTimings(os.path.join(self.run_info_dir,
+                                                                   'build_file_parse_timings'))
+
     # Hit/miss stats for the artifact cache.
     self.artifact_cache_stats = \
       ArtifactCacheStats(os.path.join(self.run_info_dir, 'artifact_cache_stats'))
@@ -153,6 +157,13 @@ class RunTracker(Subsystem):
     """
     self._threadlocal.current_workunit = parent_workunit
 
+  def get_current_workunit(self):
+    """Returns the workunit new work in the calling thread is created under.
+
+    :API: public
+    """
+    return self._threadlocal.current_workunit
+
   def is_under_main_root(self, workunit):
     """Is the workunit running under the main thread's root.
 
@@ -309,6 +320,7 @@ class RunTracker(Subsystem):
       'run_info': self.run_info.get_as_dict(),
       'cumulative_timings': self.cumulative_timings.get_all(),
       'self_timings': self.self_timings.get_all(),
+      'build_file_parse_timings': self.build_file_parse_timings.get_all(),
       'artifact_cache_stats': self.artifact_cache_stats.get_all(),
       'outcomes': self.outcomes
     }
@@ -6,14 +6,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
-import shutil
 import sys
 from hashlib import sha1
 
 from pants.build_graph.build_graph import sort_targets
 from pants.build_graph.target import Target
 from pants.invalidation.build_invalidator import BuildInvalidator, CacheKeyGenerator
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import clone_tree, safe_mkdir
 
 
 class VersionedTargetSet(object):
@@ -145,13 +144,16 @@ class VersionedTarget(VersionedTargetSet):
     super(VersionedTarget, self).__init__(cache_manager, [self])
     self.id = target.id
 
-  def create_results_dir(self, root_dir, allow_incremental):
+  def create_results_dir(self, root_dir, allow_incremental, clone_strategy='copy'):
     """Ensures that a results_dir exists under the given root_dir for this versioned target.
 
     If incremental=True, attempts to clone the results_dir for the previous version of this target
     to the new results dir. Otherwise, simply ensures that the results dir exists.
 
     :API: public
+
+    :param string clone_strategy: How to clone the files of the previous results dir: one of the
+                                  strategies of :func:`pants.util.dirutil.clone_tree`.
     """
     def dirname(key):
       def version_to_string(task_ver):
@@ -174,7 +176,7 @@ class VersionedTarget(VersionedTargetSet):
       old_dir = dirname(self.previous_cache_key)
       self._previous_results_dir = old_dir
       if os.path.isdir(old_dir) and not os.path.isdir(new_dir):
-        shutil.copytree(old_dir, new_dir)
+        clone_tree(old_dir, new_dir, strategy=clone_strategy)
     else:
       safe_mkdir(new_dir)
 
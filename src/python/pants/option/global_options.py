@@ -63,6 +63,10 @@ class GlobalOptionsRegistrar(Optionable):
 
     register('--backend-packages', advanced=True, type=list_option,
              help='Load backends from these packages that are already on the path.')
+    register('--lazy-backends', advanced=True, action='store_true', default=False,
+             help='Only load the backends that declare metadata once they are needed: by the '
+                  'requested goals, by the option scopes set on the command line or by the '
+                  'aliases used in BUILD files.')
 
     register('--pants-bootstrapdir', advanced=True, metavar='<dir>', default=get_pants_cachedir(),
              help='Use this dir for global cache.')
@@ -154,14 +158,34 @@ class GlobalOptionsRegistrar(Optionable):
     register('--workdir-max-build-entries', advanced=True, type=int, default=None,
              help='Maximum number of previous builds to keep per task target pair in workdir. '
              'If set, minimum 2 will always be kept to support incremental compilation.')
+    register('--results-dir-clone-strategy', advanced=True, choices=['copy', 'reflink'],
+             default='reflink', recursive=True,
+             help='How incremental tasks seed the results dir of a target from its previous one.  '
+                  'copy copies every file.  reflink shares file data copy-on-write where the '
+                  'filesystem supports it, and otherwise copies.')
     register('--max-subprocess-args', advanced=True, type=int, default=100, recursive=True,
              help='Used to limit the number of arguments passed to some subprocesses by breaking '
              'the command up into multiple invocations.')
+    register('--max-concurrent-tasks', advanced=True, type=int, default=1,
+             help='Execute up to this many tasks at once.  Tasks of different goals that neither '
+                  'require data from one another nor depend on tasks that do are executed '
+                  'concurrently; the tasks of a single goal always execute in installed order, '
+                  'and tasks that must execute alone, like clean-all, do so in goal order.')
     register('--print-exception-stacktrace', advanced=True, action='store_true',
              help='Print to console the full exception stack trace if encountered.')
     register('--build-file-rev', advanced=True,
              help='Read BUILD files from this scm rev instead of from the working tree.  This is '
              'useful for implementing pants-aware sparse checkouts.')
+    register('--build-file-rev-prefetch', advanced=True, action='store_true', default=False,
+             help='When reading BUILD files from --build-file-rev, load the listing of the whole '
+                  'tree at that rev with one git call and read BUILD files in batches, rather than '
+                  'making a git round trip per directory and file.')
+    register('--build-file-code-cache', advanced=True, action='store_true', default=True,
+             help='Cache compiled BUILD file code objects in the workdir, keyed by BUILD file '
+                  'content and the registered BUILD file aliases.')
+    register('--parallel-build-file-scan', advanced=True, action='store_true', default=False,
+             help='Walk directories and compile BUILD files in a pool of subprocesses when scanning '
+                  'for all BUILD files under a directory, e.g. for :: specs.')
     register('--lock', advanced=True, action='store_true', default=True,
              help='Use a global lock to exclude other versions of pants from running during '
                   'critical operations.')
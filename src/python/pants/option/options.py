@@ -206,6 +206,20 @@ class Options(object):
     """
     return scope in self._known_scope_to_info
 
+  def add_known_scope_infos(self, scope_infos):
+    """Makes scopes that only became known after this instance was created known to it.
+
+    This is for scopes registered by backends that are loaded late.  The command line was split
+    without these scopes, so their option values come from the config, the environment and the
+    option defaults only.
+
+    :param scope_infos: ScopeInfos for the new scopes; their enclosing scopes are added as needed.
+    """
+    new_scope_infos = [si for si in self.complete_scopes(scope_infos)
+                       if si.scope not in self._known_scope_to_info]
+    self._parser_hierarchy.add_scope_infos(new_scope_infos)
+    self._known_scope_to_info.update((si.scope, si) for si in new_scope_infos)
+
   def passthru_args_for_scope(self, scope):
     # Passthru args "belong" to the last scope mentioned on the command-line.
 
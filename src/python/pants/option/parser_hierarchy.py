@@ -24,15 +24,28 @@ class ParserHierarchy(object):
   """
 
   def __init__(self, env, config, scope_infos, option_tracker):
+    self._env = env
+    self._config = config
+    self._option_tracker = option_tracker
+    self._parser_by_scope = {}
+    self.add_scope_infos(scope_infos)
+
+  def add_scope_infos(self, scope_infos):
+    """Adds parsers for the given scopes, skipping any that already have one.
+
+    The enclosing scope of each new scope must either already have a parser or be among the
+    given scopes.
+    """
     # Sorting ensures that ancestors precede descendants.
     scope_infos = sorted(set(list(scope_infos)), key=lambda si: si.scope)
-    self._parser_by_scope = {}
     for scope_info in scope_infos:
       scope = scope_info.scope
+      if scope in self._parser_by_scope:
+        continue
       parent_parser = (None if scope == GLOBAL_SCOPE else
                        self._parser_by_scope[enclosing_scope(scope)])
-      self._parser_by_scope[scope] = Parser(env, config, scope_info, parent_parser,
-                                            option_tracker=option_tracker)
+      self._parser_by_scope[scope] = Parser(self._env, self._config, scope_info, parent_parser,
+                                            option_tracker=self._option_tracker)
 
   def get_parser_by_scope(self, scope):
     try:
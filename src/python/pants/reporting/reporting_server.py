@@ -49,6 +49,7 @@ class PantsHandler(BaseHTTPServer.BaseHTTPRequestHandler):
       ('/run/', self._handle_run),  # Show a report for a single pants run.
       ('/stats/', self._handle_stats),  # Show a stats analytics page.
       ('/statsdata/', self._handle_statsdata),  # Get JSON stats data.
+      ('/trend/', self._handle_trend),  # Show the timing trend of a label.
       ('/browse/', self._handle_browse),  # Browse filesystem under build root.
       ('/content/', self._handle_content),  # Show content of file.
       ('/assets/', self._handle_assets),  # Statically serve assets (css, js etc.)
@@ -154,6 +155,47 @@ class PantsHandler(BaseHTTPServer.BaseHTTPRequestHandler):
     statsdata = list(statsdb.get_aggregated_stats_for_cmd_line('cumulative_timings', '%'))
     self._send_content(json.dumps(statsdata), 'application/json')
 
+  def _handle_trend(self, relpath, params):
+    """Show the timings of a label over recent runs in the statsdb, against their baselines."""
+    def param(name, default):
+      return params.get(name, [default])[0]
+
+    timing_table = '{}_timings'.format(
+      'self' if param('timings', 'cumulative') == 'self' else 'cumulative')
+    threshold = float(param('threshold', 25))
+    label = param('label', None)
+
+    statsdb = StatsDBFactory.global_instance().get_db()
+    args = self._default_template_args('trend')
+    args.update({'timings': timing_table.split('_')[0], 'threshold': threshold})
+    if label is None:
+      args['labels'] = [{'label': l, 'link': urllib.urlencode({'label': l})}
+                        for l in statsdb.get_labels(timing_table)]
+    else:
+      trend = statsdb.get_timing_trend(timing_table, label,
+                                       cmd_line_like=param('cmd_line', '%'),
+                                       machine=param('machine', None),
+                                       limit=int(param('limit', 100)),
+                                       window=int(param('window', 20)))
+      max_timing = max([point.timing for point in trend] or [0]) or 1
+      points = []
+      for point in reversed(trend):
+        regressed = (point.baseline is not None and
+                     point.timing > point.baseline * (1 + threshold / 100.0))
+        points.append({
+          'run_id': point.run_id,
+          'time_text': datetime.fromtimestamp(point.timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+          'machine': point.machine,
+          'cmd_line': point.cmd_line,
+          'timing_text': '{:.3f}'.format(point.timing / 1000.0),
+          'baseline_text': ('{:.3f}'.format(point.baseline / 1000.0)
+                            if point.baseline is not None else '-'),
+          'bar_width': int(100.0 * point.timing / max_timing),
+          'regressed': regressed,
+        })
+      args.update({'label': label, 'points': points})
+    self._send_content(self._renderer.render_name('base', args), 'text/html')
+
   def _handle_browse(self, relpath, params):
     """Handle requests to browse the filesystem under the build root."""
     abspath = os.path.normpath(os.path.join(self._root, relpath))
@@ -271,8 +271,8 @@ class Git(Scm):
   def _log_call(self, cmd):
     self._log.debug('Executing: ' + ' '.join(cmd))
 
-  def repo_reader(self, rev):
-    return GitRepositoryReader(self, rev)
+  def repo_reader(self, rev, prefetch=False):
+    return GitRepositoryReader(self, rev, prefetch=prefetch)
 
 
 class GitRepositoryReader(object):
@@ -280,14 +280,31 @@ class GitRepositoryReader(object):
   Allows reading from files and directory information from an arbitrary git
   commit. This is useful for pants-aware git sparse checkouts.
 
+  Trees are read lazily, one `git cat-file` round trip per directory, unless `prefetch` is set, in
+  which case the listing of the whole commit is loaded with a single `git ls-tree -r` on first
+  use.  Either way parsed trees are shared by sha between readers, so unchanged directories are
+  only read once across revisions.
   """
 
-  def __init__(self, scm, rev):
+  # Trees are immutable, so parsed trees are cached by sha for all readers; the cache is simply
+  # dropped when it reaches this many trees.
+  _MAX_CACHED_TREES = 100000
+  _trees_by_sha = {}
+
+  # The number of requests written to `git cat-file --batch` before reading their responses.  The
+  # requests of a batch must fit in the pipe's buffer, or git and pants could deadlock.
+  _BATCH_SIZE = 256
+
+  def __init__(self, scm, rev, prefetch=False):
     self.scm = scm
     self.rev = rev
+    self._prefetch = prefetch
     self._cat_file_process = None
     # Trees is a dict from path to [list of Dir, Symlink or File objects]
     self._trees = {}
+    self._trees_loaded = False
+    # Blob contents read ahead by `prefetch_blobs`, by path; consumed by `open`.
+    self._blobs = {}
     self._realpath_cache = {'.': './', '': './'}
 
   def _maybe_start_cat_file_process(self):
@@ -364,18 +381,21 @@ class GitRepositoryReader(object):
     return False
 
   class Symlink(object):
+    __slots__ = ('name', 'sha')
 
     def __init__(self, name, sha):
       self.name = name
       self.sha = sha
 
   class Dir(object):
+    __slots__ = ('name', 'sha')
 
     def __init__(self, name, sha):
       self.name = name
       self.sha = sha
 
   class File(object):
+    __slots__ = ('name', 'sha')
 
     def __init__(self, name, sha):
       self.name = name
@@ -414,12 +434,42 @@ class GitRepositoryReader(object):
       yield open(path, 'rb')
       return
 
+    data = self._blobs.pop(path, None)
+    if data is not None:
+      yield StringIO.StringIO(data)
+      return
+
     object_type, data = self._read_object_from_repo(rev=self.rev, relpath=path)
     if object_type == 'tree':
       raise self.IsDirException(self.rev, relpath)
     assert object_type == 'blob'
     yield StringIO.StringIO(data)
 
+  def prefetch_blobs(self, relpaths):
+    """Reads the contents of the given files ahead of their being opened.
+
+    The files are requested from git in batches rather than one round trip at a time.  Paths that
+    are not files in the repository are ignored here and fail as usual when opened.
+
+    :param relpaths: The relative paths of the files that will be opened.
+    """
+    entries = []
+    for relpath in relpaths:
+      try:
+        path = self._realpath(relpath)
+      except (self.MissingFileException, self.NotADirException, self.SymlinkLoopException):
+        continue
+      if path.endswith('/') or path.startswith('../') or path[0] == '/' or path in self._blobs:
+        continue
+      parent, _, name = path.rpartition('/')
+      entries.append((path, self._read_tree(parent)[name].sha))
+
+    for i in range(0, len(entries), self._BATCH_SIZE):
+      paths, shas = zip(*entries[i:i + self._BATCH_SIZE])
+      for path, (object_type, data) in zip(paths, self._read_objects(shas)):
+        assert object_type == 'blob'
+        self._blobs[path] = data
+
   def _realpath(self, relpath):
     """Follow symlinks to find the real path to a file or directory in the repo.
 
@@ -511,11 +561,39 @@ class GitRepositoryReader(object):
     path = self._fixup_dot_relative(path)
 
     tree = self._trees.get(path)
-    if tree:
+    if tree is not None:
+      return tree
+
+    if self._prefetch:
+      if not self._trees_loaded:
+        self._load_trees()
+        tree = self._trees.get(path)
+      if tree is None:
+        raise self.MissingFileException(self.rev, path)
       return tree
+
+    sha = None
+    if path:
+      parent, _, name = path.rpartition('/')
+      entry = self._read_tree(parent).get(name)
+      if isinstance(entry, self.Dir):
+        sha = entry.sha
+        tree = self._trees_by_sha.get(sha)
+
+    if tree is None:
+      if sha:
+        object_type, tree_data = self._read_object_from_repo(sha=sha)
+      else:
+        object_type, tree_data = self._read_object_from_repo(rev=self.rev, relpath=path)
+      assert object_type == 'tree'
+      tree = self._parse_tree(tree_data)
+      if sha:
+        self._cache_tree(sha, tree)
+    self._trees[path] = tree
+    return tree
+
+  def _parse_tree(self, tree_data):
     tree = {}
-    object_type, tree_data = self._read_object_from_repo(rev=self.rev, relpath=path)
-    assert object_type == 'tree'
     # The tree data here is (mode ' ' filename \0 20-byte-sha)*
     i = 0
     while i < len(tree_data):
@@ -536,9 +614,50 @@ class GitRepositoryReader(object):
         tree[name] = self.Dir(name, sha)
       else:
         tree[name] = self.File(name, sha)
-    self._trees[path] = tree
     return tree
 
+  @classmethod
+  def _cache_tree(cls, sha, tree):
+    if len(cls._trees_by_sha) >= cls._MAX_CACHED_TREES:
+      cls._trees_by_sha.clear()
+    cls._trees_by_sha[sha] = tree
+
+  def _load_trees(self):
+    """Loads the listing of every tree in the revision with a single `git ls-tree`."""
+    self._trees_loaded = True
+    cmdline = self.scm._create_git_cmdline(['ls-tree', '-r', '-t', '-z', '--full-tree', self.rev])
+    process = subprocess.Popen(cmdline, stdout=subprocess.PIPE)
+    out, _ = process.communicate()
+    if process.returncode != 0:
+      raise self.MissingFileException(self.rev, '')
+
+    # Each entry is `<mode> SP <type> SP <sha> TAB <path>`; with -t, trees are listed before
+    # their contents.
+    trees = {'': {}}
+    for line in out.split(NUL):
+      if not line:
+        continue
+      meta, path = line.split(b'\t', 1)
+      mode, object_type, sha = meta.split(SPACE)
+      parent, _, name = path.rpartition(SLASH)
+      if object_type == 'tree':
+        entry = self.Dir(name, sha)
+        cached = self._trees_by_sha.get(sha)
+        trees[path] = cached if cached is not None else {}
+      elif mode == '120000':
+        entry = self.Symlink(name, sha)
+      else:
+        entry = self.File(name, sha)
+      tree = trees[parent]
+      if name not in tree:
+        tree[name] = entry
+
+    for path, tree in trees.items():
+      if path:
+        parent, _, name = path.rpartition(SLASH)
+        self._cache_tree(trees[parent][name].sha, tree)
+    self._trees.update(trees)
+
   def _read_object_from_repo(self, rev=None, relpath=None, sha=None):
     """Read an object from the git repo.
     This is implemented via a pipe to git cat-file --batch
@@ -554,6 +673,17 @@ class GitRepositoryReader(object):
     self._maybe_start_cat_file_process()
     self._cat_file_process.stdin.write(spec)
     self._cat_file_process.stdin.flush()
+    return self._read_object_response(spec, rev, relpath)
+
+  def _read_objects(self, shas):
+    """Reads several objects from the git repo with a single write of all their requests."""
+    specs = [sha + '\n' for sha in shas]
+    self._maybe_start_cat_file_process()
+    self._cat_file_process.stdin.write(''.join(specs))
+    self._cat_file_process.stdin.flush()
+    return [self._read_object_response(spec) for spec in specs]
+
+  def _read_object_response(self, spec, rev=None, relpath=None):
     header = None
     while not header:
       header = self._cat_file_process.stdout.readline()
@@ -5,8 +5,10 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import math
 import os
 import sqlite3
+from collections import defaultdict, namedtuple
 from contextlib import contextmanager
 
 from pants.subsystem.subsystem import Subsystem
@@ -16,6 +18,25 @@ from pants.util.dirutil import safe_mkdir_for
 class StatsDBError(Exception): pass
 
 
+class TimingBaseline(namedtuple('TimingBaseline', ['label', 'count', 'median', 'percentile'])):
+  """The distribution of the timings of a label over a window of runs.
+
+  :param string label: The workunit label timed, e.g. `main:compile:zinc`.
+  :param int count: The number of runs in the window the label was timed in.
+  :param int median: The median timing, in milliseconds.
+  :param int percentile: The timing at the percentile requested, in milliseconds.
+  """
+
+
+class TimingTrendPoint(namedtuple('TimingTrendPoint', ['run_id', 'timestamp', 'machine',
+                                                       'cmd_line', 'timing', 'baseline'])):
+  """The timing of a label in one run, with the median timing of the label in the runs before it.
+
+  Timings and baselines are in milliseconds.  The baseline is `None` for the first run of a
+  command on a machine.
+  """
+
+
 class StatsDBFactory(Subsystem):
   options_scope = 'statsdb'
 
@@ -68,6 +89,7 @@ class StatsDB(object):
           )
         """.format(tab=tab))
         create_index(tab, 'label')
+        create_index(tab, 'run_info_id')
 
       create_timings_table('cumulative_timings')
       create_timings_table('self_timings')
@@ -129,6 +151,150 @@ class StatsDB(object):
         """.format(timing_table), [cmd_line_like]):
         yield row
 
+  def get_run_info(self, run_id=None, machine=None, exclude_cmd_line_like=None):
+    """Returns the run info of the given run, or of the latest run if no run id is given.
+
+    :param run_id: The id of the run to return, or `None` for the latest run.
+    :param machine: If not `None`, only consider runs on this machine.
+    :param exclude_cmd_line_like: If not `None`, skip runs whose command line is LIKE this pattern.
+    :returns: A dict of run info, or `None` if there is no such run.
+    """
+    clauses, params = [], []
+    if run_id is not None:
+      clauses.append('id=?')
+      params.append(run_id)
+    if machine is not None:
+      clauses.append('machine=?')
+      params.append(machine)
+    if exclude_cmd_line_like is not None:
+      clauses.append('cmd_line NOT LIKE ?')
+      params.append(exclude_cmd_line_like)
+    with self._cursor() as c:
+      c.execute("""
+        SELECT * FROM run_info {} ORDER BY timestamp DESC, rowid DESC LIMIT 1
+      """.format('WHERE {}'.format(' AND '.join(clauses)) if clauses else ''), params)
+      row = c.fetchone()
+      return dict(zip([column[0] for column in c.description], row)) if row else None
+
+  def get_timings_for_run(self, timing_table, run_id):
+    """Returns a dict of label to timing in milliseconds for the given run.
+
+    :param timing_table: One of 'cumulative_timings' or 'self_timings'.
+    """
+    with self._cursor() as c:
+      return dict(c.execute("""
+        SELECT label, timing FROM {} WHERE run_info_id=?
+      """.format(timing_table), [run_id]))
+
+  def get_baselines(self, timing_table, cmd_line, machine, window, before_run_id=None,
+                    percentile=90):
+    """Returns the timing baselines of every label over a sliding window of runs.
+
+    The window holds the latest successful runs of exactly the given command on the given machine,
+    so that baselines only compare like with like.
+
+    :param timing_table: One of 'cumulative_timings' or 'self_timings'.
+    :param string cmd_line: The command line of the runs in the window.
+    :param string machine: The machine of the runs in the window.
+    :param int window: The maximum number of runs in the window.
+    :param before_run_id: If not `None`, only runs recorded before this run are in the window.
+                          Runs started in the same second are ordered by when they were recorded.
+    :param int percentile: The percentile of timings to compute, besides the median.
+    :returns: A dict of label to :class:`TimingBaseline`.
+    """
+    clauses = ['cmd_line=?', 'machine=?', 'outcome=?']
+    params = [cmd_line, machine, 'SUCCESS']
+    if before_run_id is not None:
+      clauses.append("""id!=? AND EXISTS (
+        SELECT 1 FROM run_info AS before
+        WHERE before.id=? AND (run_info.timestamp<before.timestamp OR
+                               (run_info.timestamp=before.timestamp AND
+                                run_info.rowid<before.rowid))
+      )""")
+      params.extend([before_run_id, before_run_id])
+    timings_by_label = defaultdict(list)
+    with self._cursor() as c:
+      for label, timing in c.execute("""
+        SELECT t.label, t.timing
+        FROM {} AS t INNER JOIN (
+          SELECT id FROM run_info WHERE {} ORDER BY timestamp DESC, rowid DESC LIMIT ?
+        ) AS ri ON (t.run_info_id=ri.id)
+      """.format(timing_table, ' AND '.join(clauses)), params + [window]):
+        timings_by_label[label].append(timing)
+
+    baselines = {}
+    for label, timings in timings_by_label.items():
+      timings.sort()
+      baselines[label] = TimingBaseline(label=label,
+                                        count=len(timings),
+                                        median=self._median(timings),
+                                        percentile=self._percentile(timings, percentile))
+    return baselines
+
+  def get_timing_trend(self, timing_table, label, cmd_line_like='%', machine=None, limit=100,
+                       window=20):
+    """Returns the timings of a label in the latest runs, oldest first.
+
+    Each timing comes with the median timing of the label in up to `window` runs before it of the
+    same command on the same machine, for spotting where a slowdown started.
+
+    :param timing_table: One of 'cumulative_timings' or 'self_timings'.
+    :param string label: The label to return the timings of.
+    :param cmd_line_like: Look at all cmd lines that are LIKE this string, in the sql sense.
+    :param machine: If not `None`, only consider runs on this machine.
+    :param int limit: The maximum number of runs to return timings for.
+    :param int window: The maximum number of earlier runs to compute each median over.
+    :returns: A list of :class:`TimingTrendPoint`.
+    """
+    clauses = ['t.label=?', 'ri.cmd_line LIKE ?']
+    params = [label, cmd_line_like]
+    if machine is not None:
+      clauses.append('ri.machine=?')
+      params.append(machine)
+    with self._cursor() as c:
+      rows = list(c.execute("""
+        SELECT ri.id, ri.timestamp, ri.machine, ri.cmd_line, ri.outcome, t.timing
+        FROM {} AS t INNER JOIN run_info AS ri ON (t.run_info_id=ri.id)
+        WHERE {}
+        ORDER BY ri.timestamp DESC, ri.rowid DESC
+        LIMIT ?
+      """.format(timing_table, ' AND '.join(clauses)), params + [limit + window]))
+    rows.reverse()
+
+    trend = []
+    earlier_timings_by_command = defaultdict(list)
+    for run_id, timestamp, run_machine, cmd_line, outcome, timing in rows:
+      earlier_timings = earlier_timings_by_command[(run_machine, cmd_line)]
+      baseline = self._median(sorted(earlier_timings[-window:])) if earlier_timings else None
+      trend.append(TimingTrendPoint(run_id=run_id, timestamp=timestamp, machine=run_machine,
+                                    cmd_line=cmd_line, timing=timing, baseline=baseline))
+      if outcome == 'SUCCESS':
+        earlier_timings.append(timing)
+    return trend[-limit:]
+
+  def get_labels(self, timing_table):
+    """Returns all recorded labels, sorted.
+
+    :param timing_table: One of 'cumulative_timings' or 'self_timings'.
+    """
+    with self._cursor() as c:
+      return [row[0] for row in c.execute("""
+        SELECT DISTINCT label FROM {} ORDER BY label
+      """.format(timing_table))]
+
+  @staticmethod
+  def _median(sorted_values):
+    mid = len(sorted_values) // 2
+    if len(sorted_values) % 2:
+      return sorted_values[mid]
+    return int((sorted_values[mid - 1] + sorted_values[mid]) / 2.0 + 0.5)
+
+  @staticmethod
+  def _percentile(sorted_values, percentile):
+    """Returns the given percentile of the given sorted values, by the nearest rank method."""
+    rank = int(math.ceil(len(sorted_values) * percentile / 100.0))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
   @staticmethod
   def _to_ms(timing_secs):
     """Convert a string representing a float of seconds to an int representing milliseconds."""
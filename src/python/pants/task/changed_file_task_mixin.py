@@ -10,7 +10,9 @@ import re
 from pants.base.build_environment import get_scm
 from pants.base.deprecated import deprecated_conditional
 from pants.base.exceptions import TaskError
+from pants.build_graph.dependee_index import DependeeIndex
 from pants.build_graph.source_mapper import SpecSourceMapper
+from pants.build_graph.source_owner_index import SourceOwnerIndex
 from pants.goal.workspace import ScmWorkspace
 
 
@@ -27,7 +29,9 @@ class ChangeCalculator(object):
                changes_since=None,
                diffspec=None,
                exclude_target_regexp=None,
-               spec_excludes=None):
+               spec_excludes=None,
+               dependee_index=None,
+               source_owner_index=None):
     deprecated_conditional(lambda: spec_excludes is not None,
                            '0.0.75',
                            'Use address_mapper#build_ignore_patterns instead.')
@@ -43,13 +47,16 @@ class ChangeCalculator(object):
     self._diffspec = diffspec
     self._exclude_target_regexp = exclude_target_regexp
     self._spec_excludes = spec_excludes
+    self._dependee_index = dependee_index
+    self._source_owner_index = source_owner_index
 
     self._mapper_cache = None
 
   @property
   def _mapper(self):
     if self._mapper_cache is None:
-      self._mapper_cache = SpecSourceMapper(self._address_mapper, self._build_graph, self._fast)
+      self._mapper_cache = SpecSourceMapper(self._address_mapper, self._build_graph, self._fast,
+                                            source_owner_index=self._source_owner_index)
     return self._mapper_cache
 
   def changed_files(self):
@@ -66,6 +73,8 @@ class ChangeCalculator(object):
     result = set()
     for src in self.changed_files():
       result.update(set(targets_for_source(src)))
+    if self._source_owner_index is not None:
+      self._source_owner_index.flush()
     return result
 
   def _find_changed_targets(self):
@@ -79,6 +88,9 @@ class ChangeCalculator(object):
     if self._include_dependees == 'none':
       return changed
 
+    if self._dependee_index is not None:
+      return self._find_dependees_from_index(changed)
+
     # Load the whole build graph since we need it for dependee finding in either remaining case.
     for address in self._address_mapper.scan_addresses(spec_excludes=self._spec_excludes):
       self._build_graph.inject_address_closure(address)
@@ -92,6 +104,17 @@ class ChangeCalculator(object):
     # Should never get here.
     raise ValueError('Unknown dependee inclusion: "{}"'.format(self._include_dependees))
 
+  def _find_dependees_from_index(self, changed):
+    # Internal helper to find dependees without loading the whole build graph.
+    if self._include_dependees == 'direct':
+      return changed.union(*[self._dependee_index.dependees_of(addr) for addr in changed])
+
+    if self._include_dependees == 'transitive':
+      return set(self._dependee_index.transitive_dependees_of_addresses(changed))
+
+    # Should never get here.
+    raise ValueError('Unknown dependee inclusion: "{}"'.format(self._include_dependees))
+
   def changed_target_addresses(self):
     """Find changed targets, according to SCM.
 
@@ -131,6 +154,14 @@ class ChangedFileTaskMixin(object):
              help='Calculate changes contained within given scm spec (commit range/sha/ref/etc).')
     register('--include-dependees', choices=['none', 'direct', 'transitive'], default='none',
              help='Include direct or transitive dependees of changed targets.')
+    register('--dependee-index', advanced=True, action='store_true', default=False,
+             help='Find dependees using a persistent index stored in the workdir instead of loading '
+                  'the whole build graph. Only BUILD files that changed since the index was last '
+                  'updated are parsed.')
+    register('--source-owner-index', advanced=True, action='store_true', default=False,
+             help='Map changed files to their owning targets using a persistent index stored in the '
+                  'workdir. Only BUILD files that changed since the index was last updated are '
+                  'parsed.')
 
   @classmethod
   def change_calculator(cls, options, address_mapper, build_graph, scm=None, workspace=None, spec_excludes=None):
@@ -143,6 +174,14 @@ class ChangedFileTaskMixin(object):
       raise TaskError('No SCM available.')
     workspace = workspace or ScmWorkspace(scm)
 
+    dependee_index = None
+    if options.dependee_index:
+      dependee_index = cls.dependee_index(options, address_mapper)
+
+    source_owner_index = None
+    if options.source_owner_index:
+      source_owner_index = cls.source_owner_index(options, address_mapper, build_graph)
+
     return ChangeCalculator(scm,
                             workspace,
                             address_mapper,
@@ -154,4 +193,16 @@ class ChangedFileTaskMixin(object):
                             # NB: exclude_target_regexp is a global scope option registered
                             # elsewhere
                             exclude_target_regexp=options.exclude_target_regexp,
-                            spec_excludes=spec_excludes)
+                            spec_excludes=spec_excludes,
+                            dependee_index=dependee_index,
+                            source_owner_index=source_owner_index)
+
+  @classmethod
+  def dependee_index(cls, options, address_mapper):
+    index_file = DependeeIndex.index_file_for(options.pants_workdir)
+    return DependeeIndex(address_mapper, index_file)
+
+  @classmethod
+  def source_owner_index(cls, options, address_mapper, build_graph):
+    index_file = SourceOwnerIndex.index_file_for(options.pants_workdir)
+    return SourceOwnerIndex(address_mapper, build_graph, index_file)
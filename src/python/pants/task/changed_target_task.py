@@ -53,4 +53,7 @@ class ChangedTargetTask(ChangedFileTaskMixin, NoopExecTask):
     changed_addresses = change_calculator.changed_target_addresses()
     readable = ''.join(sorted('\n\t* {}'.format(addr.reference()) for addr in changed_addresses))
     logger.info('Operating on changed {} target(s): {}'.format(len(changed_addresses), readable))
+    # NB: When dependees are found via the dependee index, the graph is not fully loaded.
+    for addr in changed_addresses:
+      build_graph.inject_address_closure(addr)
     return [build_graph.get_target(addr) for addr in changed_addresses]
@@ -112,6 +112,17 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
       if not dep.is_global():
         yield dep.subsystem_cls.get_scope_info(subscope=dep.scope)
 
+  @classmethod
+  def executes_exclusively(cls):
+    """Whether this task must execute alone when tasks execute concurrently.
+
+    Subclasses whose side effects are unsafe to overlap with other tasks, e.g. deleting the
+    workdir, should override this to return True.  They then execute after every task before them
+    in goal order and before every task after them.  Other tasks are only ordered by their goals'
+    installed order and the data they require.
+    """
+    return False
+
   @classmethod
   def supports_passthru_args(cls):
     """Subclasses may override to indicate that they can use passthru args."""
@@ -282,7 +293,7 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
     Incremental tasks with `cache_target_dirs` set will have the results_dir of the previous build
     for a target cloned into the results_dir for the current build (where possible). This
     copy-on-write behaviour allows for immutability of the results_dir once a target has been
-    marked valid.
+    marked valid.  See the `--results-dir-clone-strategy` option for how the files are cloned.
     """
     return False
 
@@ -421,8 +432,10 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
   def _maybe_create_results_dirs(self, vts):
     """If `cache_target_dirs`, create results_dirs for the given versioned targets."""
     if self.cache_target_dirs:
+      clone_strategy = self.get_options().results_dir_clone_strategy
       for vt in vts:
-        vt.create_results_dir(self.workdir, allow_incremental=self.incremental)
+        vt.create_results_dir(self.workdir, allow_incremental=self.incremental,
+                              clone_strategy=clone_strategy)
 
   def check_artifact_cache_for(self, invalidation_check):
     """Decides which VTS to check the artifact cache for.
@@ -7,9 +7,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import atexit
 import errno
+import fcntl
 import os
 import shutil
 import stat
+import sys
 import tempfile
 import threading
 import uuid
@@ -179,6 +181,66 @@ def safe_concurrent_rename(src, dst):
       raise
 
 
+# The ioctl that shares the data of one file with another, copy-on-write, from linux/fs.h.
+_FICLONE = 0x40049409
+
+# Errors that indicate the filesystem can't share data between the files of a tree at all, rather
+# than a problem with a particular file.
+_CLONE_UNSUPPORTED_ERRNOS = frozenset([errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+                                       errno.ENOSYS, errno.EPERM])
+
+CLONE_STRATEGIES = ('copy', 'reflink')
+
+
+def clone_tree(src, dst, strategy='copy'):
+  """Recursively clones the directory tree at src to dst, which must not exist.
+
+  Like `shutil.copytree`, the contents of symlinks are cloned rather than the symlinks themselves.
+
+  :param string strategy: How to clone files. `copy` copies them.  `reflink` shares their data
+                          copy-on-write where the filesystem supports it (e.g. btrfs or xfs on
+                          Linux), which takes constant time per file and leaves the clones
+                          independent.  Files that can't be shared are copied instead.
+  """
+  if strategy not in CLONE_STRATEGIES:
+    raise ValueError('Unknown clone strategy {!r}, expected one of {}.'.format(
+      strategy, ', '.join(CLONE_STRATEGIES)))
+  if strategy == 'copy' or (strategy == 'reflink' and not sys.platform.startswith('linux')):
+    shutil.copytree(src, dst)
+    return
+
+  # Stop trying to share files as soon as the filesystem turns out not to support it.
+  sharing_supported = [True]
+
+  def clone_file(src_file, dst_file):
+    if sharing_supported[0]:
+      try:
+        _reflink(src_file, dst_file)
+        return
+      except (IOError, OSError) as e:
+        if e.errno not in _CLONE_UNSUPPORTED_ERRNOS:
+          raise
+        sharing_supported[0] = False
+    shutil.copy2(src_file, dst_file)
+
+  cloned_dirs = []
+  for root, dirs, files in os.walk(src, followlinks=True):
+    dst_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+    os.mkdir(dst_root)
+    cloned_dirs.append((root, dst_root))
+    for f in files:
+      clone_file(os.path.join(root, f), os.path.join(dst_root, f))
+  # Copy the permissions of directories only once nothing more is created in them.
+  for root, dst_root in reversed(cloned_dirs):
+    shutil.copystat(root, dst_root)
+
+
+def _reflink(src_file, dst_file):
+  with open(src_file, 'rb') as src_fp, open(dst_file, 'wb') as dst_fp:
+    fcntl.ioctl(dst_fp.fileno(), _FICLONE, src_fp.fileno())
+  shutil.copystat(src_file, dst_file)
+
+
 def safe_rm_oldest_items_in_dir(root_dir, num_of_items_to_keep, excludes=frozenset()):
   """
   Keep `num_of_items_to_keep` newly modified items besides `excludes` in `root_dir` then remove the rest.
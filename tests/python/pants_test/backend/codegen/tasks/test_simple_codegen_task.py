@@ -6,6 +6,8 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+import threading
+import time
 from textwrap import dedent
 
 from pants.backend.codegen.register import build_file_aliases as register_codegen
@@ -61,6 +63,10 @@ class DummyGen(SimpleCodegenTask):
     self._all_targets = None
     self.setup_for_testing(None, None)
     self.execution_counts = 0
+    self.codegen_delay = 0
+    self.max_concurrent_executions = 0
+    self._concurrent_executions = 0
+    self._lock = threading.Lock()
 
   def setup_for_testing(self, test_case, all_targets):
     """Gets this dummy generator class ready for testing.
@@ -77,8 +83,19 @@ class DummyGen(SimpleCodegenTask):
     return isinstance(target, DummyLibrary)
 
   def execute_codegen(self, target, target_workdir):
-    self.execution_counts += 1
-
+    with self._lock:
+      self.execution_counts += 1
+      self._concurrent_executions += 1
+      self.max_concurrent_executions = max(self.max_concurrent_executions,
+                                           self._concurrent_executions)
+    try:
+      time.sleep(self.codegen_delay)
+      self._generate(target, target_workdir)
+    finally:
+      with self._lock:
+        self._concurrent_executions -= 1
+
+  def _generate(self, target, target_workdir):
     for path in self._dummy_sources_to_generate(target, target_workdir):
       class_name = os.path.basename(path).split('.')[0]
       package_name = os.path.relpath(os.path.dirname(path),
@@ -167,6 +184,41 @@ class SimpleCodegenTaskTest(TaskTestBase):
   def test_execute_isolated(self):
     self._test_execute_strategy('isolated', 3)
 
+  def test_execute_concurrently(self):
+    suffixes = range(8)
+    self.add_to_build_file('gen-lib', '\n'.join(dedent('''
+      dummy_library(name='{suffix}',
+        sources=['org/pantsbuild/example/foo{suffix}.dummy'],
+        dependencies=[{dependencies}],
+      )
+    ''').format(suffix=suffix, dependencies="':{}'".format(suffix - 1) if suffix else '')
+      for suffix in suffixes))
+    for suffix in suffixes:
+      self.create_file('gen-lib/org/pantsbuild/example/foo{suffix}.dummy'.format(suffix=suffix),
+                       'org.pantsbuild.example Foo{0}'.format(suffix))
+
+    targets = [self.target('gen-lib:{suffix}'.format(suffix=suffix)) for suffix in suffixes]
+    task = self._create_dummy_task(target_roots=targets[-1:], strategy='isolated', worker_count=4)
+    task.codegen_delay = 0.1
+    task.execute()
+    self.assertEqual(len(targets), task.execution_counts)
+    self.assertGreater(task.max_concurrent_executions, 1)
+
+    # Each target's dependees depend on its synthetic target, which depends on its dependencies.
+    build_graph = task.context.build_graph
+    synthetic_targets = [t for t in build_graph.targets() if t.derived_from in set(targets) - {t}]
+    self.assertEqual(len(targets), len(synthetic_targets))
+    for synthetic_target in synthetic_targets:
+      target = synthetic_target.derived_from
+      self.assertEqual(['org/pantsbuild/example/Foo{}'.format(target.name)],
+                       list(synthetic_target.sources_relative_to_source_root()))
+      self.assertTrue(set(target.dependencies).issubset(synthetic_target.dependencies))
+      for dependee in build_graph.dependents_of(target.address):
+        if dependee != synthetic_target.address:
+          self.assertIn(synthetic_target, build_graph.get_target(dependee).dependencies)
+      if target == targets[-1]:
+        self.assertIn(synthetic_target, task.context.target_roots)
+
   def _get_duplication_test_targets(self):
     self.add_to_build_file('gen-parent', dedent('''
       dummy_library(name='gen-parent',
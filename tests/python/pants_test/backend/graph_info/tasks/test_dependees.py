@@ -240,6 +240,14 @@ class ReverseDepmapTest(BaseReverseDepmapTest):
     )
 
 
+class ReverseDepmapDependeeIndexTest(ReverseDepmapTest):
+  def assert_console_output(self, *output, **kwargs):
+    options = {'dependee_index': True}
+    options.update(kwargs.get('options', {}))
+    kwargs['options'] = options
+    super(ReverseDepmapDependeeIndexTest, self).assert_console_output(*output, **kwargs)
+
+
 class ReverseDepmapTestWithPantsBuildIgnore(BaseReverseDepmapTest):
   @property
   def build_ignore_patterns(self):
@@ -67,3 +67,11 @@ class ListOwnersTest(ConsoleTaskTestBase):
   def test_too_many_sources(self):
     """In future this will support multiple passthru_args, but not yet."""
     self.assert_console_raises(TaskError, passthru_args=['a/a.txt', 'a/b.txt'])
+
+
+class ListOwnersSourceOwnerIndexTest(ListOwnersTest):
+  def assert_console_output(self, *output, **kwargs):
+    options = {'source_owner_index': True}
+    options.update(kwargs.get('options', {}))
+    kwargs['options'] = options
+    super(ListOwnersSourceOwnerIndexTest, self).assert_console_output(*output, **kwargs)
@@ -0,0 +1,99 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+from contextlib import contextmanager
+
+from pants.backend.jvm.ivy_utils import IvyInfo, IvyModule, IvyModuleRef
+from pants.backend.jvm.jar_dependency_utils import M2Coordinate
+from pants.backend.jvm.subsystems.ivy_resolution_cache import IvyResolution, IvyResolutionCache
+from pants.backend.jvm.targets.exclude import Exclude
+from pants.backend.jvm.targets.jar_dependency import JarDependency
+from pants.util.dirutil import safe_delete, safe_mkdtemp, safe_rmtree, touch
+from pants_test.subsystem.subsystem_util import subsystem_instance
+
+
+class IvyResolutionCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = safe_mkdtemp()
+    self.addCleanup(safe_rmtree, self.tmpdir)
+    self.ivy_cache_dir = os.path.join(self.tmpdir, 'ivy_cache')
+    self.jar_path = os.path.join(self.ivy_cache_dir, 'org', 'foo', 'foo-1.0.jar')
+    touch(self.jar_path)
+
+  @contextmanager
+  def resolution_cache(self, enabled=True):
+    options = {
+      'ivy': {'cache_dir': self.ivy_cache_dir},
+      'ivy-resolution-cache': {'enabled': enabled, 'dir': os.path.join(self.tmpdir, 'resolutions')},
+    }
+    with subsystem_instance(IvyResolutionCache, **options) as resolution_cache:
+      yield resolution_cache
+
+  def key(self, resolution_cache, jars=None, excludes=(), pinned=(), confs=('default',)):
+    jars = jars or [JarDependency('org', 'foo', '1.0')]
+    return resolution_cache.resolution_key(jars, excludes, pinned, confs)
+
+  def resolution(self, resolve_hash_name):
+    ivy_info = IvyInfo('default')
+    ivy_info.add_module(IvyModule(IvyModuleRef('org', 'foo', '1.0'),
+                                  self.jar_path,
+                                  [IvyModuleRef('internal', resolve_hash_name, 'latest.integration')]))
+    report = '<ivy-report><info module="{}"/></ivy-report>'.format(resolve_hash_name)
+    return IvyResolution(classpath=[self.jar_path],
+                         reports={'default': report},
+                         ivy_infos={'default': ivy_info})
+
+  def test_key_is_normalized(self):
+    with self.resolution_cache() as resolution_cache:
+      a, b = Exclude('org', 'a'), Exclude('org', 'b')
+      self.assertEqual(self.key(resolution_cache, excludes=[a, b], confs=('default', 'sources')),
+                       self.key(resolution_cache, excludes=[b, a], confs=('sources', 'default')))
+      self.assertEqual(self.key(resolution_cache, pinned=[M2Coordinate('org', 'a', '1')]),
+                       self.key(resolution_cache, pinned=[M2Coordinate('org', 'a', '1')]))
+      self.assertNotEqual(self.key(resolution_cache),
+                          self.key(resolution_cache, pinned=[M2Coordinate('org', 'a', '1')]))
+      self.assertNotEqual(self.key(resolution_cache),
+                          self.key(resolution_cache, jars=[JarDependency('org', 'foo', '1.1')]))
+
+  def test_uncacheable_resolves(self):
+    with self.resolution_cache() as resolution_cache:
+      self.assertIsNone(self.key(resolution_cache,
+                                 jars=[JarDependency('org', 'foo', '1.0', mutable=True)]))
+      self.assertIsNone(self.key(resolution_cache, jars=[JarDependency('org', 'foo')]))
+      self.assertIsNone(self.key(resolution_cache,
+                                 jars=[JarDependency('org', 'foo', 'latest.integration')]))
+      self.assertIsNone(self.key(resolution_cache, jars=[JarDependency('org', 'foo', '[1.0,2.0)')]))
+
+    with self.resolution_cache(enabled=False) as resolution_cache:
+      self.assertIsNone(self.key(resolution_cache))
+
+  def test_restored_under_new_resolve_name(self):
+    with self.resolution_cache() as resolution_cache:
+      key = self.key(resolution_cache)
+      self.assertIsNone(resolution_cache.load(key, 'checkout1'))
+      resolution_cache.store(key, 'checkout1', self.resolution('checkout1'))
+
+      resolution = resolution_cache.load(key, 'checkout2')
+      self.assertEqual(1, resolution_cache.hits)
+      self.assertEqual(1, resolution_cache.misses)
+      self.assertEqual([self.jar_path], resolution.classpath)
+      self.assertEqual(self.resolution('checkout2').reports, resolution.reports)
+
+      ivy_info = resolution.ivy_infos['default']
+      module = ivy_info.modules_by_ref[IvyModuleRef('org', 'foo', '1.0')]
+      self.assertEqual(self.jar_path, module.artifact)
+      self.assertEqual(['checkout2'], [caller.name for caller in module.callers])
+
+  def test_entry_with_missing_artifact_is_ignored(self):
+    with self.resolution_cache() as resolution_cache:
+      key = self.key(resolution_cache)
+      resolution_cache.store(key, 'checkout1', self.resolution('checkout1'))
+      safe_delete(self.jar_path)
+      self.assertIsNone(resolution_cache.load(key, 'checkout1'))
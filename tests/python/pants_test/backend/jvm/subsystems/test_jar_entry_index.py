@@ -0,0 +1,70 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+import zlib
+
+from pants.backend.jvm.subsystems.jar_entry_index import JarEntryIndex
+from pants.util.contextutil import open_zip
+from pants.util.dirutil import safe_mkdtemp, safe_rmtree
+from pants_test.subsystem.subsystem_util import create_subsystem
+
+
+class JarEntryIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = safe_mkdtemp()
+    self.addCleanup(safe_rmtree, self.tmpdir)
+    self.workdir = os.path.join(self.tmpdir, 'workdir')
+    self.jar = os.path.join(self.tmpdir, 'lib.jar')
+
+  def write_jar(self, *entries):
+    with open_zip(self.jar, 'w') as jar:
+      for name, content in entries:
+        jar.writestr(name, content)
+
+  def create_index(self, persist=True):
+    return create_subsystem(JarEntryIndex, pants_workdir=self.workdir, persist=persist)
+
+  def test_entries(self):
+    self.write_jar(('META-INF/MANIFEST.MF', b'Manifest-Version: 1.0\n'),
+                   ('org/pantsbuild/Foo.class', b'0xCAFEBABE'))
+    index = self.create_index()
+    self.assertEqual(['META-INF/MANIFEST.MF', 'org/pantsbuild/Foo.class'], index.entry_names(self.jar))
+    self.assertEqual(zlib.crc32(b'0xCAFEBABE') & 0xffffffff,
+                     index.entry_crcs(self.jar)['org/pantsbuild/Foo.class'])
+
+  def test_persisted_across_instances(self):
+    self.write_jar(('Foo.class', b'foo'))
+    first = self.create_index()
+    self.assertEqual(['Foo.class'], first.entry_names(self.jar))
+    self.assertEqual(1, first.misses)
+
+    second = self.create_index()
+    self.assertEqual(['Foo.class'], second.entry_names(self.jar))
+    self.assertEqual(0, second.misses)
+    self.assertEqual(1, second.hits)
+
+  def test_changed_jar_is_reread(self):
+    self.write_jar(('Foo.class', b'foo'))
+    self.assertEqual(['Foo.class'], self.create_index().entry_names(self.jar))
+
+    self.write_jar(('Foo.class', b'foo'), ('Bar.class', b'bar'))
+    stat = os.stat(self.jar)
+    os.utime(self.jar, (stat.st_atime, stat.st_mtime + 1))
+    index = self.create_index()
+    self.assertEqual(['Foo.class', 'Bar.class'], index.entry_names(self.jar))
+    self.assertEqual(1, index.misses)
+
+  def test_not_persisted(self):
+    self.write_jar(('Foo.class', b'foo'))
+    index = self.create_index(persist=False)
+    self.assertEqual(['Foo.class'], index.entry_names(self.jar))
+    self.assertEqual(['Foo.class'], index.entry_names(self.jar))
+    self.assertEqual(1, index.misses)
+    self.assertFalse(os.path.exists(os.path.join(self.workdir, 'jar_entry_index')))
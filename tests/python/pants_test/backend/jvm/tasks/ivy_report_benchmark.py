@@ -0,0 +1,155 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import gc
+import os
+import random
+import xml.etree.ElementTree as ET
+
+from twitter.common.collections import OrderedSet
+
+from pants.backend.jvm.ivy_utils import IvyInfo, IvyModule, IvyModuleRef, IvyUtils
+from pants.backend.jvm.jar_dependency_utils import M2Coordinate, ResolvedJar
+from pants.backend.jvm.targets.jar_dependency import JarDependency
+from pants.util.contextutil import Timer, temporary_dir
+from pants.util.dirutil import safe_open
+
+
+class LegacyIvyInfo(IvyInfo):
+  """Traverses the module graph the way `IvyInfo` did before it used adjacency arrays."""
+
+  def _do_traverse_dependency_graph(self, ref, collector, memo, visited):
+    memoized_value = memo.get(ref)
+    if memoized_value:
+      return memoized_value
+    if ref in visited:
+      return set()
+    visited.add(ref)
+    acc = collector(ref)
+    for dep in sorted(self._deps_by_caller.get(ref.caller_key, ())):
+      acc.update(self._do_traverse_dependency_graph(dep, collector, memo, visited))
+    memo[ref] = acc
+    return acc
+
+  def traverse_dependency_graph(self, ref, collector, memo=None):
+    resolved_ref = self.refs_by_unversioned_refs.get(ref.unversioned)
+    if resolved_ref:
+      ref = resolved_ref
+    return self._do_traverse_dependency_graph(ref, collector, {} if memo is None else memo, set())
+
+  def get_resolved_jars_for_coordinates(self, coordinates, memo=None):
+    resolved_jars = OrderedSet()
+    for jar in coordinates:
+      classifier = jar.classifier if self._conf == 'default' else self._conf
+      jar_module_ref = IvyModuleRef(jar.org, jar.name, jar.rev, classifier)
+      for module_ref in self.traverse_dependency_graph(jar_module_ref,
+                                                       lambda dep: OrderedSet([dep]),
+                                                       memo):
+        for artifact_path in self._artifacts_by_ref[module_ref.unversioned]:
+          coordinate = M2Coordinate(org=module_ref.org, name=module_ref.name, rev=module_ref.rev,
+                                    classifier=module_ref.classifier, ext=module_ref.ext)
+          resolved_jars.add(ResolvedJar(coordinate=coordinate, cache_path=artifact_path))
+    return resolved_jars
+
+
+def legacy_parse_xml_report(conf, path):
+  """Parses a report the way `IvyUtils._parse_xml_report` did before it streamed reports."""
+  ret = LegacyIvyInfo(conf)
+  for module in ET.parse(path).getroot().findall('dependencies/module'):
+    org = module.get('organisation')
+    name = module.get('name')
+    for revision in module.findall('revision'):
+      rev = revision.get('name')
+      callers = [IvyModuleRef(caller.get('organisation'), caller.get('name'), caller.get('callerrev'))
+                 for caller in revision.findall('caller')]
+      for artifact in revision.findall('artifacts/artifact'):
+        ref = IvyModuleRef(org=org, name=name, rev=rev,
+                           classifier=artifact.get('extra-classifier'), ext=artifact.get('ext'))
+        ret.add_module(IvyModule(ref, artifact.get('location'), callers))
+  return ret
+
+
+def write_report(path, num_modules, max_callers, seed):
+  """Writes a report of `num_modules` modules, each called by up to `max_callers` earlier ones."""
+  rnd = random.Random(seed)
+  with safe_open(path, 'w') as report:
+    report.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    report.write('<ivy-report version="1.0">\n')
+    report.write('  <info organisation="internal" module="benchmark" revision="latest"/>\n')
+    report.write('  <dependencies>\n')
+    for i in range(num_modules):
+      report.write('    <module organisation="org{}" name="name{}">\n'.format(i % 97, i))
+      report.write('      <revision name="1.{}">\n'.format(i))
+      if i == 0 or rnd.random() < 0.05:
+        callers = [('internal', 'benchmark', 'latest')]
+      else:
+        callers = [('org{}'.format(c % 97), 'name{}'.format(c), '1.{}'.format(c))
+                   for c in set(rnd.randrange(i) for _ in range(rnd.randint(1, max_callers)))]
+      for org, name, rev in callers:
+        report.write('        <caller organisation="{}" name="{}" callerrev="{}"/>\n'
+                     .format(org, name, rev))
+      report.write('        <artifacts>\n')
+      report.write('          <artifact location="/ivy2/org{0}/name{1}-1.{1}.jar"/>\n'
+                   .format(i % 97, i))
+      report.write('        </artifacts>\n')
+      report.write('      </revision>\n')
+      report.write('    </module>\n')
+    report.write('  </dependencies>\n')
+    report.write('</ivy-report>\n')
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Benchmarks parsing and traversing ivy reports.')
+  parser.add_argument('--modules', type=int, default=2000,
+                      help='The number of modules in the synthetic report.')
+  parser.add_argument('--max-callers', type=int, default=4,
+                      help='The maximum number of callers of each module.')
+  parser.add_argument('--repeat', type=int, default=3,
+                      help='The number of times to run each benchmark; the fastest run is reported.')
+  parser.add_argument('--seed', type=int, default=42,
+                      help='The seed for the random module graph.')
+  args = parser.parse_args()
+
+  # Roughly how `IvyTaskMixin` queries a resolve: one query per jar, sharing a memo.
+  coordinates = [JarDependency('org{}'.format(i % 97), 'name{}'.format(i), '1.{}'.format(i))
+                 for i in range(args.modules)]
+
+  def best_of(parse, path):
+    parse_times = []
+    traverse_times = []
+    for _ in range(args.repeat):
+      # Don't charge the collection of the previous run's graph to this one.
+      ivy_info = memo = result = None
+      gc.collect()
+      with Timer() as timer:
+        ivy_info = parse('default', path)
+      parse_times.append(timer.elapsed)
+      with Timer() as timer:
+        memo = {}
+        result = [ivy_info.get_resolved_jars_for_coordinates([coordinate], memo=memo)
+                  for coordinate in coordinates]
+      traverse_times.append(timer.elapsed)
+    return min(parse_times), min(traverse_times), result
+
+  with temporary_dir() as tmpdir:
+    path = os.path.join(tmpdir, 'report.xml')
+    write_report(path, args.modules, args.max_callers, args.seed)
+    print('Wrote a report of {} modules ({} bytes).'.format(args.modules, os.path.getsize(path)))
+
+    legacy_parse, legacy_traverse, expected = best_of(legacy_parse_xml_report, path)
+    parse, traverse, result = best_of(IvyUtils._parse_xml_report, path)
+    assert expected == result
+
+    print('           {:>10} {:>10}'.format('parse', 'traverse'))
+    print('legacy:    {:>9.3f}s {:>9.3f}s'.format(legacy_parse, legacy_traverse))
+    print('streaming: {:>9.3f}s {:>9.3f}s ({:.1f}x, {:.1f}x)'.format(
+      parse, traverse, legacy_parse / parse, legacy_traverse / traverse))
+
+
+if __name__ == '__main__':
+  main()
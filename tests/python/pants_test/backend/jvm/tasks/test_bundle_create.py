@@ -12,10 +12,11 @@ from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.targets.java_library import JavaLibrary
 from pants.backend.jvm.targets.jvm_app import JvmApp
 from pants.backend.jvm.targets.jvm_binary import JvmBinary
-from pants.backend.jvm.tasks.bundle_create import BundleCreate
+from pants.backend.jvm.tasks.bundle_create import (BundleCreate,
+                                                   ResolvedJarIdentityFingerprintStrategy)
 from pants.backend.jvm.tasks.classpath_util import MissingClasspathEntryError
 from pants.util.contextutil import open_zip
-from pants.util.dirutil import safe_file_dump
+from pants.util.dirutil import safe_file_dump, safe_rmtree
 from pants_test.backend.jvm.tasks.jvm_binary_task_test_base import JvmBinaryTaskTestBase
 from pants_test.testutils.file_test_util import check_zip_file_content
 
@@ -95,6 +96,67 @@ class TestBundleCreate(JvmBinaryTaskTestBase):
     self.execute(self.task_context)
     self._check_bundle_products('FooApp')
 
+  def test_jvm_bundle_reused_when_unchanged(self):
+    """Test an unchanged app is not re-bundled or re-archived."""
+
+    def bundle(task):
+      task.execute()
+      self._check_bundle_products('foo.foo-app')
+      self.assertFalse(os.path.islink(os.path.join(self.dist_root, 'foo.foo-app-bundle')))
+      bundle_jar = os.path.join(self.dist_root, 'foo.foo-app-bundle', 'foo-binary.jar')
+      archive = os.path.join(self.dist_root, 'foo.foo-app.zip')
+      return os.path.getmtime(bundle_jar), os.stat(archive).st_ino
+
+    def rerun():
+      # NB: `prepare_execute` invalidates the task, so later runs create the task directly.
+      self.task_context = self.context(target_roots=[self.app_target])
+      self._setup_classpath(self.task_context)
+      return bundle(self.create_task(self.task_context))
+
+    self.set_options(archive='zip')
+    self.task_context = self.context(target_roots=[self.app_target])
+    self._setup_classpath(self.task_context)
+    first = bundle(self.prepare_execute(self.task_context))
+    self.assertEqual(first, rerun())
+
+    # Removing the dist dir clones the existing bundle and links the archive back in.
+    safe_rmtree(self.dist_root)
+    self.assertEqual(first, rerun())
+
+  def test_jvm_bundle_rebuilt_when_resolved_jar_changes(self):
+    """Test an app is re-bundled and re-archived when a jar changes at the same coordinate."""
+
+    def bundle(task):
+      task.execute()
+      self._check_bundle_products('foo.foo-app')
+      return os.stat(os.path.join(self.dist_root, 'foo.foo-app.zip')).st_ino
+
+    def rerun():
+      self.task_context = self.context(target_roots=[self.app_target])
+      self._setup_classpath(self.task_context)
+      return bundle(self.create_task(self.task_context))
+
+    self.set_options(archive='zip')
+    self.task_context = self.context(target_roots=[self.app_target])
+    self._setup_classpath(self.task_context)
+    first = bundle(self.prepare_execute(self.task_context))
+
+    # Like a SNAPSHOT resolved again to new contents.
+    safe_file_dump(self.jar_artifact.pants_path, 'new contents')
+    self.assertNotEqual(first, rerun())
+
+  def test_resolved_jar_identity_fingerprint(self):
+    classpath_products = self.ensure_classpath_products(self.task_context)
+    strategy = ResolvedJarIdentityFingerprintStrategy(self.create_task(self.task_context),
+                                                      classpath_products)
+    jar_lib_fingerprint = strategy.compute_fingerprint(self.jar_lib)
+    java_lib_fingerprint = strategy.compute_fingerprint(self.java_lib_target)
+
+    mtime = os.path.getmtime(self.jar_artifact.pants_path) + 10
+    os.utime(self.jar_artifact.pants_path, (mtime, mtime))
+    self.assertNotEqual(jar_lib_fingerprint, strategy.compute_fingerprint(self.jar_lib))
+    self.assertEqual(java_lib_fingerprint, strategy.compute_fingerprint(self.java_lib_target))
+
   def test_bundle_non_app_target(self):
     """Test bundle does not apply to a non jvm_app/jvm_binary target."""
     self.task_context = self.context(target_roots=[self.java_lib_target])
@@ -399,6 +399,63 @@ class ClasspathProductsTest(BaseTest):
                       ('default', ClasspathEntry(self.path('b/loose/classes/dir')))],
                      classpath)
 
+  def test_queries_are_memoized_until_products_change(self):
+    b = self.make_target('b', JvmTarget)
+    a = self.make_target('a', JvmTarget, dependencies=[b])
+
+    classpath_product = ClasspathProducts(self.pants_workdir)
+    classpath_product.add_for_target(a, [('default', self.path('a/classes'))])
+    a_closure = a.closure(bfs=True)
+
+    self.assertEqual([('default', self.path('a/classes'))], classpath_product.get_for_targets(a_closure))
+    self.assertEqual([('default', self.path('a/classes'))], classpath_product.get_for_targets(a_closure))
+    self.assertEqual(1, classpath_product.query_cache_hits)
+    self.assertEqual(1, classpath_product.query_cache_misses)
+
+    classpath_product.add_for_target(b, [('default', self.path('b/classes'))])
+    self.assertEqual([('default', self.path('a/classes')), ('default', self.path('b/classes'))],
+                     classpath_product.get_for_targets(a_closure))
+
+    classpath_product.remove_for_target(a, [('default', self.path('a/classes'))])
+    self.assertEqual([('default', self.path('b/classes'))], classpath_product.get_for_targets(a_closure))
+    self.assertEqual(1, classpath_product.query_cache_hits)
+    self.assertEqual(3, classpath_product.query_cache_misses)
+
+  def test_queries_stay_memoized_when_unrelated_products_change(self):
+    a = self.make_target('a', JvmTarget)
+    c = self.make_target('c', JvmTarget)
+
+    classpath_product = ClasspathProducts(self.pants_workdir)
+    classpath_product.add_for_target(a, [('default', self.path('a/classes'))])
+    self.assertEqual([('default', self.path('a/classes'))], classpath_product.get_for_target(a))
+
+    # Neither adding nor removing products of a target outside the query forgets it.
+    classpath_product.add_for_target(c, [('default', self.path('c/classes'))])
+    classpath_product.remove_for_target(c, [('default', self.path('c/classes'))])
+    self.assertEqual([('default', self.path('a/classes'))], classpath_product.get_for_target(a))
+    self.assertEqual(1, classpath_product.query_cache_hits)
+    self.assertEqual(1, classpath_product.query_cache_misses)
+
+    classpath_product.add_for_target(a, [('default', self.path('a/more-classes'))])
+    self.assertEqual([('default', self.path('a/classes')),
+                      ('default', self.path('a/more-classes'))],
+                     classpath_product.get_for_target(a))
+    self.assertEqual(2, classpath_product.query_cache_misses)
+
+  def test_memoized_excludes_are_invalidated(self):
+    b = self.make_target('b', JvmTarget, excludes=[Exclude('com.example', 'lib')])
+    a = self.make_target('a', JvmTarget, dependencies=[b])
+
+    classpath_product = ClasspathProducts(self.pants_workdir)
+    resolved_jar = self.add_jar_classpath_element_for_path(classpath_product, a,
+                                                           self._example_jar_path())
+    self.assertEqual([('default', resolved_jar.pants_path)], classpath_product.get_for_target(a))
+
+    self.add_excludes_for_targets(classpath_product, b, a)
+    self.assertEqual([], classpath_product.get_for_target(a))
+    self.assertEqual(1, len(classpath_product.get_classpath_entries_for_targets(
+      [a], respect_excludes=False)))
+
   def _example_jar_path(self):
     return self.path('ivy/jars/com.example/lib/jars/123.4.jar')
 
@@ -9,6 +9,7 @@ import os
 import xml.etree.ElementTree as ET
 from textwrap import dedent
 
+import mock
 from twitter.common.collections import OrderedSet
 
 from pants.backend.jvm.ivy_utils import (IvyInfo, IvyModule, IvyModuleRef, IvyResolveMappingError,
@@ -21,6 +22,7 @@ from pants.backend.jvm.targets.jar_dependency import JarDependency
 from pants.build_graph.register import build_file_aliases as register_core
 from pants.ivy.ivy_subsystem import IvySubsystem
 from pants.util.contextutil import temporary_dir, temporary_file_path
+from pants.util.dirutil import safe_rmtree, touch
 from pants_test.base_test import BaseTest
 from pants_test.subsystem.subsystem_util import subsystem_instance
 
@@ -374,6 +376,47 @@ class IvyUtilsGenerateIvyTest(IvyUtilsTestBase):
           with open(output_path, 'r') as outpath:
             self.assertEquals(symlink_bar_path + os.pathsep + symlink_foo_path, outpath.readline())
 
+  def test_symlink_cachepath_only_links_new_artifacts(self):
+    with temporary_dir() as mock_cache_dir:
+      with temporary_dir() as symlink_dir:
+        with temporary_dir() as classpath_dir:
+          input_path = os.path.join(classpath_dir, 'inpath')
+          output_path = os.path.join(classpath_dir, 'classpath')
+
+          def resolve(*jar_names):
+            jar_paths = [os.path.join(mock_cache_dir, 'org', jar_name) for jar_name in jar_names]
+            for jar_path in jar_paths:
+              touch(jar_path)
+            with open(input_path, 'w') as inpath:
+              inpath.write(os.pathsep.join(jar_paths))
+            # Forget what this process has seen, as a new run would.
+            IvyUtils._symlinks_by_dir.clear()
+            with mock.patch('os.symlink', wraps=os.symlink) as symlink:
+              IvyUtils.symlink_cachepath(mock_cache_dir, input_path, symlink_dir, output_path)
+              return sorted(os.path.basename(call[0][1]) for call in symlink.call_args_list)
+
+          # Enough jars to be linked in parallel.
+          jar_names = ['{}.jar'.format(i) for i in range(IvyUtils._PARALLEL_SYMLINK_THRESHOLD)]
+          self.assertEqual(sorted(jar_names), resolve(*jar_names))
+          for jar_name in jar_names:
+            self.assertTrue(os.path.islink(os.path.join(symlink_dir, 'org', jar_name)))
+
+          self.assertEqual(['new.jar'], resolve('new.jar', *jar_names))
+          with open(output_path, 'r') as outpath:
+            self.assertEqual(os.path.join(symlink_dir, 'org', 'new.jar'),
+                             outpath.read().split(os.pathsep)[0])
+
+          # A recorded link that was deleted is recreated, but not recorded again.
+          os.unlink(os.path.join(symlink_dir, 'org', '0.jar'))
+          self.assertEqual(['0.jar'], resolve('0.jar', 'new.jar'))
+          self.assertTrue(os.path.islink(os.path.join(symlink_dir, 'org', '0.jar')))
+          with open(os.path.join(symlink_dir, IvyUtils._SYMLINK_MANIFEST), 'r') as manifest:
+            self.assertEqual(1, manifest.read().splitlines().count(os.path.join('org', '0.jar')))
+
+          # Cleaning the symlink dir forgets the links.
+          safe_rmtree(symlink_dir)
+          self.assertEqual(['new.jar'], resolve('new.jar'))
+
   def test_missing_ivy_report(self):
     self.set_options_for_scope(IvySubsystem.options_scope,
                                cache_dir='DOES_NOT_EXIST',
@@ -468,3 +511,15 @@ class IvyUtilsGenerateIvyTest(IvyUtilsTestBase):
     assert_order([module6, module4, module3, module1 ,module2, module5])
     assert_order([module4, module2, module1, module3, module6, module5])
     assert_order([module4, module2, module5, module6, module1, module3])
+
+  def test_traverse_deep_dep_graph(self):
+    # A chain of modules deeper than the interpreter's recursion limit.
+    refs = [IvyModuleRef(org='foo', name='module{}'.format(i), rev='1.0') for i in range(2000)]
+    info = IvyInfo('default')
+    for i, ref in enumerate(refs):
+      info.add_module(IvyModule(ref, '/foo/{}.jar'.format(i), [refs[i - 1]] if i else []))
+
+    self.assertEqual(set(refs), info.traverse_dependency_graph(refs[0], lambda dep: {dep}))
+    resolved_jars = info.get_resolved_jars_for_coordinates([coord('foo', 'module0', rev='1.0')])
+    self.assertEqual(['/foo/{}.jar'.format(i) for i in range(2000)],
+                     [resolved_jar.cache_path for resolved_jar in resolved_jars])
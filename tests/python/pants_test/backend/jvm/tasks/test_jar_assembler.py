@@ -0,0 +1,134 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+import zipfile
+
+from pants.backend.jvm.targets.jvm_binary import Duplicate, JarRules, Skip
+from pants.backend.jvm.tasks.jar_assembler import JarAssembler
+from pants.java.jar.manifest import Manifest
+from pants.util.contextutil import open_zip, temporary_dir
+from pants.util.dirutil import safe_open
+
+
+class JarAssemblerTest(unittest.TestCase):
+
+  def setUp(self):
+    self.manifest = Manifest()
+    self.manifest.addentry(Manifest.MANIFEST_VERSION, '1.0')
+
+  def create_jar(self, path, entries, compression=zipfile.ZIP_DEFLATED):
+    with open_zip(path, 'w', compression) as zf:
+      for name, contents in entries:
+        zf.writestr(name, contents)
+    return path
+
+  def assemble(self, path, files=(), jars=(), rules=None, compressed=True):
+    assembler = JarAssembler(path, rules or JarRules.default(), compressed=compressed, workers=2)
+    assembler.assemble(self.manifest, files, jars)
+    with open_zip(path) as zf:
+      self.assertIsNone(zf.testzip())
+      return zf.namelist(), {name: zf.read(name) for name in zf.namelist()}
+
+  def test_files_and_contents(self):
+    with temporary_dir() as tmpdir:
+      with safe_open(os.path.join(tmpdir, 'classes', 'a', 'b', 'C.class'), 'wb') as fp:
+        fp.write(b'0xCAFEBABE')
+      with safe_open(os.path.join(tmpdir, 'd.txt'), 'wb') as fp:
+        fp.write(b'e')
+
+      names, contents = self.assemble(os.path.join(tmpdir, 'out.jar'),
+                                      files=[(os.path.join(tmpdir, 'classes'), None),
+                                             (os.path.join(tmpdir, 'd.txt'), 'f/g/h'),
+                                             (JarAssembler.Contents(b'42'), 'README')])
+      self.assertEqual(['META-INF/', 'META-INF/MANIFEST.MF', 'a/', 'a/b/', 'a/b/C.class',
+                        'f/', 'f/g/', 'f/g/h', 'README'],
+                       names)
+      self.assertEqual(self.manifest.contents(), contents['META-INF/MANIFEST.MF'])
+      self.assertEqual(b'0xCAFEBABE', contents['a/b/C.class'])
+      self.assertEqual(b'e', contents['f/g/h'])
+      self.assertEqual(b'42', contents['README'])
+
+  def test_jar_entries_are_copied_raw(self):
+    with temporary_dir() as tmpdir:
+      lib = self.create_jar(os.path.join(tmpdir, 'lib.jar'),
+                            [('META-INF/MANIFEST.MF', b'Manifest-Version: 2.0\n'),
+                             ('com/', b''),
+                             ('com/A.class', b'A' * 1000)])
+      stored = self.create_jar(os.path.join(tmpdir, 'stored.jar'),
+                               [('com/B.class', b'B' * 1000)],
+                               compression=zipfile.ZIP_STORED)
+
+      out = os.path.join(tmpdir, 'out.jar')
+      names, contents = self.assemble(out, jars=[lib, stored])
+      self.assertEqual(['META-INF/', 'META-INF/MANIFEST.MF', 'com/', 'com/A.class', 'com/B.class'],
+                       names)
+      self.assertEqual(self.manifest.contents(), contents['META-INF/MANIFEST.MF'])
+      self.assertEqual(b'A' * 1000, contents['com/A.class'])
+      self.assertEqual(b'B' * 1000, contents['com/B.class'])
+
+      with open_zip(lib) as zf:
+        original = zf.getinfo('com/A.class')
+      with open_zip(out) as zf:
+        copied = zf.getinfo('com/A.class')
+        self.assertEqual(zipfile.ZIP_DEFLATED, copied.compress_type)
+        self.assertEqual(original.compress_size, copied.compress_size)
+        self.assertEqual(original.CRC, copied.CRC)
+        # Entries already stored uncompressed are copied as is too.
+        self.assertEqual(zipfile.ZIP_STORED, zf.getinfo('com/B.class').compress_type)
+
+  def test_uncompressed(self):
+    with temporary_dir() as tmpdir:
+      lib = self.create_jar(os.path.join(tmpdir, 'lib.jar'), [('com/A.class', b'A' * 1000)])
+
+      out = os.path.join(tmpdir, 'out.jar')
+      _, contents = self.assemble(out, jars=[lib], compressed=False)
+      self.assertEqual(b'A' * 1000, contents['com/A.class'])
+      with open_zip(out) as zf:
+        self.assertEqual(zipfile.ZIP_STORED, zf.getinfo('com/A.class').compress_type)
+
+  def test_duplicates(self):
+    with temporary_dir() as tmpdir:
+      first = self.create_jar(os.path.join(tmpdir, 'first.jar'),
+                              [('skip', b'1'), ('replace', b'1'), ('concat', b'1'),
+                               ('concat_text', b'1'), ('skipped.txt', b'1'), ('fail', b'1')])
+      second = self.create_jar(os.path.join(tmpdir, 'second.jar'),
+                               [('skip', b'2'), ('replace', b'2'), ('concat', b'2'),
+                                ('concat_text', b'2')])
+      rules = JarRules(rules=[Skip(r'\.txt$'),
+                              Duplicate(r'^replace$', Duplicate.REPLACE),
+                              Duplicate(r'^concat$', Duplicate.CONCAT),
+                              Duplicate(r'^concat_text$', Duplicate.CONCAT_TEXT)],
+                       default_dup_action=Duplicate.SKIP)
+
+      names, contents = self.assemble(os.path.join(tmpdir, 'out.jar'),
+                                      jars=[first, second],
+                                      rules=rules)
+      self.assertEqual(['META-INF/', 'META-INF/MANIFEST.MF', 'skip', 'replace', 'concat',
+                        'concat_text', 'fail'],
+                       names)
+      self.assertEqual(b'1', contents['skip'])
+      self.assertEqual(b'2', contents['replace'])
+      self.assertEqual(b'12', contents['concat'])
+      self.assertEqual(b'1\n2', contents['concat_text'])
+
+      third = self.create_jar(os.path.join(tmpdir, 'third.jar'), [('fail', b'3')])
+      failed = os.path.join(tmpdir, 'failed.jar')
+      with self.assertRaises(Duplicate.Error):
+        self.assemble(failed, jars=[first, third],
+                      rules=JarRules(rules=[], default_dup_action=Duplicate.FAIL))
+      self.assertFalse(os.path.exists(failed))
+
+      # A failed assembly leaves any jar from an earlier assembly in place.
+      _, expected_contents = self.assemble(failed, jars=[first])
+      with self.assertRaises(Duplicate.Error):
+        self.assemble(failed, jars=[first, third],
+                      rules=JarRules(rules=[], default_dup_action=Duplicate.FAIL))
+      with open_zip(failed) as zf:
+        self.assertEqual(expected_contents, {name: zf.read(name) for name in zf.namelist()})
+      self.assertEqual([], [name for name in os.listdir(tmpdir) if '.tmp.' in name])
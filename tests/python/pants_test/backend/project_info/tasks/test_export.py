@@ -9,6 +9,8 @@ import json
 import os
 from textwrap import dedent
 
+import mock
+
 from pants.backend.jvm.register import build_file_aliases as register_jvm
 from pants.backend.jvm.subsystems.scala_platform import ScalaPlatform
 from pants.backend.jvm.targets.jar_dependency import JarDependency
@@ -377,3 +379,43 @@ class ExportTest(InterpreterCacheTestMixin, ConsoleTaskTestBase):
     self.assertTrue(result['targets']['src/python/alpha:alpha_synthetic_resources']['is_synthetic'])
     # But not the origin target
     self.assertFalse(result['targets']['src/python/alpha:alpha']['is_synthetic'])
+
+  def test_fragment_cache(self):
+    self.set_options(fragment_cache=False)
+    uncached = self.execute_export('project_info:third')
+
+    self.set_options(fragment_cache=True)
+    self.assertEqual(uncached, self.execute_export('project_info:third'))
+    # The second cached export reads the fragments written by the first.
+    self.assertEqual(uncached, self.execute_export('project_info:third'))
+    self.assertTrue(os.listdir(os.path.join(self.test_workdir, 'fragments')))
+
+    self.set_options(formatted=False)
+    unformatted = self.execute_export('project_info:third')
+    self.assertEqual(1, len(unformatted))
+    self.assertEqual(json.loads(''.join(uncached)), json.loads(unformatted[0]))
+
+  def test_fragment_cache_skips_unchanged_targets(self):
+    self.set_options(fragment_cache=True)
+    first = self.execute_export('project_info:jvm_target')
+    with mock.patch.object(Export, '_target_fragment') as target_fragment:
+      self.assertEqual(first, self.execute_export('project_info:jvm_target'))
+    self.assertFalse(target_fragment.called)
+
+  def test_fragment_cache_recomputes_changed_targets(self):
+    self.set_options(fragment_cache=True, sources=True)
+    self.make_target('project_info:changing', JavaLibrary, sources=['com/foo/A.java'])
+    result = self.execute_export_json('project_info:changing')
+    self.assertEqual(['project_info/com/foo/A.java'],
+                     result['targets']['project_info:changing']['sources'])
+    self.assertEqual([], result['targets']['project_info:changing']['targets'])
+
+    self.reset_build_graph()
+    self.make_target('project_info:dep', JavaLibrary, sources=['com/foo/C.java'])
+    self.make_target('project_info:changing', JavaLibrary,
+                     sources=['com/foo/A.java', 'com/foo/B.java'],
+                     dependencies=[self.target('project_info:dep')])
+    result = self.execute_export_json('project_info:changing')
+    self.assertEqual(['project_info/com/foo/A.java', 'project_info/com/foo/B.java'],
+                     sorted(result['targets']['project_info:changing']['sources']))
+    self.assertEqual(['project_info:dep'], result['targets']['project_info:changing']['targets'])
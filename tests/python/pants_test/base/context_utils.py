@@ -55,6 +55,15 @@ class TestContext(Context):
 
     artifact_cache_stats = DummyArtifactCacheStats()
 
+    def register_thread(self, parent_workunit): pass
+
+    def get_current_workunit(self): pass
+
+    @contextmanager
+    def new_workunit_under_parent(self, name, parent, labels=None, cmd='', log_config=None):
+      sys.stderr.write('\nStarting workunit {}\n'.format(name))
+      yield TestContext.DummyWorkUnit()
+
   @contextmanager
   def new_workunit(self, name, labels=None, cmd='', log_config=None):
     """
@@ -0,0 +1,107 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import os
+
+from pathspec import PathSpec
+from pathspec.gitignore import GitIgnorePattern
+
+from pants.base.build_file import BuildFile
+from pants.base.file_system_project_tree import FileSystemProjectTree
+from pants.base.ignore_pattern_matcher import IgnorePatternMatcher
+from pants.util.contextutil import Timer, temporary_dir
+from pants.util.dirutil import fast_relpath, safe_mkdir, touch
+
+
+# Roughly the shape of a large repo's .gitignore: a few anchored build output dirs, lots of
+# unanchored editor/tool droppings and a couple of negations.
+IGNORE_PATTERNS = (
+  ['/dist/', '/.pants.d/', '/build-support/*.venv/', '/.cache/', '/out/', '/target/'] +
+  ['*.{}'.format(ext) for ext in ('pyc', 'pyo', 'class', 'jar', 'swp', 'swo', 'iml', 'ipr', 'iws',
+                                  'egg-info', 'log', 'tmp', 'bak', 'orig', 'rej', 'DS_Store')] +
+  ['generated{}'.format(i) for i in range(60)] +
+  ['/third_party/vendor{}/'.format(i) for i in range(20)] +
+  ['node_modules', '.idea', '.gradle', '.eggs', '__pycache__', 'bin/', 'obj/'] +
+  ['!generated0/keep', '!/third_party/vendor0/BUILD']
+)
+
+
+def create_tree(root, num_dirs, fanout):
+  """Creates `num_dirs` directories under `root`, each with a BUILD file, `fanout` per level."""
+  created = 0
+  level = ['']
+  while created < num_dirs:
+    next_level = []
+    for parent in level:
+      for i in range(fanout):
+        if created >= num_dirs:
+          break
+        # Every so often, create a directory the ignore patterns prune.
+        name = 'generated{}'.format(created % 60) if created % 101 == 100 else 'd{}'.format(i)
+        relpath = os.path.join(parent, name)
+        safe_mkdir(os.path.join(root, relpath))
+        touch(os.path.join(root, relpath, 'BUILD'))
+        next_level.append(relpath)
+        created += 1
+    level = next_level
+
+
+def scan_with_path_spec(project_tree, path_spec):
+  """Scans for BUILD files the way `BuildFile.scan_build_files` did before `IgnorePatternMatcher`."""
+  build_files = set()
+  for root, dirs, files in project_tree.walk('', topdown=True):
+    excluded_dirs = list(path_spec.match_files('{}/'.format(os.path.join(root, dirname))
+                                               for dirname in dirs))
+    for subdir in excluded_dirs:
+      dirs.remove(fast_relpath(subdir, root)[:-1])
+    for filename in files:
+      if BuildFile._is_buildfile_name(filename):
+        build_files.add(os.path.join(root, filename))
+  return build_files.difference(path_spec.match_files(build_files))
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Benchmarks scanning a tree for BUILD files.')
+  parser.add_argument('--dirs', type=int, default=100000,
+                      help='The number of directories (each with a BUILD file) to create.')
+  parser.add_argument('--fanout', type=int, default=20,
+                      help='The number of subdirectories per directory.')
+  parser.add_argument('--repeat', type=int, default=3,
+                      help='The number of times to run each scan; the fastest run is reported.')
+  args = parser.parse_args()
+
+  path_spec = PathSpec.from_lines(GitIgnorePattern, IGNORE_PATTERNS)
+  with temporary_dir() as root:
+    with Timer() as timer:
+      create_tree(root, args.dirs, args.fanout)
+    print('Created {} directories in {:.3f}s; matching against {} patterns.'
+          .format(args.dirs, timer.elapsed, len(path_spec)))
+    project_tree = FileSystemProjectTree(root)
+
+    def best_of(scan):
+      times = []
+      for _ in range(args.repeat):
+        with Timer() as timer:
+          result = scan()
+        times.append(timer.elapsed)
+      return min(times), result
+
+    path_spec_time, expected = best_of(lambda: scan_with_path_spec(project_tree, path_spec))
+    matcher = IgnorePatternMatcher.for_path_spec(path_spec)
+    matcher_time, build_files = best_of(
+      lambda: BuildFile._walk_build_file_relpaths(project_tree, '', matcher))
+    assert expected == build_files
+
+    print('Found {} BUILD files.'.format(len(build_files)))
+    print('PathSpec:             {:.3f}s'.format(path_spec_time))
+    print('IgnorePatternMatcher: {:.3f}s ({:.1f}x)'.format(matcher_time,
+                                                           path_spec_time / matcher_time))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,75 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pathspec import PathSpec
+from pathspec.gitignore import GitIgnorePattern
+
+from pants.base.ignore_pattern_matcher import IgnorePatternMatcher
+
+
+class IgnorePatternMatcherTest(unittest.TestCase):
+
+  PATHS = [
+    'BUILD',
+    'a/',
+    'a/BUILD',
+    'a/b/',
+    'a/b/BUILD',
+    'a/b/BUILD.tools',
+    'build/',
+    'build/BUILD',
+    'dist/',
+    'dist/keep/',
+    'dist/keep/BUILD',
+    'src/dist/BUILD',
+    'src/python/foo.pyc',
+    'src/python/BUILD',
+    '.pants.d/',
+    '.pants.d/BUILD',
+  ]
+
+  def assert_matches_like_path_spec(self, lines):
+    path_spec = PathSpec.from_lines(GitIgnorePattern, lines)
+    matcher = IgnorePatternMatcher(path_spec.patterns)
+    self.assertEqual(set(path_spec.match_files(self.PATHS)), matcher.match_files(self.PATHS))
+    for path in self.PATHS:
+      self.assertEqual(path in set(path_spec.match_files([path])), matcher.matches(path), path)
+
+  def test_no_patterns(self):
+    matcher = IgnorePatternMatcher([])
+    self.assertFalse(matcher)
+    self.assertEqual(set(), matcher.match_files(self.PATHS))
+
+  def test_include_patterns(self):
+    self.assert_matches_like_path_spec(['/build/', 'dist', '*.pyc', '.pants.d', 'a/b/BUILD.*'])
+
+  def test_negated_patterns(self):
+    self.assert_matches_like_path_spec(['dist', '!dist/keep', '!/dist/', '*.pyc', '!src/python/*'])
+
+  def test_comments_and_blank_patterns(self):
+    self.assert_matches_like_path_spec(['# a comment', '', 'build', '# another'])
+
+  def test_many_patterns(self):
+    self.assert_matches_like_path_spec(['dir{}'.format(i) for i in range(500)] + ['a/b'])
+
+  def test_prune_dirs(self):
+    matcher = IgnorePatternMatcher(PathSpec.from_lines(GitIgnorePattern, ['/a/b', 'c']).patterns)
+    dirs = ['b', 'c', 'd']
+    matcher.prune_dirs('a', dirs)
+    self.assertEqual(['d'], dirs)
+
+    dirs = ['b', 'c', 'd']
+    matcher.prune_dirs('', dirs)
+    self.assertEqual(['b', 'd'], dirs)
+
+  def test_for_path_spec_is_memoized(self):
+    path_spec = PathSpec.from_lines(GitIgnorePattern, ['build'])
+    self.assertIs(IgnorePatternMatcher.for_path_spec(path_spec),
+                  IgnorePatternMatcher.for_path_spec(path_spec))
+    self.assertFalse(IgnorePatternMatcher.for_path_spec(None))
@@ -0,0 +1,61 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from pants.util.contextutil import Timer
+
+
+# Run in a fresh interpreter so that each measurement pays for all of its imports.
+_SETUP_OPTIONS = """
+import json, sys
+from pkg_resources import WorkingSet
+from pants.bin.goal_runner import OptionsInitializer
+from pants.option.options_bootstrapper import OptionsBootstrapper
+options_bootstrapper = OptionsBootstrapper(args=sys.argv[1:])
+OptionsInitializer(options_bootstrapper, working_set=WorkingSet()).setup()
+print(json.dumps(len(sys.modules)))
+"""
+
+
+def setup_options(pants_args):
+  """Initializes options and loads backends for the given command line in a new interpreter.
+
+  Returns the number of modules the interpreter imported.
+  """
+  env = os.environ.copy()
+  env['PYTHONPATH'] = os.pathsep.join(sys.path)
+  output = subprocess.check_output([sys.executable, '-c', _SETUP_OPTIONS, './pants'] + pants_args,
+                                   env=env)
+  return json.loads(output.splitlines()[-1])
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Benchmarks pants startup with backends loaded eagerly and lazily.')
+  parser.add_argument('--repeat', type=int, default=5,
+                      help='The number of times to run each benchmark; the fastest is reported.')
+  parser.add_argument('pants_args', nargs='*', default=['list'],
+                      help='The pants command line to start up for, e.g. `list` or `compile`.')
+  args = parser.parse_args()
+
+  print('{:<8} {:>9} {:>9}'.format('mode', 'time', 'modules'))
+  for mode, mode_args in (('eager', ['--no-lazy-backends']), ('lazy', ['--lazy-backends'])):
+    times = []
+    for _ in range(args.repeat):
+      with Timer() as timer:
+        modules = setup_options(mode_args + args.pants_args)
+      times.append(timer.elapsed)
+    print('{:<8} {:>8.3f}s {:>9}'.format(mode, min(times), modules))
+
+
+if __name__ == '__main__':
+  main()
@@ -15,7 +15,8 @@ from pkg_resources import (Distribution, EmptyProvider, VersionConflict, Working
                            yield_lines)
 
 from pants.base.exceptions import BuildConfigurationError
-from pants.bin.extension_loader import (PluginLoadOrderError, PluginNotFound, load_backend,
+from pants.bin.extension_loader import (BackendMetadata, LazyBackendLoader, PluginLoadOrderError,
+                                        PluginNotFound, backend_packages, load_backend,
                                         load_plugins)
 from pants.build_graph.build_configuration import BuildConfiguration
 from pants.build_graph.build_file_aliases import BuildFileAliases
@@ -86,7 +87,7 @@ class LoaderTest(unittest.TestCase):
 
   @contextmanager
   def create_register(self, build_file_aliases=None, register_goals=None, global_subsystems=None,
-                      module_name='register'):
+                      module_name='register', metadata=None):
 
     package_name = b'__test_package_{0}'.format(uuid.uuid4().hex)
     self.assertFalse(package_name in sys.modules)
@@ -107,6 +108,14 @@ class LoaderTest(unittest.TestCase):
       register_entrypoint('global_subsystems', global_subsystems)
       register_entrypoint('register_goals', register_goals)
 
+      if metadata is not None:
+        metadata_module_fqn = b'{0}.metadata'.format(package_name)
+        metadata_module = types.ModuleType(metadata_module_fqn)
+        for name, value in metadata.items():
+          setattr(metadata_module, name, value)
+        setattr(package_module, 'metadata', metadata_module)
+        sys.modules[metadata_module_fqn] = metadata_module
+
       yield package_name
     finally:
       del sys.modules[package_name]
@@ -284,3 +293,95 @@ class LoaderTest(unittest.TestCase):
       load_backend(self.build_configuration, backend_package)
       self.assertEqual(self.build_configuration.subsystems(),
                        {DummySubsystem1, DummySubsystem2})
+
+  def test_lazy_backend_loader(self):
+    def register_goals():
+      Goal.by_name('jack').install(TaskRegistrar('jill', DummyTask))
+
+    def build_file_aliases():
+      return BuildFileAliases(targets={'bob': DummyTarget})
+
+    def register_jane():
+      Goal.by_name('jane').install(TaskRegistrar('jane', DummyTask))
+
+    with self.create_register(register_goals=register_goals) as eager_backend:
+      with self.create_register(build_file_aliases=build_file_aliases,
+                                metadata={'aliases': ['bob']}) as aliases_backend:
+        with self.create_register(register_goals=register_jane,
+                                  metadata={'tasks': ['jane'],
+                                            'dependencies': [aliases_backend]}) as goal_backend:
+          late_loads = []
+
+          def late_load_hook(load):
+            late_loads.append(load)
+            load()
+
+          loader = LazyBackendLoader(self.build_configuration,
+                                     [eager_backend, aliases_backend, goal_backend],
+                                     late_load_hook=late_load_hook)
+          self.assertEqual({'goals', 'jane'}, {si.scope for si in loader.known_scope_infos()})
+
+          loader.load(['jack'])
+          self.assertEqual([eager_backend], loader.loaded_backend_packages)
+          self.assertEqual(['jill'], Goal.by_name('jack').ordered_task_names())
+          self.assertEqual(0, len(self.build_configuration.registered_aliases().target_types))
+          self.assertEqual({'bob'}, self.build_configuration.lazy_aliases())
+
+          self.build_configuration.load_lazy_aliases({'bob', 'jack'})
+          self.assertEqual(1, len(late_loads))
+          self.assertEqual([eager_backend, aliases_backend], loader.loaded_backend_packages)
+          self.assertEqual(DummyTarget,
+                           self.build_configuration.registered_aliases().target_types['bob'])
+          self.assertEqual(frozenset(), self.build_configuration.lazy_aliases())
+
+  def test_lazy_backend_loader_loads_needed_backends_with_dependencies(self):
+    with self.create_register() as eager_backend:
+      with self.create_register(metadata={'subsystems': ['dummy-subsystem1']}) as dep_backend:
+        with self.create_register(metadata={'tasks': ['compile.dummy'],
+                                            'dependencies': [dep_backend]}) as goal_backend:
+          with self.create_register(metadata={'tasks': ['other']}) as other_backend:
+            backends = [eager_backend, goal_backend, dep_backend, other_backend]
+
+            loader = LazyBackendLoader(self.build_configuration, backends)
+            loader.load(['compile'])
+            self.assertEqual([eager_backend, goal_backend, dep_backend],
+                             loader.loaded_backend_packages)
+
+            loader = LazyBackendLoader(BuildConfiguration(), backends)
+            loader.load(['dummy-subsystem1.compile.dummy'])
+            self.assertEqual([eager_backend, dep_backend], loader.loaded_backend_packages)
+
+            loader = LazyBackendLoader(BuildConfiguration(), backends)
+            loader.load(['goals'])
+            self.assertEqual(backends, loader.loaded_backend_packages)
+
+  def test_builtin_backend_metadata(self):
+    # The metadata of each builtin backend must declare exactly what loading it registers.
+    for backend_package in backend_packages():
+      metadata = BackendMetadata.load(backend_package)
+      if not metadata:
+        continue
+
+      Goal.clear()
+      build_configuration = BuildConfiguration()
+      load_backend(build_configuration, 'pants.build_graph')
+      load_backend(build_configuration, 'pants.core_tasks')
+
+      def registered():
+        aliases = build_configuration.registered_aliases()
+        return (set(aliases.target_types) | set(aliases.target_macro_factories) |
+                set(aliases.objects) | set(aliases.context_aware_object_factories),
+                {Goal.scope(goal.name, task_name)
+                 for goal in Goal.all() for task_name in goal.ordered_task_names()},
+                {subsystem.options_scope for subsystem in
+                 Subsystem.closure(build_configuration.subsystems() | Goal.subsystems())})
+
+      aliases, tasks, subsystems = registered()
+      load_backend(build_configuration, backend_package)
+      all_aliases, all_tasks, all_subsystems = registered()
+
+      self.assertEqual(all_aliases - aliases, set(metadata.aliases), backend_package)
+      self.assertEqual(all_tasks - tasks, set(metadata.tasks), backend_package)
+      self.assertEqual(all_subsystems - subsystems, set(metadata.subsystems), backend_package)
+      for dependency in metadata.dependencies:
+        self.assertIn(dependency, backend_packages())
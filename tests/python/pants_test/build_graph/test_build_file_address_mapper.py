@@ -285,3 +285,54 @@ Invalid BUILD files for \[::\]$""", re.DOTALL)
 
     self.assertEqual(sort(Address.parse(addr) for addr in expected),
                      sort(address_mapper.scan_specs(specs)))
+
+
+class BuildFileAddressMapperParallelScanTest(BaseTest):
+
+  def setUp(self):
+    super(BuildFileAddressMapperParallelScanTest, self).setUp()
+
+    def add_target(path, name):
+      self.add_to_build_file(path, 'target(name="{name}")\n'.format(name=name))
+
+    add_target('BUILD', 'root')
+    add_target('a', 'a')
+    add_target('a/b', 'b')
+    add_target('a/b/c/d', 'd')
+    add_target('a/b/c/d/e', 'e')
+    add_target('f/g/h', 'h')
+    add_target('ignored/a/b', 'bogus')
+    add_target('f/ignored', 'bogus')
+
+  def _address_mapper(self, parallel_scan):
+    return BuildFileAddressMapper(self.build_file_parser,
+                                  self.project_tree,
+                                  build_ignore_patterns=['ignored'],
+                                  parallel_scan=parallel_scan)
+
+  def test_scan_build_files(self):
+    serial = self._address_mapper(parallel_scan=False).scan_build_files(None)
+    parallel = self._address_mapper(parallel_scan=True).scan_build_files(None)
+    self.assertEqual(serial, parallel)
+    self.assertEqual(['BUILD', 'a/BUILD', 'a/b/BUILD', 'a/b/c/d/BUILD', 'a/b/c/d/e/BUILD',
+                      'f/g/h/BUILD'],
+                     [build_file.relpath for build_file in parallel])
+
+  def test_scan_build_files_with_base_path(self):
+    serial = self._address_mapper(parallel_scan=False).scan_build_files('a/b')
+    parallel = self._address_mapper(parallel_scan=True).scan_build_files('a/b')
+    self.assertEqual(serial, parallel)
+    self.assertEqual(['a/b/BUILD', 'a/b/c/d/BUILD', 'a/b/c/d/e/BUILD'],
+                     [build_file.relpath for build_file in parallel])
+
+  def test_scan_addresses(self):
+    serial = self._address_mapper(parallel_scan=False).scan_addresses()
+    parallel = self._address_mapper(parallel_scan=True).scan_addresses()
+    self.assertEqual(serial, parallel)
+    self.assertEqual({'//:root', 'a:a', 'a/b:b', 'a/b/c/d:d', 'a/b/c/d/e:e', 'f/g/h:h'},
+                     {address.spec for address in parallel})
+
+  def test_scan_specs(self):
+    parallel = self._address_mapper(parallel_scan=True).scan_specs([DescendantAddresses('a')])
+    self.assertEqual({'a:a', 'a/b:b', 'a/b/c/d:d', 'a/b/c/d/e:e'},
+                     {address.spec for address in parallel})
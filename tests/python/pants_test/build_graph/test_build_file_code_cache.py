@@ -0,0 +1,94 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+
+from pants.base.build_file import BuildFile
+from pants.base.file_system_project_tree import FileSystemProjectTree
+from pants.build_graph.address import BuildFileAddress
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.build_file_code_cache import BuildFileCodeCache
+from pants.build_graph.build_file_parser import BuildFileParser
+from pants.build_graph.target import Target
+from pants_test.base_test import BaseTest
+
+
+class BuildFileCodeCacheTest(BaseTest):
+
+  def setUp(self):
+    super(BuildFileCodeCacheTest, self).setUp()
+    self.cache_dir = os.path.join(self.pants_workdir, 'build_file_code')
+
+  def create_buildfile(self, path):
+    return BuildFile(FileSystemProjectTree(self.build_root), path)
+
+  def create_parser(self, aliases=None):
+    aliases = aliases or self.build_file_parser.registered_aliases()
+    code_cache = BuildFileCodeCache(self.cache_dir, aliases)
+    return BuildFileParser(self._build_configuration, self.build_root, code_cache=code_cache)
+
+  def test_cached_code_is_reused(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a")\n')
+    build_file = self.create_buildfile('a/BUILD')
+
+    parser = self.create_parser()
+    self.assertEqual({BuildFileAddress(build_file, 'a')}, set(parser.parse_build_file(build_file)))
+    self.assertEqual((0, 1), (parser._code_cache.hits, parser._code_cache.misses))
+
+    parser = self.create_parser()
+    address_map = parser.parse_build_file(build_file)
+    self.assertEqual((1, 0), (parser._code_cache.hits, parser._code_cache.misses))
+    self.assertEqual({BuildFileAddress(build_file, 'a')}, set(address_map))
+
+  def test_changed_source_misses(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a")\n')
+    build_file = self.create_buildfile('a/BUILD')
+    self.create_parser().parse_build_file(build_file)
+
+    self.add_to_build_file('a/BUILD', 'target(name="b")\n')
+    parser = self.create_parser()
+    address_map = parser.parse_build_file(build_file)
+    self.assertEqual((0, 1), (parser._code_cache.hits, parser._code_cache.misses))
+    self.assertEqual({BuildFileAddress(build_file, 'a'), BuildFileAddress(build_file, 'b')},
+                     set(address_map))
+
+  def test_changed_aliases_miss(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a")\n')
+    build_file = self.create_buildfile('a/BUILD')
+    self.create_parser().parse_build_file(build_file)
+
+    aliases = self.build_file_parser.registered_aliases().merge(
+      BuildFileAliases(targets={'other_target': Target}))
+    parser = self.create_parser(aliases=aliases)
+    parser.parse_build_file(build_file)
+    self.assertEqual((0, 1), (parser._code_cache.hits, parser._code_cache.misses))
+
+  def test_corrupt_entry(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a")\n')
+    build_file = self.create_buildfile('a/BUILD')
+    self.create_parser().parse_build_file(build_file)
+    for root, _, files in os.walk(self.cache_dir):
+      for f in files:
+        with open(os.path.join(root, f), 'wb') as fp:
+          fp.write(b'garbage')
+
+    parser = self.create_parser()
+    self.assertEqual({BuildFileAddress(build_file, 'a')}, set(parser.parse_build_file(build_file)))
+    self.assertEqual((0, 1), (parser._code_cache.hits, parser._code_cache.misses))
+
+  def test_syntax_error_is_not_cached(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a"\n')
+    build_file = self.create_buildfile('a/BUILD')
+    with self.assertRaises(BuildFileParser.ParseError):
+      self.create_parser().parse_build_file(build_file)
+    self.assertFalse(os.path.exists(self.cache_dir))
+
+  def test_parse_timings(self):
+    self.add_to_build_file('a/BUILD', 'target(name="a")\n')
+    parser = self.create_parser()
+    parser.parse_build_file(self.create_buildfile('a/BUILD'))
+    self.assertEqual({'read', 'compile', 'exec', 'addressables'}, set(parser.timings))
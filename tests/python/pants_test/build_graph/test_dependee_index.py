@@ -0,0 +1,85 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+
+import mock
+
+from pants.build_graph.address import Address
+from pants.build_graph.dependee_index import DependeeIndex
+from pants_test.base_test import BaseTest
+
+
+class DependeeIndexTest(BaseTest):
+
+  def setUp(self):
+    super(DependeeIndexTest, self).setUp()
+    self.index_file = DependeeIndex.index_file_for(self.pants_workdir)
+
+    self.add_to_build_file('common/a', "target(name='a', dependencies=['common/b'])\n")
+    self.add_to_build_file('common/b', "target(name='b', dependencies=['common/c'])\n")
+    self.add_to_build_file('common/c', "target(name='c')\n")
+    self.add_to_build_file('other', "target(name='other', dependencies=['common/c'])\n")
+
+  def create_index(self):
+    # A fresh BuildGraph per index simulates a new pants run.
+    self.reset_build_graph()
+    return DependeeIndex(self.address_mapper, self.index_file)
+
+  def test_dependees(self):
+    index = self.create_index()
+    self.assertEqual({Address.parse('common/b'), Address.parse('other')},
+                     index.dependees_of(Address.parse('common/c')))
+    self.assertEqual(set(), index.dependees_of(Address.parse('common/a')))
+    self.assertEqual([Address.parse('common/b'), Address.parse('common/a')],
+                     list(index.transitive_dependees_of_addresses([Address.parse('common/b')])))
+    self.assertEqual({Address.parse('common/c'), Address.parse('common/b'),
+                      Address.parse('common/a'), Address.parse('other')},
+                     set(index.transitive_dependees_of_addresses([Address.parse('common/c')])))
+    self.assertTrue(os.path.isfile(self.index_file))
+
+  def test_incremental_update(self):
+    self.assertEqual(4, self.create_index().update())
+
+    index = self.create_index()
+    self.assertEqual(0, index.update())
+    # No targets need to be materialized when every BUILD file is unchanged.
+    self.assertEqual([], list(self.build_graph.targets()))
+    self.assertEqual({Address.parse('common/b'), Address.parse('other')},
+                     index.dependees_of(Address.parse('common/c')))
+
+    self.create_file('other/BUILD', "target(name='other', dependencies=['common/a'])\n")
+    index = self.create_index()
+    with mock.patch.object(self.address_mapper, 'resolve',
+                           wraps=self.address_mapper.resolve) as resolve:
+      self.assertEqual(1, index.update())
+    # A changed BUILD file is only read for the dependencies it declares: the BUILD files of those
+    # dependencies are not resolved, and no targets are injected into the run's BuildGraph.
+    self.assertEqual({'other'}, {args[0].spec_path for args, _ in resolve.call_args_list})
+    self.assertEqual([], list(self.build_graph.targets()))
+    self.assertEqual({Address.parse('common/b')}, index.dependees_of(Address.parse('common/c')))
+    self.assertEqual({Address.parse('other')}, index.dependees_of(Address.parse('common/a')))
+
+  def test_removed_build_file(self):
+    self.create_index().update()
+    os.unlink(os.path.join(self.build_root, 'other', 'BUILD'))
+    index = self.create_index()
+    self.assertEqual(0, index.update())
+    self.assertEqual({Address.parse('common/b')}, index.dependees_of(Address.parse('common/c')))
+
+  def test_corrupt_index(self):
+    self.create_file(os.path.relpath(self.index_file, self.build_root), '{not json')
+    index = self.create_index()
+    self.assertEqual(4, index.update())
+    self.assertEqual({Address.parse('common/a')}, index.dependees_of(Address.parse('common/b')))
+
+  def test_relative_dependency_specs(self):
+    self.add_to_build_file('common/c', "target(name='d', dependencies=[':c'])\n")
+    index = self.create_index()
+    self.assertEqual({Address.parse('common/b'), Address.parse('common/c:d'),
+                      Address.parse('other')},
+                     index.dependees_of(Address.parse('common/c')))
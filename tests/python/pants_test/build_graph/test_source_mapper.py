@@ -9,6 +9,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 from pants.backend.jvm.targets.java_library import JavaLibrary
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.source_mapper import LazySourceMapper, SpecSourceMapper
+from pants.build_graph.source_owner_index import SourceOwnerIndex
 from pants_test.base_test import BaseTest
 
 
@@ -104,3 +105,23 @@ class LazySourceMapperTest(SourceMapperTest, BaseTest):
 class SpecSourceMapperTest(SourceMapperTest, BaseTest):
   def set_mapper(self, fast=False):
     self._mapper = SpecSourceMapper(self.address_mapper, self.build_graph, fast)
+
+
+class IndexedSourceMapperTest(SourceMapperTest):
+  def source_owner_index(self):
+    # Each mapper gets a fresh build graph and index instance, as it would in a new pants run.
+    self.reset_build_graph()
+    index_file = SourceOwnerIndex.index_file_for(self.pants_workdir)
+    return SourceOwnerIndex(self.address_mapper, self.build_graph, index_file)
+
+
+class IndexedLazySourceMapperTest(IndexedSourceMapperTest, BaseTest):
+  def set_mapper(self, fast=False):
+    self._mapper = LazySourceMapper(self.address_mapper, self.build_graph, fast,
+                                    source_owner_index=self.source_owner_index())
+
+
+class IndexedSpecSourceMapperTest(IndexedSourceMapperTest, BaseTest):
+  def set_mapper(self, fast=False):
+    self._mapper = SpecSourceMapper(self.address_mapper, self.build_graph, fast,
+                                    source_owner_index=self.source_owner_index())
@@ -0,0 +1,98 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+from textwrap import dedent
+
+from pants.backend.jvm.targets.java_library import JavaLibrary
+from pants.build_graph.address import Address
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.source_owner_index import SourceOwnerIndex
+from pants.source.wrapped_globs import Globs
+from pants_test.base_test import BaseTest
+
+
+class SourceOwnerIndexTest(BaseTest):
+
+  @property
+  def alias_groups(self):
+    return BuildFileAliases(
+      targets={
+        'java_library': JavaLibrary,
+      },
+      context_aware_object_factories={
+        'globs': Globs,
+      },
+    )
+
+  def setUp(self):
+    super(SourceOwnerIndexTest, self).setUp()
+    self.index_file = SourceOwnerIndex.index_file_for(self.pants_workdir)
+    self.create_file('lib/a.java')
+    self.create_file('lib/b.java')
+    self.add_to_build_file('lib', "java_library(name='lib', sources=globs('*.java'))\n")
+
+  def create_index(self):
+    # A fresh BuildGraph per index simulates a new pants run.
+    self.reset_build_graph()
+    return SourceOwnerIndex(self.address_mapper, self.build_graph, self.index_file)
+
+  def owned_sources(self, spec_path):
+    index = self.create_index()
+    owned = index.owned_sources(spec_path)
+    index.flush()
+    return owned
+
+  def test_owned_sources(self):
+    lib = {Address.parse('lib')}
+    self.assertEqual({'lib/a.java': lib, 'lib/b.java': lib, 'lib/BUILD': lib},
+                     self.owned_sources('lib'))
+    self.assertTrue(os.path.isfile(self.index_file))
+
+  def test_queries_are_persisted_on_flush(self):
+    index = self.create_index()
+    index.owned_sources('lib')
+    index.addresses_matching('lib/c.java', 'lib')
+    self.assertFalse(os.path.exists(self.index_file))
+    index.flush()
+    self.assertTrue(os.path.isfile(self.index_file))
+    self.assertEqual(['index.json'], os.listdir(os.path.dirname(self.index_file)))
+
+  def test_unchanged_entry_is_reused(self):
+    self.owned_sources('lib')
+
+    index = self.create_index()
+    self.assertIn('lib/a.java', index.owned_sources('lib'))
+    # The entry was valid, so no targets were materialized.
+    self.assertEqual([], list(self.build_graph.targets()))
+
+  def test_new_source_in_globbed_dir(self):
+    self.owned_sources('lib')
+    self.create_file('lib/c.java')
+    self.assertIn('lib/c.java', self.owned_sources('lib'))
+
+  def test_changed_build_file(self):
+    self.owned_sources('lib')
+    self.create_file('lib/BUILD', dedent("""
+      java_library(name='lib', sources=['a.java'])
+      java_library(name='other', sources=['b.java'])
+    """))
+    owned = self.owned_sources('lib')
+    self.assertEqual({Address.parse('lib')}, owned['lib/a.java'])
+    self.assertEqual({Address.parse('lib:other')}, owned['lib/b.java'])
+
+  def test_new_build_file(self):
+    self.create_file('new/d.java')
+    self.assertEqual({}, self.owned_sources('new'))
+    self.add_to_build_file('new', "java_library(name='new', sources=['d.java'])\n")
+    self.assertEqual({Address.parse('new')}, self.owned_sources('new')['new/d.java'])
+
+  def test_addresses_matching(self):
+    index = self.create_index()
+    self.assertEqual([Address.parse('lib')], index.addresses_matching('lib/deleted.java', 'lib'))
+    self.assertEqual([Address.parse('lib')], index.addresses_matching('lib/BUILD', 'lib'))
+    self.assertEqual([], index.addresses_matching('lib/a.txt', 'lib'))
@@ -0,0 +1,112 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import socket
+
+from pants.base.exceptions import TaskError
+from pants.core_tasks.perf_report import PerfReport
+from pants.stats.statsdb import StatsDB
+from pants_test.tasks.task_test_base import ConsoleTaskTestBase
+
+
+class PerfReportTest(ConsoleTaskTestBase):
+  @classmethod
+  def task_type(cls):
+    return PerfReport
+
+  def setUp(self):
+    super(PerfReportTest, self).setUp()
+    statsdb_path = os.path.join(self.pants_workdir, 'statsdb.sqlite')
+    self.set_options_for_scope('statsdb', path=statsdb_path)
+    self._statsdb = StatsDB(statsdb_path)
+    self._statsdb.ensure_tables()
+
+  def _insert_run(self, run_id, timestamp, timings, machine=None, cmd_line='pants compile ::'):
+    self._statsdb.insert_stats({
+      'run_info': {
+        'id': run_id,
+        'timestamp': str(timestamp),
+        'machine': machine or socket.gethostname(),
+        'user': 'bert',
+        'version': '9.8.7',
+        'buildroot': '/path/to/repo',
+        'outcome': 'SUCCESS',
+        'cmd_line': cmd_line
+      },
+      'cumulative_timings': [{'label': label, 'timing': timing}
+                             for label, timing in timings.items()],
+      'self_timings': []
+    })
+
+  def _insert_history(self):
+    for i in range(5):
+      self._insert_run('run{}'.format(i), 1000 + i,
+                       {'main': 10 + 0.1 * i, 'main:compile': 8, 'main:resolve': 0.1})
+
+  def test_no_runs(self):
+    with self.assertRaises(TaskError):
+      self.execute_console_task()
+
+  def test_no_regressions(self):
+    self._insert_history()
+    self._insert_run('latest', 2000, {'main': 10.3, 'main:compile': 8.2, 'main:resolve': 0.1})
+    self.assert_console_output('Run latest (pants compile ::)', 'No regressions.')
+
+  def test_regressions(self):
+    self._insert_history()
+    # The resolve timing doubled, but by less than the minimum regression.
+    self._insert_run('latest', 2000, {'main': 16.2, 'main:compile': 14, 'main:resolve': 0.2})
+    self.assert_console_output_ordered(
+      'Run latest (pants compile ::)',
+      'main:compile: 14.000s, +75.0% over median 8.000s (p90 8.000s over 5 runs)',
+      'main: 16.200s, +58.8% over median 10.200s (p90 10.400s over 5 runs)')
+
+    with self.assertRaises(TaskError):
+      self.execute_console_task(options={'fail_on_regression': True})
+
+  def test_threshold(self):
+    self._insert_history()
+    self._insert_run('latest', 2000, {'main': 16.2, 'main:compile': 14})
+    self.assert_console_output_ordered(
+      'Run latest (pants compile ::)',
+      'main:compile: 14.000s, +75.0% over median 8.000s (p90 8.000s over 5 runs)',
+      options={'threshold': 60})
+    self.assert_console_output('Run latest (pants compile ::)', 'No regressions.',
+                               options={'threshold': 80})
+
+  def test_run_id_and_min_runs(self):
+    self._insert_history()
+    self._insert_run('slow', 2000, {'main': 20, 'main:compile': 18})
+    self._insert_run('latest', 3000, {'main': 10})
+    self.assertEqual(
+      ['Run slow (pants compile ::)',
+       'main:compile: 18.000s, +125.0% over median 8.000s (p90 8.000s over 5 runs)',
+       'main: 20.000s, +96.1% over median 10.200s (p90 10.400s over 5 runs)'],
+      self.execute_console_task(options={'run_id': 'slow'}))
+    self.assertEqual(['Run slow (pants compile ::)', 'No regressions.'],
+                     self.execute_console_task(options={'run_id': 'slow', 'min_runs': 6}))
+
+  def test_skips_perf_report_runs(self):
+    self._insert_history()
+    self._insert_run('latest', 2000, {'main': 16.2, 'main:compile': 14})
+    # Reporting records a run of its own, which the next report must not pick.
+    self._insert_run('report', 2001, {'main': 1}, cmd_line='pants perf-report')
+    self.assert_console_output_ordered(
+      'Run latest (pants compile ::)',
+      'main:compile: 14.000s, +75.0% over median 8.000s (p90 8.000s over 5 runs)',
+      'main: 16.200s, +58.8% over median 10.200s (p90 10.400s over 5 runs)')
+
+  def test_runs_in_the_same_second(self):
+    # Timestamps have second resolution, so a whole history can share one.
+    for i in range(5):
+      self._insert_run('run{}'.format(i), 1000, {'main': 10 + 0.1 * i, 'main:compile': 8})
+    self._insert_run('latest', 1000, {'main': 16.2, 'main:compile': 14})
+    self.assert_console_output_ordered(
+      'Run latest (pants compile ::)',
+      'main:compile: 14.000s, +75.0% over median 8.000s (p90 8.000s over 5 runs)',
+      'main: 16.200s, +58.8% over median 10.200s (p90 10.400s over 5 runs)')
@@ -315,6 +315,22 @@ class WhatChangedTest(WhatChangedTestBasic):
       workspace=self.workspace(files=['root/src/py/dependency_tree/a/a.py'])
     )
 
+  def test_include_dependees_from_dependee_index(self):
+    self.assert_console_output(
+      'root/src/py/dependency_tree/a:a',
+      'root/src/py/dependency_tree/b:b',
+      options={'include_dependees': 'direct', 'dependee_index': True},
+      workspace=self.workspace(files=['root/src/py/dependency_tree/a/a.py'])
+    )
+
+    self.assert_console_output(
+      'root/src/py/dependency_tree/a:a',
+      'root/src/py/dependency_tree/b:b',
+      'root/src/py/dependency_tree/c:c',
+      options={'include_dependees': 'transitive', 'dependee_index': True},
+      workspace=self.workspace(files=['root/src/py/dependency_tree/a/a.py'])
+    )
+
   def test_exclude(self):
     self.assert_console_output(
       'root/src/py/dependency_tree/a:a',
@@ -0,0 +1,103 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import time
+
+from pants.engine.round_engine import RoundEngine
+from pants.goal.goal import Goal
+from pants.goal.task_registrar import TaskRegistrar
+from pants.source.source_root import SourceRootConfig
+from pants.subsystem.subsystem import Subsystem
+from pants.task.task import Task
+from pants.util.contextutil import Timer
+from pants_test.base.context_utils import create_context
+from pants_test.option.util.fakes import create_options_for_optionables
+
+
+def sleeping_task_type(scope, task_secs, product_types=(), required_data=()):
+  """Returns a task type that sleeps, standing in for a task waiting on a tool subprocess."""
+
+  class SleepingTask(Task):
+    options_scope = scope
+
+    @classmethod
+    def product_types(cls):
+      return list(product_types)
+
+    @classmethod
+    def prepare(cls, options, round_manager):
+      for product_type in required_data:
+        round_manager.require_data(product_type)
+
+    def execute(self):
+      time.sleep(task_secs)
+
+  return SleepingTask
+
+
+def install_goals(num_goals, tasks_per_goal, task_secs):
+  """Installs a goal producing shared data and `num_goals` independent goals requiring it.
+
+  Returns the independent goals and all installed task types.
+  """
+  task_types = []
+
+  def install(goal_name, task_name, **kwargs):
+    task_type = sleeping_task_type('{}.{}'.format(goal_name, task_name), task_secs, **kwargs)
+    TaskRegistrar(task_name, task_type).install(goal_name)
+    task_types.append(task_type)
+
+  install('prepare', 'shared', product_types=['shared'])
+  goals = []
+  for i in range(num_goals):
+    goal_name = 'goal{}'.format(i)
+    for j in range(tasks_per_goal):
+      install(goal_name, 'task{}'.format(j), required_data=['shared'] if j == 0 else ())
+    goals.append(Goal.by_name(goal_name))
+  return goals, task_types
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Benchmarks RoundEngine wall-clock time executing independent goals with '
+                'different limits on concurrent tasks.')
+  parser.add_argument('--goals', type=int, default=4,
+                      help='The number of independent goals, each requiring data from one shared '
+                           'producer task.')
+  parser.add_argument('--tasks-per-goal', type=int, default=3,
+                      help='The number of tasks installed in each goal.')
+  parser.add_argument('--task-secs', type=float, default=0.1,
+                      help='The time each task takes to execute.')
+  parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8],
+                      help='The limits on concurrent tasks to benchmark.')
+  args = parser.parse_args()
+
+  goals, task_types = install_goals(args.goals, args.tasks_per_goal, args.task_secs)
+  options = {'': {'explain': False}}
+  options.update((task_type.options_scope, {'level': 'info', 'colors': False})
+                 for task_type in task_types)
+  optionables = {SourceRootConfig}
+  extra_scopes = set()
+  for task_type in task_types:
+    optionables.add(task_type)
+    optionables.update(Subsystem.closure(
+      {dep.subsystem_cls for dep in task_type.subsystem_dependencies_iter()}))
+    extra_scopes.update(scope_info.scope for scope_info in task_type.known_scope_infos())
+  options = create_options_for_optionables(optionables, extra_scopes=extra_scopes, options=options)
+  Subsystem.set_options(options)
+
+  print('{:<12} {:>9}'.format('concurrency', 'time'))
+  for max_concurrent_tasks in args.concurrency:
+    context = create_context(options=options)
+    with Timer() as timer:
+      RoundEngine(max_concurrent_tasks=max_concurrent_tasks).attempt(context, goals)
+    print('{:<12} {:>8.2f}s'.format(max_concurrent_tasks, timer.elapsed))
+
+
+if __name__ == '__main__':
+  main()
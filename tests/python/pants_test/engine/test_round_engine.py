@@ -6,7 +6,9 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import itertools
+import threading
 
+from pants.base.exceptions import TaskError
 from pants.engine.round_engine import RoundEngine
 from pants.task.task import Task
 from pants_test.base_test import BaseTest
@@ -42,7 +44,8 @@ class RoundEngineTest(EngineTestBase, BaseTest):
   def construct_action(self, tag):
     return 'construct', tag, self._context
 
-  def record(self, tag, product_types=None, required_data=None, alternate_target_roots=None):
+  def record(self, tag, product_types=None, required_data=None, alternate_target_roots=None,
+             execute=None, exclusive=False):
 
     class RecordingTask(Task):
       options_scope = tag
@@ -51,6 +54,10 @@ class RoundEngineTest(EngineTestBase, BaseTest):
       def product_types(cls):
         return product_types or []
 
+      @classmethod
+      def executes_exclusively(cls):
+        return exclusive
+
       @classmethod
       def alternate_target_roots(cls, options, address_mapper, build_graph):
         self.actions.append(self.alternate_target_roots_action(tag))
@@ -67,17 +74,20 @@ class RoundEngineTest(EngineTestBase, BaseTest):
         self.actions.append(self.construct_action(tag))
 
       def execute(me):
+        if execute:
+          execute()
         self.actions.append(self.execute_action(tag))
 
     return RecordingTask
 
   def install_task(self, name, product_types=None, goal=None, required_data=None,
-                   alternate_target_roots=None):
+                   alternate_target_roots=None, execute=None, exclusive=False):
     """Install a task to goal and return all installed tasks of the goal.
 
     This is needed to initialize tasks' context.
     """
-    task_type = self.record(name, product_types, required_data, alternate_target_roots)
+    task_type = self.record(name, product_types, required_data, alternate_target_roots, execute,
+                            exclusive)
     return super(RoundEngineTest,
                  self).install_task(name=name, action=task_type, goal=goal).task_types()
 
@@ -229,3 +239,103 @@ class RoundEngineTest(EngineTestBase, BaseTest):
     self.engine.attempt(self._context, self.as_goals('goal1', 'goal2'))
 
     self.assertEquals([], self._context.target_roots)
+
+  def executed(self):
+    return [tag for action, tag, _ in self.actions if action == 'execute']
+
+  def test_concurrent_independent_goals_overlap(self):
+    # Each task waits until the other has started, so they can only both finish if they overlap.
+    started = {'task1': threading.Event(), 'task2': threading.Event()}
+    overlapped = []
+
+    def rendezvous(tag, other):
+      def execute():
+        started[tag].set()
+        if started[other].wait(10):
+          overlapped.append(tag)
+      return execute
+
+    # Like a compile task and an unrelated lint task, which produces no data.
+    task1 = self.install_task('task1', goal='goal1', product_types=['1'],
+                              execute=rendezvous('task1', 'task2'))
+    task2 = self.install_task('task2', goal='goal2', execute=rendezvous('task2', 'task1'))
+    self.create_context(for_task_types=task1+task2)
+    RoundEngine(max_concurrent_tasks=2).attempt(self._context, self.as_goals('goal1', 'goal2'))
+    self.assertEqual({'task1', 'task2'}, set(overlapped))
+    self.assertEqual({'task1', 'task2'}, set(self.executed()))
+
+  def test_concurrent_dependent_tasks_do_not_overlap(self):
+    running = []
+    overlaps = []
+
+    def track(tag):
+      def execute():
+        if running:
+          overlaps.append((tag, list(running)))
+        running.append(tag)
+        # Give a wrongly scheduled dependee the chance to start.
+        threading.Event().wait(0.05)
+        running.remove(tag)
+      return execute
+
+    task1 = self.install_task('task1', goal='goal1', product_types=['1'], execute=track('task1'))
+    task2 = self.install_task('task2', goal='goal1', product_types=['2'], execute=track('task2'))
+    task3 = self.install_task('task3', goal='goal3', product_types=['3'], required_data=['1'],
+                              execute=track('task3'))
+    task4 = self.install_task('task4', goal='goal4', required_data=['2', '3'],
+                              execute=track('task4'))
+    self.create_context(for_task_types=task1+task2+task3+task4)
+    RoundEngine(max_concurrent_tasks=4).attempt(self._context, self.as_goals('goal4'))
+
+    executed = self.executed()
+    self.assertEqual({'task1', 'task2', 'task3', 'task4'}, set(executed))
+    # The tasks of a goal execute in installed order and after the producers of data they require.
+    self.assertLess(executed.index('task1'), executed.index('task2'))
+    self.assertLess(executed.index('task1'), executed.index('task3'))
+    self.assertEqual('task4', executed[-1])
+    # Only task2 and task3 are independent of one another.
+    for tag, others in overlaps:
+      self.assertEqual({'task2', 'task3'}, set([tag] + others))
+
+  def test_concurrent_exclusive_tasks_are_barriers(self):
+    running = []
+    overlaps = []
+
+    def track(tag):
+      def execute():
+        if running:
+          overlaps.append((tag, list(running)))
+        running.append(tag)
+        # Give a wrongly scheduled task the chance to start.
+        threading.Event().wait(0.05)
+        running.remove(tag)
+      return execute
+
+    # Like `clean-all compile`, where the first goal must finish before the second starts.
+    task1 = self.install_task('task1', goal='goal1', execute=track('task1'), exclusive=True)
+    task2 = self.install_task('task2', goal='goal2', product_types=['2'], execute=track('task2'))
+    task3 = self.install_task('task3', goal='goal3', execute=track('task3'))
+    task4 = self.install_task('task4', goal='goal4', execute=track('task4'), exclusive=True)
+    task5 = self.install_task('task5', goal='goal5', product_types=['5'], execute=track('task5'))
+    self.create_context(for_task_types=task1+task2+task3+task4+task5)
+    RoundEngine(max_concurrent_tasks=4).attempt(
+      self._context, self.as_goals('goal1', 'goal2', 'goal3', 'goal4', 'goal5'))
+
+    executed = self.executed()
+    self.assertEqual('task1', executed[0])
+    self.assertEqual({'task2', 'task3'}, set(executed[1:3]))
+    self.assertEqual(['task4', 'task5'], executed[3:])
+    # Only task2 and task3 are independent of one another.
+    for tag, others in overlaps:
+      self.assertEqual({'task2', 'task3'}, set([tag] + others))
+
+  def test_concurrent_failure(self):
+    def fail():
+      raise TaskError('task1 failed')
+
+    task1 = self.install_task('task1', goal='goal1', product_types=['1'], execute=fail)
+    task2 = self.install_task('task2', goal='goal2', required_data=['1'])
+    self.create_context(for_task_types=task1+task2)
+    with self.assertRaises(TaskError):
+      RoundEngine(max_concurrent_tasks=2).attempt(self._context, self.as_goals('goal2'))
+    self.assertEqual([], self.executed())
@@ -0,0 +1,80 @@
+# coding=utf-8
+# Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import multiprocessing
+import os
+import random
+
+from pants.fs.archive import archiver
+from pants.util.contextutil import Timer, temporary_dir
+from pants.util.dirutil import safe_open
+
+
+def write_tree(root, total_mb, num_files, seed):
+  """Writes `num_files` files totalling `total_mb` of moderately compressible data."""
+  rnd = random.Random(seed)
+  words = [os.urandom(rnd.randint(2, 12)) for _ in range(4096)]
+  file_size = total_mb * 1024 * 1024 // num_files
+  for i in range(num_files):
+    chunks = []
+    size = 0
+    while size < file_size:
+      word = rnd.choice(words)
+      chunks.append(word)
+      size += len(word)
+    with safe_open(os.path.join(root, 'dir{}'.format(i % 16), 'file{}'.format(i)), 'wb') as fp:
+      fp.write(b''.join(chunks)[:file_size])
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Benchmarks archive creation throughput.')
+  parser.add_argument('--mb', type=int, default=256,
+                      help='The total size of the files to archive, in MB.')
+  parser.add_argument('--files', type=int, default=512,
+                      help='The number of files to archive.')
+  parser.add_argument('--parallelism', type=int, default=multiprocessing.cpu_count(),
+                      help='The parallelism of the parallel archivers.')
+  parser.add_argument('--repeat', type=int, default=3,
+                      help='The number of times to run each benchmark; the fastest is reported.')
+  parser.add_argument('--seed', type=int, default=42,
+                      help='The seed for the random file contents.')
+  args = parser.parse_args()
+
+  configurations = [
+    ('tgz', {}),
+    ('tgz', dict(compression_level=1)),
+    ('tgz', dict(parallelism=args.parallelism)),
+    ('tgz', dict(compression_level=1, parallelism=args.parallelism)),
+    ('zip', {}),
+    ('zip', dict(compression_level=1)),
+    ('zip', dict(parallelism=args.parallelism)),
+    ('zip', dict(compression_level=1, parallelism=args.parallelism)),
+    ('zip', dict(compression_level=0)),
+  ]
+
+  with temporary_dir() as basedir:
+    write_tree(basedir, args.mb, args.files, args.seed)
+    print('Wrote {} files ({} MB).'.format(args.files, args.mb))
+
+    print('{:<6} {:<34} {:>9} {:>10} {:>8}'.format('type', 'options', 'time', 'MB/s', 'ratio'))
+    for typename, kwargs in configurations:
+      times = []
+      for _ in range(args.repeat):
+        with temporary_dir() as outdir:
+          with Timer() as timer:
+            path = archiver(typename, **kwargs).create(basedir, outdir, 'archive')
+          times.append(timer.elapsed)
+          size = os.path.getsize(path)
+      elapsed = min(times)
+      options = ', '.join('{}={}'.format(k, v) for k, v in sorted(kwargs.items())) or 'default'
+      print('{:<6} {:<34} {:>8.2f}s {:>10.1f} {:>8.3f}'.format(
+        typename, options, elapsed, args.mb / elapsed, size / (args.mb * 1024 * 1024)))
+
+
+if __name__ == '__main__':
+  main()
@@ -7,9 +7,12 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import unittest
+import zipfile
 
-from pants.fs.archive import archiver
-from pants.util.contextutil import temporary_dir
+import mock
+
+from pants.fs.archive import ZIP, Archiver, _ParallelGzipWriter, archiver
+from pants.util.contextutil import open_zip, temporary_dir
 from pants.util.dirutil import safe_mkdir, safe_walk, touch
 
 
@@ -56,9 +59,59 @@ class ArchiveTest(unittest.TestCase):
     self.round_trip(archiver('tgz'), expected_ext='tar.gz', empty_dirs=True)
     self.round_trip(archiver('tbz2'), expected_ext='tar.bz2', empty_dirs=True)
 
+  def test_tar_configured(self):
+    self.round_trip(archiver('tgz', compression_level=1), expected_ext='tar.gz', empty_dirs=True)
+    self.round_trip(archiver('tgz', parallelism=2), expected_ext='tar.gz', empty_dirs=True)
+    self.round_trip(archiver('tbz2', compression_level=1), expected_ext='tar.bz2', empty_dirs=True)
+
+  def test_tar_parallel_gzip_blocks(self):
+    tgz = archiver('tgz', parallelism=3)
+    with temporary_dir() as fromdir:
+      contents = os.urandom(1024) * 3000
+      with open(os.path.join(fromdir, 'big'), 'wb') as fp:
+        fp.write(contents)
+      # Enough for several gzip members, and for blocks to queue up behind the pool.
+      with temporary_dir() as archivedir, \
+           mock.patch.object(_ParallelGzipWriter, '_BLOCK_SIZE', 100 * 1024):
+        path = tgz.create(fromdir, archivedir, 'archive')
+        with temporary_dir() as todir:
+          tgz.extract(path, todir)
+          with open(os.path.join(todir, 'big'), 'rb') as fp:
+            self.assertEqual(contents, fp.read())
+
   def test_zip(self):
     self.round_trip(archiver('zip'), expected_ext='zip', empty_dirs=False)
 
+  def test_zip_configured(self):
+    self.round_trip(archiver('zip', compression_level=1), expected_ext='zip', empty_dirs=False)
+    self.round_trip(archiver('zip', parallelism=2), expected_ext='zip', empty_dirs=False)
+    self.round_trip(archiver('zip', compression_level=0), expected_ext='zip', empty_dirs=False)
+    self.assertIs(ZIP, archiver('zip'))
+
+  def test_configured_defaults_to_self(self):
+    class CustomArchiver(Archiver):
+      def create(self, basedir, outdir, name, prefix=None):
+        pass
+
+    custom = CustomArchiver()
+    self.assertIs(custom, custom.configured(compression_level=1, parallelism=2))
+
+  def test_zip_compression(self):
+    def compress_types(archiver):
+      with temporary_dir() as fromdir:
+        for i in range(10):
+          with open(os.path.join(fromdir, '{}.txt'.format(i)), 'wb') as fp:
+            fp.write(b'a' * 1000 * i)
+        with temporary_dir() as archivedir:
+          path = archiver.create(fromdir, archivedir, 'archive')
+          with open_zip(path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(b'a' * 9000, zf.read('9.txt'))
+            return set(info.compress_type for info in zf.infolist())
+
+    self.assertEqual({zipfile.ZIP_DEFLATED}, compress_types(archiver('zip', parallelism=4)))
+    self.assertEqual({zipfile.ZIP_STORED}, compress_types(archiver('zip', compression_level=0)))
+
   def test_zip_filter(self):
     def do_filter(path):
       return path == 'allowed.txt'
@@ -104,3 +104,40 @@ class UnionProductsTest(BaseTest):
     found_target = self.products.target_for_product(1000)
 
     self.assertIsNone(found_target)
+
+  def test_copy_shares_until_modified(self):
+    b = self.make_target('b')
+    a = self.make_target('a', dependencies=[b])
+    self.products.add_for_target(a, [1])
+    self.products.add_for_target(b, [2])
+
+    copied = self.products.copy()
+    copied.remove_for_target(a, [1])
+    self.products.add_for_target(b, [3])
+
+    self.assertEquals(self.products.get_for_targets([a, b]), OrderedSet([1, 2, 3]))
+    self.assertEquals(copied.get_for_targets([a, b]), OrderedSet([2]))
+
+    # Copies of copies are independent too.
+    copied_again = copied.copy()
+    copied_again.add_for_target(a, [4])
+    self.assertEquals(copied.get_for_target(a), OrderedSet())
+    self.assertEquals(copied_again.get_for_target(a), OrderedSet([4]))
+    self.assertEquals(self.products.get_for_target(a), OrderedSet([1]))
+
+  def test_target_for_product_tracks_updates(self):
+    c = self.make_target('c')
+    d = self.make_target('d')
+    self.products.add_for_target(c, [3])
+    self.assertEqual(c, self.products.target_for_product(3))
+
+    self.products.add_for_target(d, [4])
+    self.assertEqual(d, self.products.target_for_product(4))
+
+    self.products.remove_for_target(c, [3])
+    self.assertIsNone(self.products.target_for_product(3))
+
+    copied = self.products.copy()
+    copied.add_for_target(c, [5])
+    self.assertEqual(c, copied.target_for_product(5))
+    self.assertIsNone(self.products.target_for_product(5))
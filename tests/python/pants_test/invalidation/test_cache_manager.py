@@ -5,12 +5,14 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import os
 import shutil
 import tempfile
 
 from pants.invalidation.build_invalidator import CacheKey, CacheKeyGenerator
 from pants.invalidation.cache_manager import (InvalidationCacheManager, InvalidationCheck,
                                               VersionedTarget)
+from pants.util.dirutil import CLONE_STRATEGIES, read_file, safe_delete, safe_file_dump
 from pants_test.base_test import BaseTest
 
 
@@ -78,3 +80,25 @@ class InvalidationCacheManagerTest(BaseTest):
     self.assertEquals(5, len(all_vts))
     vts_targets = [vt.targets[0] for vt in all_vts]
     self.assertEquals(set(targets), set(vts_targets))
+
+  def test_create_results_dir_incrementally(self):
+    root_dir = os.path.join(self._dir, 'results')
+    for clone_strategy in CLONE_STRATEGIES:
+      target = self.make_target(':{}'.format(clone_strategy))
+      previous_vt = VersionedTarget(self.cache_manager, target, CacheKey(target.id, 'previous', 1))
+      previous_vt.create_results_dir(root_dir, allow_incremental=True)
+      previous_file = os.path.join(previous_vt.results_dir, 'classes', 'A.class')
+      safe_file_dump(previous_file, 'previous')
+      previous_vt.update()
+
+      vt = VersionedTarget(self.cache_manager, target, CacheKey(target.id, 'current', 1))
+      vt.create_results_dir(root_dir, allow_incremental=True, clone_strategy=clone_strategy)
+      self.assertTrue(vt.is_incremental)
+      self.assertEqual(previous_vt.results_dir, vt.previous_results_dir)
+      current_file = os.path.join(vt.results_dir, 'classes', 'A.class')
+      self.assertEqual('previous', read_file(current_file))
+
+      # Replacing a cloned file leaves the previous results dir intact.
+      safe_delete(current_file)
+      safe_file_dump(current_file, 'current')
+      self.assertEqual('previous', read_file(previous_file))
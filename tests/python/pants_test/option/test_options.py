@@ -453,6 +453,22 @@ class OptionsTest(unittest.TestCase):
       self.assertTrue(options.is_known_scope(scope_info.scope))
     self.assertFalse(options.is_known_scope('nonexistent_scope'))
 
+  def test_add_known_scope_infos(self):
+    options = self._parse('./pants --num=88 compile.java --c=5',
+                          config={'late.task': {'foo': 'from_config'}})
+    options.for_scope('compile')  # Values for existing scopes may already be computed.
+    options.add_known_scope_infos([task('late.task'), task('compile.late')])
+    self.assertTrue(options.is_known_scope('late'))
+    self.assertTrue(options.is_known_scope('late.task'))
+    self.assertTrue(options.is_known_scope('compile.late'))
+
+    options.register('late.task', '--foo')
+    options.register('compile.late', '--bar', default='bar')
+    self.assertEqual('from_config', options.for_scope('late.task').foo)
+    self.assertEqual(88, options.for_scope('late.task').num)
+    self.assertEqual('bar', options.for_scope('compile.late').bar)
+    self.assertEqual(5, options.for_scope('compile.java').c)
+
   def test_designdoc_example(self):
     # The example from the design doc.
     # Get defaults from config and environment.
@@ -233,6 +233,54 @@ class GitTest(unittest.TestCase):
     with current_reader.open('dir/relative-dotdot') as f:
       self.assertEquals('Hello World.\u2764'.encode('utf-8'), f.read())
 
+  def test_prefetch_reader_matches_lazy_reader(self):
+    def read(reader, path):
+      try:
+        with reader.open(path) as f:
+          contents = f.read()
+      except Exception as e:
+        contents = type(e).__name__
+      try:
+        listing = sorted(reader.listdir(path))
+      except Exception as e:
+        listing = type(e).__name__
+      return reader.exists(path), reader.isdir(path), reader.isfile(path), contents, listing
+
+    paths = ['.', 'README', 'dir', 'dir/f', 'dir/relative-symlink', 'dir/relative-nonexistent',
+             'dir/relative-dotdot', 'dir/no-such-file', 'link-to-dir', 'link-to-dir/f',
+             'not-a-dir', 'no-such-dir/f']
+    for rev in self.initial_rev, self.current_rev:
+      lazy_reader = self.git.repo_reader(rev)
+      prefetch_reader = self.git.repo_reader(rev, prefetch=True)
+      for path in paths:
+        self.assertEqual(read(lazy_reader, path), read(prefetch_reader, path))
+
+    with self.assertRaises(prefetch_reader.MissingFileException):
+      self.git.repo_reader('no-such-rev', prefetch=True).listdir('.')
+
+  def test_prefetch_blobs(self):
+    for prefetch in False, True:
+      reader = self.git.repo_reader(self.current_rev, prefetch=prefetch)
+      reader.prefetch_blobs(['README', 'link-to-dir/f', 'dir/relative-dotdot', 'dir', 'loop1',
+                             'no-such-file'])
+
+      with reader.open('README') as f:
+        self.assertEquals('Hello World.\u2764'.encode('utf-8'), f.read())
+      with reader.open('dir/f') as f:
+        self.assertEquals('file in subdir', f.read())
+      with reader.open('dir/relative-dotdot') as f:
+        self.assertEquals('Hello World.\u2764'.encode('utf-8'), f.read())
+      # Prefetched contents are only held until the file is read.
+      with reader.open('README') as f:
+        self.assertEquals('Hello World.\u2764'.encode('utf-8'), f.read())
+
+      with self.assertRaises(reader.IsDirException):
+        with reader.open('dir'):
+          pass
+      with self.assertRaises(reader.MissingFileException):
+        with reader.open('no-such-file'):
+          pass
+
   def test_integration(self):
     self.assertEqual(set(), self.git.changed_files())
     self.assertEqual({'README'}, self.git.changed_files(from_commit='HEAD^'))
@@ -67,3 +67,98 @@ class StatsDBTest(unittest.TestCase):
       self.assertEqual(
         sorted([('2015-08-03', 'compile.java', 2, 21340), ('2015-08-03', 'resolve.ivy', 1, 56000)]),
         sorted(aggs))
+
+  def _insert_run(self, statsdb, run_id, timestamp, timings, cmd_line='pants compile ::',
+                  machine='ernie', outcome='SUCCESS'):
+    statsdb.insert_stats({
+      'run_info': {
+        'id': run_id,
+        'timestamp': str(timestamp),
+        'machine': machine,
+        'user': 'bert',
+        'version': '9.8.7',
+        'buildroot': '/path/to/repo',
+        'outcome': outcome,
+        'cmd_line': cmd_line
+      },
+      'cumulative_timings': [t(label, timing) for label, timing in timings.items()],
+      'self_timings': []
+    })
+
+  def test_run_info_and_timings(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      self.assertIsNone(statsdb.get_run_info())
+      self._insert_run(statsdb, 'run1', 1000, {'main': 2, 'main:compile': 1.5})
+      self._insert_run(statsdb, 'run2', 2000, {'main': 3}, machine='oscar')
+
+      self.assertEqual('run2', statsdb.get_run_info()['id'])
+      self.assertEqual('run1', statsdb.get_run_info(machine='ernie')['id'])
+      run_info = statsdb.get_run_info(run_id='run1')
+      self.assertEqual(('ernie', 1000, 'pants compile ::'),
+                       (run_info['machine'], run_info['timestamp'], run_info['cmd_line']))
+      self.assertIsNone(statsdb.get_run_info(run_id='run3'))
+      self._insert_run(statsdb, 'report', 3000, {'main': 1}, cmd_line='pants perf-report')
+      self.assertEqual('run1', statsdb.get_run_info(machine='ernie',
+                                                    exclude_cmd_line_like='%perf-report%')['id'])
+      self.assertEqual({'main': 2000, 'main:compile': 1500},
+                       statsdb.get_timings_for_run('cumulative_timings', 'run1'))
+
+  def test_baselines(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i, timing in enumerate([5, 1, 4, 2, 3]):
+        self._insert_run(statsdb, 'run{}'.format(i), 1000 + i, {'main': timing})
+      # Runs of another command, on another machine or that failed are not in the window.
+      self._insert_run(statsdb, 'other_cmd', 1010, {'main': 100}, cmd_line='pants test ::')
+      self._insert_run(statsdb, 'other_machine', 1011, {'main': 100}, machine='oscar')
+      self._insert_run(statsdb, 'failed', 1012, {'main': 100}, outcome='FAILURE')
+
+      baselines = statsdb.get_baselines('cumulative_timings', 'pants compile ::', 'ernie',
+                                        window=10, percentile=80)
+      self.assertEqual({'main'}, set(baselines))
+      self.assertEqual(5, baselines['main'].count)
+      self.assertEqual(3000, baselines['main'].median)
+      self.assertEqual(4000, baselines['main'].percentile)
+
+      # The window only holds the latest runs before the given run.
+      baselines = statsdb.get_baselines('cumulative_timings', 'pants compile ::', 'ernie',
+                                        window=2, before_run_id='run4')
+      self.assertEqual(2, baselines['main'].count)
+      self.assertEqual(3000, baselines['main'].median)
+
+  def test_baselines_before_run_in_the_same_second(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i, timing in enumerate([5, 1, 4, 2, 3]):
+        self._insert_run(statsdb, 'run{}'.format(i), 1000, {'main': timing})
+
+      # Runs recorded earlier in the same second are in the window, the run and later ones aren't.
+      baselines = statsdb.get_baselines('cumulative_timings', 'pants compile ::', 'ernie',
+                                        window=10, before_run_id='run3')
+      self.assertEqual(3, baselines['main'].count)
+      self.assertEqual(4000, baselines['main'].median)
+      self.assertEqual({}, statsdb.get_baselines('cumulative_timings', 'pants compile ::',
+                                                 'ernie', window=10, before_run_id='run0'))
+
+  def test_timing_trend(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i, timing in enumerate([1, 3, 2, 10]):
+        self._insert_run(statsdb, 'run{}'.format(i), 1000 + i, {'main:compile': timing})
+      self._insert_run(statsdb, 'other_cmd', 999, {'main:compile': 100}, cmd_line='pants test ::')
+
+      self.assertEqual(['main:compile'], statsdb.get_labels('cumulative_timings'))
+
+      trend = statsdb.get_timing_trend('cumulative_timings', 'main:compile', limit=3, window=2)
+      self.assertEqual([('run1', 3000, 1000), ('run2', 2000, 2000), ('run3', 10000, 2500)],
+                       [(point.run_id, point.timing, point.baseline) for point in trend])
+
+      trend = statsdb.get_timing_trend('cumulative_timings', 'main:compile',
+                                       cmd_line_like='% test %')
+      self.assertEqual([('other_cmd', 100000, None)],
+                       [(point.run_id, point.timing, point.baseline) for point in trend])
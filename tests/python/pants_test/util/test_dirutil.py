@@ -8,9 +8,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import atexit
 import errno
 import os
+import sys
 import tempfile
 import time
 import unittest
+from contextlib import contextmanager
 
 import mock
 import mox
@@ -18,9 +20,10 @@ import six
 
 from pants.util import dirutil
 from pants.util.contextutil import pushd, temporary_dir
-from pants.util.dirutil import (_mkdtemp_unregister_cleaner, fast_relpath, get_basedir, read_file,
-                                relative_symlink, relativize_paths, rm_rf, safe_concurrent_creation,
-                                safe_file_dump, safe_mkdir, safe_rm_oldest_items_in_dir, touch)
+from pants.util.dirutil import (CLONE_STRATEGIES, _mkdtemp_unregister_cleaner, clone_tree,
+                                fast_relpath, get_basedir, read_file, relative_symlink,
+                                relativize_paths, rm_rf, safe_concurrent_creation, safe_file_dump,
+                                safe_mkdir, safe_rm_oldest_items_in_dir, touch)
 
 
 class DirutilTest(unittest.TestCase):
@@ -277,3 +280,48 @@ class DirutilTest(unittest.TestCase):
       safe_rm_oldest_items_in_dir(td, 1)
       touch(os.path.join(td, 'file1'))
       self.assertEqual(len(os.listdir(td)), 1)
+
+  @contextmanager
+  def _tree(self):
+    with temporary_dir() as src, temporary_dir() as parent:
+      safe_file_dump(os.path.join(src, 'a'), 'a')
+      safe_file_dump(os.path.join(src, 'b', 'c'), 'c')
+      safe_mkdir(os.path.join(src, 'b', 'd'))
+      os.symlink('c', os.path.join(src, 'b', 'e'))
+      os.chmod(os.path.join(src, 'b'), 0o555)
+      dst = os.path.join(parent, 'dst')
+      try:
+        yield src, dst
+      finally:
+        for root in src, dst:
+          if os.path.isdir(os.path.join(root, 'b')):
+            os.chmod(os.path.join(root, 'b'), 0o755)
+
+  def _assert_tree(self, root):
+    self.assertEqual('a', read_file(os.path.join(root, 'a')))
+    self.assertEqual('c', read_file(os.path.join(root, 'b', 'c')))
+    self.assertTrue(os.path.isdir(os.path.join(root, 'b', 'd')))
+    self.assertEqual('c', read_file(os.path.join(root, 'b', 'e')))
+    self.assertEqual(0o555, os.stat(os.path.join(root, 'b')).st_mode & 0o777)
+
+  def test_clone_tree(self):
+    for strategy in CLONE_STRATEGIES:
+      with self._tree() as (src, dst):
+        clone_tree(src, dst, strategy=strategy)
+        self._assert_tree(dst)
+        self.assertFalse(os.path.samefile(os.path.join(src, 'a'), os.path.join(dst, 'a')))
+
+  def test_clone_tree_unknown_strategy(self):
+    with temporary_dir() as src, temporary_dir() as parent:
+      with self.assertRaises(ValueError):
+        clone_tree(src, os.path.join(parent, 'dst'), strategy='symlink')
+
+  @unittest.skipUnless(sys.platform.startswith('linux'), 'Reflinks are only attempted on Linux.')
+  def test_clone_tree_reflink_fallback(self):
+    with self._tree() as (src, dst):
+      unsupported = IOError(errno.EOPNOTSUPP, 'Operation not supported')
+      with mock.patch('fcntl.ioctl', side_effect=unsupported) as ioctl:
+        clone_tree(src, dst, strategy='reflink')
+      # Files are copied once the filesystem turns out not to support reflinks.
+      self.assertEqual(1, ioctl.call_count)
+      self._assert_tree(dst)